@@ -94,6 +94,7 @@ def main() -> None:
 
   # API Key 管理
   registry-tools api-key create "My API Key" --permission read
+  registry-tools api-key create "Team A" --permission write --namespace team-a
   registry-tools api-key list
         """,
     )
@@ -120,7 +121,7 @@ def main() -> None:
     parser.add_argument(
         "--storage-backend",
         type=str,
-        choices=["json", "sqlite"],
+        choices=["json", "sqlite", "binary"],
         default=None,
         help="存储后端类型 (默认: json)",
     )
@@ -145,6 +146,9 @@ def main() -> None:
     )
     create_parser.add_argument("--expires-in", type=int, help="过期时间（秒）")
     create_parser.add_argument("--owner", type=str, help="所有者标识")
+    create_parser.add_argument(
+        "--namespace", type=str, help="绑定的命名空间（Key 只能访问该命名空间的工具）"
+    )
 
     # list 子命令
     list_parser = api_key_subparsers.add_parser("list", help="列出 API Key")
@@ -226,6 +230,7 @@ def main() -> None:
     from registrytools.server import (
         create_auth_middleware_for_server,
         create_server,
+        create_server_with_binary,
         create_server_with_sqlite,
     )
 
@@ -236,12 +241,16 @@ def main() -> None:
         auth_middleware = create_auth_middleware_for_server(data_path)
         if storage_backend == StorageBackend.SQLITE:
             app = create_server_with_sqlite(data_path, auth_middleware)
+        elif storage_backend == StorageBackend.BINARY:
+            app = create_server_with_binary(data_path, auth_middleware)
         else:
             app = create_server(data_path, auth_middleware)
         logger.info("API Key 认证中间件已启用")
     else:
         if storage_backend == StorageBackend.SQLITE:
             app = create_server_with_sqlite(data_path)
+        elif storage_backend == StorageBackend.BINARY:
+            app = create_server_with_binary(data_path)
         else:
             app = create_server(data_path)
         logger.info("API Key 认证中间件未启用")
@@ -270,6 +279,7 @@ def _handle_api_key_command(args: argparse.Namespace) -> None:
     """
 
     from registrytools.auth import APIKeyPermission, APIKeyScope, APIKeyStorage, generate_api_key
+    from registrytools.registry.namespaces import validate_namespace
 
     # 获取数据路径
     data_path_str = os.getenv("REGISTRYTOOLS_DATA_PATH") or args.data_path
@@ -286,14 +296,22 @@ def _handle_api_key_command(args: argparse.Namespace) -> None:
     storage = APIKeyStorage(data_path / "api_keys.db")
 
     if args.api_key_action == "create":
-        # 创建 API Key
+        # 创建 API Key（绑定命名空间记录在元数据中）
         permission = APIKeyPermission(args.permission)
+        metadata = None
+        if args.namespace:
+            try:
+                metadata = {"namespace": validate_namespace(args.namespace)}
+            except ValueError as e:
+                print(f"✗ {e}")
+                return
         api_key = generate_api_key(
             name=args.name,
             permission=permission,
             scope=APIKeyScope.ALL,
             expires_in=args.expires_in,
             owner=args.owner,
+            metadata=metadata,
         )
         storage.save(api_key)
 
@@ -301,6 +319,8 @@ def _handle_api_key_command(args: argparse.Namespace) -> None:
         print(f"  ID: {api_key.key_id}")
         print(f"  Name: {api_key.name}")
         print(f"  Permission: {api_key.permission.value}")
+        if metadata:
+            print(f"  Namespace: {metadata['namespace']}")
         print(f"  API Key: {api_key.api_key}")
         print("\n重要: 请妥善保存 API Key，它只会显示这一次！")
 
@@ -317,6 +337,8 @@ def _handle_api_key_command(args: argparse.Namespace) -> None:
             print(f"ID: {key_meta.key_id}")
             print(f"Name: {key_meta.name}")
             print(f"Permission: {key_meta.permission.value}")
+            if key_meta.metadata and key_meta.metadata.get("namespace"):
+                print(f"Namespace: {key_meta.metadata['namespace']}")
             print(f"Active: {key_meta.is_active}")
             print(f"Created: {key_meta.created_at}")
             print(f"Usage: {key_meta.usage_count} 次")
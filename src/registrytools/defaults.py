@@ -16,7 +16,7 @@ from registrytools.registry.models import SearchMethod, ToolMetadata
 # ============================================================
 
 DEFAULT_SEARCH_METHOD = SearchMethod.BM25
-"""默认搜索方法 (regex/bm25/embedding)"""
+"""默认搜索方法 (regex/bm25/embedding/hybrid/fusion)"""
 
 
 def get_supported_search_methods() -> list[SearchMethod]:
@@ -33,14 +33,55 @@ def get_supported_search_methods() -> list[SearchMethod]:
         import sentence_transformers  # noqa: F401
 
         methods.append(SearchMethod.EMBEDDING)
+        methods.append(SearchMethod.HYBRID)
     except ImportError:
         pass
+    methods.append(SearchMethod.FUSION)
     return methods
 
 
 SUPPORTED_SEARCH_METHODS = get_supported_search_methods()
 """支持的搜索方法列表（动态检测）"""
 
+# ============================================================
+# Embedding 分层路由配置
+# ============================================================
+
+EMBEDDING_ROUTING_TOP_K = 3
+"""类别质心路由每次选取的类别数量"""
+
+EMBEDDING_ROUTING_MIN_CONFIDENCE = 0.3
+"""最佳类别质心的最低余弦相似度，低于此值回退到全局搜索"""
+
+EMBEDDING_ROUTING_MIN_TOOLS = 1000
+"""启用类别路由的最小工具数量（小规模工具集直接全局搜索）"""
+
+# ============================================================
+# 混合搜索配置
+# ============================================================
+
+HYBRID_CANDIDATE_POOL = 50
+"""混合搜索中 BM25 召回的候选数量"""
+
+HYBRID_BM25_WEIGHT = 0.4
+"""混合搜索中 BM25 分数的融合权重（语义分数权重为 1 - 该值）"""
+
+# ============================================================
+# 融合搜索配置
+# ============================================================
+
+FUSION_METHOD_DEADLINE_MS = 500
+"""融合搜索中单个搜索方法的截止时间（毫秒），超时的方法被丢弃"""
+
+FUSION_MAX_WORKERS = 4
+"""融合搜索线程池的最大线程数"""
+
+FUSION_RRF_K = 60
+"""倒数排名融合 (RRF) 的平滑常数 k"""
+
+FUSION_FETCH_MULTIPLIER = 2
+"""融合搜索中每个方法取回的结果数量倍数（相对于 limit）"""
+
 # ============================================================
 # 冷热工具分类配置 (TASK-802)
 # ============================================================
@@ -52,6 +93,13 @@ HOT_TOOL_THRESHOLD = 10
 WARM_TOOL_THRESHOLD = 3
 """温工具: 使用频率 ≥ 3"""
 
+# 使用分数衰减配置
+USAGE_SCORE_HALF_LIFE_DAYS = 14.0
+"""使用分数半衰期（天）：每经过一个半衰期，衰减后的使用分数减半"""
+
+USAGE_SCORE_EPSILON = 1e-6
+"""比较衰减分数与阈值时的容差（抵消连续使用之间的微小衰减）"""
+
 # 降级机制配置
 HOT_TOOL_INACTIVE_DAYS = 30
 """热工具 30 天未使用降级为温工具"""
@@ -66,6 +114,70 @@ MAX_HOT_TOOLS_PRELOAD = 100
 ENABLE_DOWNGRADE = True
 """是否启用工具降级机制"""
 
+TEMPERATURE_MAINTENANCE_INTERVAL = 300
+"""后台温度维护间隔（秒），0 表示禁用后台维护并在请求路径上内联执行"""
+
+# 使用统计写后刷新配置
+USAGE_FLUSH_INTERVAL = 5.0
+"""使用统计写后刷新间隔（秒）"""
+
+USAGE_FLUSH_BATCH_SIZE = 100
+"""待刷新工具数达到该值时提前刷新"""
+
+# 存储写缓冲配置
+WRITE_FLUSH_DELAY = 0.1
+"""写缓冲的防抖延迟（秒）：第一次缓冲写入后等待该时间再刷新，合并期间的后续写入"""
+
+WRITE_BATCH_SIZE = 500
+"""写缓冲中待写入工具数达到该值时立即刷新"""
+
+# 使用排行配置
+TOP_TOOLS_LIMIT = 10
+"""registry://top-tools 资源返回的最常用工具数量"""
+
+# Schema 延迟加载配置
+SCHEMA_CACHE_SIZE = 256
+"""已解析 Schema 的 LRU 缓存容量（工具数），0 表示启动时加载全部 Schema"""
+
+# 分层启动加载配置
+COLD_LOAD_BATCH_SIZE = 500
+"""后台加载未驻留温度层时每批注册的工具数"""
+
+# 变更日志配置
+CHANGE_LOG_SIZE = 1000
+"""注册表变更日志保留的最大变更数"""
+
+# JSON 存储日志模式配置
+JSON_JOURNAL_MIN_BYTES = 64 * 1024
+"""日志低于该大小时不压缩（避免小工具集每次写入都重写快照）"""
+
+JSON_JOURNAL_COMPACT_RATIO = 1.0
+"""日志大小达到快照大小的该倍数时压缩"""
+
+JSON_JOURNAL_MAX_BYTES = 16 * 1024 * 1024
+"""日志达到该大小时无论快照大小都压缩"""
+
+# 命名空间配置
+DEFAULT_NAMESPACE = "default"
+"""默认命名空间（未绑定命名空间的 API Key 和未指定命名空间的请求使用）"""
+
+MAX_LOADED_NAMESPACES = 16
+"""同时加载的非默认命名空间数量上限（超出时淘汰最久未使用的命名空间）"""
+
+# SQLite 连接配置
+SQLITE_READ_POOL_SIZE = 4
+"""SQLite 存储保留的空闲读连接数（并发读取超出时临时创建连接，归还时关闭）"""
+
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+"""SQLite 连接内存映射读取的上限（字节，PRAGMA mmap_size）"""
+
+SQLITE_CACHE_SIZE_KB = 16 * 1024
+"""每个 SQLite 连接的页缓存大小（KiB，PRAGMA cache_size）"""
+
+SQLITE_BUSY_TIMEOUT = 10.0
+"""等待其他进程释放数据库锁的超时（秒）"""
+
+
 # ============================================================
 # 默认工具集 (TASK-603)
 # ============================================================
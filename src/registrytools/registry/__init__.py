@@ -7,7 +7,30 @@ Copyright (c) 2026 Maric
 License: MIT
 """
 
-from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
+from registrytools.registry.compact import ToolRecord
+from registrytools.registry.maintenance import TemperatureMaintenanceScheduler
+from registrytools.registry.models import (
+    FusionMethodReport,
+    FusionSearchResult,
+    MaintenanceReport,
+    SearchMethod,
+    ToolMetadata,
+    ToolSearchResult,
+)
 from registrytools.registry.registry import ToolRegistry
+from registrytools.registry.snapshot import RegistrySnapshot
+from registrytools.registry.usage import UsageRecorder
 
-__all__ = ["SearchMethod", "ToolMetadata", "ToolSearchResult", "ToolRegistry"]
+__all__ = [
+    "SearchMethod",
+    "ToolMetadata",
+    "ToolSearchResult",
+    "FusionMethodReport",
+    "FusionSearchResult",
+    "MaintenanceReport",
+    "ToolRegistry",
+    "RegistrySnapshot",
+    "ToolRecord",
+    "TemperatureMaintenanceScheduler",
+    "UsageRecorder",
+]
@@ -0,0 +1,145 @@
+"""
+注册表变更日志
+
+按代数 (generation) 记录工具的注册、注销和温度变化，下游缓存和跟随者
+可以从上次同步的代数增量拉取变更，不需要重新列出全部工具。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+from registrytools.defaults import CHANGE_LOG_SIZE
+from registrytools.registry.models import ToolTemperature
+
+
+class ChangeOp(str, Enum):
+    """变更类型枚举"""
+
+    REGISTER = "register"
+    """注册或更新工具"""
+
+    UNREGISTER = "unregister"
+    """注销工具"""
+
+    TEMPERATURE = "temperature"
+    """工具温度层变化"""
+
+    CLEAR = "clear"
+    """清空注册表（tool_name 为 None）"""
+
+
+@dataclass(frozen=True, slots=True)
+class ToolChange:
+    """
+    一条注册表变更
+
+    Attributes:
+        generation: 变更所在的注册表代数（同一批写操作的变更共享代数）
+        op: 变更类型
+        tool_name: 工具名称（CLEAR 为 None）
+        temperature: 变更后的温度层（UNREGISTER 和 CLEAR 为 None）
+    """
+
+    generation: int
+    op: ChangeOp
+    tool_name: str | None = None
+    temperature: ToolTemperature | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        """转换为 JSON 兼容的字典"""
+        return {
+            "generation": self.generation,
+            "op": self.op.value,
+            "tool_name": self.tool_name,
+            "temperature": self.temperature.value if self.temperature else None,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeSet:
+    """
+    一次增量拉取的结果
+
+    Attributes:
+        generation: 拉取时的注册表代数（下次拉取的 since_generation）
+        changes: since_generation 之后的变更（按代数升序）
+        truncated: 是否有变更已被丢弃（为 True 时消费者需要全量重新同步）
+    """
+
+    generation: int
+    changes: list[ToolChange]
+    truncated: bool = False
+
+
+class ChangeLog:
+    """
+    容量有限的变更日志
+
+    超出容量时丢弃最早的变更，并记录被丢弃的最大代数，
+    使落后太多的消费者能够知道需要全量重新同步。
+
+    Attributes:
+        capacity: 保留的最大变更数
+        _entries: 变更队列（按代数升序）
+        _dropped_through: 已丢弃变更的最大代数（0 表示未丢弃）
+        _lock: 保护队列的锁
+    """
+
+    def __init__(self, capacity: int = CHANGE_LOG_SIZE) -> None:
+        """
+        初始化变更日志
+
+        Args:
+            capacity: 保留的最大变更数，默认 CHANGE_LOG_SIZE
+
+        Raises:
+            ValueError: 如果容量不大于 0
+        """
+        if capacity < 1:
+            raise ValueError(f"变更日志容量必须大于 0, 实际 {capacity}")
+
+        self.capacity = capacity
+        self._entries: deque[ToolChange] = deque()
+        self._dropped_through = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """日志中的变更数量"""
+        return len(self._entries)
+
+    def extend(self, changes: list[ToolChange]) -> None:
+        """
+        追加一批变更，超出容量时丢弃最早的变更
+
+        Args:
+            changes: 按代数升序排列的变更
+        """
+        with self._lock:
+            self._entries.extend(changes)
+            while len(self._entries) > self.capacity:
+                self._dropped_through = self._entries.popleft().generation
+
+    def since(self, generation: int) -> tuple[list[ToolChange], bool]:
+        """
+        获取指定代数之后的变更
+
+        Args:
+            generation: 消费者已同步到的代数
+
+        Returns:
+            (变更列表, 是否不完整) 元组。不完整表示部分变更已被丢弃，消费者需要全量重新同步
+        """
+        with self._lock:
+            truncated = generation < self._dropped_through
+            # 代数单调递增，从尾部向前找到第一条已同步的变更
+            index = len(self._entries)
+            while index > 0 and self._entries[index - 1].generation > generation:
+                index -= 1
+            changes = list(itertools.islice(self._entries, index, None))
+        return changes, truncated
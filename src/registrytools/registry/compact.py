@@ -0,0 +1,143 @@
+"""
+紧凑工具记录
+
+注册表内部使用 slots 记录保存工具：类别、服务器和标签字符串驻留 (intern) 共享，
+相同的标签组合共享同一个 frozenset。ToolMetadata 只在 API 边界按需创建。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+from registrytools.registry import scoring
+from registrytools.registry.models import ToolMetadata, ToolTemperature
+
+
+@dataclass(slots=True, eq=False)
+class ToolRecord:
+    """
+    注册表内部的工具记录
+
+    字段与 ToolMetadata 相同，但没有实例 __dict__ 和 pydantic 的字段集合，
+    tags 为共享的 frozenset。搜索算法只读取 name/description/tags/category/mcp_server，
+    可以直接在记录上建立索引。
+
+    Attributes:
+        name: 工具名称
+        description: 工具描述
+        mcp_server: 所属 MCP 服务器名称（驻留字符串）
+        category: 工具类别（驻留字符串）
+        tags: 工具标签（相同组合共享同一个 frozenset）
+        defer_loading: 是否延迟加载
+        use_frequency: 使用频率统计（累计次数）
+        last_used: 最后使用时间
+        usage_score: 指数衰减使用分数（在 usage_score_updated_at 时刻的值）
+        usage_score_updated_at: 使用分数最后更新时间
+        temperature: 工具温度级别
+        input_schema: 输入参数的 JSON Schema
+        output_schema: 输出结果的 JSON Schema
+        schemas_deferred: Schema 是否未随记录加载（首次访问时由注册表从存储读取）
+    """
+
+    name: str
+    description: str
+    mcp_server: str | None
+    category: str | None
+    tags: frozenset[str]
+    defer_loading: bool
+    use_frequency: int
+    last_used: datetime | None
+    usage_score: float
+    usage_score_updated_at: datetime | None
+    temperature: ToolTemperature
+    input_schema: dict | None
+    output_schema: dict | None
+    schemas_deferred: bool = False
+
+    @classmethod
+    def from_metadata(
+        cls,
+        tool: ToolMetadata,
+        tag_sets: dict[frozenset[str], frozenset[str]],
+        defer_schemas: bool = False,
+    ) -> "ToolRecord":
+        """
+        从 ToolMetadata 创建紧凑记录
+
+        Args:
+            tool: 工具元数据
+            tag_sets: 标签组合驻留表（相同组合返回同一个 frozenset）
+            defer_schemas: 工具的 Schema 是否未随元数据加载
+
+        Returns:
+            工具记录
+        """
+        tags = frozenset(sys.intern(tag) for tag in tool.tags)
+        tags = tag_sets.setdefault(tags, tags)
+        return cls(
+            name=tool.name,
+            description=tool.description,
+            mcp_server=sys.intern(tool.mcp_server) if tool.mcp_server else tool.mcp_server,
+            category=sys.intern(tool.category) if tool.category else tool.category,
+            tags=tags,
+            defer_loading=tool.defer_loading,
+            use_frequency=tool.use_frequency,
+            last_used=tool.last_used,
+            usage_score=tool.usage_score,
+            usage_score_updated_at=tool.usage_score_updated_at,
+            temperature=tool.temperature,
+            input_schema=tool.input_schema,
+            output_schema=tool.output_schema,
+            schemas_deferred=defer_schemas,
+        )
+
+    def to_metadata(self) -> ToolMetadata:
+        """
+        创建 ToolMetadata（API 边界）
+
+        字段已在注册时验证，使用 model_construct 跳过重复验证。
+        返回的实例是独立副本，修改它不会影响注册表（Schema 字典除外，与注册表共享）。
+        schemas_deferred 为 True 时返回的 Schema 为 None，由注册表负责按需加载。
+
+        Returns:
+            工具元数据
+        """
+        return ToolMetadata.model_construct(
+            name=self.name,
+            description=self.description,
+            mcp_server=self.mcp_server,
+            defer_loading=self.defer_loading,
+            tags=set(self.tags),
+            category=self.category,
+            use_frequency=self.use_frequency,
+            last_used=self.last_used,
+            usage_score=self.usage_score,
+            usage_score_updated_at=self.usage_score_updated_at,
+            temperature=self.temperature,
+            input_schema=self.input_schema,
+            output_schema=self.output_schema,
+        )
+
+    def usage_score_at(self, now: datetime | None = None) -> float:
+        """
+        获取指定时刻衰减后的使用分数（见 scoring.usage_score_at）
+
+        Args:
+            now: 当前时间，默认 datetime.now()
+
+        Returns:
+            衰减后的使用分数
+        """
+        return scoring.usage_score_at(self, now)
+
+    def record_usage(self, now: datetime | None = None) -> None:
+        """
+        记录一次使用（见 scoring.record_usage）
+
+        Args:
+            now: 使用时间，默认 datetime.now()
+        """
+        scoring.record_usage(self, now)
@@ -0,0 +1,150 @@
+"""
+后台温度维护
+
+周期性执行工具降级维护，并将温度变化批量写入存储，使请求路径只做计数更新。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from registrytools.defaults import TEMPERATURE_MAINTENANCE_INTERVAL
+from registrytools.registry.models import MaintenanceReport
+
+if TYPE_CHECKING:
+    from registrytools.registry.registry import ToolRegistry
+    from registrytools.storage.base import ToolStorage
+
+logger = logging.getLogger(__name__)
+
+
+class TemperatureMaintenanceScheduler:
+    """
+    后台温度维护调度器
+
+    由服务器持有的守护线程，每隔 interval 秒执行一次
+    ToolRegistry.run_maintenance()，并通过 storage.save_many() 一次性持久化
+    温度发生变化的工具。
+
+    Attributes:
+        interval: 维护间隔（秒）
+        last_report: 最近一次维护报告
+        _registry: 工具注册表
+        _storage: 存储层（None 表示不持久化）
+        _thread: 后台线程
+        _stop_event: 停止信号
+    """
+
+    def __init__(
+        self,
+        registry: "ToolRegistry",
+        storage: "ToolStorage | None" = None,
+        interval: float = TEMPERATURE_MAINTENANCE_INTERVAL,
+    ) -> None:
+        """
+        初始化维护调度器
+
+        Args:
+            registry: 工具注册表
+            storage: 存储层，None 表示只在内存中维护
+            interval: 维护间隔（秒），默认 TEMPERATURE_MAINTENANCE_INTERVAL
+
+        Raises:
+            ValueError: 如果间隔不大于 0
+        """
+        if interval <= 0:
+            raise ValueError(f"维护间隔必须大于 0, 实际 {interval}")
+
+        self.interval = interval
+        self.last_report: MaintenanceReport | None = None
+        self._registry = registry
+        self._storage = storage
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._run_lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """后台线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self, now: datetime | None = None) -> MaintenanceReport:
+        """
+        执行一次维护
+
+        Args:
+            now: 当前时间，默认 datetime.now()
+
+        Returns:
+            维护报告
+        """
+        with self._run_lock:
+            started_at = datetime.now()
+            start = time.perf_counter()
+
+            moved = self._registry.run_maintenance(now)
+
+            # 批量持久化温度变化
+            persisted = True
+            if moved and self._storage is not None:
+                try:
+                    self._storage.save_many(moved)
+                except OSError as e:
+                    persisted = False
+                    logger.error(f"温度维护：持久化 {len(moved)} 个工具失败: {e}")
+
+            report = MaintenanceReport(
+                started_at=started_at,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                moved=[tool.name for tool in moved],
+                persisted=persisted,
+            )
+            self.last_report = report
+
+        if report.moved:
+            logger.info(
+                f"温度维护完成：降级 {report.moved_count} 个工具，耗时 {report.duration_ms:.1f}ms"
+            )
+        else:
+            logger.debug(f"温度维护完成：无工具降级，耗时 {report.duration_ms:.1f}ms")
+        return report
+
+    def start(self) -> None:
+        """启动后台维护线程（已启动时不重复启动）"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="registry-maintenance", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"后台温度维护已启动，间隔 {self.interval} 秒")
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """
+        停止后台维护线程
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout)
+        self._thread = None
+        logger.info("后台温度维护已停止")
+
+    def _run_loop(self) -> None:
+        """后台线程主循环"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                # 维护失败不应终止后台线程
+                logger.error(f"温度维护失败: {e}")
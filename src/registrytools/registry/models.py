@@ -30,6 +30,15 @@ class SearchMethod(str, Enum):
     EMBEDDING = "embedding"
     """语义向量搜索"""
 
+    HYBRID = "hybrid"
+    """混合搜索：BM25 召回候选 + 语义向量重排序"""
+
+    FUSION = "fusion"
+    """多方法融合：并发执行已注册的搜索方法，按倒数排名融合 (RRF) 合并结果"""
+
+    FTS5 = "fts5"
+    """SQLite FTS5 全文搜索：直接查询存储中的全部工具，无需内存索引（仅 SQLite 后端）"""
+
 
 class ToolTemperature(str, Enum):
     """工具温度级别枚举 (TASK-802)"""
@@ -53,11 +62,40 @@ class StorageBackend(str, Enum):
     SQLITE = "sqlite"
     """SQLite 数据库存储，适合大规模工具集（> 1000 工具）"""
 
+    BINARY = "binary"
+    """二进制快照存储（内存映射读取），适合读多写少的大规模工具集的快速冷启动"""
+
     # 未来可扩展
     # POSTGRES = "postgres"
     # REDIS = "redis"
 
 
+class ColdLoadMode(str, Enum):
+    """冷工具启动加载模式枚举"""
+
+    EAGER = "eager"
+    """启动时加载全部工具（默认）"""
+
+    BACKGROUND = "background"
+    """启动时只加载热/温工具，冷工具由后台线程分批加载"""
+
+    ON_DEMAND = "on_demand"
+    """启动时只加载热/温工具，冷工具在首次按名称访问时读取"""
+
+
+class WriteMode(str, Enum):
+    """存储写入持久化模式枚举"""
+
+    SYNC = "sync"
+    """每次写入在返回前持久化（默认）"""
+
+    BATCHED = "batched"
+    """写入先进入缓冲区，延迟或批量已满时刷新；批量已满时由写入方同步刷新"""
+
+    ASYNC = "async"
+    """写入先进入缓冲区，全部刷新由后台线程执行，写入方从不等待 I/O"""
+
+
 class ToolMetadata(BaseModel):
     """
     工具元数据模型
@@ -71,8 +109,10 @@ class ToolMetadata(BaseModel):
         defer_loading: 是否延迟加载，默认 True
         tags: 工具标签集合，用于分类和搜索
         category: 工具类别（可选）
-        use_frequency: 使用频率统计
+        use_frequency: 使用频率统计（累计次数）
         last_used: 最后使用时间（可选）
+        usage_score: 指数衰减使用分数（在 usage_score_updated_at 时刻的值）
+        usage_score_updated_at: 使用分数最后更新时间（None 表示尚未跟踪衰减）
         input_schema: 输入参数的 JSON Schema（可选）
         output_schema: 输出结果的 JSON Schema（可选）
     """
@@ -101,6 +141,12 @@ class ToolMetadata(BaseModel):
     last_used: datetime | None = None
     """最后使用时间（可选）"""
 
+    usage_score: float = 0.0
+    """指数衰减使用分数（在 usage_score_updated_at 时刻的值）"""
+
+    usage_score_updated_at: datetime | None = None
+    """使用分数最后更新时间（None 表示尚未跟踪衰减）"""
+
     temperature: ToolTemperature = ToolTemperature.COLD
     """工具温度级别，默认为冷工具 (TASK-802)"""
 
@@ -175,3 +221,84 @@ class ToolSearchResult(BaseModel):
             ]
         }
     )
+
+
+class FusionMethodReport(BaseModel):
+    """
+    融合搜索中单个搜索方法的执行报告
+
+    Attributes:
+        method: 搜索方法
+        status: 执行状态（ok/timeout/error/busy，busy 表示上次超时的搜索仍在运行，本次跳过）
+        latency_ms: 执行耗时（毫秒），超时时为截止时间
+        result_count: 返回结果数量
+    """
+
+    method: SearchMethod
+    """搜索方法"""
+
+    status: str
+    """执行状态（ok/timeout/error/busy）"""
+
+    latency_ms: float = Field(ge=0.0)
+    """执行耗时（毫秒），超时时为截止时间"""
+
+    result_count: int = 0
+    """返回结果数量"""
+
+    @property
+    def contributed(self) -> bool:
+        """该方法的结果是否参与了融合"""
+        return self.status == "ok"
+
+
+class FusionSearchResult(BaseModel):
+    """
+    融合搜索结果模型
+
+    Attributes:
+        results: 融合后的搜索结果，按 RRF 分数降序排列
+        methods: 各搜索方法的执行报告
+    """
+
+    results: list[ToolSearchResult] = Field(default_factory=list)
+    """融合后的搜索结果"""
+
+    methods: list[FusionMethodReport] = Field(default_factory=list)
+    """各搜索方法的执行报告"""
+
+    @property
+    def contributing_methods(self) -> list[SearchMethod]:
+        """参与融合的搜索方法列表"""
+        return [report.method for report in self.methods if report.contributed]
+
+
+class MaintenanceReport(BaseModel):
+    """
+    温度维护报告模型
+
+    记录一次后台温度维护的执行结果。
+
+    Attributes:
+        started_at: 维护开始时间
+        duration_ms: 维护耗时（毫秒），包含持久化时间
+        moved: 温度层发生变化的工具名称列表
+        persisted: 变化是否已成功写入存储
+    """
+
+    started_at: datetime
+    """维护开始时间"""
+
+    duration_ms: float = Field(ge=0.0)
+    """维护耗时（毫秒），包含持久化时间"""
+
+    moved: list[str] = Field(default_factory=list)
+    """温度层发生变化的工具名称列表"""
+
+    persisted: bool = True
+    """变化是否已成功写入存储"""
+
+    @property
+    def moved_count(self) -> int:
+        """温度层发生变化的工具数量"""
+        return len(self.moved)
@@ -0,0 +1,320 @@
+"""
+多租户命名空间
+
+每个命名空间拥有独立的注册表、索引和存储分区。默认命名空间常驻内存，
+其他命名空间按需打开，超出容量时按 LRU 淘汰最久未使用的命名空间，
+被淘汰的命名空间在下次访问时从存储重新加载。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from registrytools.defaults import MAX_LOADED_NAMESPACES
+
+if TYPE_CHECKING:
+    from registrytools.registry.registry import ToolRegistry
+    from registrytools.registry.usage import UsageRecorder
+    from registrytools.storage.base import ToolStorage
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+"""命名空间名称格式（用作文件名和 SQLite 分区键）"""
+
+
+def validate_namespace(name: str) -> str:
+    """
+    验证命名空间名称
+
+    Args:
+        name: 命名空间名称
+
+    Returns:
+        命名空间名称
+
+    Raises:
+        ValueError: 如果名称格式无效
+    """
+    if not NAMESPACE_PATTERN.match(name):
+        raise ValueError(
+            f"无效的命名空间: {name!r}（1-64 个字母、数字、下划线、点或连字符，以字母或数字开头）"
+        )
+    return name
+
+
+@dataclass
+class NamespaceContext:
+    """
+    一个命名空间的运行时状态
+
+    Attributes:
+        name: 命名空间名称
+        registry: 命名空间的工具注册表（含搜索索引）
+        storage: 命名空间的存储分区
+        usage_recorder: 写后使用统计记录器（可选）
+        leases: 正在使用该命名空间的请求数（由 NamespaceManager 在其锁内维护）
+        evicted: 是否已被淘汰（最后一个租约释放时关闭）
+    """
+
+    name: str
+    registry: "ToolRegistry"
+    storage: "ToolStorage"
+    usage_recorder: "UsageRecorder | None" = None
+    leases: int = field(default=0, init=False, repr=False)
+    evicted: bool = field(default=False, init=False, repr=False)
+
+    def close(self) -> None:
+        """停止使用统计刷新（刷新剩余数据），关闭存储分区并释放注册表资源"""
+        if self.usage_recorder is not None:
+            self.usage_recorder.stop()
+        self.storage.close()
+        self.registry.close()
+
+
+class NamespaceManager:
+    """
+    命名空间管理器
+
+    默认命名空间常驻；其他命名空间首次访问时通过 factory 打开，
+    最多同时保留 capacity 个，超出时淘汰最久未使用的命名空间。
+
+    factory 在锁外执行：打开命名空间（加载分区、建立索引）期间，其他命名空间的
+    请求不被阻塞，同名的并发请求等待同一次打开。请求通过 lease() 持有命名空间，
+    被淘汰的命名空间在最后一个租约释放后才关闭。
+
+    Attributes:
+        capacity: 同时加载的非默认命名空间数量上限
+        default: 默认命名空间
+        _factory: 打开命名空间的回调（None 表示未启用多命名空间）
+        _loaded: 已加载的非默认命名空间（最近使用的在末尾）
+        _opening: 正在打开的命名空间（等待者共享结果）
+        _lock: 保护加载、租约和淘汰的锁
+        _running: 服务器是否在运行（运行期间打开的命名空间启动后台刷新）
+    """
+
+    def __init__(
+        self,
+        default: NamespaceContext,
+        factory: Callable[[str], NamespaceContext] | None = None,
+        capacity: int = MAX_LOADED_NAMESPACES,
+    ) -> None:
+        """
+        初始化命名空间管理器
+
+        Args:
+            default: 默认命名空间
+            factory: 按名称打开命名空间的回调，None 表示只支持默认命名空间
+            capacity: 同时加载的非默认命名空间数量上限，默认 MAX_LOADED_NAMESPACES
+
+        Raises:
+            ValueError: 如果容量小于 0
+        """
+        if capacity < 0:
+            raise ValueError(f"命名空间容量不能为负数, 实际 {capacity}")
+
+        self.capacity = capacity
+        self.default = default
+        self._factory = factory
+        self._loaded: OrderedDict[str, NamespaceContext] = OrderedDict()
+        self._opening: dict[str, Future[NamespaceContext]] = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def loaded_namespaces(self) -> list[str]:
+        """已加载的命名空间（默认命名空间在前，其余按最近使用顺序）"""
+        return [self.default.name, *self._loaded]
+
+    def resolve(self, requested: str | None, bound: str | None = None) -> NamespaceContext:
+        """
+        解析请求使用的命名空间
+
+        API Key 绑定了命名空间时只能访问该命名空间；未绑定时使用请求参数，
+        两者都未指定时使用默认命名空间。
+
+        Args:
+            requested: 请求参数指定的命名空间
+            bound: API Key 绑定的命名空间
+
+        Returns:
+            命名空间上下文
+
+        Raises:
+            PermissionError: 如果请求的命名空间与 API Key 绑定的命名空间不一致
+            ValueError: 如果命名空间名称无效或未启用多命名空间
+        """
+        return self.get(self.resolve_name(requested, bound))
+
+    def resolve_name(self, requested: str | None, bound: str | None = None) -> str:
+        """
+        解析请求使用的命名空间名称（规则同 resolve()，不打开命名空间）
+
+        Args:
+            requested: 请求参数指定的命名空间
+            bound: API Key 绑定的命名空间
+
+        Returns:
+            命名空间名称
+
+        Raises:
+            PermissionError: 如果请求的命名空间与 API Key 绑定的命名空间不一致
+        """
+        if bound is not None and requested is not None and requested != bound:
+            raise PermissionError(f"API Key 只能访问命名空间: {bound}")
+        return bound or requested or self.default.name
+
+    def get(self, name: str) -> NamespaceContext:
+        """
+        获取命名空间（未加载时打开，超出容量时淘汰最久未使用的命名空间）
+
+        不持有租约：返回的命名空间可能随后被淘汰并关闭，请求处理应使用 lease()。
+
+        Args:
+            name: 命名空间名称
+
+        Returns:
+            命名空间上下文
+
+        Raises:
+            ValueError: 如果命名空间名称无效或未启用多命名空间
+        """
+        with self.lease(name) as context:
+            return context
+
+    @contextmanager
+    def lease(self, name: str) -> Iterator[NamespaceContext]:
+        """
+        在上下文期间持有命名空间（未加载时打开）
+
+        持有期间命名空间可以被淘汰，但要等租约释放后才关闭，
+        因此请求中的使用统计和存储写入不会落到已关闭的命名空间。
+
+        Args:
+            name: 命名空间名称
+
+        Yields:
+            命名空间上下文
+
+        Raises:
+            ValueError: 如果命名空间名称无效或未启用多命名空间
+        """
+        if name == self.default.name:
+            yield self.default
+            return
+
+        context = self._acquire(name)
+        try:
+            yield context
+        finally:
+            with self._lock:
+                context.leases -= 1
+                close = context.evicted and context.leases == 0
+            if close:
+                self._close_evicted(context)
+
+    def _acquire(self, name: str) -> NamespaceContext:
+        """
+        获取命名空间并增加租约（未加载时在锁外打开）
+
+        Args:
+            name: 命名空间名称
+
+        Returns:
+            已增加租约的命名空间上下文
+
+        Raises:
+            ValueError: 如果命名空间名称无效或未启用多命名空间
+        """
+        while True:
+            with self._lock:
+                context = self._loaded.get(name)
+                if context is not None:
+                    self._loaded.move_to_end(name)
+                    context.leases += 1
+                    return context
+
+                validate_namespace(name)
+                if self._factory is None or self.capacity == 0:
+                    raise ValueError(f"未启用多命名空间，无法访问命名空间: {name}")
+
+                pending = self._opening.get(name)
+                if pending is None:
+                    future: Future[NamespaceContext] = Future()
+                    self._opening[name] = future
+                    factory = self._factory
+
+            if pending is not None:
+                # 等待其他请求完成打开后重新查找（期间可能已被淘汰）
+                pending.result()
+                continue
+
+            try:
+                context = factory(name)
+            except BaseException as e:
+                with self._lock:
+                    del self._opening[name]
+                future.set_exception(e)
+                raise
+
+            evicted: list[NamespaceContext] = []
+            with self._lock:
+                del self._opening[name]
+                if self._running and context.usage_recorder is not None:
+                    context.usage_recorder.start()
+                context.leases += 1
+                self._loaded[name] = context
+                while len(self._loaded) > self.capacity:
+                    old = self._loaded.popitem(last=False)[1]
+                    old.evicted = True
+                    if old.leases == 0:
+                        evicted.append(old)
+            future.set_result(context)
+
+            # 在锁外关闭被淘汰的命名空间（刷新使用统计需要 I/O）；仍在使用的在租约释放后关闭
+            for old in evicted:
+                self._close_evicted(old)
+            logger.info(f"命名空间已加载: {name}（{context.registry.tool_count} 个工具）")
+            return context
+
+    @staticmethod
+    def _close_evicted(context: NamespaceContext) -> None:
+        """
+        关闭被淘汰的命名空间
+
+        Args:
+            context: 已淘汰且没有租约的命名空间
+        """
+        logger.info(f"命名空间已淘汰: {context.name}")
+        context.close()
+
+    def start(self) -> None:
+        """标记服务器运行，并为已加载的命名空间启动后台刷新"""
+        with self._lock:
+            self._running = True
+            contexts = list(self._loaded.values())
+        for context in contexts:
+            if context.usage_recorder is not None:
+                context.usage_recorder.start()
+
+    def close(self) -> None:
+        """关闭所有非默认命名空间（默认命名空间由服务器生命周期负责；仍在使用的在租约释放后关闭）"""
+        with self._lock:
+            self._running = False
+            contexts = []
+            for context in self._loaded.values():
+                context.evicted = True
+                if context.leases == 0:
+                    contexts.append(context)
+            self._loaded.clear()
+        for context in contexts:
+            context.close()
@@ -7,27 +7,61 @@ Copyright (c) 2026 Maric
 License: MIT
 """
 
+import bisect
+import dataclasses
+import heapq
+import itertools
+import logging
 import threading
+import time
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 from registrytools.defaults import (
+    CHANGE_LOG_SIZE,
+    COLD_LOAD_BATCH_SIZE,
     ENABLE_DOWNGRADE,
+    FUSION_FETCH_MULTIPLIER,
+    FUSION_MAX_WORKERS,
+    FUSION_METHOD_DEADLINE_MS,
+    FUSION_RRF_K,
     HOT_TOOL_INACTIVE_DAYS,
     HOT_TOOL_THRESHOLD,
+    SCHEMA_CACHE_SIZE,
     WARM_TOOL_INACTIVE_DAYS,
     WARM_TOOL_THRESHOLD,
 )
-from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
-from registrytools.search.base import SearchAlgorithm
+from registrytools.registry.changes import ChangeLog, ChangeOp, ChangeSet, ToolChange
+from registrytools.registry.compact import ToolRecord
+from registrytools.registry.models import (
+    FusionMethodReport,
+    FusionSearchResult,
+    SearchMethod,
+    ToolMetadata,
+    ToolSearchResult,
+    ToolTemperature,
+)
+from registrytools.registry.schemas import SchemaCache, ToolSchemas
+from registrytools.registry.scoring import (
+    classify_usage_score,
+    usage_score_at,
+    usage_score_crossing_time,
+)
+from registrytools.registry.snapshot import RegistrySnapshot
+from registrytools.search.base import SearchableTool, SearchAlgorithm
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Iterator, Sequence
+
+    import numpy as np
 
-    from registrytools.registry.models import ToolTemperature
     from registrytools.storage.base import ToolStorage
 
+logger = logging.getLogger(__name__)
+
 
 class ToolRegistry:
     """
@@ -35,38 +69,116 @@ class ToolRegistry:
 
     管理所有工具的元数据、搜索索引和使用统计。
 
+    工具在内部以紧凑的 ToolRecord 保存，注册时从 ToolMetadata 转换，
+    get_tool()、list_tools() 等返回工具的方法在 API 边界重新创建 ToolMetadata。
+    启用 Schema 延迟加载后，只有 get_tool() 和 run_maintenance() 会读取 Schema。
+
+    写操作在 _temp_lock 内修改可变状态并使当前快照失效；读操作（搜索、列表）
+    通过 snapshot() 无锁获取不可变快照，每批写操作后首次读取时重建一次快照。
+
     Attributes:
-        _tools: 按名称索引的工具字典
-        _hot_tools: 热工具字典
-        _warm_tools: 温工具字典
-        _cold_tools: 冷工具字典
+        _tools: 按名称索引的工具记录字典
+        _hot_tools: 热工具记录字典
+        _warm_tools: 温工具记录字典
+        _cold_tools: 冷工具记录字典
+        _tag_sets: 标签组合驻留表（相同组合的记录共享同一个 frozenset）
+        _schema_storage: 延迟加载 Schema 的存储（None 表示未启用）
+        _schema_cache: 已解析 Schema 的 LRU 缓存
+        _tier_storage: 分层加载的存储（None 表示全部温度层已驻留）
+        _resident_temperatures: 已完整加载到内存的温度层
+        _removed_while_loading: 分层加载期间注销的工具（加载时跳过）
         _searchers: 搜索算法实例字典
         _category_index: 按类别索引的工具名称集合
-        _temp_lock: 温度层锁（线程安全）
+        _tag_index: 按标签索引的工具名称（有序，dict 作为有序集合）
+        _server_index: 按 MCP 服务器索引的工具名称（有序，dict 作为有序集合）
+        _use_frequency: 工具名称到已索引使用频率的映射
+        _frequency_buckets: 按使用频率分桶的工具名称（有序，dict 作为有序集合）
+        _frequency_levels: 非空频率桶的升序列表
+        _temp_lock: 写锁，保护工具字典、类别索引、温度层和快照发布
+        _downgrade_heap: 降级截止时间最小堆 (deadline, seq, tool_name)
+        _downgrade_seq: 每个工具当前有效的堆条目序号（用于惰性失效）
+        _fusion_executor: 融合搜索线程池（首次融合搜索时创建）
+        _fusion_stragglers: 超过截止时间后仍在运行的融合搜索任务（每个方法最多一个）
+        _generation: 注册表代数（每次写操作递增）
+        _change_log: 按代数记录注册、注销和温度变化的有界日志
+        _pending_changes: 当前写操作中尚未分配代数的变更
+        _snapshot: 当前发布的不可变快照（None 表示需要重建）
     """
 
-    def __init__(self) -> None:
-        """初始化工具注册表"""
-        # 主工具存储：name -> ToolMetadata
-        self._tools: dict[str, ToolMetadata] = {}
+    def __init__(
+        self, inline_maintenance: bool = True, change_log_size: int = CHANGE_LOG_SIZE
+    ) -> None:
+        """
+        初始化工具注册表
+
+        Args:
+            inline_maintenance: 是否在 update_usage 中内联执行降级维护。
+                由后台调度器负责维护时应设为 False，使请求路径只做 O(1) 计数更新
+            change_log_size: 变更日志保留的最大变更数，默认 CHANGE_LOG_SIZE
+        """
+        self._inline_maintenance = inline_maintenance
+
+        # 主工具存储：name -> ToolRecord（紧凑记录，API 边界再转换为 ToolMetadata）
+        self._tools: dict[str, ToolRecord] = {}
+        self._tag_sets: dict[frozenset[str], frozenset[str]] = {}
+
+        # Schema 延迟加载：记录中不保存 Schema，首次 get_tool() 时从存储读取并缓存
+        self._schema_storage: ToolStorage | None = None
+        self._schema_cache: SchemaCache | None = None
+
+        # 分层启动加载：未驻留的温度层在后台或按需从存储加载
+        self._tier_storage: ToolStorage | None = None
+        self._tier_defer_schemas = False
+        self._resident_temperatures: set[ToolTemperature] = set(ToolTemperature)
+        self._removed_while_loading: set[str] = set()
 
         # 冷热分层存储 (TASK-802)
-        self._hot_tools: dict[str, ToolMetadata] = {}
-        self._warm_tools: dict[str, ToolMetadata] = {}
-        self._cold_tools: dict[str, ToolMetadata] = {}
+        self._hot_tools: dict[str, ToolRecord] = {}
+        self._warm_tools: dict[str, ToolRecord] = {}
+        self._cold_tools: dict[str, ToolRecord] = {}
 
-        # 温度锁：保护分层存储的并发访问
+        # 写锁：保护所有可变状态的修改和快照发布
         self._temp_lock = threading.RLock()
 
+        # 写时复制快照：写操作使其失效，读操作无锁获取
+        self._generation = 0
+        self._snapshot: RegistrySnapshot | None = None
+
+        # 变更日志：写操作中的变更在快照失效（代数递增）时以新代数写入
+        self._change_log = ChangeLog(change_log_size)
+        self._pending_changes: list[tuple[ChangeOp, str | None, ToolTemperature | None]] = []
+
+        # 降级截止时间堆：按 min(last_used + 不活跃窗口, 分数衰减到阈值的时间) 排序
+        # 过期条目通过序号惰性失效，无需从堆中删除
+        self._downgrade_heap: list[tuple[datetime, int, str]] = []
+        self._downgrade_seq: dict[str, int] = {}
+        self._heap_counter = itertools.count()
+
         # 搜索算法实例：SearchMethod -> SearchAlgorithm
         self._searchers: dict[SearchMethod, SearchAlgorithm] = {}
 
         # 类别索引：category -> set[tool_name]
         self._category_index: dict[str | None, set[str]] = defaultdict(set)
 
+        # 二级索引：tag / mcp_server -> {tool_name: None}（保持注册顺序，便于稳定分页）
+        # 温度索引即 _hot_tools / _warm_tools / _cold_tools
+        self._tag_index: dict[str, dict[str, None]] = defaultdict(dict)
+        self._server_index: dict[str | None, dict[str, None]] = defaultdict(dict)
+
+        # 使用频率排行：use_frequency -> {tool_name: None}，_frequency_levels 为非空桶的升序频率
+        # 使用时工具从 f 桶移到 f + 1 桶，top-N 从最高频率桶向下遍历，复杂度为 O(结果数量)
+        self._use_frequency: dict[str, int] = {}
+        self._frequency_buckets: dict[int, dict[str, None]] = {}
+        self._frequency_levels: list[int] = []
+
         # 延迟导入搜索算法（避免循环导入）
         self._searcher_classes: dict[SearchMethod, type[SearchAlgorithm]] = {}
 
+        # 融合搜索线程池（延迟创建）
+        self._fusion_executor: ThreadPoolExecutor | None = None
+        self._fusion_stragglers: dict[SearchMethod, Future] = {}
+        self._fusion_lock = threading.Lock()
+
     def register_searcher(self, method: SearchMethod, searcher: SearchAlgorithm) -> None:
         """
         注册搜索算法实例
@@ -94,36 +206,222 @@ class ToolRegistry:
         """
         return self._searchers.get(method)
 
+    # ============================================================
+    # 写时复制快照
+    # ============================================================
+
+    @property
+    def generation(self) -> int:
+        """当前注册表代数（每次写操作递增）"""
+        return self._generation
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        获取当前注册表的不可变快照
+
+        快照未失效时无锁直接返回；写操作后的首次调用在写锁内重建一次。
+
+        Returns:
+            注册表快照
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._temp_lock:
+            if self._snapshot is None:
+                self._snapshot = self._build_snapshot()
+            return self._snapshot
+
+    def _build_snapshot(self) -> RegistrySnapshot:
+        """根据当前可变状态构建快照（调用方需持有 _temp_lock）"""
+        hot_tools = tuple(self._hot_tools.values())
+        warm_tools = tuple(self._warm_tools.values())
+        tools = self._tools
+        return RegistrySnapshot(
+            generation=self._generation,
+            tools=tuple(self._tools.values()),
+            by_name=MappingProxyType(dict(self._tools)),
+            row_index=MappingProxyType({name: row for row, name in enumerate(self._tools)}),
+            category_index=MappingProxyType(
+                {category: frozenset(names) for category, names in self._category_index.items()}
+            ),
+            tag_index=MappingProxyType(
+                {
+                    tag: tuple(tools[name] for name in names)
+                    for tag, names in self._tag_index.items()
+                }
+            ),
+            server_index=MappingProxyType(
+                {
+                    server: tuple(tools[name] for name in names)
+                    for server, names in self._server_index.items()
+                }
+            ),
+            hot_tools=hot_tools,
+            warm_tools=warm_tools,
+            cold_tools=tuple(self._cold_tools.values()),
+            hot_warm_tools=hot_tools + warm_tools,
+        )
+
+    def _index_tool(self, tool: ToolRecord) -> None:
+        """将工具加入类别、标签、服务器和使用频率索引（调用方需持有 _temp_lock）"""
+        self._category_index[tool.category or None].add(tool.name)
+        for tag in tool.tags:
+            self._tag_index[tag][tool.name] = None
+        self._server_index[tool.mcp_server][tool.name] = None
+        self._rank_tool(tool.name, tool.use_frequency)
+
+    def _unindex_tool(self, tool: ToolRecord) -> None:
+        """将工具从类别、标签、服务器和使用频率索引中移除（调用方需持有 _temp_lock）"""
+        self._unrank_tool(tool.name)
+        category_names = self._category_index.get(tool.category or None)
+        if category_names is not None:
+            category_names.discard(tool.name)
+        for tag in tool.tags:
+            names = self._tag_index.get(tag)
+            if names is not None:
+                names.pop(tool.name, None)
+                if not names:
+                    del self._tag_index[tag]
+        names = self._server_index.get(tool.mcp_server)
+        if names is not None:
+            names.pop(tool.name, None)
+            if not names:
+                del self._server_index[tool.mcp_server]
+
+    def _rank_tool(self, tool_name: str, frequency: int) -> None:
+        """将工具加入使用频率桶（调用方需持有 _temp_lock）"""
+        bucket = self._frequency_buckets.get(frequency)
+        if bucket is None:
+            bucket = self._frequency_buckets[frequency] = {}
+            bisect.insort(self._frequency_levels, frequency)
+        bucket[tool_name] = None
+        self._use_frequency[tool_name] = frequency
+
+    def _unrank_tool(self, tool_name: str) -> None:
+        """将工具从使用频率桶中移除（调用方需持有 _temp_lock）"""
+        frequency = self._use_frequency.pop(tool_name, None)
+        if frequency is None:
+            return
+        bucket = self._frequency_buckets[frequency]
+        del bucket[tool_name]
+        if not bucket:
+            del self._frequency_buckets[frequency]
+            del self._frequency_levels[bisect.bisect_left(self._frequency_levels, frequency)]
+
+    def _invalidate_snapshot(self) -> None:
+        """递增代数并使当前快照失效，本次写操作的变更以新代数写入变更日志（调用方需持有 _temp_lock）"""
+        self._generation += 1
+        self._snapshot = None
+        if self._pending_changes:
+            generation = self._generation
+            self._change_log.extend(
+                [ToolChange(generation, *change) for change in self._pending_changes]
+            )
+            self._pending_changes.clear()
+
+    def _record_change(
+        self, op: ChangeOp, tool_name: str | None, temperature: ToolTemperature | None = None
+    ) -> None:
+        """记录一条变更，在写操作结束使快照失效时分配代数（调用方需持有 _temp_lock）"""
+        self._pending_changes.append((op, tool_name, temperature))
+
+    # ============================================================
+    # 变更日志
+    # ============================================================
+
+    def get_changes(self, since_generation: int = 0) -> ChangeSet:
+        """
+        获取指定代数之后的注册表变更
+
+        消费者保存返回的 generation，下次以它作为 since_generation 增量拉取。
+        变更日志容量有限（CHANGE_LOG_SIZE），落后太多时 truncated 为 True，
+        消费者需要重新列出全部工具后从返回的 generation 继续同步。
+        搜索算法也可以据此对索引做增量更新。
+
+        Args:
+            since_generation: 已同步到的代数，默认 0（从日志中最早的变更开始）
+
+        Returns:
+            变更集合
+
+        Raises:
+            ValueError: 如果 since_generation 为负数
+        """
+        if since_generation < 0:
+            raise ValueError(f"since_generation 不能为负数, 实际 {since_generation}")
+
+        # 在写锁内读取代数和日志，保证返回的代数与变更一致
+        with self._temp_lock:
+            generation = self._generation
+            changes, truncated = self._change_log.since(since_generation)
+        return ChangeSet(generation=generation, changes=changes, truncated=truncated)
+
+    def iter_changes(self, since_generation: int = 0) -> "Iterator[ToolChange]":
+        """
+        迭代指定代数之后的注册表变更
+
+        Args:
+            since_generation: 已同步到的代数
+
+        Yields:
+            按代数升序排列的变更
+
+        Raises:
+            ValueError: 如果 since_generation 之后的部分变更已被丢弃（需要全量重新同步）
+        """
+        change_set = self.get_changes(since_generation)
+        if change_set.truncated:
+            raise ValueError(f"代数 {since_generation} 之后的部分变更已被丢弃，请全量重新同步")
+        yield from change_set.changes
+
     # ============================================================
     # 冷热工具分类方法 (TASK-802)
     # ============================================================
 
-    def _classify_tool_temperature(self, tool: ToolMetadata) -> "ToolTemperature":
+    def _classify_tool_temperature(
+        self, tool: ToolRecord, now: datetime | None = None
+    ) -> "ToolTemperature":
         """
-        根据使用频率分类工具温度 (TASK-802)
+        根据衰减后的使用分数分类工具温度 (TASK-802)
 
         Args:
-            tool: 工具元数据
+            tool: 工具记录
+            now: 当前时间，默认 datetime.now()
 
         Returns:
             工具温度级别
         """
-        from registrytools.registry.models import ToolTemperature
+        return classify_usage_score(usage_score_at(tool, now))
 
-        if tool.use_frequency >= HOT_TOOL_THRESHOLD:
-            return ToolTemperature.HOT
-        elif tool.use_frequency >= WARM_TOOL_THRESHOLD:
-            return ToolTemperature.WARM
-        else:
-            return ToolTemperature.COLD
+    def _replace_temperature(self, tool: ToolRecord, temp: "ToolTemperature") -> ToolRecord:
+        """
+        以带新温度的副本替换工具记录（写时复制，调用方需持有 _temp_lock）
+
+        已发布的快照继续持有原记录，其温度与快照的温度层和过滤掩码保持一致。
+
+        Args:
+            tool: 当前工具记录
+            temp: 新温度级别
+
+        Returns:
+            替换后的工具记录
+        """
+        record = dataclasses.replace(tool, temperature=temp)
+        self._tools[tool.name] = record
+        return record
 
-    def _add_to_temperature_layer(self, tool: ToolMetadata, temp: "ToolTemperature") -> None:
+    def _add_to_temperature_layer(
+        self, tool: ToolRecord, temp: "ToolTemperature", invalidate: bool = True
+    ) -> None:
         """
         将工具添加到对应的温度层 (TASK-802)
 
         Args:
-            tool: 工具元数据
+            tool: 工具记录
             temp: 温度级别
+            invalidate: 是否使快照失效（批量写入由调用方在结束时统一失效）
         """
         tool_name = tool.name
 
@@ -140,39 +438,79 @@ class ToolRegistry:
         else:
             self._cold_tools[tool_name] = tool
 
-    def _check_downgrade_tool(self, tool: ToolMetadata) -> bool:
+        # 温度层变化后重新登记降级截止时间
+        self._schedule_downgrade(tool)
+        if invalidate:
+            self._invalidate_snapshot()
+
+    def _get_downgrade_deadline(self, tool: ToolRecord) -> datetime | None:
         """
-        检查工具是否需要降级 (TASK-802)
+        计算工具的降级截止时间
+
+        取以下两者中较早的时间：
+        - last_used + 所在层的不活跃窗口
+        - 衰减使用分数降到所在层阈值以下的时间（可由分数和更新时间直接算出）
 
         Args:
-            tool: 工具元数据
+            tool: 工具记录
 
         Returns:
-            True 如果需要降级，否则 False
+            降级截止时间，冷工具或无使用记录的工具返回 None
         """
         from registrytools.registry.models import ToolTemperature
 
-        # 如果未启用降级机制，直接返回 False
-        if not ENABLE_DOWNGRADE:
-            return False
+        if not ENABLE_DOWNGRADE or tool.last_used is None:
+            return None
+        if tool.temperature == ToolTemperature.HOT:
+            deadline = tool.last_used + timedelta(days=HOT_TOOL_INACTIVE_DAYS)
+            threshold = HOT_TOOL_THRESHOLD
+        elif tool.temperature == ToolTemperature.WARM:
+            deadline = tool.last_used + timedelta(days=WARM_TOOL_INACTIVE_DAYS)
+            threshold = WARM_TOOL_THRESHOLD
+        else:
+            return None
 
-        # 如果工具没有使用记录，不需要降级
-        if tool.last_used is None:
-            return False
+        if tool.usage_score_updated_at is not None:
+            crossing = usage_score_crossing_time(
+                tool.usage_score, tool.usage_score_updated_at, threshold
+            )
+            deadline = min(deadline, crossing)
+        return deadline
 
-        # 计算未使用天数
-        days_since_last_use = (datetime.now() - tool.last_used).days
+    def _schedule_downgrade(self, tool: ToolRecord) -> None:
+        """
+        将工具的降级截止时间加入堆（调用方需持有 _temp_lock）
 
-        # 热工具降级检查
-        if tool.temperature == ToolTemperature.HOT:
-            return days_since_last_use >= HOT_TOOL_INACTIVE_DAYS
+        旧条目不从堆中删除，通过序号不匹配惰性失效。
 
-        # 温工具降级检查
-        if tool.temperature == ToolTemperature.WARM:
-            return days_since_last_use >= WARM_TOOL_INACTIVE_DAYS
+        Args:
+            tool: 工具记录
+        """
+        deadline = self._get_downgrade_deadline(tool)
+        if deadline is None:
+            self._downgrade_seq.pop(tool.name, None)
+            return
 
-        # 冷工具不需要降级
-        return False
+        seq = next(self._heap_counter)
+        self._downgrade_seq[tool.name] = seq
+        heapq.heappush(self._downgrade_heap, (deadline, seq, tool.name))
+
+    def _check_downgrade_tool(self, tool: ToolRecord) -> bool:
+        """
+        检查工具是否需要降级 (TASK-802)
+
+        Args:
+            tool: 工具记录
+
+        Returns:
+            True 如果需要降级，否则 False
+        """
+        # 未启用降级、冷工具或没有使用记录的工具没有截止时间
+        deadline = self._get_downgrade_deadline(tool)
+        if deadline is None:
+            return False
+
+        return deadline <= datetime.now()
 
     def _downgrade_tool(self, tool_name: str) -> bool:
         """
@@ -200,10 +538,11 @@ class ToolRegistry:
         else:  # WARM
             new_temp = ToolTemperature.COLD
 
-        # 更新工具温度
-        tool.temperature = new_temp
+        # 更新工具温度（替换为副本，不修改已发布快照中的记录）
+        tool = self._replace_temperature(tool, new_temp)
 
         # 移动到新温度层
+        self._record_change(ChangeOp.TEMPERATURE, tool_name, new_temp)
         self._add_to_temperature_layer(tool, new_temp)
 
         return True
@@ -233,19 +572,231 @@ class ToolRegistry:
 
         return len(hot_tools_from_storage)
 
+    # ============================================================
+    # 分层启动加载
+    # ============================================================
+
+    @property
+    def resident_temperatures(self) -> frozenset[ToolTemperature]:
+        """已完整加载到内存的温度层"""
+        return frozenset(self._resident_temperatures)
+
+    @property
+    def pending_temperatures(self) -> list[ToolTemperature]:
+        """尚未加载的温度层（按 HOT → WARM → COLD 顺序）"""
+        return [t for t in ToolTemperature if t not in self._resident_temperatures]
+
+    @property
+    def is_fully_loaded(self) -> bool:
+        """是否所有温度层都已驻留"""
+        return self._tier_storage is None
+
+    def preload_tiers(
+        self,
+        storage: "ToolStorage",
+        temperatures: "Iterable[ToolTemperature]" = (ToolTemperature.HOT, ToolTemperature.WARM),
+        *,
+        defer_schemas: bool = False,
+    ) -> int:
+        """
+        分层启动：只预加载指定温度层，其余温度层标记为未驻留
+
+        未驻留温度层的工具可以通过 load_tier() 在后台分批加载；在此之前，
+        get_tool() 和 update_usage() 遇到未注册的名称时会从存储按名称读取。
+        搜索和列表方法只覆盖已驻留的工具。
+
+        Args:
+            storage: 存储实例
+            temperatures: 预加载的温度层，默认热和温
+            defer_schemas: 是否不加载 Schema（需要先调用 enable_lazy_schemas()）
+
+        Returns:
+            预加载的工具数量
+        """
+        preload = [ToolTemperature(t) for t in temperatures]
+        with self._temp_lock:
+            self._tier_storage = storage
+            self._tier_defer_schemas = defer_schemas
+            self._resident_temperatures = set()
+
+        loaded = 0
+        for temperature in ToolTemperature:
+            if temperature in preload:
+                loaded += self.load_tier(temperature)
+
+        logger.info(
+            f"分层启动：已预加载 {loaded} 个工具，"
+            f"未驻留温度层: {[t.value for t in self.pending_temperatures]}"
+        )
+        return loaded
+
+    def load_tier(
+        self,
+        temperature: ToolTemperature,
+        batch_size: int = COLD_LOAD_BATCH_SIZE,
+        stop_event: threading.Event | None = None,
+    ) -> int:
+        """
+        从存储加载一个未驻留的温度层
+
+        工具分批注册，每批发布一次快照，搜索可以逐步看到新加载的工具。
+        已在内存中的工具（如按需读取或加载期间重新注册的工具）不会被存储中的旧数据覆盖。
+
+        Args:
+            temperature: 温度层
+            batch_size: 每批注册的工具数，默认 COLD_LOAD_BATCH_SIZE
+            stop_event: 停止信号，设置后在批次之间中止（温度层保持未驻留）
+
+        Returns:
+            新注册的工具数量
+
+        Raises:
+            IOError: 如果从存储读取失败
+        """
+        storage = self._tier_storage
+        if storage is None or temperature in self._resident_temperatures:
+            return 0
+
+        tools = storage.load_by_temperature(
+            temperature, include_schemas=not self._tier_defer_schemas
+        )
+
+        loaded = 0
+        for start in range(0, len(tools), batch_size):
+            if stop_event is not None and stop_event.is_set():
+                return loaded
+            with self._temp_lock:
+                batch = [
+                    tool
+                    for tool in tools[start : start + batch_size]
+                    if tool.name not in self._tools and tool.name not in self._removed_while_loading
+                ]
+                self.register_many(batch, defer_schemas=self._tier_defer_schemas)
+            loaded += len(batch)
+
+        with self._temp_lock:
+            self._resident_temperatures.add(temperature)
+            if len(self._resident_temperatures) == len(ToolTemperature):
+                self._tier_storage = None
+                self._removed_while_loading.clear()
+
+        logger.debug(f"温度层 {temperature.value} 已加载：{loaded} 个工具")
+        return loaded
+
+    def _fetch_unloaded(self, name: str) -> ToolRecord | None:
+        """
+        从存储按名称读取尚未驻留的工具并注册（分层加载期间使用）
+
+        Args:
+            name: 工具名称
+
+        Returns:
+            工具记录，如果全部温度层已驻留或存储中不存在则返回 None
+        """
+        storage = self._tier_storage
+        if storage is None:
+            return None
+
+        tool = storage.get(name)
+        if tool is None:
+            return None
+
+        with self._temp_lock:
+            record = self._tools.get(name)
+            if record is not None or name in self._removed_while_loading:
+                return record
+            if self._schema_storage is not None:
+                # 与其他延迟加载的工具一致：记录不保存 Schema，已读取的 Schema 放入缓存
+                schemas = (tool.input_schema, tool.output_schema)
+                tool.input_schema = tool.output_schema = None
+                self.register(tool, defer_schemas=True)
+                assert self._schema_cache is not None
+                self._schema_cache.put(name, schemas)
+            else:
+                self.register(tool)
+            return self._tools[name]
+
     # ============================================================
     # 工具注册功能 (TASK-302)
     # ============================================================
 
-    def register(self, tool: ToolMetadata) -> None:
+    def enable_lazy_schemas(
+        self, storage: "ToolStorage", cache_size: int = SCHEMA_CACHE_SIZE
+    ) -> None:
+        """
+        启用 Schema 延迟加载
+
+        之后以 defer_schemas=True 注册的工具不在内存中保存 Schema，
+        get_tool() 首次访问时通过 storage.load_schemas() 读取，并缓存最近使用的 cache_size 个。
+        搜索和列表方法不会读取 Schema。
+
+        Args:
+            storage: 提供 Schema 的存储
+            cache_size: LRU 缓存容量（工具数），默认 SCHEMA_CACHE_SIZE
+
+        Raises:
+            ValueError: 如果缓存容量不大于 0
+        """
+        self._schema_cache = SchemaCache(cache_size)
+        self._schema_storage = storage
+
+    def _load_schemas(self, tool_name: str) -> ToolSchemas:
+        """
+        读取延迟加载工具的 Schema（优先使用 LRU 缓存）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组
+
+        Raises:
+            IOError: 如果从存储读取失败
+        """
+        if self._schema_storage is None or self._schema_cache is None:
+            return (None, None)
+
+        schemas = self._schema_cache.get(tool_name)
+        if schemas is None:
+            schemas = self._schema_storage.load_schemas(tool_name) or (None, None)
+            self._schema_cache.put(tool_name, schemas)
+        return schemas
+
+    def _materialize(self, record: ToolRecord) -> ToolMetadata:
+        """
+        将记录转换为包含 Schema 的完整 ToolMetadata
+
+        Args:
+            record: 工具记录
+
+        Returns:
+            工具元数据
+
+        Raises:
+            IOError: 如果延迟加载的 Schema 读取失败
+        """
+        tool = record.to_metadata()
+        if record.schemas_deferred:
+            tool.input_schema, tool.output_schema = self._load_schemas(record.name)
+        return tool
+
+    def register(self, tool: ToolMetadata, *, defer_schemas: bool = False) -> None:
         """
         注册工具到注册表
 
         如果工具名称已存在，将更新其元数据。
         自动分类工具温度并添加到对应层 (TASK-802)。
 
+        注册表保存工具的紧凑记录副本，之后修改传入的实例不会影响注册表，
+        需要更新时重新注册。传入实例的 temperature 会被设置为分类结果。
+
         Args:
             tool: 工具元数据
+            defer_schemas: 工具是否为不含 Schema 的摘要（如 storage.load_all(include_schemas=False)
+                的结果），Schema 在首次访问时从存储加载。需要先调用 enable_lazy_schemas()
+
+        Raises:
+            ValueError: 如果 defer_schemas 为 True 但未启用 Schema 延迟加载
 
         Examples:
             >>> registry = ToolRegistry()
@@ -256,42 +807,64 @@ class ToolRegistry:
             ... )
             >>> registry.register(tool)
         """
+        if defer_schemas and self._schema_storage is None:
+            raise ValueError("未启用 Schema 延迟加载，请先调用 enable_lazy_schemas()")
+
+        with self._temp_lock:
+            self._register_locked(tool, defer_schemas)
+
+            # 标记搜索索引需要重建（延迟重建）
+            self._invalidate_search_indexes()
+
+    def _register_locked(self, tool: ToolMetadata, defer_schemas: bool) -> None:
+        """
+        注册单个工具并增量更新索引和温度层（调用方需持有 _temp_lock，并负责使快照失效）
+
+        Args:
+            tool: 工具元数据
+            defer_schemas: 工具是否为不含 Schema 的摘要
+        """
         tool_name = tool.name
 
-        # 如果工具已存在，先从类别索引和温度层中移除
+        record = ToolRecord.from_metadata(tool, self._tag_sets, defer_schemas)
+        if self._schema_cache is not None:
+            self._schema_cache.discard(tool_name)
+        self._removed_while_loading.discard(tool_name)
+
+        # 如果工具已存在，先从索引和温度层中移除
         if tool_name in self._tools:
-            old_tool = self._tools[tool_name]
-            if old_tool.category in self._category_index:
-                self._category_index[old_tool.category].discard(tool_name)
+            self._unindex_tool(self._tools[tool_name])
             # 从温度层移除
             self._hot_tools.pop(tool_name, None)
             self._warm_tools.pop(tool_name, None)
             self._cold_tools.pop(tool_name, None)
 
         # 添加工具
-        self._tools[tool_name] = tool
+        self._tools[tool_name] = record
 
-        # 更新类别索引
-        if tool.category:
-            self._category_index[tool.category].add(tool_name)
-        else:
-            self._category_index[None].add(tool_name)
+        # 更新类别、标签和服务器索引
+        self._index_tool(record)
 
         # 自动分类工具温度并添加到对应层 (TASK-802)
-        with self._temp_lock:
-            temperature = self._classify_tool_temperature(tool)
-            tool.temperature = temperature
-            self._add_to_temperature_layer(tool, temperature)
+        temperature = self._classify_tool_temperature(record)
+        record.temperature = temperature
+        tool.temperature = temperature
+        self._add_to_temperature_layer(record, temperature, invalidate=False)
+        self._record_change(ChangeOp.REGISTER, tool_name, temperature)
 
-        # 标记搜索索引需要重建（延迟重建）
-        self._invalidate_search_indexes()
-
-    def register_many(self, tools: list[ToolMetadata]) -> None:
+    def register_many(self, tools: list[ToolMetadata], *, defer_schemas: bool = False) -> None:
         """
         批量注册工具
 
+        整批在一次写锁内增量更新类别/标签/服务器索引和温度层，结束时只递增一次代数、
+        发布一次快照，搜索索引在下次搜索时重建一次。
+
         Args:
-            tools: 工具元数据列表
+            tools: 工具元数据列表（同名工具以后出现的为准）
+            defer_schemas: 工具是否为不含 Schema 的摘要（见 register()）
+
+        Raises:
+            ValueError: 如果 defer_schemas 为 True 但未启用 Schema 延迟加载
 
         Examples:
             >>> registry = ToolRegistry()
@@ -301,8 +874,16 @@ class ToolRegistry:
             ... ]
             >>> registry.register_many(tools)
         """
-        for tool in tools:
-            self.register(tool)
+        if defer_schemas and self._schema_storage is None:
+            raise ValueError("未启用 Schema 延迟加载，请先调用 enable_lazy_schemas()")
+        if not tools:
+            return
+
+        # 整批在写锁内完成，读者只会看到批量写入前或写入后的快照
+        with self._temp_lock:
+            for tool in tools:
+                self._register_locked(tool, defer_schemas)
+            self._invalidate_search_indexes()
 
     def unregister(self, tool_name: str) -> bool:
         """
@@ -314,26 +895,32 @@ class ToolRegistry:
         Returns:
             True 如果工具存在并被移除，False 如果工具不存在
         """
-        if tool_name not in self._tools:
-            return False
+        with self._temp_lock:
+            if self._tier_storage is not None:
+                # 分层加载期间：防止后台加载把已注销的工具从存储的旧结果中重新注册
+                self._removed_while_loading.add(tool_name)
 
-        tool = self._tools[tool_name]
+            tool = self._tools.get(tool_name)
+            if tool is None:
+                return False
 
-        # 从类别索引中移除
-        if tool.category in self._category_index:
-            self._category_index[tool.category].discard(tool_name)
+            # 从类别、标签和服务器索引中移除
+            self._unindex_tool(tool)
 
-        # 从温度层中移除 (TASK-802)
-        with self._temp_lock:
+            # 从温度层中移除 (TASK-802)
             self._hot_tools.pop(tool_name, None)
             self._warm_tools.pop(tool_name, None)
             self._cold_tools.pop(tool_name, None)
+            self._downgrade_seq.pop(tool_name, None)
 
-        # 从注册表中移除
-        del self._tools[tool_name]
+            # 从注册表中移除
+            del self._tools[tool_name]
+            if self._schema_cache is not None:
+                self._schema_cache.discard(tool_name)
+            self._record_change(ChangeOp.UNREGISTER, tool_name)
 
-        # 标记搜索索引需要重建
-        self._invalidate_search_indexes()
+            # 标记搜索索引需要重建
+            self._invalidate_search_indexes()
 
         return True
 
@@ -348,25 +935,102 @@ class ToolRegistry:
         Args:
             name: 工具名称
 
+        分层加载期间，未驻留的工具会从存储按名称读取并注册。
+
         Returns:
-            工具元数据，如果不存在则返回 None
+            工具元数据（独立副本，包含 Schema），如果不存在则返回 None
+
+        Raises:
+            IOError: 如果延迟加载的 Schema 读取失败
         """
-        return self._tools.get(name)
+        record = self._tools.get(name)
+        if record is None:
+            record = self._fetch_unloaded(name)
+        return self._materialize(record) if record is not None else None
 
     def list_tools(self, category: str | None = None) -> list[ToolMetadata]:
         """
         列出所有工具
 
+        列表方法不读取延迟加载的 Schema，这些工具的 Schema 字段为 None。
+
         Args:
             category: 可选，按类别筛选
 
         Returns:
             工具元数据列表
         """
-        if category:
-            tool_names = self._category_index.get(category, set())
-            return [self._tools[name] for name in tool_names if name in self._tools]
-        return list(self._tools.values())
+        snapshot = self.snapshot()
+        records = snapshot.list_by_category(category) if category else snapshot.tools
+        return [record.to_metadata() for record in records]
+
+    def list_tools_by_tag(self, tag: str) -> list[ToolMetadata]:
+        """
+        列出带有指定标签的工具（按注册顺序）
+
+        基于标签倒排索引，复杂度为 O(结果数量)。
+
+        Args:
+            tag: 标签
+
+        Returns:
+            工具元数据列表
+        """
+        return [record.to_metadata() for record in self.snapshot().tag_index.get(tag, ())]
+
+    def list_tools_by_server(self, mcp_server: str | None) -> list[ToolMetadata]:
+        """
+        列出属于指定 MCP 服务器的工具（按注册顺序）
+
+        基于服务器倒排索引，复杂度为 O(结果数量)。
+
+        Args:
+            mcp_server: MCP 服务器名称，None 表示未指定服务器的工具
+
+        Returns:
+            工具元数据列表
+        """
+        records = self.snapshot().server_index.get(mcp_server, ())
+        return [record.to_metadata() for record in records]
+
+    def list_tools_by_temperature(self, temperature: "ToolTemperature") -> list[ToolMetadata]:
+        """
+        列出指定温度级别的工具
+
+        Args:
+            temperature: 温度级别 (HOT/WARM/COLD)
+
+        Returns:
+            工具元数据列表
+        """
+        from registrytools.registry.models import ToolTemperature
+
+        snapshot = self.snapshot()
+        if temperature == ToolTemperature.HOT:
+            records = snapshot.hot_tools
+        elif temperature == ToolTemperature.WARM:
+            records = snapshot.warm_tools
+        else:
+            records = snapshot.cold_tools
+        return [record.to_metadata() for record in records]
+
+    def list_tags(self) -> list[str]:
+        """
+        列出所有标签
+
+        Returns:
+            标签列表
+        """
+        return list(self.snapshot().tag_index)
+
+    def list_servers(self) -> list[str]:
+        """
+        列出所有 MCP 服务器
+
+        Returns:
+            MCP 服务器名称列表（不包括 None）
+        """
+        return [server for server in self.snapshot().server_index if server is not None]
 
     def list_categories(self) -> list[str]:
         """
@@ -375,7 +1039,7 @@ class ToolRegistry:
         Returns:
             类别名称列表（不包括 None）
         """
-        return [cat for cat in self._category_index.keys() if cat is not None]
+        return [cat for cat in self.snapshot().category_index if cat is not None]
 
     # ============================================================
     # 工具搜索功能 (TASK-303)
@@ -386,16 +1050,27 @@ class ToolRegistry:
         query: str,
         method: SearchMethod = SearchMethod.BM25,
         limit: int = 5,
+        *,
+        category: str | None = None,
+        tags: "Iterable[str] | None" = None,
+        mcp_server: str | None = None,
+        temperature: "ToolTemperature | None" = None,
     ) -> list[ToolSearchResult]:
         """
         搜索工具
 
         使用指定的搜索算法在工具名称、描述和标签中搜索匹配项。
+        指定过滤条件时先用快照缓存的布尔掩码求出允许的行，搜索算法只对这些行打分，
+        因此过滤后的查询比全量查询更快，且 limit 作用于过滤后的结果。
 
         Args:
             query: 搜索查询字符串
-            method: 搜索方法 (REGEX/BM25/EMBEDDING)，默认 BM25
+            method: 搜索方法 (REGEX/BM25/EMBEDDING/HYBRID/FUSION)，默认 BM25
             limit: 返回结果数量限制，默认 5
+            category: 可选，只搜索该类别的工具
+            tags: 可选，只搜索包含全部这些标签的工具
+            mcp_server: 可选，只搜索该 MCP 服务器的工具
+            temperature: 可选，只搜索该温度级别的工具
 
         Returns:
             搜索结果列表，按相关度降序排列
@@ -409,8 +1084,22 @@ class ToolRegistry:
             >>> results = registry.search("github pull request", method=SearchMethod.BM25)
             >>> for result in results:
             ...     print(f"{result.tool_name}: {result.score}")
+            >>> # 只搜索 github 服务器的工具
+            >>> results = registry.search("pull request", mcp_server="github")
         """
-        if not self._tools:
+        # 融合搜索：并发执行所有已注册的搜索器
+        if method == SearchMethod.FUSION:
+            return self.search_fusion(
+                query,
+                limit,
+                category=category,
+                tags=tags,
+                mcp_server=mcp_server,
+                temperature=temperature,
+            ).results
+
+        snapshot = self.snapshot()
+        if not snapshot.tools:
             return []
 
         # 获取搜索器
@@ -420,13 +1109,258 @@ class ToolRegistry:
                 f"搜索方法 {method.value} 未注册。" f"请先使用 register_searcher() 注册搜索算法。"
             )
 
-        # 获取工具列表
-        tools = list(self._tools.values())
+        # 预过滤：计算允许的行号（无过滤条件时为 None）
+        rows = snapshot.filter_rows(category, tags, mcp_server, temperature)
 
-        # 执行搜索
-        results = searcher.search(query, tools, limit)
+        # 直接使用快照中的不可变工具元组（无锁、无复制）
+        return self._run_search(searcher, query, snapshot.tools, limit, rows)
 
-        return results
+    def search_fusion(
+        self,
+        query: str,
+        limit: int = 5,
+        methods: list[SearchMethod] | None = None,
+        deadline_ms: float = FUSION_METHOD_DEADLINE_MS,
+        *,
+        category: str | None = None,
+        tags: "Iterable[str] | None" = None,
+        mcp_server: str | None = None,
+        temperature: "ToolTemperature | None" = None,
+    ) -> FusionSearchResult:
+        """
+        多方法融合搜索
+
+        在线程池中并发执行多个搜索方法，使用倒数排名融合 (RRF) 合并排序结果：
+        score(tool) = Σ 1 / (k + rank)。超过截止时间或执行出错的方法被丢弃，
+        不会阻塞响应。
+
+        已开始运行的超时任务无法取消，会继续占用一个线程；在它结束前该方法不再提交
+        （状态为 busy），持续变慢的方法（如首次加载嵌入模型）最多占用一个线程。
+
+        Args:
+            query: 搜索查询字符串
+            limit: 返回结果数量限制，默认 5
+            methods: 参与融合的搜索方法，默认使用所有已注册的搜索器
+            deadline_ms: 单个方法的截止时间（毫秒），默认 FUSION_METHOD_DEADLINE_MS
+            category: 可选，只搜索该类别的工具
+            tags: 可选，只搜索包含全部这些标签的工具
+            mcp_server: 可选，只搜索该 MCP 服务器的工具
+            temperature: 可选，只搜索该温度级别的工具
+
+        Returns:
+            融合搜索结果，包含融合后的结果和各方法的执行报告
+
+        Raises:
+            ValueError: 如果指定的搜索方法未注册
+
+        Examples:
+            >>> fused = registry.search_fusion("create pull request", limit=5)
+            >>> fused.contributing_methods
+            [<SearchMethod.REGEX: 'regex'>, <SearchMethod.BM25: 'bm25'>]
+        """
+        if methods is None:
+            methods = [m for m in self._searchers if m != SearchMethod.FUSION]
+        else:
+            for method in methods:
+                if method not in self._searchers:
+                    raise ValueError(
+                        f"搜索方法 {method.value} 未注册。"
+                        f"请先使用 register_searcher() 注册搜索算法。"
+                    )
+
+        snapshot = self.snapshot()
+        tools = snapshot.tools
+        if not tools or not methods:
+            return FusionSearchResult()
+
+        # 所有方法共享同一组预过滤行号
+        rows = snapshot.filter_rows(category, tags, mcp_server, temperature)
+        if rows is not None and len(rows) == 0:
+            return FusionSearchResult()
+
+        fetch_limit = limit * FUSION_FETCH_MULTIPLIER
+        executor = self._get_fusion_executor()
+
+        # 上次超时的任务仍在运行的方法本次跳过，不再占用新的线程
+        with self._fusion_lock:
+            busy = {method for method in methods if method in self._fusion_stragglers}
+
+        # 并发提交其余搜索方法
+        futures: dict[SearchMethod, Future[tuple[list[ToolSearchResult], float]]] = {
+            method: executor.submit(
+                self._timed_search, self._searchers[method], query, tools, fetch_limit, rows
+            )
+            for method in methods
+            if method not in busy
+        }
+        # 所有方法同时开始，统一等待到截止时间（全部完成时提前返回）
+        wait(list(futures.values()), timeout=deadline_ms / 1000)
+
+        # 收集结果并生成报告
+        ranked_lists: list[list[ToolSearchResult]] = []
+        reports: list[FusionMethodReport] = []
+        for method in methods:
+            if method in busy:
+                logger.debug(f"融合搜索：{method.value} 上次超时的搜索仍在运行，已跳过")
+                reports.append(FusionMethodReport(method=method, status="busy", latency_ms=0.0))
+                continue
+            future = futures[method]
+            if not future.done():
+                # 超时：丢弃该方法（尚未开始的任务直接取消，已在运行的登记为滞后任务）
+                if not future.cancel():
+                    self._track_fusion_straggler(method, future)
+                logger.warning(f"融合搜索：{method.value} 超过截止时间 {deadline_ms}ms，已丢弃")
+                reports.append(
+                    FusionMethodReport(method=method, status="timeout", latency_ms=deadline_ms)
+                )
+                continue
+            try:
+                results, latency_ms = future.result()
+            except Exception as e:
+                logger.warning(f"融合搜索：{method.value} 执行失败，已丢弃: {e}")
+                reports.append(FusionMethodReport(method=method, status="error", latency_ms=0.0))
+                continue
+            ranked_lists.append(results)
+            reports.append(
+                FusionMethodReport(
+                    method=method,
+                    status="ok",
+                    latency_ms=latency_ms,
+                    result_count=len(results),
+                )
+            )
+
+        return FusionSearchResult(
+            results=self._reciprocal_rank_fusion(ranked_lists, limit),
+            methods=reports,
+        )
+
+    @staticmethod
+    def _run_search(
+        searcher: SearchAlgorithm,
+        query: str,
+        tools: "Sequence[SearchableTool]",
+        limit: int,
+        rows: "np.ndarray | None" = None,
+    ) -> list[ToolSearchResult]:
+        """
+        执行搜索，有预过滤行号时只对这些行打分
+
+        Args:
+            searcher: 搜索算法实例
+            query: 搜索查询字符串
+            tools: 工具元数据列表
+            limit: 返回结果数量限制
+            rows: 允许的行号数组，None 表示不过滤
+
+        Returns:
+            搜索结果列表
+        """
+        if rows is None:
+            return searcher.search(query, tools, limit)
+        if len(rows) == 0:
+            return []
+        return searcher.search_subset(query, tools, limit, rows)
+
+    @classmethod
+    def _timed_search(
+        cls,
+        searcher: SearchAlgorithm,
+        query: str,
+        tools: "Sequence[SearchableTool]",
+        limit: int,
+        rows: "np.ndarray | None" = None,
+    ) -> tuple[list[ToolSearchResult], float]:
+        """
+        执行搜索并记录耗时
+
+        Args:
+            searcher: 搜索算法实例
+            query: 搜索查询字符串
+            tools: 工具元数据列表
+            limit: 返回结果数量限制
+            rows: 允许的行号数组，None 表示不过滤
+
+        Returns:
+            (搜索结果列表, 耗时毫秒) 元组
+        """
+        start = time.perf_counter()
+        results = cls._run_search(searcher, query, tools, limit, rows)
+        return results, (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _reciprocal_rank_fusion(
+        ranked_lists: list[list[ToolSearchResult]], limit: int, k: int = FUSION_RRF_K
+    ) -> list[ToolSearchResult]:
+        """
+        倒数排名融合 (RRF)
+
+        分数归一化到 [0, 1]：在所有参与方法中均排名第一的工具得分为 1.0。
+
+        Args:
+            ranked_lists: 各方法按相关度降序排列的结果列表
+            limit: 返回结果数量限制
+            k: RRF 平滑常数
+
+        Returns:
+            融合后的搜索结果列表，按 RRF 分数降序排列
+        """
+        if not ranked_lists:
+            return []
+
+        fused: dict[str, float] = defaultdict(float)
+        descriptions: dict[str, str] = {}
+        for results in ranked_lists:
+            for rank, result in enumerate(results, start=1):
+                fused[result.tool_name] += 1.0 / (k + rank)
+                descriptions.setdefault(result.tool_name, result.description)
+
+        max_score = len(ranked_lists) / (k + 1)
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            ToolSearchResult(
+                tool_name=name,
+                description=descriptions[name],
+                score=min(score / max_score, 1.0),
+                match_reason="reciprocal_rank_fusion",
+            )
+            for name, score in ranked
+        ]
+
+    def _track_fusion_straggler(self, method: SearchMethod, future: Future) -> None:
+        """
+        登记超时后仍在运行的融合搜索任务，任务结束时自动移除
+
+        Args:
+            method: 搜索方法
+            future: 仍在运行的任务
+        """
+
+        def release(done: Future) -> None:
+            with self._fusion_lock:
+                if self._fusion_stragglers.get(method) is done:
+                    del self._fusion_stragglers[method]
+
+        with self._fusion_lock:
+            self._fusion_stragglers[method] = future
+        # 任务已结束时立即调用
+        future.add_done_callback(release)
+
+    def _get_fusion_executor(self) -> ThreadPoolExecutor:
+        """
+        获取融合搜索线程池（延迟创建）
+
+        Returns:
+            线程池实例
+        """
+        if self._fusion_executor is None:
+            with self._fusion_lock:
+                if self._fusion_executor is None:
+                    self._fusion_executor = ThreadPoolExecutor(
+                        max_workers=FUSION_MAX_WORKERS,
+                        thread_name_prefix="registry-fusion",
+                    )
+        return self._fusion_executor
 
     def search_hot_warm(
         self,
@@ -442,7 +1376,7 @@ class ToolRegistry:
 
         Args:
             query: 搜索查询字符串
-            method: 搜索方法 (REGEX/BM25/EMBEDDING)，默认 BM25
+            method: 搜索方法 (REGEX/BM25/EMBEDDING/HYBRID)，默认 BM25
             limit: 返回结果数量限制，默认 5
 
         Returns:
@@ -464,17 +1398,17 @@ class ToolRegistry:
                 f"搜索方法 {method.value} 未注册。" f"请先使用 register_searcher() 注册搜索算法。"
             )
 
-        # 获取热工具和温工具（合并列表）
-        hot_tools = list(self._hot_tools.values())
-        warm_tools = list(self._warm_tools.values())
+        # 读取前弹出已到期的降级条目，保证分数衰减后的温度层准确（无过期条目时 O(1)）
+        if ENABLE_DOWNGRADE:
+            self._check_and_downgrade_other_tools()
+
+        # 快照中预先合并的热工具 + 温工具
+        hot_warm_tools = self.snapshot().hot_warm_tools
 
         # 如果没有热工具和温工具，返回空结果
-        if not hot_tools and not warm_tools:
+        if not hot_warm_tools:
             return []
 
-        # 合并热工具和温工具
-        hot_warm_tools = hot_tools + warm_tools
-
         # 仅在需要时重建索引（使用缓存检测）
         if searcher._should_rebuild_index(hot_warm_tools):
             searcher.index(hot_warm_tools)
@@ -492,95 +1426,178 @@ class ToolRegistry:
         """
         更新工具使用频率和最后使用时间 (TASK-304 + TASK-802)
 
-        自动升级工具温度，并检查是否需要降级其他工具。
+        自动升级工具温度；inline_maintenance 为 True 时同时降级其他过期工具。
 
         Args:
             tool_name: 工具名称
 
         Returns:
-            True 如果工具存在并被更新，False 如果工具不存在
+            True 如果工具存在并被更新，False 如果工具不存在（或更新期间被注销）
 
         Examples:
             >>> registry = ToolRegistry()
             >>> # ... 注册工具 ...
             >>> registry.update_usage("github.create_pr")
         """
-        if tool_name not in self._tools:
-            return False
-
-        tool = self._tools[tool_name]
-        old_temperature = tool.temperature
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            tool = self._fetch_unloaded(tool_name)
+            if tool is None:
+                return False
 
-        # 更新使用统计
-        tool.use_frequency += 1
-        tool.last_used = datetime.now()
+        now = datetime.now()
 
-        # 重新分类工具温度 (TASK-802)
         with self._temp_lock:
-            new_temperature = self._classify_tool_temperature(tool)
+            # 加锁后重新查找：工具可能已被注销（不再登记到频率桶、温度层和降级堆），
+            # 或因温度变化被替换为副本
+            tool = self._tools.get(tool_name)
+            if tool is None:
+                return False
+
+            # 更新使用统计（累计次数 + 衰减分数）；读-改-写在锁内，并发调用不丢失计数
+            old_temperature = tool.temperature
+            tool.record_usage(now)
+
+            # 移到新的使用频率桶
+            self._unrank_tool(tool_name)
+            self._rank_tool(tool_name, tool.use_frequency)
+
+            # 重新分类工具温度 (TASK-802)
+            new_temperature = self._classify_tool_temperature(tool, now)
             if new_temperature != old_temperature:
-                tool.temperature = new_temperature
+                tool = self._replace_temperature(tool, new_temperature)
+                self._record_change(ChangeOp.TEMPERATURE, tool_name, new_temperature)
                 self._add_to_temperature_layer(tool, new_temperature)
+            elif tool_name not in self._downgrade_seq:
+                # 首次获得使用记录的热/温工具：登记降级截止时间
+                # 已登记的工具无需更新堆：使用只会推迟截止时间，出堆时重新计算
+                self._schedule_downgrade(tool)
 
         # 检查是否需要降级其他工具 (TASK-802)
-        if ENABLE_DOWNGRADE and new_temperature.value in ("hot", "warm"):
+        # 启用后台维护时由 TemperatureMaintenanceScheduler 负责
+        if (
+            self._inline_maintenance
+            and ENABLE_DOWNGRADE
+            and new_temperature.value in ("hot", "warm")
+        ):
             self._check_and_downgrade_other_tools()
 
         return True
 
-    def _check_and_downgrade_other_tools(self) -> None:
+    def _check_and_downgrade_other_tools(self, now: datetime | None = None) -> list[str]:
         """
         检查并降级其他长时间未使用的工具 (TASK-802)
 
         这是一个后台维护操作，用于在工具升级时触发降级检查。
+        只弹出截止时间已到的堆条目，复杂度为 O(过期数量 × log N)。
+
+        Args:
+            now: 当前时间，默认 datetime.now()
+
+        Returns:
+            本次被降级的工具名称列表（同一工具可能连续降级两次）
         """
+        if now is None:
+            now = datetime.now()
+
+        downgraded: list[str] = []
         with self._temp_lock:
-            # 检查热工具是否需要降级
-            hot_tools_to_downgrade = [
-                name for name, tool in self._hot_tools.items() if self._check_downgrade_tool(tool)
-            ]
-            for tool_name in hot_tools_to_downgrade:
-                self._downgrade_tool(tool_name)
-
-            # 检查温工具是否需要降级
-            warm_tools_to_downgrade = [
-                name for name, tool in self._warm_tools.items() if self._check_downgrade_tool(tool)
-            ]
-            for tool_name in warm_tools_to_downgrade:
-                self._downgrade_tool(tool_name)
-
-    def get_usage_stats(self) -> "Mapping[str, int]":
+            heap = self._downgrade_heap
+            while heap and heap[0][0] <= now:
+                _, seq, tool_name = heapq.heappop(heap)
+
+                # 惰性失效：工具已注销或已重新登记
+                if self._downgrade_seq.get(tool_name) != seq:
+                    continue
+                del self._downgrade_seq[tool_name]
+
+                # 出堆时按最新 last_used 和使用分数重新计算，期间被使用过的工具重新入堆
+                tool = self._tools.get(tool_name)
+                if tool is None:
+                    continue
+                deadline = self._get_downgrade_deadline(tool)
+                if deadline is None:
+                    continue
+                if deadline > now:
+                    self._schedule_downgrade(tool)
+                    continue
+
+                # 降级后会登记下一层的截止时间，若已过期将在本轮继续弹出
+                if self._downgrade_tool(tool_name):
+                    downgraded.append(tool_name)
+
+            # 堆中失效条目过多时重建，避免堆无限增长
+            if len(heap) > 2 * len(self._downgrade_seq) + 64:
+                self._rebuild_downgrade_heap()
+
+        return downgraded
+
+    def run_maintenance(self, now: datetime | None = None) -> list[ToolMetadata]:
+        """
+        执行一次温度维护：降级所有截止时间已到的工具
+
+        Args:
+            now: 当前时间，默认 datetime.now()
+
+        Returns:
+            温度层发生变化的工具列表（去重，保持降级顺序；包含 Schema，可直接持久化）
+        """
+        names = dict.fromkeys(self._check_and_downgrade_other_tools(now))
+        return [self._materialize(self._tools[name]) for name in names if name in self._tools]
+
+    def _rebuild_downgrade_heap(self) -> None:
+        """仅保留有效条目重建降级堆（调用方需持有 _temp_lock）"""
+        self._downgrade_heap = [
+            entry for entry in self._downgrade_heap if self._downgrade_seq.get(entry[2]) == entry[1]
+        ]
+        heapq.heapify(self._downgrade_heap)
+
+    def get_usage_stats(self) -> dict[str, int]:
         """
         获取所有工具的使用频率统计
 
+        在写锁内复制增量维护的频率映射，不再遍历全部工具；返回的字典不随后续使用变化。
+
         Returns:
             工具名称到使用频率的映射
         """
-        return {name: tool.use_frequency for name, tool in self._tools.items()}
+        with self._temp_lock:
+            return dict(self._use_frequency)
 
     def get_most_used(self, limit: int = 10) -> list[ToolMetadata]:
         """
         获取最常用的工具
 
+        从最高的使用频率桶向下遍历，复杂度为 O(limit)，不对全部工具排序。
+        频率相同的工具按进入该频率的先后排列。
+
         Args:
             limit: 返回数量限制，默认 10
 
         Returns:
             工具元数据列表，按使用频率降序排列
         """
-        tools = list(self._tools.values())
-        sorted_tools = sorted(tools, key=lambda t: t.use_frequency, reverse=True)
-        return sorted_tools[:limit]
+        result: list[ToolMetadata] = []
+        if limit < 1:
+            return result
+
+        with self._temp_lock:
+            for frequency in reversed(self._frequency_levels):
+                for name in self._frequency_buckets[frequency]:
+                    result.append(self._tools[name].to_metadata())
+                    if len(result) >= limit:
+                        return result
+        return result
 
     # ============================================================
     # 索引管理
     # ============================================================
 
     def _invalidate_search_indexes(self) -> None:
-        """标记搜索索引需要重建"""
-        # 索引将在下次搜索时自动重建
+        """标记搜索索引需要重建（调用方需持有 _temp_lock）"""
+        # 索引将在下次搜索时根据新快照自动重建
         # 由各个搜索算法的 search() 方法处理
-        pass
+        self._invalidate_snapshot()
 
     def rebuild_indexes(self) -> None:
         """
@@ -589,7 +1606,7 @@ class ToolRegistry:
         调用此方法可以强制重建所有搜索算法的索引。
         通常在批量注册工具后调用以提高首次搜索性能。
         """
-        tools = list(self._tools.values())
+        tools = self.snapshot().tools
         for searcher in self._searchers.values():
             searcher.index(tools)
 
@@ -611,13 +1628,37 @@ class ToolRegistry:
         """检查注册表是否为空"""
         return len(self._tools) == 0
 
+    def close(self) -> None:
+        """
+        释放注册表持有的后台资源
+
+        关闭融合搜索线程池，不等待仍在运行的慢速搜索任务。
+        """
+        with self._fusion_lock:
+            executor = self._fusion_executor
+            self._fusion_executor = None
+            self._fusion_stragglers.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def clear(self) -> None:
         """清空注册表"""
-        self._tools.clear()
-        self._category_index.clear()
-        # 清空温度层 (TASK-802)
         with self._temp_lock:
+            self._tools.clear()
+            self._tag_sets.clear()
+            if self._schema_cache is not None:
+                self._schema_cache.clear()
+            self._category_index.clear()
+            self._tag_index.clear()
+            self._server_index.clear()
+            self._use_frequency.clear()
+            self._frequency_buckets.clear()
+            self._frequency_levels.clear()
+            # 清空温度层 (TASK-802)
             self._hot_tools.clear()
             self._warm_tools.clear()
             self._cold_tools.clear()
-        self._invalidate_search_indexes()
+            self._downgrade_heap.clear()
+            self._downgrade_seq.clear()
+            self._record_change(ChangeOp.CLEAR, None)
+            self._invalidate_search_indexes()
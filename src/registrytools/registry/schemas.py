@@ -0,0 +1,101 @@
+"""
+Schema 延迟加载缓存
+
+启动时只加载工具的摘要元数据，input_schema / output_schema 在首次访问时
+从存储按名称读取，并保存在容量有限的 LRU 缓存中。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import threading
+from collections import OrderedDict
+
+from registrytools.defaults import SCHEMA_CACHE_SIZE
+
+ToolSchemas = tuple[dict | None, dict | None]
+"""(input_schema, output_schema) 元组"""
+
+
+class SchemaCache:
+    """
+    已解析 Schema 的线程安全 LRU 缓存
+
+    Attributes:
+        capacity: 缓存容量（工具数）
+        hits: 命中次数
+        misses: 未命中次数
+        _entries: 工具名称到 Schema 的有序映射（最近使用的在末尾）
+        _lock: 保护缓存的锁
+    """
+
+    def __init__(self, capacity: int = SCHEMA_CACHE_SIZE) -> None:
+        """
+        初始化 Schema 缓存
+
+        Args:
+            capacity: 缓存容量（工具数），默认 SCHEMA_CACHE_SIZE
+
+        Raises:
+            ValueError: 如果容量不大于 0
+        """
+        if capacity < 1:
+            raise ValueError(f"缓存容量必须大于 0, 实际 {capacity}")
+
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, ToolSchemas] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """缓存中的工具数量"""
+        return len(self._entries)
+
+    def get(self, tool_name: str) -> ToolSchemas | None:
+        """
+        获取缓存的 Schema 并标记为最近使用
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组，未缓存时返回 None
+        """
+        with self._lock:
+            schemas = self._entries.get(tool_name)
+            if schemas is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(tool_name)
+            self.hits += 1
+            return schemas
+
+    def put(self, tool_name: str, schemas: ToolSchemas) -> None:
+        """
+        缓存 Schema，超出容量时淘汰最久未使用的条目
+
+        Args:
+            tool_name: 工具名称
+            schemas: (input_schema, output_schema) 元组
+        """
+        with self._lock:
+            self._entries[tool_name] = schemas
+            self._entries.move_to_end(tool_name)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def discard(self, tool_name: str) -> None:
+        """
+        移除工具的缓存条目（工具被重新注册或注销时调用）
+
+        Args:
+            tool_name: 工具名称
+        """
+        with self._lock:
+            self._entries.pop(tool_name, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
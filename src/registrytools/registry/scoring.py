@@ -0,0 +1,156 @@
+"""
+使用分数计算
+
+指数衰减使用分数的衰减、温度分类和阈值穿越时间计算，
+ToolMetadata 和 ToolRecord 共用同一套规则。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from registrytools.defaults import (
+    HOT_TOOL_THRESHOLD,
+    USAGE_SCORE_EPSILON,
+    USAGE_SCORE_HALF_LIFE_DAYS,
+    WARM_TOOL_THRESHOLD,
+)
+from registrytools.registry.models import ToolTemperature
+
+
+class UsageTracked(Protocol):
+    """带使用统计字段的工具（ToolMetadata 或 ToolRecord）"""
+
+    use_frequency: int
+    last_used: datetime | None
+    usage_score: float
+    usage_score_updated_at: datetime | None
+
+
+def decay_usage_score(score: float, updated_at: datetime, now: datetime) -> float:
+    """
+    计算指数衰减后的使用分数
+
+    score(now) = score * 0.5 ^ ((now - updated_at) / USAGE_SCORE_HALF_LIFE_DAYS)
+
+    Args:
+        score: 上次更新时的使用分数
+        updated_at: 上次更新时间
+        now: 当前时间
+
+    Returns:
+        衰减后的使用分数（now 早于 updated_at 时不衰减）
+    """
+    elapsed_days = (now - updated_at).total_seconds() / 86400
+    if elapsed_days <= 0:
+        return score
+    return score * math.pow(0.5, elapsed_days / USAGE_SCORE_HALF_LIFE_DAYS)
+
+
+def usage_score_crossing_time(score: float, updated_at: datetime, threshold: float) -> datetime:
+    """
+    计算衰减分数降到阈值以下的时间
+
+    Args:
+        score: 上次更新时的使用分数
+        updated_at: 上次更新时间
+        threshold: 温度阈值
+
+    Returns:
+        衰减分数低于阈值的时间（已低于阈值时返回 updated_at）
+    """
+    if score + USAGE_SCORE_EPSILON < threshold:
+        return updated_at
+    days = USAGE_SCORE_HALF_LIFE_DAYS * math.log2((score + USAGE_SCORE_EPSILON) / threshold)
+    return updated_at + timedelta(days=days)
+
+
+def classify_usage_score(score: float) -> ToolTemperature:
+    """
+    根据衰减后的使用分数分类工具温度
+
+    Args:
+        score: 衰减后的使用分数
+
+    Returns:
+        工具温度级别
+    """
+    if score + USAGE_SCORE_EPSILON >= HOT_TOOL_THRESHOLD:
+        return ToolTemperature.HOT
+    if score + USAGE_SCORE_EPSILON >= WARM_TOOL_THRESHOLD:
+        return ToolTemperature.WARM
+    return ToolTemperature.COLD
+
+
+def usage_score_range(temperature: ToolTemperature) -> tuple[float | None, float | None]:
+    """
+    获取温度级别对应的衰减分数区间（与 classify_usage_score() 一致）
+
+    Args:
+        temperature: 温度级别
+
+    Returns:
+        (下界, 上界) 元组，分数 >= 下界且 < 上界时属于该温度；None 表示无界
+    """
+    hot = HOT_TOOL_THRESHOLD - USAGE_SCORE_EPSILON
+    warm = WARM_TOOL_THRESHOLD - USAGE_SCORE_EPSILON
+    if temperature == ToolTemperature.HOT:
+        return hot, None
+    if temperature == ToolTemperature.WARM:
+        return warm, hot
+    return None, warm
+
+
+def usage_decay_key(score: float, at: datetime) -> float:
+    """
+    计算前向衰减键 log2(score) + t / USAGE_SCORE_HALF_LIFE_DAYS（t 为时刻 at 的天数）
+
+    衰减分数 score(now) = 2 ^ (key - t(now) / 半衰期)，因此键不随时间变化，
+    键的大小顺序即任意时刻衰减分数的大小顺序；分数阈值对应的键界限
+    由同一函数以 (阈值, now) 计算，可以在数据库索引上做范围查询。
+
+    Args:
+        score: 时刻 at 的使用分数（不大于 0 时按 USAGE_SCORE_EPSILON 计算）
+        at: 分数对应的时刻
+
+    Returns:
+        前向衰减键
+    """
+    days = at.timestamp() / 86400
+    return math.log2(max(score, USAGE_SCORE_EPSILON)) + days / USAGE_SCORE_HALF_LIFE_DAYS
+
+
+def usage_score_at(tool: UsageTracked, now: datetime | None = None) -> float:
+    """
+    获取工具在指定时刻衰减后的使用分数（惰性计算，不修改工具）
+
+    尚未跟踪衰减的旧数据（usage_score_updated_at 为 None）以累计使用频率作为分数。
+
+    Args:
+        tool: 工具元数据或工具记录
+        now: 当前时间，默认 datetime.now()
+
+    Returns:
+        衰减后的使用分数
+    """
+    if tool.usage_score_updated_at is None:
+        return float(tool.use_frequency)
+    return decay_usage_score(tool.usage_score, tool.usage_score_updated_at, now or datetime.now())
+
+
+def record_usage(tool: UsageTracked, now: datetime | None = None) -> None:
+    """
+    记录一次使用：累计次数加 1，衰减分数先衰减到当前时刻再加 1
+
+    Args:
+        tool: 工具元数据或工具记录（原地修改）
+        now: 使用时间，默认 datetime.now()
+    """
+    now = now or datetime.now()
+    tool.usage_score = usage_score_at(tool, now) + 1.0
+    tool.usage_score_updated_at = now
+    tool.use_frequency += 1
+    tool.last_used = now
@@ -0,0 +1,162 @@
+"""
+注册表不可变快照
+
+写操作在写锁内修改可变状态后使快照失效；读操作无锁获取当前快照，
+直接使用其中的元组和索引，不需要复制工具列表。
+
+快照的结构（元组、索引、温度层和过滤掩码）不可变；工具记录除使用统计外也不会被修改：
+温度变化时注册表以副本替换记录（写时复制）。使用统计字段（use_frequency、last_used、
+usage_score、usage_score_updated_at）在写锁内原地更新，读者看到的是最新值。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+
+from registrytools.registry.compact import ToolRecord
+from registrytools.registry.models import ToolTemperature
+
+
+@dataclass(frozen=True, slots=True)
+class RegistrySnapshot:
+    """
+    注册表在某一代 (generation) 的不可变视图
+
+    快照一经发布不再修改，读者持有引用即可获得一致的状态，
+    不会看到并发写入造成的中间状态。记录的温度与 hot_tools/warm_tools/cold_tools
+    一致；只有记录的使用统计字段会在发布后变化（见模块说明）。
+
+    Attributes:
+        generation: 快照对应的注册表代数（每批写操作递增）
+        tools: 全部工具记录（按注册顺序）
+        by_name: 名称到工具的只读映射
+        row_index: 名称到 tools 行号的只读映射（用于构建过滤掩码）
+        category_index: 类别到工具名称集合的只读映射（None 表示未分类）
+        tag_index: 标签到工具元组的只读映射
+        server_index: MCP 服务器到工具元组的只读映射（None 表示未指定服务器）
+        hot_tools: 热工具
+        warm_tools: 温工具
+        cold_tools: 冷工具
+        hot_warm_tools: 热工具 + 温工具（search_hot_warm 直接使用）
+        _mask_cache: 按 (维度, 值) 缓存的布尔掩码（快照不可变，缓存随快照失效）
+    """
+
+    generation: int
+    tools: tuple[ToolRecord, ...] = ()
+    by_name: Mapping[str, ToolRecord] = field(default_factory=lambda: MappingProxyType({}))
+    row_index: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    category_index: Mapping[str | None, frozenset[str]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    tag_index: Mapping[str, tuple[ToolRecord, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    server_index: Mapping[str | None, tuple[ToolRecord, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    hot_tools: tuple[ToolRecord, ...] = ()
+    warm_tools: tuple[ToolRecord, ...] = ()
+    cold_tools: tuple[ToolRecord, ...] = ()
+    hot_warm_tools: tuple[ToolRecord, ...] = ()
+    _mask_cache: dict[tuple[str, object], np.ndarray] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        """快照中的工具数量"""
+        return len(self.tools)
+
+    def list_by_category(self, category: str | None) -> list[ToolRecord]:
+        """
+        按类别列出工具
+
+        Args:
+            category: 类别名称（None 表示未分类）
+
+        Returns:
+            该类别下的工具列表
+        """
+        names = self.category_index.get(category, frozenset())
+        return [self.by_name[name] for name in names if name in self.by_name]
+
+    def filter_rows(
+        self,
+        category: str | None = None,
+        tags: Iterable[str] | None = None,
+        mcp_server: str | None = None,
+        temperature: ToolTemperature | None = None,
+    ) -> np.ndarray | None:
+        """
+        计算满足过滤条件的工具行号
+
+        每个维度取值的布尔掩码按需构建并缓存在快照上，多个条件按位与组合。
+
+        Args:
+            category: 类别
+            tags: 标签（工具须包含全部标签）
+            mcp_server: MCP 服务器
+            temperature: 温度级别
+
+        Returns:
+            tools 中满足条件的行号数组（升序）；未指定任何条件时返回 None
+        """
+        masks = []
+        if category is not None:
+            masks.append(self._facet_mask("category", category))
+        for tag in tags or ():
+            masks.append(self._facet_mask("tag", tag))
+        if mcp_server is not None:
+            masks.append(self._facet_mask("mcp_server", mcp_server))
+        if temperature is not None:
+            masks.append(self._facet_mask("temperature", ToolTemperature(temperature)))
+
+        if not masks:
+            return None
+        combined = masks[0] if len(masks) == 1 else np.logical_and.reduce(masks)
+        return np.flatnonzero(combined)
+
+    def _facet_mask(self, facet: str, value: Any) -> np.ndarray:
+        """
+        获取（或构建并缓存）单个维度取值的布尔掩码
+
+        构建复杂度为 O(N / 8 + k)：一次清零加上对 k 个命中工具的置位。
+
+        Args:
+            facet: 维度 (category/tag/mcp_server/temperature)
+            value: 维度取值
+
+        Returns:
+            长度为 len(tools) 的只读布尔数组
+        """
+        key = (facet, value)
+        mask = self._mask_cache.get(key)
+        if mask is not None:
+            return mask
+
+        if facet == "category":
+            names: Iterable[str] = self.category_index.get(value, frozenset())
+        elif facet == "tag":
+            names = (tool.name for tool in self.tag_index.get(value, ()))
+        elif facet == "mcp_server":
+            names = (tool.name for tool in self.server_index.get(value, ()))
+        else:
+            layer = {
+                ToolTemperature.HOT: self.hot_tools,
+                ToolTemperature.WARM: self.warm_tools,
+                ToolTemperature.COLD: self.cold_tools,
+            }[value]
+            names = (tool.name for tool in layer)
+
+        mask = np.zeros(len(self.tools), dtype=bool)
+        rows = [self.row_index[name] for name in names if name in self.row_index]
+        mask[rows] = True
+        mask.setflags(write=False)
+        # 并发构建同一掩码时结果相同，覆盖写入无害
+        self._mask_cache[key] = mask
+        return mask
@@ -0,0 +1,105 @@
+"""
+后台分层加载
+
+分层启动只预加载热/温工具，冷工具由后台线程分批从存储加载，
+使服务器的首次响应时间不依赖工具总数。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from registrytools.registry.registry import ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTierLoader:
+    """
+    后台温度层加载器
+
+    由服务器持有的守护线程，依次调用 ToolRegistry.load_tier() 加载
+    所有未驻留的温度层，全部加载完成后退出。
+
+    Attributes:
+        loaded_count: 已加载的工具数量
+        _registry: 工具注册表
+        _thread: 后台线程
+        _stop_event: 停止信号
+    """
+
+    def __init__(self, registry: "ToolRegistry") -> None:
+        """
+        初始化后台加载器
+
+        Args:
+            registry: 已调用 preload_tiers() 的工具注册表
+        """
+        self.loaded_count = 0
+        self._registry = registry
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        """后台线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> int:
+        """
+        加载所有未驻留的温度层（在调用线程中执行）
+
+        Returns:
+            本次加载的工具数量
+        """
+        start = time.perf_counter()
+        loaded = 0
+        for temperature in self._registry.pending_temperatures:
+            if self._stop_event.is_set():
+                break
+            loaded += self._registry.load_tier(temperature, stop_event=self._stop_event)
+        self.loaded_count += loaded
+
+        logger.info(
+            f"后台分层加载完成：加载 {loaded} 个工具，"
+            f"耗时 {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return loaded
+
+    def start(self) -> None:
+        """启动后台加载线程（已启动或无未驻留温度层时不启动）"""
+        if self.is_running or self._registry.is_fully_loaded:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="registry-tier-loader", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"后台分层加载已启动，温度层: {[t.value for t in self._registry.pending_temperatures]}"
+        )
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """
+        停止后台加载线程（在批次之间中止）
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        """后台线程主函数"""
+        try:
+            self.run_once()
+        except Exception as e:
+            # 加载失败时未驻留的工具仍可通过 get_tool 按需读取
+            logger.error(f"后台分层加载失败: {e}")
@@ -0,0 +1,181 @@
+"""
+写后（write-behind）使用统计跟踪
+
+使用事件立即更新内存中的计数器，由后台线程按间隔或批量大小把变化批量写入存储。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from registrytools.defaults import USAGE_FLUSH_BATCH_SIZE, USAGE_FLUSH_INTERVAL
+
+if TYPE_CHECKING:
+    from registrytools.registry.registry import ToolRegistry
+    from registrytools.storage.base import ToolStorage
+
+logger = logging.getLogger(__name__)
+
+
+class UsageRecorder:
+    """
+    写后使用统计记录器
+
+    record() 调用 ToolRegistry.update_usage() 立即更新内存计数器和温度层，
+    并把工具名称加入待刷新集合。后台线程每隔 flush_interval 秒、或待刷新
+    工具数达到 flush_batch_size 时，通过一次 storage.save_many() 写入
+    所有待刷新工具的最新元数据。同一工具在两次刷新之间被多次使用只写入一次。
+
+    Attributes:
+        flush_interval: 刷新间隔（秒）
+        flush_batch_size: 触发提前刷新的待刷新工具数
+        _registry: 工具注册表
+        _storage: 存储层
+        _pending: 待刷新的工具名称集合
+        _lock: 保护待刷新集合的锁
+        _thread: 后台刷新线程
+    """
+
+    def __init__(
+        self,
+        registry: "ToolRegistry",
+        storage: "ToolStorage",
+        flush_interval: float = USAGE_FLUSH_INTERVAL,
+        flush_batch_size: int = USAGE_FLUSH_BATCH_SIZE,
+    ) -> None:
+        """
+        初始化使用统计记录器
+
+        Args:
+            registry: 工具注册表
+            storage: 存储层
+            flush_interval: 刷新间隔（秒），默认 USAGE_FLUSH_INTERVAL
+            flush_batch_size: 触发提前刷新的待刷新工具数，默认 USAGE_FLUSH_BATCH_SIZE
+
+        Raises:
+            ValueError: 如果刷新间隔或批量大小不大于 0
+        """
+        if flush_interval <= 0:
+            raise ValueError(f"刷新间隔必须大于 0, 实际 {flush_interval}")
+        if flush_batch_size < 1:
+            raise ValueError(f"批量大小必须大于 0, 实际 {flush_batch_size}")
+
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self._registry = registry
+        self._storage = storage
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """后台刷新线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending_count(self) -> int:
+        """待刷新的工具数量"""
+        return len(self._pending)
+
+    def record(self, tool_name: str) -> bool:
+        """
+        记录一次工具使用
+
+        只更新内存，不进行 I/O（后台线程未运行且达到批量大小时除外）。
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            True 如果工具存在并被记录，False 如果工具不存在
+        """
+        if not self._registry.update_usage(tool_name):
+            return False
+
+        with self._lock:
+            self._pending.add(tool_name)
+            batch_full = len(self._pending) >= self.flush_batch_size
+
+        if batch_full:
+            if self.is_running:
+                self._wake_event.set()
+            else:
+                # 没有后台线程时直接刷新，避免待刷新集合无限增长
+                self.flush()
+        return True
+
+    def flush(self) -> int:
+        """
+        将待刷新的工具批量写入存储
+
+        写入失败时工具名称会放回待刷新集合，下次刷新重试。
+
+        Returns:
+            写入的工具数量
+        """
+        with self._flush_lock:
+            with self._lock:
+                names, self._pending = self._pending, set()
+            if not names:
+                return 0
+
+            try:
+                # get_tool 可能需要从存储读取延迟加载的 Schema，失败时同样重试
+                tools = [
+                    tool for name in names if (tool := self._registry.get_tool(name)) is not None
+                ]
+                self._storage.save_many(tools)
+            except OSError as e:
+                with self._lock:
+                    self._pending |= names
+                logger.error(f"使用统计刷新失败（{len(names)} 个工具，将重试）: {e}")
+                return 0
+
+        logger.debug(f"使用统计已刷新：{len(tools)} 个工具")
+        return len(tools)
+
+    def start(self) -> None:
+        """启动后台刷新线程（已启动时不重复启动）"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="registry-usage", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"使用统计写后刷新已启动，间隔 {self.flush_interval} 秒，批量 {self.flush_batch_size}"
+        )
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """
+        停止后台刷新线程并刷新剩余的使用统计
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        thread = self._thread
+        if thread is not None:
+            self._stop_event.set()
+            self._wake_event.set()
+            thread.join(timeout)
+            self._thread = None
+
+        # 关闭时刷新剩余数据
+        self.flush()
+
+    def _run_loop(self) -> None:
+        """后台线程主循环"""
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # 刷新失败不应终止后台线程
+                logger.error(f"使用统计刷新失败: {e}")
@@ -10,6 +10,8 @@ License: MIT
 from registrytools.search.base import SearchAlgorithm
 from registrytools.search.bm25_search import BM25Search
 from registrytools.search.embedding_search import EmbeddingSearch
+from registrytools.search.fts5_search import FTS5Search
+from registrytools.search.hybrid_search import HybridSearch
 from registrytools.search.regex_search import RegexSearch
 
 __all__ = [
@@ -17,4 +19,6 @@ __all__ = [
     "RegexSearch",
     "BM25Search",
     "EmbeddingSearch",
+    "HybridSearch",
+    "FTS5Search",
 ]
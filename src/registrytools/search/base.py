@@ -11,8 +11,45 @@ import hashlib
 import json
 import threading
 from abc import ABC, abstractmethod
+from collections.abc import Sequence, Set
+from typing import Protocol
 
-from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
+import numpy as np
+
+from registrytools.registry.models import SearchMethod, ToolSearchResult
+
+
+class SearchableTool(Protocol):
+    """
+    搜索算法读取的工具字段
+
+    ToolMetadata 和注册表内部的紧凑记录 ToolRecord 都满足该协议。
+    """
+
+    @property
+    def name(self) -> str:
+        """工具名称"""
+        ...
+
+    @property
+    def description(self) -> str:
+        """工具描述"""
+        ...
+
+    @property
+    def tags(self) -> Set[str]:
+        """工具标签"""
+        ...
+
+    @property
+    def category(self) -> str | None:
+        """工具类别"""
+        ...
+
+    @property
+    def mcp_server(self) -> str | None:
+        """所属 MCP 服务器名称"""
+        ...
 
 
 class SearchAlgorithm(ABC):
@@ -34,12 +71,12 @@ class SearchAlgorithm(ABC):
     def __init__(self) -> None:
         """初始化搜索算法"""
         self._indexed = False
-        self._tools: list[ToolMetadata] = []
+        self._tools: Sequence[SearchableTool] = ()
         self._tools_hash: str | None = None
         self._lock = threading.RLock()
 
     @abstractmethod
-    def index(self, tools: list[ToolMetadata]) -> None:
+    def index(self, tools: Sequence[SearchableTool]) -> None:
         """
         建立搜索索引
 
@@ -52,9 +89,9 @@ class SearchAlgorithm(ABC):
 
     def index_layered(
         self,
-        hot_tools: list[ToolMetadata],
-        warm_tools: list[ToolMetadata],
-        cold_tools: list[ToolMetadata] | None = None,
+        hot_tools: list[SearchableTool],
+        warm_tools: list[SearchableTool],
+        cold_tools: list[SearchableTool] | None = None,
     ) -> None:
         """
         建立分层搜索索引 (TASK-802)
@@ -86,7 +123,9 @@ class SearchAlgorithm(ABC):
         self.index(all_indexed)
 
     @abstractmethod
-    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
         """
         执行搜索
 
@@ -100,6 +139,46 @@ class SearchAlgorithm(ABC):
         """
         pass
 
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """
+        只在指定行的工具中搜索（预过滤搜索）
+
+        默认实现对全部工具打分后按行过滤；子类应覆盖为只对 rows 中的工具打分。
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（与 rows 的行号对应）
+            limit: 返回结果数量限制
+            rows: 允许的行号数组
+
+        Returns:
+            搜索结果列表，按相关度降序排列
+        """
+        allowed = {tools[row].name for row in rows.tolist()}
+        results = self.search(query, tools, len(tools))
+        return [result for result in results if result.tool_name in allowed][:limit]
+
+    def _ensure_exact_index(self, tools: Sequence[SearchableTool]) -> Sequence[SearchableTool]:
+        """
+        确保索引与 tools 的行顺序完全一致（预过滤行号依赖行顺序）
+
+        分层索引会重排工具顺序，内容相同但不是同一序列时同样需要重建。
+
+        Args:
+            tools: 工具元数据列表
+
+        Returns:
+            已索引的工具序列（即 tools）
+        """
+        if self._indexed and self._tools is tools:
+            return tools
+        with self._lock:
+            if not (self._indexed and self._tools is tools):
+                self.index(tools)
+        return tools
+
     def is_indexed(self) -> bool:
         """
         检查是否已建立索引
@@ -109,7 +188,7 @@ class SearchAlgorithm(ABC):
         """
         return self._indexed
 
-    def _compute_tools_hash(self, tools: list[ToolMetadata]) -> str:
+    def _compute_tools_hash(self, tools: Sequence[SearchableTool]) -> str:
         """
         计算工具列表的哈希值
 
@@ -139,21 +218,25 @@ class SearchAlgorithm(ABC):
         data_str = json.dumps(tools_data, sort_keys=True, ensure_ascii=False)
         return hashlib.sha256(data_str.encode()).hexdigest()
 
-    def _should_rebuild_index(self, tools: list[ToolMetadata]) -> bool:
+    def _should_rebuild_index(self, tools: Sequence[SearchableTool]) -> bool:
         """
         检查是否需要重建索引
 
+        注册表快照的工具元组不可变：与已索引的是同一个元组时直接跳过哈希计算。
+
         Args:
             tools: 工具元数据列表
 
         Returns:
             True 如果需要重建索引，否则 False
         """
+        if isinstance(tools, tuple) and tools is self._tools:
+            return False
         current_hash = self._compute_tools_hash(tools)
         return current_hash != self._tools_hash
 
     def _filter_by_score(
-        self, results: list[tuple[ToolMetadata, float]], limit: int
+        self, results: list[tuple[SearchableTool, float]], limit: int
     ) -> list[ToolSearchResult]:
         """
         过滤并转换搜索结果
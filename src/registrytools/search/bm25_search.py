@@ -7,11 +7,14 @@ Copyright (c) 2026 Maric
 License: MIT
 """
 
+from collections.abc import Sequence
+
 import jieba
+import numpy as np
 from rank_bm25 import BM25Okapi
 
-from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
-from registrytools.search.base import SearchAlgorithm
+from registrytools.registry.models import SearchMethod, ToolSearchResult
+from registrytools.search.base import SearchableTool, SearchAlgorithm
 
 
 class BM25Search(SearchAlgorithm):
@@ -47,7 +50,7 @@ class BM25Search(SearchAlgorithm):
         self._bm25: BM25Okapi | None = None
         self._tokenized_docs: list[list[str]] = []
 
-    def index(self, tools: list[ToolMetadata]) -> None:
+    def index(self, tools: Sequence[SearchableTool]) -> None:
         """
         建立 BM25 搜索索引
 
@@ -78,9 +81,9 @@ class BM25Search(SearchAlgorithm):
 
     def index_layered(
         self,
-        hot_tools: list[ToolMetadata],
-        warm_tools: list[ToolMetadata],
-        cold_tools: list[ToolMetadata] | None = None,
+        hot_tools: list[SearchableTool],
+        warm_tools: list[SearchableTool],
+        cold_tools: list[SearchableTool] | None = None,
     ) -> None:
         """
         建立分层 BM25 搜索索引 (TASK-802)
@@ -128,7 +131,9 @@ class BM25Search(SearchAlgorithm):
         # 创建 BM25 索引（热工具在索引前部，搜索更快）
         self._bm25 = BM25Okapi(self._tokenized_docs, k1=self.k1, b=self.b, epsilon=self.epsilon)
 
-    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
         """
         执行 BM25 搜索
 
@@ -140,6 +145,134 @@ class BM25Search(SearchAlgorithm):
         Returns:
             搜索结果列表，按 BM25 分数降序排列
         """
+        scored = self._score_all(query, tools)
+        if scored is None:
+            return []
+        indexed_tools, scores = scored
+
+        # 构建结果（不过滤分数，由 _filter_by_score 进行归一化）
+        results = []
+        for i, score in enumerate(scores):
+            if i < len(indexed_tools):
+                results.append((indexed_tools[i], score))
+
+        # 转换并过滤结果
+        return self._filter_by_score(results, limit)
+
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """
+        只对指定行的工具计算 BM25 分数
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（与 rows 的行号对应）
+            limit: 返回结果数量限制
+            rows: 允许的行号数组
+
+        Returns:
+            搜索结果列表，按 BM25 分数降序排列
+        """
+        scored = self._score_rows(query, tools, rows)
+        if scored is None:
+            return []
+        indexed_tools, scores = scored
+
+        results = [
+            (indexed_tools[row], float(score))
+            for row, score in zip(rows.tolist(), scores, strict=True)
+        ]
+        return self._filter_by_score(results, limit)
+
+    def top_candidates(
+        self,
+        query: str,
+        tools: Sequence[SearchableTool],
+        n: int,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[SearchableTool, float]]:
+        """
+        获取 BM25 原始分数最高的前 N 个候选工具
+
+        使用 argpartition 选取前 N 个，避免对全部分数排序。
+        供混合搜索作为候选召回阶段使用。
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表
+            n: 候选数量
+            rows: 可选，只在这些行中召回（预过滤）
+
+        Returns:
+            (工具, BM25 原始分数) 元组列表，按分数降序排列（不含零分工具）
+        """
+        if n < 1:
+            return []
+        if rows is None:
+            scored = self._score_all(query, tools)
+        else:
+            scored = self._score_rows(query, tools, rows)
+        if scored is None:
+            return []
+        indexed_tools, scores = scored
+
+        # 候选行号：全量打分时为 0..N-1，预过滤时为 rows
+        if rows is None:
+            scores = np.asarray(scores[: len(indexed_tools)], dtype=float)
+            candidate_rows = np.arange(len(scores))
+        else:
+            candidate_rows = rows
+
+        # 仅保留有关键词命中的工具（分数为正）
+        positive = np.flatnonzero(scores > 0)
+        if n < len(positive):
+            top = positive[np.argpartition(-scores[positive], n - 1)[:n]]
+        else:
+            top = positive
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(indexed_tools[candidate_rows[i]], float(scores[i])) for i in top]
+
+    def _score_rows(
+        self, query: str, tools: Sequence[SearchableTool], rows: np.ndarray
+    ) -> tuple[Sequence[SearchableTool], np.ndarray] | None:
+        """
+        只计算查询对指定行的 BM25 分数
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（与 rows 的行号对应）
+            rows: 行号数组
+
+        Returns:
+            (索引工具列表, 与 rows 对齐的分数数组)，索引为空或 rows 为空时返回 None
+        """
+        if len(rows) == 0:
+            return None
+        # 在锁内确认索引与 tools 行顺序一致并取快照，避免并发重建导致行号错位
+        with self._lock:
+            self._ensure_exact_index(tools)
+            if self._bm25 is None or not self._indexed:
+                return None
+            bm25 = self._bm25
+            indexed_tools = self._tools
+
+        query_tokens = list(jieba.cut(query))
+        return indexed_tools, np.asarray(bm25.get_batch_scores(query_tokens, rows.tolist()))
+
+    def _score_all(
+        self, query: str, tools: Sequence[SearchableTool]
+    ) -> tuple[Sequence[SearchableTool], np.ndarray] | None:
+        """
+        计算查询对索引中所有工具的 BM25 分数
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表
+
+        Returns:
+            (索引工具列表, 分数数组)，索引为空时返回 None
+        """
         # 使用哈希值检测是否需要重建索引（缓存优化）
         if self._should_rebuild_index(tools):
             with self._lock:
@@ -150,7 +283,7 @@ class BM25Search(SearchAlgorithm):
         # 获取索引状态的快照
         with self._lock:
             if self._bm25 is None or not self._indexed:
-                return []
+                return None
             bm25 = self._bm25
             indexed_tools = self._tools
 
@@ -158,16 +291,7 @@ class BM25Search(SearchAlgorithm):
         query_tokens = list(jieba.cut(query))
 
         # 获取 BM25 分数（不需要锁，因为我们有索引的快照）
-        scores = bm25.get_scores(query_tokens)
-
-        # 构建结果（不过滤分数，由 _filter_by_score 进行归一化）
-        results = []
-        for i, score in enumerate(scores):
-            if i < len(indexed_tools):
-                results.append((indexed_tools[i], score))
-
-        # 转换并过滤结果
-        return self._filter_by_score(results, limit)
+        return indexed_tools, bm25.get_scores(query_tokens)
 
     def _get_match_reason(self) -> str:
         """
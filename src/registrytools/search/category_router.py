@@ -0,0 +1,200 @@
+"""
+类别质心路由
+
+为 Embedding 语义搜索提供两阶段分层检索的第一阶段：
+按类别维护质心向量，先选出与查询最相近的少数类别，再只对这些类别下的工具打分。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from registrytools.defaults import (
+    EMBEDDING_ROUTING_MIN_CONFIDENCE,
+    EMBEDDING_ROUTING_TOP_K,
+)
+
+
+class CategoryCentroidRouter:
+    """
+    类别质心路由器
+
+    每个类别（与 ToolRegistry._category_index 的键一致，None 表示未分类）维护
+    向量和与工具数量，质心 = 向量和 / 数量。注册/注销工具时只需增量加减对应向量，
+    无需重新计算全部质心。
+
+    Attributes:
+        top_k: 每次查询选取的类别数量
+        min_confidence: 最佳类别的最低余弦相似度，低于此值时回退到全局搜索
+        _sums: 类别 -> 向量和
+        _counts: 类别 -> 工具数量
+        _rows: 类别 -> 嵌入矩阵中的行号数组
+        _centroids: 归一化质心矩阵缓存（类别列表, 矩阵）
+    """
+
+    def __init__(
+        self,
+        top_k: int = EMBEDDING_ROUTING_TOP_K,
+        min_confidence: float = EMBEDDING_ROUTING_MIN_CONFIDENCE,
+    ) -> None:
+        """
+        初始化类别质心路由器
+
+        Args:
+            top_k: 每次查询选取的类别数量，默认 EMBEDDING_ROUTING_TOP_K
+            min_confidence: 最低路由置信度，默认 EMBEDDING_ROUTING_MIN_CONFIDENCE
+
+        Raises:
+            ValueError: 如果 top_k 小于 1
+        """
+        if top_k < 1:
+            raise ValueError(f"top_k 必须大于 0, 实际 {top_k}")
+        self.top_k = top_k
+        self.min_confidence = min_confidence
+        self._sums: dict[str | None, np.ndarray] = {}
+        self._counts: dict[str | None, int] = {}
+        self._rows: dict[str | None, np.ndarray] = {}
+        self._centroids: tuple[list[str | None], np.ndarray] | None = None
+
+    # ============================================================
+    # 增量维护
+    # ============================================================
+
+    def add(self, category: str | None, vector: np.ndarray) -> None:
+        """
+        将工具向量累加到所属类别的质心
+
+        Args:
+            category: 工具类别
+            vector: 工具嵌入向量
+        """
+        if category in self._sums:
+            self._sums[category] = self._sums[category] + vector
+            self._counts[category] += 1
+        else:
+            self._sums[category] = np.array(vector, dtype=np.float64)
+            self._counts[category] = 1
+        self._centroids = None
+
+    def remove(self, category: str | None, vector: np.ndarray) -> None:
+        """
+        从所属类别的质心中减去工具向量
+
+        Args:
+            category: 工具类别
+            vector: 工具嵌入向量
+        """
+        count = self._counts.get(category, 0)
+        if count <= 1:
+            # 类别已空，直接移除（避免浮点残差）
+            self._sums.pop(category, None)
+            self._counts.pop(category, None)
+        else:
+            self._sums[category] = self._sums[category] - vector
+            self._counts[category] = count - 1
+        self._centroids = None
+
+    def assign_rows(self, categories: Sequence[str | None]) -> None:
+        """
+        记录每个类别在嵌入矩阵中的行号
+
+        嵌入矩阵按工具列表顺序排列，重建矩阵后调用此方法刷新行号映射。
+        只做整数分组，不涉及向量运算。
+
+        Args:
+            categories: 与嵌入矩阵行一一对应的类别列表
+        """
+        grouped: dict[str | None, list[int]] = {}
+        for row, category in enumerate(categories):
+            grouped.setdefault(category, []).append(row)
+        self._rows = {cat: np.asarray(rows, dtype=np.intp) for cat, rows in grouped.items()}
+
+    def clear(self) -> None:
+        """清空所有质心和行号映射"""
+        self._sums.clear()
+        self._counts.clear()
+        self._rows = {}
+        self._centroids = None
+
+    # ============================================================
+    # 查询路由
+    # ============================================================
+
+    @property
+    def category_count(self) -> int:
+        """获取参与路由的类别数量"""
+        return len(self._counts)
+
+    def get_centroid(self, category: str | None) -> np.ndarray | None:
+        """
+        获取指定类别的质心向量（未归一化）
+
+        Args:
+            category: 工具类别
+
+        Returns:
+            质心向量，如果类别不存在则返回 None
+        """
+        if category not in self._counts:
+            return None
+        return self._sums[category] / self._counts[category]
+
+    def route(self, query_vector: np.ndarray, min_rows: int = 1) -> np.ndarray | None:
+        """
+        为查询选择候选行
+
+        计算查询与各类别质心的余弦相似度，选取前 top_k 个类别，
+        返回这些类别下所有工具在嵌入矩阵中的行号。
+
+        Args:
+            query_vector: 查询嵌入向量（一维）
+            min_rows: 候选行的最少数量，不足时回退到全局搜索
+
+        Returns:
+            候选行号数组；返回 None 表示置信度不足或候选不足，应回退到全局搜索
+        """
+        # 类别数不超过 top_k 时路由没有意义
+        if len(self._counts) <= self.top_k:
+            return None
+
+        categories, centroids = self._get_normalized_centroids()
+
+        query_norm = np.linalg.norm(query_vector)
+        if query_norm == 0:
+            return None
+        similarities = centroids @ (query_vector / query_norm)
+
+        # 选取相似度最高的 top_k 个类别
+        top = np.argpartition(-similarities, self.top_k - 1)[: self.top_k]
+        if float(similarities[top].max()) < self.min_confidence:
+            return None
+
+        row_groups = [self._rows[categories[i]] for i in top if categories[i] in self._rows]
+        if not row_groups:
+            return None
+        rows = np.concatenate(row_groups)
+        if len(rows) < min_rows:
+            return None
+        return rows
+
+    def _get_normalized_centroids(self) -> tuple[list[str | None], np.ndarray]:
+        """
+        获取归一化的质心矩阵（带缓存）
+
+        Returns:
+            (类别列表, 归一化质心矩阵)
+        """
+        cached = self._centroids
+        if cached is not None:
+            return cached
+
+        categories = list(self._counts.keys())
+        matrix = np.vstack([self._sums[cat] / self._counts[cat] for cat in categories])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        cached = (categories, matrix / norms)
+        self._centroids = cached
+        return cached
@@ -10,12 +10,19 @@ License: MIT
 import logging
 import os
 import threading
-from typing import TYPE_CHECKING
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, cast
 
 import numpy as np
 
-from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
-from registrytools.search.base import SearchAlgorithm
+from registrytools.defaults import (
+    EMBEDDING_ROUTING_MIN_CONFIDENCE,
+    EMBEDDING_ROUTING_MIN_TOOLS,
+    EMBEDDING_ROUTING_TOP_K,
+)
+from registrytools.registry.models import SearchMethod, ToolSearchResult
+from registrytools.search.base import SearchableTool, SearchAlgorithm
+from registrytools.search.category_router import CategoryCentroidRouter
 
 logger = logging.getLogger(__name__)
 
@@ -180,32 +187,53 @@ class EmbeddingSearchLazyLoader(SearchAlgorithm):
                     else:
                         logger.info(f"Embedding 搜索：使用设备 {actual_device}")
 
+                    # 类别质心路由配置（大规模工具集推荐启用）
+                    enable_routing = os.getenv(
+                        "REGISTRYTOOLS_EMBEDDING_ROUTING", "false"
+                    ).strip().lower() in ("true", "1", "yes")
+
                     # 创建真实的 EmbeddingSearch 实例
                     # 传入验证后的实际设备
-                    self._real_searcher = EmbeddingSearch(_validated_device=actual_device)
+                    self._real_searcher = EmbeddingSearch(
+                        _validated_device=actual_device, enable_routing=enable_routing
+                    )
 
         return self._real_searcher
 
-    def index(self, tools: list[ToolMetadata]) -> None:
+    def index(self, tools: Sequence[SearchableTool]) -> None:
         """建立搜索索引（委托给真实实例）"""
         searcher = self._load_real_searcher()
         searcher.index(tools)
 
-    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
         """执行搜索（委托给真实实例）"""
         searcher = self._load_real_searcher()
         return searcher.search(query, tools, limit)
 
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """只在指定行中搜索（委托给真实实例）"""
+        searcher = self._load_real_searcher()
+        return searcher.search_subset(query, tools, limit, rows)
+
     def index_layered(
         self,
-        hot_tools: list[ToolMetadata],
-        warm_tools: list[ToolMetadata],
-        cold_tools: list[ToolMetadata] | None = None,
+        hot_tools: list[SearchableTool],
+        warm_tools: list[SearchableTool],
+        cold_tools: list[SearchableTool] | None = None,
     ) -> None:
         """建立分层搜索索引（委托给真实实例）"""
         searcher = self._load_real_searcher()
         searcher.index_layered(hot_tools, warm_tools, cold_tools)
 
+    def score_tools(self, query: str, tools: Sequence[SearchableTool]) -> np.ndarray:
+        """计算查询与指定工具的语义相似度（委托给真实实例）"""
+        searcher = self._load_real_searcher()
+        return searcher.score_tools(query, tools)
+
     def unload_model(self) -> None:
         """卸载模型（委托给真实实例）"""
         if self._real_searcher is not None:
@@ -236,6 +264,8 @@ class EmbeddingSearch(SearchAlgorithm):
         _model: sentence-transformers 模型实例（延迟加载）
         _embeddings: 工具向量嵌入矩阵
         _model_lock: 模型加载锁
+        _vector_cache: 工具向量缓存（避免重复编码未变化的工具）
+        _router: 类别质心路由器（启用分层搜索时）
     """
 
     method = SearchMethod.EMBEDDING
@@ -244,13 +274,25 @@ class EmbeddingSearch(SearchAlgorithm):
     # 默认使用支持中文的轻量级多语言模型
     DEFAULT_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
 
-    def __init__(self, model_name: str | None = None, _validated_device: str | None = None) -> None:
+    def __init__(
+        self,
+        model_name: str | None = None,
+        _validated_device: str | None = None,
+        enable_routing: bool = False,
+        routing_top_k: int = EMBEDDING_ROUTING_TOP_K,
+        routing_min_confidence: float = EMBEDDING_ROUTING_MIN_CONFIDENCE,
+        routing_min_tools: int = EMBEDDING_ROUTING_MIN_TOOLS,
+    ) -> None:
         """
         初始化 Embedding 搜索算法
 
         Args:
             model_name: sentence-transformers 模型名称，默认使用多语言模型
             _validated_device: 内部使用，已验证的设备标识（避免重复验证）
+            enable_routing: 是否启用类别质心路由（两阶段分层搜索），默认 False
+            routing_top_k: 路由选取的类别数量
+            routing_min_confidence: 路由最低置信度，低于此值回退到全局搜索
+            routing_min_tools: 启用路由的最小工具数量
 
         Note:
             设备配置通过环境变量 REGISTRYTOOLS_DEVICE 控制：
@@ -275,6 +317,19 @@ class EmbeddingSearch(SearchAlgorithm):
         self._embeddings: np.ndarray | None = None
         self._model_lock = threading.Lock()
 
+        # 向量缓存：name -> (文本, 类别, 向量)，重建索引时只编码变化的工具
+        self._vector_cache: dict[str, tuple[str, str | None, np.ndarray]] = {}
+        # 索引外编码的向量（混合搜索候选）：name -> (文本, 向量)
+        self._extra_vectors: dict[str, tuple[str, np.ndarray]] = {}
+
+        # 类别质心路由（两阶段分层搜索）
+        self.routing_min_tools = routing_min_tools
+        self._router: CategoryCentroidRouter | None = (
+            CategoryCentroidRouter(routing_top_k, routing_min_confidence)
+            if enable_routing
+            else None
+        )
+
     def _parse_device(self, device_str: str) -> str:
         """
         解析设备配置字符串
@@ -344,9 +399,15 @@ class EmbeddingSearch(SearchAlgorithm):
                 del self._model
                 self._model = None
                 self._embeddings = None
+                self._vector_cache.clear()
+                self._extra_vectors.clear()
+                if self._router is not None:
+                    self._router.clear()
+                # 强制下次搜索时重建索引
+                self._tools_hash = None
                 logger.info("Embedding 模型已卸载")
 
-    def index(self, tools: list[ToolMetadata]) -> None:
+    def index(self, tools: Sequence[SearchableTool]) -> None:
         """
         建立 Embedding 搜索索引
 
@@ -360,26 +421,19 @@ class EmbeddingSearch(SearchAlgorithm):
         # 处理空列表情况
         if not tools:
             self._embeddings = None
+            self._vector_cache.clear()
+            if self._router is not None:
+                self._router.clear()
             return
 
-        # 加载模型
-        model = self._load_model()
-
-        # 构建文档集合（名称 + 描述 + 标签）
-        texts = []
-        for tool in tools:
-            # 合并所有可搜索文本
-            text = f"{tool.name} {tool.description} {' '.join(tool.tags)}"
-            texts.append(text)
-
-        # 生成向量嵌入
-        self._embeddings = model.encode(texts, convert_to_numpy=True)
+        # 生成向量嵌入（仅编码新增或变化的工具）
+        self._embeddings = self._build_embeddings(tools)
 
     def index_layered(
         self,
-        hot_tools: list[ToolMetadata],
-        warm_tools: list[ToolMetadata],
-        cold_tools: list[ToolMetadata] | None = None,
+        hot_tools: list[SearchableTool],
+        warm_tools: list[SearchableTool],
+        cold_tools: list[SearchableTool] | None = None,
     ) -> None:
         """
         建立分层 Embedding 搜索索引
@@ -404,21 +458,145 @@ class EmbeddingSearch(SearchAlgorithm):
         # 处理空列表情况
         if not all_indexed:
             self._embeddings = None
+            self._vector_cache.clear()
+            if self._router is not None:
+                self._router.clear()
             return
 
-        # 加载模型
+        # 生成向量嵌入（热工具在索引前部）
+        self._embeddings = self._build_embeddings(all_indexed)
+
+    def _build_embeddings(self, tools: Sequence[SearchableTool]) -> np.ndarray:
+        """
+        增量构建嵌入矩阵
+
+        复用文本未变化工具的已有向量，仅对新增或修改的工具调用模型编码；
+        启用路由时同步对类别质心做增量加减。
+
+        Args:
+            tools: 工具元数据列表（矩阵行顺序与其一致）
+
+        Returns:
+            嵌入矩阵
+        """
+        texts = [self._tool_text(tool) for tool in tools]
+        old_cache = self._vector_cache
+
+        rows: list[np.ndarray | None] = [
+            self._cached_vector(tool.name, text) for tool, text in zip(tools, texts, strict=True)
+        ]
+
+        # 仅编码新增或修改的工具
+        to_encode = [i for i, row in enumerate(rows) if row is None]
+        if to_encode:
+            model = self._load_model()
+            vectors = model.encode([texts[i] for i in to_encode], convert_to_numpy=True)
+            for i, vector in zip(to_encode, vectors, strict=True):
+                rows[i] = vector
+
+        # 缺失的行已全部填充
+        embeddings = np.vstack(cast("list[np.ndarray]", rows))
+
+        # 新缓存引用新矩阵的行视图，释放旧矩阵
+        new_cache = {
+            tool.name: (texts[i], tool.category, embeddings[i]) for i, tool in enumerate(tools)
+        }
+
+        # 增量更新类别质心
+        router = self._router
+        if router is not None:
+            for name, (text, category, vector) in old_cache.items():
+                entry = new_cache.get(name)
+                if entry is None or entry[0] != text or entry[1] != category:
+                    router.remove(category, vector)
+            for name, (text, category, vector) in new_cache.items():
+                old_entry = old_cache.get(name)
+                if old_entry is None or old_entry[0] != text or old_entry[1] != category:
+                    router.add(category, vector)
+            router.assign_rows([tool.category for tool in tools])
+
+        self._vector_cache = new_cache
+        # 已进入矩阵的工具不再需要额外缓存
+        for tool in tools:
+            self._extra_vectors.pop(tool.name, None)
+        return embeddings
+
+    @staticmethod
+    def _tool_text(tool: SearchableTool) -> str:
+        """
+        构建工具的可搜索文本（名称 + 描述 + 标签）
+
+        Args:
+            tool: 工具元数据
+
+        Returns:
+            可搜索文本
+        """
+        return f"{tool.name} {tool.description} {' '.join(tool.tags)}"
+
+    def _cached_vector(self, name: str, text: str) -> np.ndarray | None:
+        """
+        查找工具的已缓存向量（文本变化时视为未命中）
+
+        Args:
+            name: 工具名称
+            text: 工具当前的可搜索文本
+
+        Returns:
+            已缓存的向量，未命中时返回 None
+        """
+        entry = self._vector_cache.get(name)
+        if entry is not None and entry[0] == text:
+            return entry[2]
+        extra = self._extra_vectors.get(name)
+        if extra is not None and extra[0] == text:
+            return extra[1]
+        return None
+
+    def score_tools(self, query: str, tools: Sequence[SearchableTool]) -> np.ndarray:
+        """
+        计算查询与指定工具的语义相似度
+
+        优先使用已缓存的工具向量（不重新编码），仅对从未编码过的工具调用模型，
+        并与查询一起批量编码。新编码的向量会被缓存供后续查询复用。
+        供混合搜索对 BM25 候选集重排序使用。
+
+        Args:
+            query: 搜索查询字符串
+            tools: 待打分的工具列表
+
+        Returns:
+            与 tools 顺序一致的相似度数组
+        """
+        if not tools:
+            return np.zeros(0)
+
+        texts = [self._tool_text(tool) for tool in tools]
+        with self._lock:
+            vectors = [
+                self._cached_vector(tool.name, text)
+                for tool, text in zip(tools, texts, strict=True)
+            ]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        # 查询与缺失的工具向量一次批量编码
         model = self._load_model()
+        encoded = model.encode([query] + [texts[i] for i in missing], convert_to_numpy=True)
+        query_embedding = encoded[0]
 
-        # 构建分层的文档集合（热工具优先）
-        texts = []
-        for tool in all_indexed:
-            text = f"{tool.name} {tool.description} {' '.join(tool.tags)}"
-            texts.append(text)
+        if missing:
+            with self._lock:
+                for i, vector in zip(missing, encoded[1:], strict=True):
+                    vectors[i] = vector
+                    self._extra_vectors[tools[i].name] = (texts[i], vector)
 
-        # 生成向量嵌入（热工具在索引前部）
-        self._embeddings = model.encode(texts, convert_to_numpy=True)
+        # 缺失的向量已全部填充
+        scores: np.ndarray = np.vstack(cast("list[np.ndarray]", vectors)) @ query_embedding
+        return scores
 
-    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
         """
         执行 Embedding 语义搜索
 
@@ -452,20 +630,74 @@ class EmbeddingSearch(SearchAlgorithm):
         # 生成查询向量嵌入
         query_embedding = model.encode([query], convert_to_numpy=True)
 
+        # 两阶段分层搜索：先按类别质心路由，只对候选类别内的工具打分
+        router = self._router
+        rows = None
+        if router is not None and len(indexed_tools) >= self.routing_min_tools:
+            with self._lock:
+                # 索引在编码查询期间被重建时，路由行号已不对应快照矩阵，回退到全局搜索
+                if embeddings is self._embeddings:
+                    rows = router.route(query_embedding[0], min_rows=limit)
+
         # 计算余弦相似度
         # 相似度 = (A · B) / (||A|| * ||B||)
         # 对于归一化的向量，相似度 = A · B
-        similarities = np.dot(embeddings, query_embedding.T).flatten()
-
-        # 构建结果
-        results = []
-        for i, score in enumerate(similarities):
-            if i < len(indexed_tools):
-                results.append((indexed_tools[i], float(score)))
+        if rows is None:
+            # 置信度不足或未启用路由：全局搜索
+            similarities = np.dot(embeddings, query_embedding.T).flatten()
+            results = [
+                (indexed_tools[i], float(score))
+                for i, score in enumerate(similarities)
+                if i < len(indexed_tools)
+            ]
+        else:
+            similarities = np.dot(embeddings[rows], query_embedding.T).flatten()
+            results = [
+                (indexed_tools[row], float(score))
+                for row, score in zip(rows.tolist(), similarities, strict=True)
+            ]
 
         # 转换并过滤结果
         return self._filter_by_score(results, limit)
 
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """
+        只对指定行的工具计算语义相似度
+
+        预过滤已经缩小了候选范围，因此不再进行类别质心路由。
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（与 rows 的行号对应）
+            limit: 返回结果数量限制
+            rows: 允许的行号数组
+
+        Returns:
+            搜索结果列表，按语义相似度降序排列
+        """
+        if len(rows) == 0:
+            return []
+
+        # 在锁内确认索引与 tools 行顺序一致并取快照，避免并发重建导致行号错位
+        with self._lock:
+            self._ensure_exact_index(tools)
+            if self._embeddings is None or not self._indexed:
+                return []
+            embeddings = self._embeddings
+            indexed_tools = self._tools
+
+        model = self._load_model()
+        query_embedding = model.encode([query], convert_to_numpy=True)
+
+        similarities = np.dot(embeddings[rows], query_embedding.T).flatten()
+        results = [
+            (indexed_tools[row], float(score))
+            for row, score in zip(rows.tolist(), similarities, strict=True)
+        ]
+        return self._filter_by_score(results, limit)
+
     def _get_match_reason(self) -> str:
         """
         获取匹配原因描述
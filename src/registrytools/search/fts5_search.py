@@ -0,0 +1,209 @@
+"""
+FTS5 全文搜索算法
+
+使用 SQLite FTS5 虚拟表在存储中直接搜索，适合无法全部加载到内存的大规模工具目录。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import re
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from registrytools.registry.models import SearchMethod, ToolSearchResult
+from registrytools.search.base import SearchableTool, SearchAlgorithm
+from registrytools.storage.sqlite_storage import fts_segment
+
+if TYPE_CHECKING:
+    from registrytools.storage.sqlite_storage import SQLiteStorage
+
+# 查询词：与 FTS5 unicode61 分词器一致，字母数字之外的字符（含下划线）都是分隔符；
+# 紧跟的 * 表示前缀查询。含汉字的词再经 fts_segment() 切分，与索引一致
+_TERM_PATTERN = re.compile(r"([^\W_]+)(\*?)")
+
+
+class FTS5Search(SearchAlgorithm):
+    """
+    SQLite FTS5 全文搜索算法
+
+    索引是 SQLiteStorage 数据库中的 FTS5 虚拟表，由触发器随工具的写入同步：
+    - 不在内存中建立索引，启动时不需要重建（首次使用时从现有数据建立一次）
+    - 搜索存储中当前命名空间的全部工具，包括尚未加载到内存的冷工具
+    - 使用 FTS5 的 bm25() 排序，可按列设置权重
+
+    查询按词拆分后以 OR 组合，词后加 * 表示前缀查询（如 "git*"）；
+    中文与索引一样经 jieba 分词，"读取" 可以匹配 "读取文件内容"。
+
+    Attributes:
+        method: 搜索方法类型 (FTS5)
+        weights: 各列的 bm25 权重（SQLiteStorage.FTS_COLUMNS 顺序），None 表示等权
+        prefix: 是否把所有查询词都作为前缀查询
+    """
+
+    method = SearchMethod.FTS5
+    """搜索方法类型"""
+
+    def __init__(
+        self,
+        storage: "SQLiteStorage",
+        weights: Mapping[str, float] | None = None,
+        prefix: bool = False,
+    ) -> None:
+        """
+        初始化 FTS5 搜索算法
+
+        Args:
+            storage: SQLite 存储（搜索其命名空间分区）
+            weights: 可选的列权重，如 {"name": 5.0, "tags": 2.0}，未指定的列权重为 1.0
+            prefix: 是否把所有查询词都作为前缀查询，默认 False（只有以 * 结尾的词）
+
+        Raises:
+            ValueError: 如果权重包含未知列或负数
+        """
+        super().__init__()
+        columns = storage.FTS_COLUMNS
+        if weights is not None:
+            unknown = set(weights) - set(columns)
+            if unknown:
+                raise ValueError(f"未知的 FTS5 列: {sorted(unknown)}，支持的列: {list(columns)}")
+            negative = {column: weight for column, weight in weights.items() if weight < 0}
+            if negative:
+                raise ValueError(f"列权重不能为负数: {negative}")
+
+        self._storage = storage
+        self.weights = (
+            tuple(float(weights.get(column, 1.0)) for column in columns) if weights else None
+        )
+        self.prefix = prefix
+
+    def index(self, tools: Sequence[SearchableTool]) -> None:
+        """
+        确保 FTS5 索引存在
+
+        索引由 SQLite 触发器维护，与传入的工具列表无关；不计算工具哈希，
+        首次调用时创建索引并从现有数据建立一次。
+
+        Args:
+            tools: 工具元数据列表（不使用）
+
+        Raises:
+            IOError: 如果 SQLite 不支持 FTS5 或创建失败
+        """
+        self._tools = tools
+        self._storage.ensure_fts_index()
+        self._indexed = True
+
+    def _should_rebuild_index(self, tools: Sequence[SearchableTool]) -> bool:
+        """FTS5 索引随存储写入同步，从不需要重建"""
+        return False
+
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
+        """
+        执行 FTS5 全文搜索
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（不使用，搜索存储中的全部工具）
+            limit: 返回结果数量限制
+
+        Returns:
+            搜索结果列表，按 bm25 分数降序排列
+
+        Raises:
+            IOError: 如果查询失败
+        """
+        match = self.build_match_query(query)
+        if not match:
+            return []
+        self._ensure_index()
+        return self._to_results(self._storage.search_fts(match, limit, self.weights))
+
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """
+        只返回指定行的工具（按相关度分批读取，直到满足 limit）
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（与 rows 的行号对应）
+            limit: 返回结果数量限制
+            rows: 允许的行号数组
+
+        Returns:
+            搜索结果列表，按 bm25 分数降序排列
+
+        Raises:
+            IOError: 如果查询失败
+        """
+        match = self.build_match_query(query)
+        if not match:
+            return []
+        self._ensure_index()
+        allowed = {tools[row].name for row in rows.tolist()}
+        hits = self._storage.search_fts(match, limit, self.weights, accept=allowed.__contains__)
+        return self._to_results(hits)
+
+    def build_match_query(self, query: str) -> str:
+        """
+        将搜索查询转换为 FTS5 MATCH 表达式
+
+        每个词加引号作为字符串（查询中的运算符和列过滤语法不会生效），词之间以 OR 组合。
+        含汉字的词按索引的分词方式切分为多个词。
+
+        Args:
+            query: 搜索查询字符串
+
+        Returns:
+            MATCH 表达式，查询中没有可搜索的词时返回空字符串
+
+        Examples:
+            >>> searcher.build_match_query("create pull-req*")
+            '"create" OR "pull" OR "req"*'
+        """
+        terms = (
+            f'"{word}"*' if star or self.prefix else f'"{word}"'
+            for term, star in _TERM_PATTERN.findall(query)
+            for word in (fts_segment(term) or term).split()
+        )
+        return " OR ".join(dict.fromkeys(terms))
+
+    def _ensure_index(self) -> None:
+        """首次搜索前确保 FTS5 索引存在（未调用 index() 时）"""
+        if not self._indexed:
+            with self._lock:
+                if not self._indexed:
+                    self.index(self._tools)
+
+    def _to_results(self, hits: list[tuple[str, str, float]]) -> list[ToolSearchResult]:
+        """
+        将 (名称, 描述, bm25 分数) 转换为搜索结果，分数归一化到 [0, 1]
+
+        Args:
+            hits: search_fts() 的结果（bm25 分数越小越相关）
+
+        Returns:
+            搜索结果列表
+        """
+        if not hits:
+            return []
+
+        relevance = [-score for _, _, score in hits]
+        max_score = max(relevance)
+        min_score = min(relevance)
+        score_range = max_score - min_score
+
+        return [
+            ToolSearchResult(
+                tool_name=name,
+                description=description,
+                score=(score - min_score) / score_range if score_range > 0 else 1.0,
+                match_reason=self._get_match_reason(),
+            )
+            for (name, description, _), score in zip(hits, relevance, strict=True)
+        ]
@@ -0,0 +1,190 @@
+"""
+混合搜索算法
+
+BM25 召回候选 + 语义向量重排序，以接近 BM25 的成本获得大部分语义搜索质量。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from registrytools.defaults import HYBRID_BM25_WEIGHT, HYBRID_CANDIDATE_POOL
+from registrytools.registry.models import SearchMethod, ToolSearchResult
+from registrytools.search.base import SearchableTool, SearchAlgorithm
+from registrytools.search.bm25_search import BM25Search
+
+if TYPE_CHECKING:
+    from registrytools.search.embedding_search import EmbeddingSearch, EmbeddingSearchLazyLoader
+
+
+class HybridSearch(SearchAlgorithm):
+    """
+    混合搜索算法
+
+    两阶段检索：
+    1. BM25 对全部工具打分，选出前 candidate_pool 个候选
+    2. 仅对候选工具计算语义相似度（优先复用已缓存的向量，不重新编码）
+
+    两路分数各自归一化到 [0, 1] 后按权重融合：
+    fused = bm25_weight * bm25 + (1 - bm25_weight) * semantic
+
+    Attributes:
+        method: 搜索方法类型 (HYBRID)
+        bm25_weight: BM25 分数的融合权重
+        candidate_pool: BM25 召回的候选数量
+        _bm25: BM25 搜索器（候选召回）
+        _embedding: Embedding 搜索器（候选重排序）
+    """
+
+    method = SearchMethod.HYBRID
+    """搜索方法类型"""
+
+    def __init__(
+        self,
+        embedding: "EmbeddingSearch | EmbeddingSearchLazyLoader | None" = None,
+        bm25: BM25Search | None = None,
+        bm25_weight: float = HYBRID_BM25_WEIGHT,
+        candidate_pool: int = HYBRID_CANDIDATE_POOL,
+    ) -> None:
+        """
+        初始化混合搜索算法
+
+        Args:
+            embedding: Embedding 搜索器，默认创建延迟加载器（可与 EMBEDDING 搜索器共享）
+            bm25: BM25 搜索器，默认创建新实例
+            bm25_weight: BM25 分数的融合权重 (0-1)，默认 HYBRID_BM25_WEIGHT
+            candidate_pool: BM25 召回的候选数量，默认 HYBRID_CANDIDATE_POOL
+
+        Raises:
+            ValueError: 如果权重不在 [0, 1] 范围或候选数量小于 1
+        """
+        super().__init__()
+        if not 0.0 <= bm25_weight <= 1.0:
+            raise ValueError(f"bm25_weight 必须在 [0, 1] 范围内, 实际 {bm25_weight}")
+        if candidate_pool < 1:
+            raise ValueError(f"candidate_pool 必须大于 0, 实际 {candidate_pool}")
+
+        if embedding is None:
+            from registrytools.search.embedding_search import EmbeddingSearchLazyLoader
+
+            embedding = EmbeddingSearchLazyLoader()
+
+        self.bm25_weight = bm25_weight
+        self.candidate_pool = candidate_pool
+        self._bm25 = bm25 or BM25Search()
+        self._embedding = embedding
+
+    def index(self, tools: Sequence[SearchableTool]) -> None:
+        """
+        建立混合搜索索引
+
+        只建立 BM25 索引；语义向量在首次作为候选时按需编码并缓存，
+        因此建立索引不会加载 Embedding 模型。
+
+        Args:
+            tools: 工具元数据列表
+        """
+        super().index(tools)
+        self._bm25.index(tools)
+
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
+        """
+        执行混合搜索
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表
+            limit: 返回结果数量限制
+
+        Returns:
+            搜索结果列表，按融合分数降序排列
+        """
+        return self._rerank(query, tools, limit)
+
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """
+        只在指定行中召回候选并重排序
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表（与 rows 的行号对应）
+            limit: 返回结果数量限制
+            rows: 允许的行号数组
+
+        Returns:
+            搜索结果列表，按融合分数降序排列
+        """
+        return self._rerank(query, tools, limit, rows)
+
+    def _rerank(
+        self,
+        query: str,
+        tools: Sequence[SearchableTool],
+        limit: int,
+        rows: np.ndarray | None = None,
+    ) -> list[ToolSearchResult]:
+        """
+        BM25 召回候选后按语义分数融合重排序
+
+        Args:
+            query: 搜索查询字符串
+            tools: 工具元数据列表
+            limit: 返回结果数量限制
+            rows: 可选，只在这些行中召回（预过滤）
+
+        Returns:
+            搜索结果列表，按融合分数降序排列
+        """
+        # BM25 召回候选（BM25 内部基于哈希检测重建索引）
+        candidates = self._bm25.top_candidates(
+            query, tools, max(self.candidate_pool, limit), rows=rows
+        )
+        if not candidates:
+            return []
+
+        candidate_tools = [tool for tool, _ in candidates]
+        bm25_scores = self._normalize(np.array([score for _, score in candidates], dtype=float))
+
+        # 仅对候选计算语义相似度
+        semantic_scores = self._normalize(self._embedding.score_tools(query, candidate_tools))
+
+        fused = self.bm25_weight * bm25_scores + (1.0 - self.bm25_weight) * semantic_scores
+        results = [(tool, float(score)) for tool, score in zip(candidate_tools, fused, strict=True)]
+
+        return self._filter_by_score(results, limit)
+
+    @staticmethod
+    def _normalize(scores: np.ndarray) -> np.ndarray:
+        """
+        将分数归一化到 [0, 1] 范围（Min-Max）
+
+        Args:
+            scores: 原始分数数组
+
+        Returns:
+            归一化后的分数数组；所有分数相同时返回全 1
+        """
+        if len(scores) == 0:
+            return scores
+        min_score = float(scores.min())
+        score_range = float(scores.max()) - min_score
+        if score_range <= 0:
+            return np.ones_like(scores, dtype=float)
+        return (scores - min_score) / score_range
+
+    def _get_match_reason(self) -> str:
+        """
+        获取匹配原因描述
+
+        Returns:
+            匹配原因字符串
+        """
+        return "hybrid_bm25_semantic"
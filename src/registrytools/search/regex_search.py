@@ -8,9 +8,12 @@ License: MIT
 """
 
 import re
+from collections.abc import Sequence
 
-from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
-from registrytools.search.base import SearchAlgorithm
+import numpy as np
+
+from registrytools.registry.models import SearchMethod, ToolSearchResult
+from registrytools.search.base import SearchableTool, SearchAlgorithm
 
 
 class RegexSearch(SearchAlgorithm):
@@ -38,7 +41,7 @@ class RegexSearch(SearchAlgorithm):
         super().__init__()
         self.case_sensitive = case_sensitive
 
-    def index(self, tools: list[ToolMetadata]) -> None:
+    def index(self, tools: Sequence[SearchableTool]) -> None:
         """
         建立搜索索引
 
@@ -49,7 +52,9 @@ class RegexSearch(SearchAlgorithm):
         """
         super().index(tools)
 
-    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+    def search(
+        self, query: str, tools: Sequence[SearchableTool], limit: int
+    ) -> list[ToolSearchResult]:
         """
         执行正则表达式搜索
 
@@ -85,7 +90,38 @@ class RegexSearch(SearchAlgorithm):
         # 转换并过滤结果
         return self._filter_by_score(results, limit)
 
-    def _calculate_score(self, tool: ToolMetadata, pattern: re.Pattern) -> float:
+    def search_subset(
+        self, query: str, tools: Sequence[SearchableTool], limit: int, rows: np.ndarray
+    ) -> list[ToolSearchResult]:
+        """
+        只在指定行的工具中进行正则匹配
+
+        Args:
+            query: 搜索查询字符串（正则表达式）
+            tools: 工具元数据列表（与 rows 的行号对应）
+            limit: 返回结果数量限制
+            rows: 允许的行号数组
+
+        Returns:
+            搜索结果列表，按匹配精度降序排列
+        """
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        try:
+            pattern = re.compile(query, flags)
+        except re.error:
+            return []
+
+        # 正则搜索无需预处理索引，直接遍历候选行
+        results = []
+        for row in rows.tolist():
+            tool = tools[row]
+            score = self._calculate_score(tool, pattern)
+            if score > 0:
+                results.append((tool, score))
+
+        return self._filter_by_score(results, limit)
+
+    def _calculate_score(self, tool: SearchableTool, pattern: re.Pattern) -> float:
         """
         计算工具的匹配分数
 
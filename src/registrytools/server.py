@@ -7,11 +7,14 @@ Copyright (c) 2026 Maric
 License: MIT
 """
 
+import importlib.util
 import json
 import logging
 import os
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, AbstractContextManager, asynccontextmanager
 from pathlib import Path
+from typing import Any
 
 from fastmcp import FastMCP
 
@@ -22,11 +25,37 @@ from registrytools.auth.middleware import (
     APIKeyInvalid,
     APIKeyPermission,
 )
-from registrytools.registry.models import SearchMethod, StorageBackend, ToolMetadata
+from registrytools.auth.models import APIKeyMetadata
+from registrytools.defaults import (
+    DEFAULT_NAMESPACE,
+    MAX_LOADED_NAMESPACES,
+    SCHEMA_CACHE_SIZE,
+    TEMPERATURE_MAINTENANCE_INTERVAL,
+    TOP_TOOLS_LIMIT,
+    USAGE_FLUSH_BATCH_SIZE,
+    USAGE_FLUSH_INTERVAL,
+    WRITE_BATCH_SIZE,
+    WRITE_FLUSH_DELAY,
+)
+from registrytools.registry.maintenance import TemperatureMaintenanceScheduler
+from registrytools.registry.models import (
+    ColdLoadMode,
+    SearchMethod,
+    StorageBackend,
+    ToolMetadata,
+    ToolTemperature,
+    WriteMode,
+)
+from registrytools.registry.namespaces import NamespaceContext, NamespaceManager
 from registrytools.registry.registry import ToolRegistry
+from registrytools.registry.tier_loader import BackgroundTierLoader
+from registrytools.registry.usage import UsageRecorder
 from registrytools.search.bm25_search import BM25Search
+from registrytools.search.fts5_search import FTS5Search
 from registrytools.search.regex_search import RegexSearch
 from registrytools.storage.base import ToolStorage
+from registrytools.storage.binary_storage import BinaryStorage
+from registrytools.storage.buffered import BufferedStorage
 from registrytools.storage.json_storage import JSONStorage
 from registrytools.storage.sqlite_storage import SQLiteStorage
 
@@ -43,6 +72,7 @@ logger = logging.getLogger(__name__)
 # 输入参数限制
 MAX_QUERY_LENGTH = 1000  # 查询字符串最大长度
 MAX_LIMIT = 100  # 返回结果最大数量
+MAX_REGISTER_BATCH = 1000  # 批量注册最大工具数
 
 
 # ============================================================
@@ -95,7 +125,7 @@ def _get_api_key_from_context() -> str | None:
 def _check_auth(
     auth_middleware: APIKeyAuthMiddleware | None,
     required_permission: APIKeyPermission,
-) -> None:
+) -> APIKeyMetadata | None:
     """
     检查 API Key 认证
 
@@ -103,12 +133,15 @@ def _check_auth(
         auth_middleware: 认证中间件实例
         required_permission: 需要的权限级别
 
+    Returns:
+        认证通过的 API Key 元数据，未启用认证时返回 None
+
     Raises:
         PermissionError: 如果认证失败或权限不足
     """
     if auth_middleware is None:
         # 未启用认证，跳过检查
-        return
+        return None
 
     # 获取 API Key
     api_key = _get_api_key_from_context()
@@ -119,7 +152,7 @@ def _check_auth(
 
     # 执行认证检查
     try:
-        auth_middleware.require_permission(api_key, required_permission)
+        return auth_middleware.require_permission(api_key, required_permission)
     except APIKeyInvalid as e:
         raise PermissionError(f"Invalid API Key: {e.message}") from e
     except APIKeyExpired as e:
@@ -128,6 +161,101 @@ def _check_auth(
         raise PermissionError(f"Insufficient permissions: {e.message}") from e
 
 
+def _key_namespace(key_metadata: APIKeyMetadata | None) -> str | None:
+    """
+    获取 API Key 绑定的命名空间
+
+    Args:
+        key_metadata: API Key 元数据（未启用认证时为 None）
+
+    Returns:
+        元数据中的 namespace，未绑定时返回 None
+    """
+    if key_metadata is None or not key_metadata.metadata:
+        return None
+    return key_metadata.metadata.get("namespace")
+
+
+def _paginate_tools(tools: list[ToolMetadata], offset: int, limit: int) -> dict[str, object]:
+    """
+    对工具列表分页并转换为响应字典
+
+    Args:
+        tools: 完整的工具列表
+        offset: 起始位置
+        limit: 每页数量
+
+    Returns:
+        包含 total、offset、limit、has_more 和 tools 的字典
+
+    Raises:
+        ValueError: 如果分页参数无效
+    """
+    if offset < 0:
+        raise ValueError("起始位置不能为负数")
+    if limit > MAX_LIMIT:
+        raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
+    if limit < 1:
+        raise ValueError("返回数量必须大于 0")
+
+    page = tools[offset : offset + limit]
+    return {
+        "total": len(tools),
+        "offset": offset,
+        "limit": limit,
+        "has_more": offset + len(page) < len(tools),
+        "tools": [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "mcp_server": tool.mcp_server,
+                "tags": sorted(tool.tags),
+                "temperature": tool.temperature.value,
+            }
+            for tool in page
+        ],
+    }
+
+
+def _build_new_tool(
+    name: str,
+    description: str,
+    category: str | None = None,
+    tags: list[str] | None = None,
+    mcp_server: str | None = None,
+) -> ToolMetadata:
+    """
+    验证注册参数并创建工具元数据
+
+    Args:
+        name: 工具名称
+        description: 工具描述
+        category: 工具类别（可选）
+        tags: 工具标签列表（可选）
+        mcp_server: 所属 MCP 服务器（可选）
+
+    Returns:
+        工具元数据
+
+    Raises:
+        ValueError: 如果参数验证失败
+    """
+    if not name or not name.strip():
+        raise ValueError("工具名称不能为空")
+    if not description or not description.strip():
+        raise ValueError("工具描述不能为空")
+    if len(description) > MAX_QUERY_LENGTH:
+        raise ValueError(f"工具描述长度超过限制 ({MAX_QUERY_LENGTH} 字符)")
+
+    return ToolMetadata(
+        name=name,
+        description=description,
+        category=category,
+        tags=set(tags) if tags else set(),
+        mcp_server=mcp_server,
+    )
+
+
 def get_server_description() -> str:
     """
     获取 MCP 服务器描述
@@ -194,8 +322,8 @@ def get_default_search_method() -> SearchMethod:
         <SearchMethod.BM25: 'bm25'>
 
     Note:
-        embedding 方法需要安装可选依赖 sentence-transformers。
-        如果设置了 embedding 但依赖未安装，将回退到 BM25 并发出警告。
+        embedding 和 hybrid 方法需要安装可选依赖 sentence-transformers。
+        如果设置了 embedding/hybrid 但依赖未安装，将回退到 BM25 并发出警告。
     """
     custom_method = os.getenv("REGISTRYTOOLS_SEARCH_METHOD", "").strip().lower()
 
@@ -203,13 +331,13 @@ def get_default_search_method() -> SearchMethod:
         try:
             method = SearchMethod(custom_method)
 
-            # 检查 embedding 依赖
-            if method == SearchMethod.EMBEDDING:
+            # 检查 embedding 依赖（hybrid 同样需要语义向量）
+            if method in (SearchMethod.EMBEDDING, SearchMethod.HYBRID):
                 try:
                     import sentence_transformers  # noqa: F401
                 except ImportError:
                     logger.warning(
-                        f"Embedding 搜索方法需要安装可选依赖，但未找到 sentence-transformers。"
+                        f"{method.value} 搜索方法需要安装可选依赖，但未找到 sentence-transformers。"
                         f"使用 'pip install registry-tools[embedding]' 安装。"
                         f"回退到默认值: {SearchMethod.BM25.value}"
                     )
@@ -229,6 +357,185 @@ def get_default_search_method() -> SearchMethod:
     return SearchMethod.BM25
 
 
+def _get_non_negative_env(name: str, default: float) -> float:
+    """
+    读取非负数值环境变量
+
+    Args:
+        name: 环境变量名称
+        default: 未设置或无效时的默认值
+
+    Returns:
+        环境变量的数值，未设置或无效（非数字、负数）时返回默认值
+    """
+    value_str = os.getenv(name, "").strip()
+
+    if value_str:
+        try:
+            value = float(value_str)
+            if value >= 0:
+                return value
+        except ValueError:
+            pass
+        logger.warning(f"无效的 {name}: {value_str}，使用默认值: {default}")
+
+    return float(default)
+
+
+def get_maintenance_interval() -> float:
+    """
+    获取后台温度维护间隔
+
+    从环境变量 REGISTRYTOOLS_MAINTENANCE_INTERVAL 读取维护间隔（秒），
+    如果未设置或无效，则使用默认值 TEMPERATURE_MAINTENANCE_INTERVAL。
+
+    Returns:
+        维护间隔（秒），0 表示禁用后台维护（降级检查在 update_usage 中内联执行）
+
+    Examples:
+        >>> # 环境变量未设置
+        >>> get_maintenance_interval()
+        300.0
+
+        >>> # 禁用后台维护
+        >>> get_maintenance_interval()  # REGISTRYTOOLS_MAINTENANCE_INTERVAL="0"
+        0.0
+    """
+    return _get_non_negative_env(
+        "REGISTRYTOOLS_MAINTENANCE_INTERVAL", TEMPERATURE_MAINTENANCE_INTERVAL
+    )
+
+
+def get_usage_flush_config() -> tuple[float, int]:
+    """
+    获取使用统计写后刷新配置
+
+    从环境变量读取：
+        - REGISTRYTOOLS_USAGE_FLUSH_INTERVAL: 刷新间隔（秒），默认 USAGE_FLUSH_INTERVAL
+        - REGISTRYTOOLS_USAGE_FLUSH_BATCH_SIZE: 提前刷新的批量大小，默认 USAGE_FLUSH_BATCH_SIZE
+
+    无效值或 0 使用默认值。
+
+    Returns:
+        (刷新间隔, 批量大小) 元组
+    """
+    interval = _get_non_negative_env("REGISTRYTOOLS_USAGE_FLUSH_INTERVAL", USAGE_FLUSH_INTERVAL)
+    batch_size = int(
+        _get_non_negative_env("REGISTRYTOOLS_USAGE_FLUSH_BATCH_SIZE", USAGE_FLUSH_BATCH_SIZE)
+    )
+    return (interval or USAGE_FLUSH_INTERVAL, batch_size or USAGE_FLUSH_BATCH_SIZE)
+
+
+def get_schema_cache_size() -> int:
+    """
+    获取 Schema 延迟加载的缓存容量
+
+    从环境变量 REGISTRYTOOLS_SCHEMA_CACHE_SIZE 读取缓存的工具数，
+    如果未设置或无效，则使用默认值 SCHEMA_CACHE_SIZE。
+
+    Returns:
+        缓存容量，0 表示禁用延迟加载（启动时加载全部 Schema）
+    """
+    return int(_get_non_negative_env("REGISTRYTOOLS_SCHEMA_CACHE_SIZE", SCHEMA_CACHE_SIZE))
+
+
+def get_cold_load_mode() -> ColdLoadMode:
+    """
+    获取冷工具启动加载模式
+
+    从环境变量 REGISTRYTOOLS_COLD_LOAD_MODE 读取加载模式，
+    如果未设置或无效，则使用默认值 EAGER（启动时加载全部工具）。
+
+    Returns:
+        冷工具加载模式枚举值
+    """
+    mode_str = os.getenv("REGISTRYTOOLS_COLD_LOAD_MODE", "").strip().lower()
+
+    if mode_str:
+        try:
+            return ColdLoadMode(mode_str)
+        except ValueError:
+            logger.warning(
+                f"无效的冷工具加载模式: {mode_str}，"
+                f"支持的模式: {[m.value for m in ColdLoadMode]}，"
+                f"使用默认值: {ColdLoadMode.EAGER.value}"
+            )
+
+    return ColdLoadMode.EAGER
+
+
+def get_json_journal_enabled() -> bool:
+    """
+    获取 JSON 存储是否启用追加日志模式
+
+    从环境变量 REGISTRYTOOLS_JSON_JOURNAL 读取 (true/false)，默认 false。
+
+    Returns:
+        True 表示写入追加到日志并定期压缩，False 表示每次写入原子重写整个文件
+    """
+    return os.getenv("REGISTRYTOOLS_JSON_JOURNAL", "false").strip().lower() in ("true", "1", "yes")
+
+
+def get_verify_on_load() -> bool:
+    """
+    获取存储读取时是否完整验证工具数据
+
+    从环境变量 REGISTRYTOOLS_VERIFY_ON_LOAD 读取 (true/false)，默认 false。
+
+    Returns:
+        True 表示每个工具经过 pydantic 完整验证，False 表示信任存储中的数据
+    """
+    return os.getenv("REGISTRYTOOLS_VERIFY_ON_LOAD", "false").strip().lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+
+
+def get_write_buffer_config() -> tuple[WriteMode, float, int]:
+    """
+    获取存储写缓冲配置
+
+    从环境变量读取：
+        - REGISTRYTOOLS_WRITE_MODE: 持久化模式 (sync/batched/async)，默认 sync
+        - REGISTRYTOOLS_WRITE_FLUSH_DELAY: 防抖延迟（秒），默认 WRITE_FLUSH_DELAY
+        - REGISTRYTOOLS_WRITE_BATCH_SIZE: 立即刷新的批量大小，默认 WRITE_BATCH_SIZE
+
+    无效值使用默认值，批量大小为 0 时使用默认值。
+
+    Returns:
+        (持久化模式, 防抖延迟, 批量大小) 元组
+    """
+    mode = WriteMode.SYNC
+    mode_str = os.getenv("REGISTRYTOOLS_WRITE_MODE", "").strip().lower()
+    if mode_str:
+        try:
+            mode = WriteMode(mode_str)
+        except ValueError:
+            logger.warning(
+                f"无效的写入模式: {mode_str}，"
+                f"支持的模式: {[m.value for m in WriteMode]}，"
+                f"使用默认值: {WriteMode.SYNC.value}"
+            )
+
+    delay = _get_non_negative_env("REGISTRYTOOLS_WRITE_FLUSH_DELAY", WRITE_FLUSH_DELAY)
+    batch_size = int(_get_non_negative_env("REGISTRYTOOLS_WRITE_BATCH_SIZE", WRITE_BATCH_SIZE))
+    return (mode, delay, batch_size or WRITE_BATCH_SIZE)
+
+
+def get_max_namespaces() -> int:
+    """
+    获取同时加载的命名空间数量上限
+
+    从环境变量 REGISTRYTOOLS_MAX_NAMESPACES 读取非默认命名空间的数量上限，
+    如果未设置或无效，则使用默认值 MAX_LOADED_NAMESPACES。
+
+    Returns:
+        命名空间数量上限，0 表示只允许默认命名空间
+    """
+    return int(_get_non_negative_env("REGISTRYTOOLS_MAX_NAMESPACES", MAX_LOADED_NAMESPACES))
+
+
 def get_default_storage_backend() -> StorageBackend:
     """
     获取默认存储后端
@@ -310,9 +617,15 @@ def create_storage(
         True
     """
     if backend == StorageBackend.SQLITE:
-        return SQLiteStorage(data_path / "tools.db")
+        return SQLiteStorage(data_path / "tools.db", verify=get_verify_on_load())
+    elif backend == StorageBackend.BINARY:
+        return BinaryStorage(data_path / "tools.bin", verify=get_verify_on_load())
     elif backend == StorageBackend.JSON:
-        return JSONStorage(data_path / "tools.json")
+        return JSONStorage(
+            data_path / "tools.json",
+            journal=get_json_journal_enabled(),
+            verify=get_verify_on_load(),
+        )
     else:
         raise ValueError(f"不支持的存储后端: {backend}")
 
@@ -323,6 +636,9 @@ def _register_mcp_tools(
     storage: ToolStorage,
     save_func: Callable[[ToolMetadata], None],
     auth_middleware: "APIKeyAuthMiddleware | None" = None,
+    maintenance: TemperatureMaintenanceScheduler | None = None,
+    usage_recorder: UsageRecorder | None = None,
+    namespaces: NamespaceManager | None = None,
 ) -> None:
     """
     注册 MCP 工具和资源到 FastMCP 服务器
@@ -336,7 +652,38 @@ def _register_mcp_tools(
         storage: 存储层实例
         save_func: 保存工具到存储的函数
         auth_middleware: API Key 认证中间件（可选）
+        maintenance: 后台温度维护调度器（可选，用于统计信息）
+        usage_recorder: 写后使用统计记录器（可选，未提供时不记录工具使用）
+        namespaces: 命名空间管理器（可选，未提供时只支持默认命名空间）
     """
+    if namespaces is None:
+        namespaces = NamespaceManager(
+            NamespaceContext(DEFAULT_NAMESPACE, registry, storage, usage_recorder)
+        )
+
+    def resolve_namespace(
+        namespace: str | None, required_permission: APIKeyPermission
+    ) -> AbstractContextManager[NamespaceContext]:
+        """
+        认证并解析请求的命名空间（API Key 绑定的命名空间优先）
+
+        返回的上下文管理器在请求期间持有命名空间租约，
+        请求处理中被淘汰的命名空间在请求结束后才关闭。
+        """
+        key_metadata = _check_auth(auth_middleware, required_permission)
+        return namespaces.lease(namespaces.resolve_name(namespace, _key_namespace(key_metadata)))
+
+    def namespace_method(ns: NamespaceContext, method: SearchMethod) -> SearchMethod:
+        """非默认命名空间只注册 Regex/BM25，其他搜索方法回退到 bm25（fusion 除外）"""
+        if (
+            ns is namespaces.default
+            or method == SearchMethod.FUSION
+            or ns.registry.get_searcher(method) is not None
+        ):
+            return method
+        logger.debug(f"命名空间 {ns.name} 未注册 {method.value} 搜索器，回退到 bm25")
+        return SearchMethod.BM25
+
     # ========================================================
     # MCP 工具: search_tools (Phase 15: API Key 认证, Phase 33: 认证集成)
     # ========================================================
@@ -346,74 +693,122 @@ def _register_mcp_tools(
         query: str,
         search_method: str | None = None,
         limit: int = 5,
+        category: str | None = None,
+        tags: list[str] | None = None,
+        mcp_server: str | None = None,
+        temperature: str | None = None,
+        namespace: str | None = None,
     ) -> str:
         """
         搜索可用的 MCP 工具
 
         根据查询字符串在已注册的工具中搜索匹配项。
+        过滤条件在打分前生效，只对满足条件的工具打分。
 
         Args:
             query: 搜索查询字符串
-            search_method: 搜索方法 (regex/bm25/embedding)，默认使用环境变量配置
+            search_method: 搜索方法 (regex/bm25/embedding/hybrid/fusion/fts5)，默认使用环境变量配置
             limit: 返回结果数量，默认 5
+            category: 只搜索该类别的工具（可选）
+            tags: 只搜索包含全部这些标签的工具（可选）
+            mcp_server: 只搜索该 MCP 服务器的工具（可选）
+            temperature: 只搜索该温度级别的工具 (hot/warm/cold)（可选）
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
 
         Returns:
-            匹配的工具列表，JSON 格式字符串
+            匹配的工具列表，JSON 格式字符串。
+            fusion 方法返回对象，包含 results（融合结果）和 methods（各方法状态与耗时）
 
         Raises:
             ValueError: 如果搜索方法无效或参数验证失败
             PermissionError: 如果认证失败（仅 HTTP 模式）
         """
         # Phase 33: 认证检查
-        _check_auth(auth_middleware, APIKeyPermission.READ)
-
-        # Phase 33: 输入参数验证
-        if len(query) > MAX_QUERY_LENGTH:
-            raise ValueError(f"查询长度超过限制 ({MAX_QUERY_LENGTH} 字符)")
-        if limit > MAX_LIMIT:
-            raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
-        if limit < 1:
-            raise ValueError("返回数量必须大于 0")
-
-        # Phase 35: 搜索方法验证（支持全局默认值）
-        if search_method is None:
-            # 使用全局默认搜索方法
-            method = get_default_search_method()
-            logger.debug(f"使用全局默认搜索方法: {method.value}")
-        else:
-            # 验证用户指定的搜索方法
-            try:
-                method = SearchMethod(search_method)
-            except ValueError as err:
-                supported_methods = [m.value for m in SearchMethod]
-                raise ValueError(
-                    f"无效的搜索方法: {search_method}。"
-                    f"支持的方法: {', '.join(supported_methods)}"
-                ) from err
-
-        # 执行搜索
-        results = registry.search(query, method=method, limit=limit)
-
-        # 转换为字典列表
-        output = []
-        for result in results:
-            output.append(
-                {
-                    "tool_name": result.tool_name,
-                    "description": result.description,
-                    "score": result.score,
-                    "match_reason": result.match_reason,
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            # Phase 33: 输入参数验证
+            if len(query) > MAX_QUERY_LENGTH:
+                raise ValueError(f"查询长度超过限制 ({MAX_QUERY_LENGTH} 字符)")
+            if limit > MAX_LIMIT:
+                raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
+            if limit < 1:
+                raise ValueError("返回数量必须大于 0")
+
+            # Phase 35: 搜索方法验证（支持全局默认值）
+            if search_method is None:
+                # 使用全局默认搜索方法
+                method = get_default_search_method()
+                logger.debug(f"使用全局默认搜索方法: {method.value}")
+            else:
+                # 验证用户指定的搜索方法
+                try:
+                    method = SearchMethod(search_method)
+                except ValueError as err:
+                    supported_methods = [m.value for m in SearchMethod]
+                    raise ValueError(
+                        f"无效的搜索方法: {search_method}。"
+                        f"支持的方法: {', '.join(supported_methods)}"
+                    ) from err
+
+            method = namespace_method(ns, method)
+
+            # 过滤条件验证
+            temperature_filter = None
+            if temperature is not None:
+                try:
+                    temperature_filter = ToolTemperature(temperature.lower())
+                except ValueError as err:
+                    supported = [t.value for t in ToolTemperature]
+                    raise ValueError(
+                        f"无效的温度级别: {temperature}。支持的级别: {', '.join(supported)}"
+                    ) from err
+            # 融合搜索：并发执行所有搜索方法，附带各方法的执行报告
+            if method == SearchMethod.FUSION:
+                fused = ns.registry.search_fusion(
+                    query,
+                    limit=limit,
+                    category=category,
+                    tags=tags,
+                    mcp_server=mcp_server,
+                    temperature=temperature_filter,
+                )
+                fusion_output = {
+                    "results": [result.model_dump(mode="json") for result in fused.results],
+                    "methods": [report.model_dump(mode="json") for report in fused.methods],
+                    "contributing_methods": [m.value for m in fused.contributing_methods],
                 }
+                return json.dumps(fusion_output, ensure_ascii=False, indent=2)
+
+            # 执行搜索
+            results = ns.registry.search(
+                query,
+                method=method,
+                limit=limit,
+                category=category,
+                tags=tags,
+                mcp_server=mcp_server,
+                temperature=temperature_filter,
             )
 
-        return json.dumps(output, ensure_ascii=False, indent=2)
+            # 转换为字典列表
+            output = []
+            for result in results:
+                output.append(
+                    {
+                        "tool_name": result.tool_name,
+                        "description": result.description,
+                        "score": result.score,
+                        "match_reason": result.match_reason,
+                    }
+                )
+
+            return json.dumps(output, ensure_ascii=False, indent=2)
 
     # ========================================================
     # MCP 工具: get_tool_definition (Phase 15: API Key 认证, Phase 33: 认证集成)
     # ========================================================
 
     @mcp.tool()
-    def get_tool_definition(tool_name: str) -> str:
+    def get_tool_definition(tool_name: str, namespace: str | None = None) -> str:
         """
         获取指定工具的完整定义
 
@@ -421,6 +816,7 @@ def _register_mcp_tools(
 
         Args:
             tool_name: 工具名称
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
 
         Returns:
             工具的完整定义，JSON 格式字符串
@@ -430,27 +826,76 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败（仅 HTTP 模式）
         """
         # Phase 33: 认证检查
-        _check_auth(auth_middleware, APIKeyPermission.READ)
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            # Phase 33: 输入参数验证
+            if not tool_name or not tool_name.strip():
+                raise ValueError("工具名称不能为空")
 
-        # Phase 33: 输入参数验证
-        if not tool_name or not tool_name.strip():
-            raise ValueError("工具名称不能为空")
+            tool = ns.registry.get_tool(tool_name)
+            if tool is None:
+                raise ValueError(f"工具不存在: {tool_name}")
 
-        tool = registry.get_tool(tool_name)
-        if tool is None:
-            raise ValueError(f"工具不存在: {tool_name}")
+            # 转换为字典
+            definition = tool.model_dump(mode="json", exclude_none=True)
 
-        # 转换为字典
-        definition = tool.model_dump(mode="json", exclude_none=True)
+            # 记录工具使用（仅更新内存，由后台线程批量持久化）
+            if ns.usage_recorder is not None:
+                ns.usage_recorder.record(tool_name)
 
-        return json.dumps(definition, ensure_ascii=False, indent=2)
+            return json.dumps(definition, ensure_ascii=False, indent=2)
+
+    # ========================================================
+    # MCP 工具: record_tool_usage
+    # ========================================================
+
+    @mcp.tool()
+    def record_tool_usage(tool_name: str, namespace: str | None = None) -> str:
+        """
+        记录工具使用
+
+        显式上报一次工具调用，更新使用频率、最后使用时间和工具温度。
+        使用统计先写入内存，由后台线程按间隔或批量大小批量持久化。
+
+        Args:
+            tool_name: 工具名称
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
+
+        Returns:
+            记录结果，JSON 格式字符串
+
+        Raises:
+            ValueError: 如果工具不存在
+            PermissionError: 如果认证失败（仅 HTTP 模式）
+        """
+        # Phase 33: 认证检查
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            # Phase 33: 输入参数验证
+            if not tool_name or not tool_name.strip():
+                raise ValueError("工具名称不能为空")
+
+            if ns.usage_recorder is not None:
+                recorded = ns.usage_recorder.record(tool_name)
+            else:
+                recorded = ns.registry.update_usage(tool_name)
+            if not recorded:
+                raise ValueError(f"工具不存在: {tool_name}")
+
+            tool = ns.registry.get_tool(tool_name)
+            result = {
+                "success": True,
+                "tool_name": tool_name,
+                "use_frequency": tool.use_frequency if tool else 0,
+                "temperature": tool.temperature.value if tool else None,
+            }
+
+            return json.dumps(result, ensure_ascii=False, indent=2)
 
     # ========================================================
     # MCP 工具: list_tools_by_category (Phase 15: API Key 认证, Phase 33: 认证集成)
     # ========================================================
 
     @mcp.tool()
-    def list_tools_by_category(category: str, limit: int = 20) -> str:
+    def list_tools_by_category(category: str, limit: int = 20, namespace: str | None = None) -> str:
         """
         按类别列出工具
 
@@ -459,6 +904,7 @@ def _register_mcp_tools(
         Args:
             category: 工具类别，使用 "all" 列出所有类别
             limit: 返回结果数量，默认 20
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
 
         Returns:
             该类别下的工具列表，JSON 格式字符串
@@ -468,37 +914,102 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败（仅 HTTP 模式）
         """
         # Phase 33: 认证检查
-        _check_auth(auth_middleware, APIKeyPermission.READ)
-
-        # Phase 33: 输入参数验证
-        if not category or not category.strip():
-            raise ValueError("类别名称不能为空")
-        if limit > MAX_LIMIT:
-            raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
-        if limit < 1:
-            raise ValueError("返回数量必须大于 0")
-
-        if category.lower() == "all":
-            # 列出所有类别
-            categories = registry.list_categories()
-            result: dict[str, object] = {"categories": categories}
-        else:
-            # 按类别列出工具
-            tools = registry.list_tools(category=category)[:limit]
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            # Phase 33: 输入参数验证
+            if not category or not category.strip():
+                raise ValueError("类别名称不能为空")
+            if limit > MAX_LIMIT:
+                raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
+            if limit < 1:
+                raise ValueError("返回数量必须大于 0")
+
+            if category.lower() == "all":
+                # 列出所有类别
+                categories = ns.registry.list_categories()
+                result: dict[str, object] = {"categories": categories}
+            else:
+                # 按类别列出工具
+                tools = ns.registry.list_tools(category=category)[:limit]
+                result = {
+                    "category": category,
+                    "count": len(tools),
+                    "tools": [
+                        {
+                            "name": tool.name,
+                            "description": tool.description,
+                            "tags": list(tool.tags),
+                        }
+                        for tool in tools
+                    ],
+                }
+
+            return json.dumps(result, ensure_ascii=False, indent=2)
+
+    # ========================================================
+    # MCP 工具: list_tools_by_tag / list_tools_by_server（二级索引）
+    # ========================================================
+
+    @mcp.tool()
+    def list_tools_by_tag(
+        tag: str, offset: int = 0, limit: int = 20, namespace: str | None = None
+    ) -> str:
+        """
+        按标签列出工具
+
+        基于标签倒排索引查询，结果按注册顺序分页返回。
+
+        Args:
+            tag: 标签
+            offset: 起始位置，默认 0
+            limit: 每页数量，默认 20
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
+
+        Returns:
+            带分页信息的工具列表，JSON 格式字符串
+
+        Raises:
+            ValueError: 如果参数验证失败
+            PermissionError: 如果认证失败（仅 HTTP 模式）
+        """
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            if not tag or not tag.strip():
+                raise ValueError("标签不能为空")
+
             result = {
-                "category": category,
-                "count": len(tools),
-                "tools": [
-                    {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "tags": list(tool.tags),
-                    }
-                    for tool in tools
-                ],
+                "tag": tag,
+                **_paginate_tools(ns.registry.list_tools_by_tag(tag), offset, limit),
             }
+            return json.dumps(result, ensure_ascii=False, indent=2)
+
+    @mcp.tool()
+    def list_tools_by_server(
+        mcp_server: str, offset: int = 0, limit: int = 20, namespace: str | None = None
+    ) -> str:
+        """
+        按 MCP 服务器列出工具
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        基于服务器倒排索引查询，结果按注册顺序分页返回。
+
+        Args:
+            mcp_server: MCP 服务器名称
+            offset: 起始位置，默认 0
+            limit: 每页数量，默认 20
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
+
+        Returns:
+            带分页信息的工具列表，JSON 格式字符串
+
+        Raises:
+            ValueError: 如果参数验证失败
+            PermissionError: 如果认证失败（仅 HTTP 模式）
+        """
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            if not mcp_server or not mcp_server.strip():
+                raise ValueError("MCP 服务器名称不能为空")
+
+            tools = ns.registry.list_tools_by_server(mcp_server)
+            result = {"mcp_server": mcp_server, **_paginate_tools(tools, offset, limit)}
+            return json.dumps(result, ensure_ascii=False, indent=2)
 
     # ========================================================
     # MCP 工具: register_tool (Phase 15: API Key 认证, Phase 33: 认证集成)
@@ -510,6 +1021,8 @@ def _register_mcp_tools(
         description: str,
         category: str | None = None,
         tags: list[str] | None = None,
+        mcp_server: str | None = None,
+        namespace: str | None = None,
     ) -> str:
         """
         动态注册新工具
@@ -521,6 +1034,8 @@ def _register_mcp_tools(
             description: 工具描述
             category: 工具类别（可选）
             tags: 工具标签列表（可选）
+            mcp_server: 所属 MCP 服务器（可选）
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
 
         Returns:
             注册结果，JSON 格式字符串
@@ -530,53 +1045,151 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败或权限不足（仅 HTTP 模式）
         """
         # Phase 33: 认证检查（需要 WRITE 权限）
-        _check_auth(auth_middleware, APIKeyPermission.WRITE)
-
-        # Phase 33: 输入参数验证
-        if not name or not name.strip():
-            raise ValueError("工具名称不能为空")
-        if not description or not description.strip():
-            raise ValueError("工具描述不能为空")
-        if len(description) > MAX_QUERY_LENGTH:
-            raise ValueError(f"工具描述长度超过限制 ({MAX_QUERY_LENGTH} 字符)")
-
-        # 检查工具是否已存在
-        if registry.get_tool(name) is not None:
-            raise ValueError(f"工具已存在: {name}")
-
-        # 创建工具元数据
-        tool = ToolMetadata(
-            name=name,
-            description=description,
-            category=category,
-            tags=set(tags) if tags else set(),
-        )
+        with resolve_namespace(namespace, APIKeyPermission.WRITE) as ns:
+            # Phase 33: 输入参数验证，创建工具元数据
+            tool = _build_new_tool(name, description, category, tags, mcp_server)
 
-        # 注册到注册表
-        registry.register(tool)
+            # 检查工具是否已存在
+            if ns.registry.get_tool(name) is not None:
+                raise ValueError(f"工具已存在: {name}")
 
-        # 保存到存储
-        save_func(tool)
+            # 注册到注册表
+            ns.registry.register(tool)
 
-        result = {
-            "success": True,
-            "message": f"工具已注册: {name}",
-            "tool": {
-                "name": tool.name,
-                "description": tool.description,
-                "category": tool.category,
-                "tags": list(tool.tags),
-            },
-        }
+            # 保存到存储
+            if ns is namespaces.default:
+                save_func(tool)
+            else:
+                ns.storage.save(tool)
+
+            result = {
+                "success": True,
+                "message": f"工具已注册: {name}",
+                "tool": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "category": tool.category,
+                    "tags": list(tool.tags),
+                },
+            }
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+            return json.dumps(result, ensure_ascii=False, indent=2)
+
+    # ========================================================
+    # MCP 工具: register_tools（批量注册）
+    # ========================================================
+
+    @mcp.tool()
+    def register_tools(tools: list[dict[str, Any]], namespace: str | None = None) -> str:
+        """
+        批量注册新工具
+
+        先验证全部条目，任一条目无效时不注册任何工具；全部有效时在一次写操作中
+        注册到注册表，并通过一次 save_many 持久化。适合接入包含大量工具的 MCP 服务器。
+
+        Args:
+            tools: 工具列表，每项包含 name、description，
+                以及可选的 category、tags、mcp_server（同 register_tool）
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
+
+        Returns:
+            注册结果，JSON 格式字符串
+
+        Raises:
+            ValueError: 如果任一条目无效、名称重复或工具已存在
+            PermissionError: 如果认证失败或权限不足（仅 HTTP 模式）
+        """
+        with resolve_namespace(namespace, APIKeyPermission.WRITE) as ns:
+            if not tools:
+                raise ValueError("工具列表不能为空")
+            if len(tools) > MAX_REGISTER_BATCH:
+                raise ValueError(f"批量注册数量超过限制 ({MAX_REGISTER_BATCH})")
+
+            # 验证全部条目，收集所有错误后统一报告
+            allowed_fields = {"name", "description", "category", "tags", "mcp_server"}
+            new_tools: list[ToolMetadata] = []
+            seen: set[str] = set()
+            errors: list[str] = []
+            for index, entry in enumerate(tools):
+                unknown = set(entry) - allowed_fields
+                if unknown:
+                    errors.append(f"[{index}] 不支持的字段: {sorted(unknown)}")
+                    continue
+                try:
+                    tool = _build_new_tool(
+                        entry.get("name", ""),
+                        entry.get("description", ""),
+                        entry.get("category"),
+                        entry.get("tags"),
+                        entry.get("mcp_server"),
+                    )
+                except ValueError as e:
+                    errors.append(f"[{index}] {e}")
+                    continue
+                if tool.name in seen:
+                    errors.append(f"[{index}] 工具名称重复: {tool.name}")
+                    continue
+                if ns.registry.get_tool(tool.name) is not None:
+                    errors.append(f"[{index}] 工具已存在: {tool.name}")
+                    continue
+                seen.add(tool.name)
+                new_tools.append(tool)
+
+            if errors:
+                raise ValueError(f"批量注册验证失败: {'; '.join(errors)}")
+
+            # 一次写操作注册全部工具，一次事务持久化
+            ns.registry.register_many(new_tools)
+            ns.storage.save_many(new_tools)
+
+            result = {
+                "success": True,
+                "message": f"已注册 {len(new_tools)} 个工具",
+                "registered": [tool.name for tool in new_tools],
+            }
+
+            return json.dumps(result, ensure_ascii=False, indent=2)
+
+    # ========================================================
+    # MCP 工具: get_changes（变更订阅）
+    # ========================================================
+
+    @mcp.tool()
+    def get_changes(since_generation: int = 0, namespace: str | None = None) -> str:
+        """
+        增量获取注册表变更
+
+        返回 since_generation 之后的工具注册、注销和温度变化。保存返回的 generation，
+        下次以它作为 since_generation 调用即可增量同步，无需重新列出全部工具。
+
+        Args:
+            since_generation: 已同步到的注册表代数，默认 0
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
+
+        Returns:
+            变更列表，JSON 格式字符串。truncated 为 true 表示部分变更已被丢弃，需要全量重新同步
+
+        Raises:
+            ValueError: 如果 since_generation 为负数
+            PermissionError: 如果认证失败（仅 HTTP 模式）
+        """
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            change_set = ns.registry.get_changes(since_generation)
+            result = {
+                "generation": change_set.generation,
+                "since_generation": since_generation,
+                "truncated": change_set.truncated,
+                "changes": [change.to_dict() for change in change_set.changes],
+            }
+
+            return json.dumps(result, ensure_ascii=False, indent=2)
 
     # ========================================================
     # MCP 工具: unregister_tool (Phase 33: 新增)
     # ========================================================
 
     @mcp.tool()
-    def unregister_tool(tool_name: str) -> str:
+    def unregister_tool(tool_name: str, namespace: str | None = None) -> str:
         """
         注销工具
 
@@ -584,6 +1197,7 @@ def _register_mcp_tools(
 
         Args:
             tool_name: 工具名称
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
 
         Returns:
             注销结果，JSON 格式字符串
@@ -593,30 +1207,29 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败或权限不足（仅 HTTP 模式）
         """
         # Phase 33: 认证检查（需要 WRITE 权限）
-        _check_auth(auth_middleware, APIKeyPermission.WRITE)
+        with resolve_namespace(namespace, APIKeyPermission.WRITE) as ns:
+            # Phase 33: 输入参数验证
+            if not tool_name or not tool_name.strip():
+                raise ValueError("工具名称不能为空")
 
-        # Phase 33: 输入参数验证
-        if not tool_name or not tool_name.strip():
-            raise ValueError("工具名称不能为空")
+            # 检查工具是否存在
+            tool = ns.registry.get_tool(tool_name)
+            if tool is None:
+                raise ValueError(f"工具不存在: {tool_name}")
 
-        # 检查工具是否存在
-        tool = registry.get_tool(tool_name)
-        if tool is None:
-            raise ValueError(f"工具不存在: {tool_name}")
+            # 从注册表中注销
+            ns.registry.unregister(tool_name)
 
-        # 从注册表中注销
-        registry.unregister(tool_name)
+            # 从存储中删除
+            ns.storage.delete(tool_name)
 
-        # 从存储中删除
-        storage.delete(tool_name)
-
-        result = {
-            "success": True,
-            "tool_name": tool_name,
-            "message": f"工具 '{tool_name}' 已成功注销",
-        }
+            result = {
+                "success": True,
+                "tool_name": tool_name,
+                "message": f"工具 '{tool_name}' 已成功注销",
+            }
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+            return json.dumps(result, ensure_ascii=False, indent=2)
 
     # ========================================================
     # MCP 工具: search_hot_tools (Phase 33: 新增)
@@ -627,6 +1240,7 @@ def _register_mcp_tools(
         query: str,
         search_method: str | None = None,
         limit: int = 5,
+        namespace: str | None = None,
     ) -> str:
         """
         快速搜索热工具（性能优化）
@@ -636,8 +1250,9 @@ def _register_mcp_tools(
 
         Args:
             query: 搜索查询字符串
-            search_method: 搜索方法 (regex/bm25)，默认使用环境变量配置
+            search_method: 搜索方法 (regex/bm25/hybrid)，默认使用环境变量配置
             limit: 返回结果数量，默认 5
+            namespace: 命名空间（可选，默认使用 API Key 绑定的命名空间或 default）
 
         Returns:
             匹配的工具列表，JSON 格式字符串
@@ -647,57 +1262,59 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败（仅 HTTP 模式）
 
         Note:
-            search_hot_tools 不支持 embedding 搜索方法。
-            如果环境变量设置为 embedding，将自动回退到 bm25。
+            search_hot_tools 不支持 embedding、fusion 和 fts5（搜索存储中的全部工具）搜索方法。
+            如果环境变量设置为 embedding、fusion 或 fts5，将自动回退到 bm25。
+            hybrid 仅对 BM25 候选复用已缓存的向量打分，可用于热工具搜索。
         """
         # Phase 33: 认证检查
-        _check_auth(auth_middleware, APIKeyPermission.READ)
-
-        # Phase 33: 输入参数验证
-        if len(query) > MAX_QUERY_LENGTH:
-            raise ValueError(f"查询长度超过限制 ({MAX_QUERY_LENGTH} 字符)")
-        if limit > MAX_LIMIT:
-            raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
-        if limit < 1:
-            raise ValueError("返回数量必须大于 0")
-
-        # Phase 35: 搜索方法验证（支持全局默认值）
-        if search_method is None:
-            # 使用全局默认搜索方法
-            method = get_default_search_method()
-            logger.debug(f"使用全局默认搜索方法: {method.value}")
-        else:
-            # 验证用户指定的搜索方法
-            try:
-                method = SearchMethod(search_method)
-            except ValueError as err:
-                supported_methods = [m.value for m in SearchMethod]
-                raise ValueError(
-                    f"无效的搜索方法: {search_method}。"
-                    f"支持的方法: {', '.join(supported_methods)}"
-                ) from err
-
-        # search_hot_tools 不支持 embedding，自动回退到 bm25
-        if method == SearchMethod.EMBEDDING:
-            logger.warning("search_hot_tools 不支持 embedding 搜索方法，自动回退到 bm25")
-            method = SearchMethod.BM25
-
-        # 执行搜索（仅搜索热工具和温工具）
-        results = registry.search_hot_warm(query, method, limit)
-
-        # 转换为字典列表
-        output = []
-        for result in results:
-            output.append(
-                {
-                    "tool_name": result.tool_name,
-                    "description": result.description,
-                    "score": result.score,
-                    "match_reason": result.match_reason,
-                }
-            )
+        with resolve_namespace(namespace, APIKeyPermission.READ) as ns:
+            # Phase 33: 输入参数验证
+            if len(query) > MAX_QUERY_LENGTH:
+                raise ValueError(f"查询长度超过限制 ({MAX_QUERY_LENGTH} 字符)")
+            if limit > MAX_LIMIT:
+                raise ValueError(f"返回数量超过限制 ({MAX_LIMIT})")
+            if limit < 1:
+                raise ValueError("返回数量必须大于 0")
+
+            # Phase 35: 搜索方法验证（支持全局默认值）
+            if search_method is None:
+                # 使用全局默认搜索方法
+                method = get_default_search_method()
+                logger.debug(f"使用全局默认搜索方法: {method.value}")
+            else:
+                # 验证用户指定的搜索方法
+                try:
+                    method = SearchMethod(search_method)
+                except ValueError as err:
+                    supported_methods = [m.value for m in SearchMethod]
+                    raise ValueError(
+                        f"无效的搜索方法: {search_method}。"
+                        f"支持的方法: {', '.join(supported_methods)}"
+                    ) from err
+
+            # search_hot_tools 不支持 embedding/fusion/fts5，自动回退到 bm25
+            if method in (SearchMethod.EMBEDDING, SearchMethod.FUSION, SearchMethod.FTS5):
+                logger.warning(f"search_hot_tools 不支持 {method.value} 搜索方法，自动回退到 bm25")
+                method = SearchMethod.BM25
+
+            method = namespace_method(ns, method)
+
+            # 执行搜索（仅搜索热工具和温工具）
+            results = ns.registry.search_hot_warm(query, method, limit)
+
+            # 转换为字典列表
+            output = []
+            for result in results:
+                output.append(
+                    {
+                        "tool_name": result.tool_name,
+                        "description": result.description,
+                        "score": result.score,
+                        "match_reason": result.match_reason,
+                    }
+                )
 
-        return json.dumps(output, ensure_ascii=False, indent=2)
+            return json.dumps(output, ensure_ascii=False, indent=2)
 
     # ========================================================
     # 资源: 工具统计信息 (Phase 33: 认证集成)
@@ -715,24 +1332,68 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败（仅 HTTP 模式）
         """
         # Phase 33: 认证检查
-        _check_auth(auth_middleware, APIKeyPermission.READ)
+        with resolve_namespace(None, APIKeyPermission.READ) as ns:
+            stats = {
+                "namespace": ns.name,
+                "loaded_namespaces": namespaces.loaded_namespaces,
+                "total_tools": ns.registry.tool_count,
+                "resident_temperatures": [
+                    t.value for t in ToolTemperature if t in ns.registry.resident_temperatures
+                ],
+                "total_categories": ns.registry.category_count,
+                "categories": ns.registry.list_categories(),
+                "most_used": [
+                    {"name": t.name, "description": t.description, "use_count": t.use_frequency}
+                    for t in ns.registry.get_most_used(5)
+                ],
+            }
 
-        stats = {
-            "total_tools": registry.tool_count,
-            "total_categories": registry.category_count,
-            "categories": registry.list_categories(),
-            "most_used": [
-                {"name": t.name, "description": t.description, "use_count": t.use_frequency}
-                for t in registry.get_most_used(5)
-            ],
-        }
+            # 后台温度维护状态（只调度默认命名空间，其他命名空间内联维护）
+            if maintenance is not None and ns is namespaces.default:
+                last_report = maintenance.last_report
+                stats["maintenance"] = {
+                    "interval_seconds": maintenance.interval,
+                    "running": maintenance.is_running,
+                    "last_run": last_report.model_dump(mode="json") if last_report else None,
+                }
 
-        return json.dumps(stats, ensure_ascii=False, indent=2)
+            return json.dumps(stats, ensure_ascii=False, indent=2)
 
     # ========================================================
     # 资源: 类别列表 (Phase 33: 认证集成)
     # ========================================================
 
+    @mcp.resource("registry://top-tools")
+    def get_top_tools() -> str:
+        """
+        获取最常用的工具排行
+
+        基于注册表增量维护的使用频率分桶，复杂度为 O(TOP_TOOLS_LIMIT)。
+
+        Returns:
+            最常用工具列表，JSON 格式字符串
+
+        Raises:
+            PermissionError: 如果认证失败（仅 HTTP 模式）
+        """
+        with resolve_namespace(None, APIKeyPermission.READ) as ns:
+            top_tools = ns.registry.get_most_used(TOP_TOOLS_LIMIT)
+            result = {
+                "count": len(top_tools),
+                "tools": [
+                    {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "mcp_server": tool.mcp_server,
+                        "use_count": tool.use_frequency,
+                        "temperature": tool.temperature.value,
+                    }
+                    for tool in top_tools
+                ],
+            }
+
+            return json.dumps(result, ensure_ascii=False, indent=2)
+
     @mcp.resource("registry://categories")
     def get_categories() -> str:
         """
@@ -745,15 +1406,14 @@ def _register_mcp_tools(
             PermissionError: 如果认证失败（仅 HTTP 模式）
         """
         # Phase 33: 认证检查
-        _check_auth(auth_middleware, APIKeyPermission.READ)
-
-        categories = registry.list_categories()
-        result = {
-            "count": len(categories),
-            "categories": categories,
-        }
+        with resolve_namespace(None, APIKeyPermission.READ) as ns:
+            categories = ns.registry.list_categories()
+            result = {
+                "count": len(categories),
+                "categories": categories,
+            }
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+            return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 # ============================================================
@@ -779,7 +1439,8 @@ def _handle_default_tools_for_json(
     from registrytools.defaults import load_default_tools_if_empty
 
     default_tools = load_default_tools_if_empty(
-        tool_count=registry.tool_count,
+        # 分层加载时冷工具可能尚未驻留，以存储中的数量为准
+        tool_count=registry.tool_count or storage.count(),
         storage_path=data_path / "tools.json",
         auto_save=True,
     )
@@ -793,7 +1454,7 @@ def _handle_default_tools_for_sqlite(
     data_path: Path,
 ) -> None:
     """
-    SQLite 存储的默认工具处理逻辑
+    SQLite / 二进制快照存储的默认工具处理逻辑
 
     使用 auto_save=False，手动调用 storage.save_many()。
 
@@ -805,7 +1466,8 @@ def _handle_default_tools_for_sqlite(
     from registrytools.defaults import load_default_tools_if_empty
 
     default_tools = load_default_tools_if_empty(
-        tool_count=registry.tool_count,
+        # 分层加载时冷工具可能尚未驻留，以存储中的数量为准
+        tool_count=registry.tool_count or storage.count(),
         storage_path=None,  # 不保存到 JSON
         auto_save=False,
     )
@@ -815,6 +1477,130 @@ def _handle_default_tools_for_sqlite(
         storage.save_many(default_tools)
 
 
+def _create_server_lifespan(
+    registry: ToolRegistry,
+    maintenance: TemperatureMaintenanceScheduler | None,
+    usage_recorder: UsageRecorder | None = None,
+    tier_loader: BackgroundTierLoader | None = None,
+    namespaces: NamespaceManager | None = None,
+    storage: ToolStorage | None = None,
+) -> Callable[[FastMCP], AbstractAsyncContextManager[dict]]:
+    """
+    创建服务器生命周期管理器
+
+    服务器启动时启动后台温度维护、使用统计刷新和冷工具加载，关闭时停止后台任务、
+    刷新剩余的使用统计和缓冲的写入并释放注册表资源。
+
+    Args:
+        registry: 工具注册表实例
+        maintenance: 后台温度维护调度器（可选）
+        usage_recorder: 写后使用统计记录器（可选）
+        tier_loader: 后台分层加载器（可选）
+        namespaces: 命名空间管理器（可选，关闭时刷新并释放已加载的命名空间）
+        storage: 默认命名空间的存储（可选，关闭时刷新缓冲的写入）
+
+    Returns:
+        FastMCP lifespan 回调
+    """
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
+        if maintenance is not None:
+            maintenance.start()
+        if usage_recorder is not None:
+            usage_recorder.start()
+        if tier_loader is not None:
+            tier_loader.start()
+        if namespaces is not None:
+            namespaces.start()
+        try:
+            yield {}
+        finally:
+            if tier_loader is not None:
+                tier_loader.stop()
+            if maintenance is not None:
+                maintenance.stop()
+            if usage_recorder is not None:
+                usage_recorder.stop()
+            if namespaces is not None:
+                namespaces.close()
+            if storage is not None:
+                storage.close()
+            registry.close()
+
+    return lifespan
+
+
+def _open_namespace(base_storage: ToolStorage, namespace: str) -> NamespaceContext:
+    """
+    打开非默认命名空间
+
+    从存储后端的命名空间分区加载工具（与默认命名空间相同的 Schema 延迟加载配置），
+    建立 Regex 和 BM25 索引。温度维护在请求路径内联执行，使用统计写后批量持久化。
+
+    Args:
+        base_storage: 默认命名空间的存储（用于定位同一后端的分区）
+        namespace: 命名空间名称（已验证格式）
+
+    Returns:
+        命名空间上下文
+
+    Raises:
+        ValueError: 如果存储后端不支持命名空间
+    """
+    try:
+        storage = base_storage.for_namespace(namespace)
+    except NotImplementedError as e:
+        raise ValueError(str(e)) from e
+
+    registry = ToolRegistry()
+    if storage.validate():
+        schema_cache_size = get_schema_cache_size()
+        if schema_cache_size > 0:
+            registry.enable_lazy_schemas(storage, schema_cache_size)
+            registry.register_many(storage.load_all(include_schemas=False), defer_schemas=True)
+        else:
+            registry.register_many(storage.load_all())
+
+    registry.register_searcher(SearchMethod.REGEX, RegexSearch(case_sensitive=False))
+    registry.register_searcher(SearchMethod.BM25, BM25Search())
+    _register_fts5_searcher(registry, storage)
+    registry.rebuild_indexes()
+
+    flush_interval, flush_batch_size = get_usage_flush_config()
+    usage_recorder = UsageRecorder(registry, storage, flush_interval, flush_batch_size)
+    return NamespaceContext(namespace, registry, storage, usage_recorder)
+
+
+def _register_fts5_searcher(registry: ToolRegistry, storage: ToolStorage) -> None:
+    """
+    注册 FTS5 全文搜索器（仅在 REGISTRYTOOLS_SEARCH_METHOD=fts5 时）
+
+    FTS5 索引位于 SQLite 数据库中，由触发器随写入同步。写缓冲包装的存储使用内层
+    SQLiteStorage，缓冲中尚未刷新的写入在刷新后才能被搜索到。
+
+    Args:
+        registry: 工具注册表
+        storage: 存储层实例（需要是 SQLiteStorage 或包装它的 BufferedStorage）
+    """
+    if get_default_search_method() != SearchMethod.FTS5:
+        return
+
+    inner = storage.inner if isinstance(storage, BufferedStorage) else storage
+    if not isinstance(inner, SQLiteStorage):
+        logger.warning(
+            "fts5 搜索方法需要 SQLite 存储后端（REGISTRYTOOLS_STORAGE_BACKEND=sqlite），"
+            "已禁用 FTS5 搜索器。"
+        )
+        return
+    if not SQLiteStorage.fts5_available():
+        logger.warning("当前 SQLite 未编译 FTS5 扩展，已禁用 FTS5 搜索器。")
+        return
+
+    registry.register_searcher(SearchMethod.FTS5, FTS5Search(inner))
+    logger.info(f"FTS5 搜索器已注册（命名空间 {inner.namespace}）")
+
+
 def _create_server_with_storage(
     data_path: Path,
     storage: ToolStorage,
@@ -835,16 +1621,60 @@ def _create_server_with_storage(
     Returns:
         配置好的 FastMCP 服务器实例
     """
-    # 创建 FastMCP 服务器
-    mcp = FastMCP("RegistryTools", instructions=get_server_description())
+    # 写缓冲（非 SYNC 模式时合并写入，按防抖延迟或批量大小批量刷新）
+    write_mode, write_flush_delay, write_batch_size = get_write_buffer_config()
+    if write_mode != WriteMode.SYNC:
+        storage = BufferedStorage(storage, write_mode, write_flush_delay, write_batch_size)
+
+    # 初始化工具注册表（启用后台维护时，请求路径只做计数更新）
+    maintenance_interval = get_maintenance_interval()
+    registry = ToolRegistry(inline_maintenance=maintenance_interval <= 0)
+    maintenance = (
+        TemperatureMaintenanceScheduler(registry, storage, maintenance_interval)
+        if maintenance_interval > 0
+        else None
+    )
 
-    # 初始化工具注册表
-    registry = ToolRegistry()
+    # 使用统计写后记录（请求路径只更新内存）
+    flush_interval, flush_batch_size = get_usage_flush_config()
+    usage_recorder = UsageRecorder(registry, storage, flush_interval, flush_batch_size)
 
-    # 加载已保存的工具
+    # 冷工具加载模式（非 EAGER 时启动只加载热/温工具）
+    cold_load_mode = get_cold_load_mode()
+    tier_loader = (
+        BackgroundTierLoader(registry) if cold_load_mode == ColdLoadMode.BACKGROUND else None
+    )
+
+    # 命名空间（默认命名空间即上面的注册表，其他命名空间按需从存储分区加载）
+    namespaces = NamespaceManager(
+        NamespaceContext(DEFAULT_NAMESPACE, registry, storage, usage_recorder),
+        factory=lambda name: _open_namespace(storage, name),
+        capacity=get_max_namespaces(),
+    )
+
+    # 创建 FastMCP 服务器（后台任务随服务器生命周期启动和停止）
+    mcp = FastMCP(
+        "RegistryTools",
+        instructions=get_server_description(),
+        lifespan=_create_server_lifespan(
+            registry, maintenance, usage_recorder, tier_loader, namespaces, storage
+        ),
+    )
+
+    # 加载已保存的工具（启用延迟加载时不读取 Schema，首次 get_tool 时按名称读取）
     if storage.validate():
-        tools = storage.load_all()
-        registry.register_many(tools)
+        schema_cache_size = get_schema_cache_size()
+        if schema_cache_size > 0:
+            registry.enable_lazy_schemas(storage, schema_cache_size)
+
+        if cold_load_mode != ColdLoadMode.EAGER:
+            registry.preload_tiers(storage, defer_schemas=schema_cache_size > 0)
+        elif schema_cache_size > 0:
+            tools = storage.load_all(include_schemas=False)
+            registry.register_many(tools, defer_schemas=True)
+        else:
+            tools = storage.load_all()
+            registry.register_many(tools)
 
     # 处理默认工具
     if default_tools_handler:
@@ -854,8 +1684,12 @@ def _create_server_with_storage(
     registry.register_searcher(SearchMethod.REGEX, RegexSearch(case_sensitive=False))
     registry.register_searcher(SearchMethod.BM25, BM25Search())
 
+    # FTS5 全文搜索器（仅在配置为 fts5 且使用 SQLite 存储时）
+    _register_fts5_searcher(registry, storage)
+
     # 延迟注册 EmbeddingSearch（仅在配置为 embedding 时）
     default_method = get_default_search_method()
+    embedding_loader = None
 
     if default_method == SearchMethod.EMBEDDING:
         # 检查依赖是否安装
@@ -865,7 +1699,8 @@ def _create_server_with_storage(
             # 注册延迟加载器（首次搜索时才初始化模型）
             from registrytools.search.embedding_search import EmbeddingSearchLazyLoader
 
-            registry.register_searcher(SearchMethod.EMBEDDING, EmbeddingSearchLazyLoader())
+            embedding_loader = EmbeddingSearchLazyLoader()
+            registry.register_searcher(SearchMethod.EMBEDDING, embedding_loader)
             logger.info(
                 "Embedding 搜索器已注册（延迟加载模式，首次搜索时初始化模型）。"
                 "当前配置：REGISTRYTOOLS_SEARCH_METHOD=embedding"
@@ -877,11 +1712,28 @@ def _create_server_with_storage(
                 "已禁用 Embedding 搜索器。"
             )
 
+    # 注册 HybridSearch（与 Embedding 搜索器共享模型和向量缓存）
+    # 建立索引只构建 BM25，模型在首次混合搜索时才加载
+    if importlib.util.find_spec("sentence_transformers") is not None:
+        from registrytools.search.hybrid_search import HybridSearch
+
+        registry.register_searcher(SearchMethod.HYBRID, HybridSearch(embedding=embedding_loader))
+        logger.debug("Hybrid 搜索器已注册（BM25 召回 + 语义重排序）")
+
     # 重建搜索索引
     registry.rebuild_indexes()
 
     # 注册 MCP 工具和资源 (TASK-708: 使用公共函数, Phase 15: 添加认证支持)
-    _register_mcp_tools(mcp, registry, storage, storage.save, auth_middleware)
+    _register_mcp_tools(
+        mcp,
+        registry,
+        storage,
+        storage.save,
+        auth_middleware,
+        maintenance,
+        usage_recorder,
+        namespaces,
+    )
 
     return mcp
 
@@ -902,7 +1754,11 @@ def create_server(
     Returns:
         配置好的 FastMCP 服务器实例
     """
-    storage = JSONStorage(data_path / "tools.json")
+    storage = JSONStorage(
+        data_path / "tools.json",
+        journal=get_json_journal_enabled(),
+        verify=get_verify_on_load(),
+    )
     return _create_server_with_storage(
         data_path,
         storage,
@@ -930,7 +1786,30 @@ def create_server_with_sqlite(
     Returns:
         配置好的 FastMCP 服务器实例
     """
-    storage = SQLiteStorage(data_path / "tools.db")
+    storage = SQLiteStorage(data_path / "tools.db", verify=get_verify_on_load())
+    return _create_server_with_storage(
+        data_path,
+        storage,
+        auth_middleware,
+        _handle_default_tools_for_sqlite,
+    )
+
+
+def create_server_with_binary(
+    data_path: Path,
+    auth_middleware: "APIKeyAuthMiddleware | None" = None,
+) -> FastMCP:
+    """
+    创建使用二进制快照存储的 MCP 服务器
+
+    Args:
+        data_path: 数据目录路径
+        auth_middleware: API Key 认证中间件（可选，仅 HTTP 模式使用）
+
+    Returns:
+        配置好的 FastMCP 服务器实例
+    """
+    storage = BinaryStorage(data_path / "tools.bin", verify=get_verify_on_load())
     return _create_server_with_storage(
         data_path,
         storage,
@@ -8,7 +8,17 @@ License: MIT
 """
 
 from registrytools.storage.base import ToolStorage
+from registrytools.storage.binary_storage import BinaryStorage
+from registrytools.storage.buffered import BufferedStorage
 from registrytools.storage.json_storage import JSONStorage
+from registrytools.storage.sqlite_connections import SQLiteConnectionManager
 from registrytools.storage.sqlite_storage import SQLiteStorage
 
-__all__ = ["ToolStorage", "JSONStorage", "SQLiteStorage"]
+__all__ = [
+    "ToolStorage",
+    "BufferedStorage",
+    "BinaryStorage",
+    "JSONStorage",
+    "SQLiteConnectionManager",
+    "SQLiteStorage",
+]
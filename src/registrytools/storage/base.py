@@ -9,10 +9,12 @@ License: MIT
 
 import logging
 from abc import ABC, abstractmethod
+from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from registrytools.registry.models import ToolMetadata
+from registrytools.registry.scoring import usage_score_at
 
 if TYPE_CHECKING:
     from registrytools.registry.models import ToolTemperature
@@ -26,33 +28,49 @@ class ToolStorage(ABC):
 
     定义工具元数据持久化的通用接口。所有存储实现必须继承此类。
 
+    存储中的数据由本项目写入（写入前已在 MCP 边界验证），读取时默认信任数据，
+    通过 _construct_tool() 直接创建模型实例，跳过 pydantic 验证；
+    verify=True 时每个工具都经过完整验证（完整性检查）。
+
     Attributes:
         path: 存储路径（文件路径或目录路径）
+        verify: 读取时是否完整验证工具数据
     """
 
-    def __init__(self, path: str | Path) -> None:
+    def __init__(self, path: str | Path, verify: bool = False) -> None:
         """
         初始化存储层
 
         Args:
             path: 存储路径
+            verify: 读取时是否完整验证工具数据，默认 False（信任存储中的数据）
         """
         self._path = Path(path)
+        self._verify = verify
 
     @property
     def path(self) -> Path:
         """获取存储路径"""
         return self._path
 
+    @property
+    def verify(self) -> bool:
+        """读取时是否完整验证工具数据"""
+        return self._verify
+
     # ============================================================
     # 核心抽象方法 (TASK-401)
     # ============================================================
 
     @abstractmethod
-    def load_all(self) -> list[ToolMetadata]:
+    def load_all(self, include_schemas: bool = True) -> list[ToolMetadata]:
         """
         加载所有工具元数据
 
+        Args:
+            include_schemas: 是否加载 input_schema / output_schema。
+                为 False 时返回的工具 Schema 为 None，可稍后通过 load_schemas() 按名称读取
+
         Returns:
             工具元数据列表
 
@@ -128,6 +146,7 @@ class ToolStorage(ABC):
         self,
         temperature: "ToolTemperature",
         limit: int | None = None,
+        include_schemas: bool = True,
     ) -> list[ToolMetadata]:
         """
         按温度级别加载工具 (TASK-802)
@@ -137,9 +156,13 @@ class ToolStorage(ABC):
         温工具：中频使用，按需加载
         冷工具：低频使用，延迟加载
 
+        结果按衰减后的使用分数、最近使用时间降序排列（同值按名称升序），
+        limit 截取的是该温度级别中最常用的工具。
+
         Args:
             temperature: 温度级别 (HOT/WARM/COLD)
             limit: 加载数量限制，None 表示加载所有
+            include_schemas: 是否加载 Schema（同 load_all()）
 
         Returns:
             工具元数据列表
@@ -189,6 +212,26 @@ class ToolStorage(ABC):
         """
         return self.count() == 0
 
+    def load_schemas(self, tool_name: str) -> "tuple[dict | None, dict | None] | None":
+        """
+        按名称读取工具的 Schema
+
+        默认实现：通过 get() 读取完整工具。子类可以覆盖以只读取 Schema。
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组，工具不存在时返回 None
+
+        Raises:
+            IOError: 如果读取失败
+        """
+        tool = self.get(tool_name)
+        if tool is None:
+            return None
+        return (tool.input_schema, tool.output_schema)
+
     def get(self, tool_name: str) -> ToolMetadata | None:
         """
         获取指定工具的元数据
@@ -206,6 +249,59 @@ class ToolStorage(ABC):
                 return tool
         return None
 
+    def delete_many(self, tool_names: list[str]) -> int:
+        """
+        批量删除工具元数据
+
+        默认实现：逐个调用 delete()。子类可以覆盖以在一次写操作中删除。
+
+        Args:
+            tool_names: 工具名称列表
+
+        Returns:
+            实际删除的工具数量
+
+        Raises:
+            IOError: 如果删除失败
+        """
+        return sum(1 for name in tool_names if self.delete(name))
+
+    def flush(self) -> int:
+        """
+        持久化缓冲的写入
+
+        默认实现：写入不经过缓冲，直接返回 0。
+
+        Returns:
+            写入的工具数量
+        """
+        return 0
+
+    def close(self) -> None:
+        """
+        刷新缓冲的写入并释放存储资源
+
+        默认实现：没有需要释放的资源。
+        """
+        self.flush()
+
+    def for_namespace(self, namespace: str) -> "ToolStorage":
+        """
+        获取同一后端中指定命名空间的存储分区
+
+        默认实现不支持命名空间。子类可以覆盖以提供分区存储。
+
+        Args:
+            namespace: 命名空间名称（已验证格式）
+
+        Returns:
+            命名空间的存储实例
+
+        Raises:
+            NotImplementedError: 如果存储后端不支持命名空间
+        """
+        raise NotImplementedError(f"{type(self).__name__} 不支持命名空间")
+
     def initialize(self) -> None:
         """
         初始化存储
@@ -237,3 +333,53 @@ class ToolStorage(ABC):
             # 路径检查失败时记录并返回 False
             logger.debug(f"验证存储路径时发生错误: {e}")
             return False
+
+    # ============================================================
+    # 私有辅助方法
+    # ============================================================
+
+    @staticmethod
+    def _order_by_usage(
+        tools: list[ToolMetadata], now: datetime | None = None
+    ) -> list[ToolMetadata]:
+        """
+        按衰减后的使用分数、最近使用时间降序排列工具（同值按名称升序）
+
+        与 SQLiteStorage.load_by_temperature() 的合并顺序一致，从未使用的工具排在最后。
+
+        Args:
+            tools: 工具列表（原地排序）
+            now: 计算衰减分数的时刻，默认 datetime.now()
+
+        Returns:
+            排序后的同一列表
+        """
+        now = now or datetime.now()
+        tools.sort(key=lambda tool: tool.name)
+        tools.sort(
+            key=lambda tool: (usage_score_at(tool, now), tool.last_used or datetime.min),
+            reverse=True,
+        )
+        return tools
+
+    def _construct_tool(self, fields: dict[str, Any]) -> ToolMetadata:
+        """
+        用从存储读取的字段创建 ToolMetadata
+
+        字段必须已是模型类型（tags 为 set，时间为 datetime，temperature 为枚举），
+        缺少的可选字段使用模型默认值。默认通过 model_construct() 跳过验证；
+        verify=True 时完整验证。
+
+        Args:
+            fields: 字段名到值的映射
+
+        Returns:
+            工具元数据
+
+        Raises:
+            ValidationError: 如果 verify=True 且字段无效
+        """
+        if self._verify:
+            return ToolMetadata(**fields)
+
+        return ToolMetadata.model_construct(**fields)
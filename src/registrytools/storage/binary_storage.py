@@ -0,0 +1,775 @@
+"""
+二进制快照存储实现
+
+使用带版本号的紧凑二进制快照持久化工具元数据，读取时内存映射文件，
+启动加载只做定长字段解包和字符串切片，不解析 JSON。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+import logging
+import mmap
+import struct
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import NamedTuple
+
+from pydantic import ValidationError
+
+from registrytools.registry.models import ToolMetadata, ToolTemperature
+from registrytools.registry.scoring import classify_usage_score, usage_score_at
+from registrytools.storage.base import ToolStorage
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# 文件格式
+# ============================================================
+#
+# 文件头   HEADER: magic, 版本, 保留标志, 字符串表条目数, 工具数, 偏移表位置
+# 字符串表 每个条目为 u32 长度 + UTF-8 字节（标签、类别、服务器名称去重后只存一次）
+# 偏移表   每个工具一个 u64，指向工具记录的绝对偏移
+# 工具记录 定长记录头（各字段长度、服务器和类别的字符串表编号、标志位、温度、
+#          使用次数、使用分数）之后依次是名称、描述、两个 ISO 8601 时间（长度 0 表示 None）、
+#          标签的字符串表编号和两个 Schema 的原始 JSON 字节（长度 _NONE 表示 None）
+
+MAGIC = b"RTBS"
+"""二进制快照文件标识"""
+
+FORMAT_VERSION = 1
+"""二进制快照格式版本（格式不兼容地变化时递增）"""
+
+_HEADER = struct.Struct("<4sHHIIQ")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_RECORD = struct.Struct("<IIIIBBqdHHHII")
+"""记录头：名称长度、描述长度、服务器编号、类别编号、标志位、温度、使用次数、使用分数、
+两个时间的长度、标签数量、两个 Schema 的长度"""
+
+_NONE = 0xFFFFFFFF
+"""字符串表编号和 Schema 长度中表示 None 的值"""
+
+_FLAG_DEFER_LOADING = 0x01
+
+_TEMPERATURES = list(ToolTemperature)
+
+_FileKey = tuple[int, int, int] | None
+"""文件的 (inode, mtime_ns, size)，文件不存在时为 None（原子替换总会产生新的 inode）"""
+
+
+class _Record(NamedTuple):
+    """
+    一个工具的快照记录（Schema 保持为未解码的 JSON 字节）
+    """
+
+    name: str
+    description: str
+    mcp_server: str | None
+    category: str | None
+    defer_loading: bool
+    temperature: ToolTemperature
+    use_frequency: int
+    usage_score: float
+    last_used: str
+    usage_score_updated_at: str
+    tags: tuple[str, ...]
+    input_schema: bytes | None
+    output_schema: bytes | None
+
+
+@dataclass
+class _Snapshot:
+    """
+    已映射的快照
+
+    Attributes:
+        key: 映射时文件的 (inode, mtime_ns, size)
+        buffer: 只读内存映射
+        strings: 字符串表
+        offsets: 工具名称到记录偏移的映射（保持文件中的顺序）
+    """
+
+    key: _FileKey
+    buffer: mmap.mmap
+    strings: list[str]
+    offsets: dict[str, int]
+
+
+def _stat_key(path: Path) -> _FileKey:
+    """获取文件的 (inode, mtime_ns, size)，文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _encode_datetime(dt: datetime | None) -> str:
+    """序列化时间（None 编码为空字符串）"""
+    return dt.isoformat() if dt is not None else ""
+
+
+def _decode_datetime(s: str) -> datetime | None:
+    """反序列化时间（空字符串解码为 None）"""
+    return datetime.fromisoformat(s) if s else None
+
+
+def _encode_schema(schema: dict | None) -> bytes | None:
+    """序列化 Schema 为紧凑 JSON 字节"""
+    if schema is None:
+        return None
+    return json.dumps(schema, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_schema(raw: bytes | None) -> dict | None:
+    """解码 Schema 的 JSON 字节"""
+    return json.loads(raw) if raw is not None else None
+
+
+def _tool_to_record(tool: ToolMetadata) -> _Record:
+    """
+    将 ToolMetadata 转换为快照记录
+
+    Args:
+        tool: 工具元数据
+
+    Returns:
+        快照记录
+    """
+    return _Record(
+        name=tool.name,
+        description=tool.description,
+        mcp_server=tool.mcp_server,
+        category=tool.category,
+        defer_loading=tool.defer_loading,
+        temperature=tool.temperature,
+        use_frequency=tool.use_frequency,
+        usage_score=tool.usage_score,
+        last_used=_encode_datetime(tool.last_used),
+        usage_score_updated_at=_encode_datetime(tool.usage_score_updated_at),
+        tags=tuple(sorted(tool.tags)),
+        input_schema=_encode_schema(tool.input_schema),
+        output_schema=_encode_schema(tool.output_schema),
+    )
+
+
+def _encode_snapshot(records: Iterable[_Record]) -> bytes:
+    """
+    编码二进制快照
+
+    Args:
+        records: 快照记录（按写入顺序）
+
+    Returns:
+        完整的快照字节
+    """
+    string_ids: dict[str, int] = {}
+
+    def intern(value: str | None) -> int:
+        if value is None:
+            return _NONE
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(string_ids)
+        return index
+
+    bodies: list[bytes] = []
+    for record in records:
+        name = record.name.encode("utf-8")
+        description = record.description.encode("utf-8")
+        last_used = record.last_used.encode("ascii")
+        score_updated_at = record.usage_score_updated_at.encode("ascii")
+        input_schema = record.input_schema or b""
+        output_schema = record.output_schema or b""
+        header = _RECORD.pack(
+            len(name),
+            len(description),
+            intern(record.mcp_server),
+            intern(record.category),
+            _FLAG_DEFER_LOADING if record.defer_loading else 0,
+            _TEMPERATURES.index(record.temperature),
+            record.use_frequency,
+            record.usage_score,
+            len(last_used),
+            len(score_updated_at),
+            len(record.tags),
+            _NONE if record.input_schema is None else len(input_schema),
+            _NONE if record.output_schema is None else len(output_schema),
+        )
+        tag_ids = struct.pack(f"<{len(record.tags)}I", *(intern(tag) for tag in record.tags))
+        bodies.append(
+            b"".join(
+                (
+                    header,
+                    name,
+                    description,
+                    last_used,
+                    score_updated_at,
+                    tag_ids,
+                    input_schema,
+                    output_schema,
+                )
+            )
+        )
+
+    string_table = b"".join(
+        _U32.pack(len(data)) + data for data in (value.encode("utf-8") for value in string_ids)
+    )
+    table_offset = _HEADER.size + len(string_table)
+    offset = table_offset + _U64.size * len(bodies)
+    offset_table = bytearray()
+    for body in bodies:
+        offset_table += _U64.pack(offset)
+        offset += len(body)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(string_ids), len(bodies), table_offset)
+    return b"".join((header, string_table, bytes(offset_table), *bodies))
+
+
+class BinaryStorage(ToolStorage):
+    """
+    二进制快照存储实现
+
+    快照文件以只读方式内存映射，用 (inode, mtime_ns, size) 判断文件是否被替换。
+    打开时只解析文件头、字符串表（标签、类别、服务器名称去重后的取值）和每条记录的名称，
+    exists/count 是字典查找，get/load_schemas 只解码一条记录；Schema 以原始 JSON 字节保存，
+    load_all(include_schemas=False) 完全不解码 Schema。
+
+    写操作读取全部记录（不解码 Schema）、应用变更后原子重写快照，
+    写入开销与工具总数成正比，频繁写入的场景可配合 BufferedStorage 合并写入。
+
+    Attributes:
+        _path: 快照文件路径
+        _snapshot: 当前映射的快照（文件变化后重新映射）
+        _snapshot_lock: 保护快照替换的锁
+        _write_lock: 串行化本进程内的写操作
+    """
+
+    def __init__(self, path: str | Path, verify: bool = False) -> None:
+        """
+        初始化二进制快照存储
+
+        Args:
+            path: 快照文件路径（如 ~/.RegistryTools/tools.bin）
+            verify: 读取时是否完整验证工具数据，默认 False（跳过 pydantic 验证）
+        """
+        super().__init__(path, verify)
+        # 确保是 .bin 文件
+        if self._path.suffix != ".bin":
+            self._path = self._path.with_suffix(".bin")
+
+        self._snapshot: _Snapshot | None = None
+        self._snapshot_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def for_namespace(self, namespace: str) -> "BinaryStorage":
+        """
+        获取指定命名空间的存储分区（每个命名空间一个快照文件）
+
+        Args:
+            namespace: 命名空间名称（已验证格式）
+
+        Returns:
+            命名空间的二进制快照存储
+        """
+        return BinaryStorage(self._path.parent / "namespaces" / f"{namespace}.bin", self._verify)
+
+    # ============================================================
+    # 核心方法实现
+    # ============================================================
+
+    def load_all(self, include_schemas: bool = True) -> list[ToolMetadata]:
+        """
+        加载所有工具元数据
+
+        Args:
+            include_schemas: 是否解码 Schema。为 False 时 Schema 字节不被读取
+
+        Returns:
+            工具元数据列表
+
+        Raises:
+            IOError: 如果快照格式错误或读取失败
+        """
+        snapshot = self._read_snapshot()
+        if snapshot is None:
+            return []
+
+        tools = []
+        for record in self._iter_records(snapshot, include_schemas):
+            try:
+                tools.append(self._record_to_tool(record, include_schemas))
+            except (ValidationError, ValueError) as e:
+                # 跳过无效的工具数据，记录警告
+                logger.warning(f"跳过无效的工具数据: {record.name}, 错误: {e}")
+        return tools
+
+    def save(self, tool: ToolMetadata) -> None:
+        """
+        保存单个工具元数据
+
+        如果工具已存在，则更新其元数据。
+
+        Args:
+            tool: 工具元数据
+
+        Raises:
+            IOError: 如果保存失败
+        """
+        self._write_changes({tool.name: _tool_to_record(tool)})
+
+    def save_many(self, tools: list[ToolMetadata]) -> None:
+        """
+        批量保存工具元数据（一次原子重写）
+
+        Args:
+            tools: 工具元数据列表
+
+        Raises:
+            IOError: 如果保存失败
+        """
+        if not tools:
+            return
+
+        self._write_changes({tool.name: _tool_to_record(tool) for tool in tools})
+
+    def delete(self, tool_name: str) -> bool:
+        """
+        删除工具元数据
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            True 如果工具存在并被删除，False 如果工具不存在
+
+        Raises:
+            IOError: 如果删除失败
+        """
+        return self.delete_many([tool_name]) == 1
+
+    def delete_many(self, tool_names: list[str]) -> int:
+        """
+        批量删除工具元数据（一次原子重写）
+
+        Args:
+            tool_names: 工具名称列表
+
+        Returns:
+            实际删除的工具数量
+
+        Raises:
+            IOError: 如果删除失败
+        """
+        snapshot = self._read_snapshot()
+        existing = [
+            name for name in dict.fromkeys(tool_names) if snapshot and name in snapshot.offsets
+        ]
+        if existing:
+            self._write_changes(dict.fromkeys(existing))
+        return len(existing)
+
+    def exists(self, tool_name: str) -> bool:
+        """
+        检查工具是否存在
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            True 如果工具存在，否则 False
+        """
+        try:
+            snapshot = self._read_snapshot()
+        except OSError:
+            return False
+        return snapshot is not None and tool_name in snapshot.offsets
+
+    def load_by_temperature(
+        self,
+        temperature: ToolTemperature,
+        limit: int | None = None,
+        include_schemas: bool = True,
+    ) -> list[ToolMetadata]:
+        """
+        按温度级别加载工具
+
+        加载全部工具后按衰减使用分数过滤并排序（与 JSON 存储一致）。
+
+        Args:
+            temperature: 温度级别 (HOT/WARM/COLD)
+            limit: 加载数量限制
+            include_schemas: 是否解码 Schema（同 load_all()）
+
+        Returns:
+            工具元数据列表
+        """
+        now = datetime.now()
+        filtered = [
+            t
+            for t in self.load_all(include_schemas)
+            if classify_usage_score(usage_score_at(t, now)) == temperature
+        ]
+        self._order_by_usage(filtered, now)
+        return filtered[:limit] if limit else filtered
+
+    # ============================================================
+    # 优化的工具方法
+    # ============================================================
+
+    def count(self) -> int:
+        """
+        获取工具数量
+
+        Returns:
+            工具数量
+        """
+        try:
+            snapshot = self._read_snapshot()
+        except OSError:
+            return 0
+        return len(snapshot.offsets) if snapshot is not None else 0
+
+    def is_empty(self) -> bool:
+        """
+        检查存储是否为空
+
+        Returns:
+            True 如果存储为空，否则 False
+        """
+        return self.count() == 0
+
+    def get(self, tool_name: str) -> ToolMetadata | None:
+        """
+        获取指定工具的元数据（只解码一条记录）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            工具元数据，如果不存在则返回 None
+        """
+        try:
+            snapshot = self._read_snapshot()
+            if snapshot is None or tool_name not in snapshot.offsets:
+                return None
+            return self._record_to_tool(self._read_record(snapshot, snapshot.offsets[tool_name]))
+        except (OSError, ValidationError, ValueError):
+            return None
+
+    def load_schemas(self, tool_name: str) -> tuple[dict | None, dict | None] | None:
+        """
+        按名称读取工具的 Schema（只解码该工具的 Schema 字节）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组，工具不存在时返回 None
+
+        Raises:
+            IOError: 如果读取失败
+        """
+        snapshot = self._read_snapshot()
+        if snapshot is None or tool_name not in snapshot.offsets:
+            return None
+        record = self._read_record(snapshot, snapshot.offsets[tool_name])
+        try:
+            return (_decode_schema(record.input_schema), _decode_schema(record.output_schema))
+        except ValueError as e:
+            raise OSError(f"读取工具 Schema 失败: {e}") from e
+
+    def clear(self) -> None:
+        """
+        清空所有工具元数据
+
+        删除快照文件。
+        """
+        with self._write_lock:
+            self._path.unlink(missing_ok=True)
+            with self._snapshot_lock:
+                self._snapshot = None
+
+    def initialize(self) -> None:
+        """
+        初始化存储
+
+        创建父目录和空快照文件。
+        """
+        super().initialize()
+        if not self._path.exists():
+            self._write_atomic(_encode_snapshot([]))
+
+    def validate(self) -> bool:
+        """
+        验证存储完整性
+
+        Returns:
+            True 如果快照文件存在且格式有效，否则 False
+        """
+        try:
+            return self._read_snapshot() is not None
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        """释放内存映射（之后的读取重新映射文件）"""
+        # 只丢弃引用，不主动关闭映射：并发读者可能仍在解码，映射随最后一个引用释放
+        with self._snapshot_lock:
+            self._snapshot = None
+
+    # ============================================================
+    # 私有辅助方法
+    # ============================================================
+
+    def _read_snapshot(self) -> _Snapshot | None:
+        """
+        映射快照文件（文件未变化时返回已映射的快照）
+
+        Returns:
+            已映射的快照，文件不存在时返回 None
+
+        Raises:
+            IOError: 如果快照格式错误或读取失败
+        """
+        key = _stat_key(self._path)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.key == key:
+            return snapshot
+        if key is None:
+            return None
+
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.key == key:
+                return snapshot
+            try:
+                with open(self._path, "rb") as f:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                raise OSError(f"读取二进制快照失败: {e}") from e
+            try:
+                snapshot = self._parse_snapshot(key, buffer)
+            except (struct.error, UnicodeDecodeError, ValueError) as e:
+                buffer.close()
+                raise OSError(f"二进制快照格式错误: {e}") from e
+            # 旧的映射不主动关闭（并发读者可能仍在使用），随最后一个引用释放
+            self._snapshot = snapshot
+            return snapshot
+
+    @staticmethod
+    def _parse_snapshot(key: _FileKey, buffer: mmap.mmap) -> _Snapshot:
+        """
+        解析文件头、字符串表和记录名称
+
+        Args:
+            key: 文件的 (inode, mtime_ns, size)
+            buffer: 快照的内存映射
+
+        Returns:
+            已映射的快照
+
+        Raises:
+            ValueError: 如果文件标识或版本不匹配
+            struct.error: 如果文件被截断
+        """
+        magic, version, _, n_strings, n_tools, table_offset = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("文件标识不匹配")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的快照版本: {version}（当前版本 {FORMAT_VERSION}）")
+
+        strings = []
+        pos = _HEADER.size
+        for _ in range(n_strings):
+            (length,) = _U32.unpack_from(buffer, pos)
+            pos += _U32.size
+            strings.append(buffer[pos : pos + length].decode("utf-8"))
+            pos += length
+
+        offsets: dict[str, int] = {}
+        size = len(buffer)
+        for offset in struct.unpack_from(f"<{n_tools}Q", buffer, table_offset):
+            (length,) = _U32.unpack_from(buffer, offset)
+            start = offset + _RECORD.size
+            if start + length > size:
+                raise ValueError("记录超出文件末尾")
+            offsets[buffer[start : start + length].decode("utf-8")] = offset
+
+        return _Snapshot(key, buffer, strings, offsets)
+
+    @staticmethod
+    def _read_record(snapshot: _Snapshot, offset: int, include_schemas: bool = True) -> _Record:
+        """
+        解码一条工具记录（Schema 保持为字节）
+
+        Args:
+            snapshot: 已映射的快照
+            offset: 记录偏移
+            include_schemas: 是否复制 Schema 字节，为 False 时记录的 Schema 为 None
+
+        Returns:
+            快照记录
+
+        Raises:
+            IOError: 如果记录格式错误
+        """
+        buffer, strings = snapshot.buffer, snapshot.strings
+        try:
+            (
+                name_len,
+                description_len,
+                server_id,
+                category_id,
+                flags,
+                temperature,
+                use_frequency,
+                usage_score,
+                last_used_len,
+                score_updated_len,
+                n_tags,
+                input_len,
+                output_len,
+            ) = _RECORD.unpack_from(buffer, offset)
+            pos = offset + _RECORD.size
+            name = buffer[pos : pos + name_len].decode("utf-8")
+            pos += name_len
+            description = buffer[pos : pos + description_len].decode("utf-8")
+            pos += description_len
+            last_used = buffer[pos : pos + last_used_len].decode("ascii")
+            pos += last_used_len
+            score_updated_at = buffer[pos : pos + score_updated_len].decode("ascii")
+            pos += score_updated_len
+            tags = tuple(map(strings.__getitem__, struct.unpack_from(f"<{n_tags}I", buffer, pos)))
+            pos += _U32.size * n_tags
+            input_schema = output_schema = None
+            if include_schemas:
+                if input_len != _NONE:
+                    input_schema = buffer[pos : pos + input_len]
+                    pos += input_len
+                if output_len != _NONE:
+                    output_schema = buffer[pos : pos + output_len]
+
+            # 按位置构造（热路径，关键字参数明显更慢）
+            return _Record(
+                name,
+                description,
+                None if server_id == _NONE else strings[server_id],
+                None if category_id == _NONE else strings[category_id],
+                bool(flags & _FLAG_DEFER_LOADING),
+                _TEMPERATURES[temperature],
+                use_frequency,
+                usage_score,
+                last_used,
+                score_updated_at,
+                tags,
+                input_schema,
+                output_schema,
+            )
+        except (struct.error, IndexError, ValueError) as e:
+            raise OSError(f"二进制快照记录格式错误（偏移 {offset}）: {e}") from e
+
+    def _record_to_tool(self, record: _Record, include_schemas: bool = True) -> ToolMetadata:
+        """
+        将快照记录转换为 ToolMetadata（见 _construct_tool()）
+
+        Args:
+            record: 快照记录
+            include_schemas: 是否解码 Schema
+
+        Returns:
+            工具元数据
+
+        Raises:
+            ValueError: 如果时间或 Schema 无法解码（verify=True 时含字段验证错误）
+        """
+        return self._construct_tool(
+            {
+                "name": record.name,
+                "description": record.description,
+                "mcp_server": record.mcp_server,
+                "category": record.category,
+                "defer_loading": record.defer_loading,
+                "temperature": record.temperature,
+                "use_frequency": record.use_frequency,
+                "usage_score": record.usage_score,
+                "last_used": _decode_datetime(record.last_used),
+                "usage_score_updated_at": _decode_datetime(record.usage_score_updated_at),
+                "tags": set(record.tags),
+                "input_schema": _decode_schema(record.input_schema) if include_schemas else None,
+                "output_schema": _decode_schema(record.output_schema) if include_schemas else None,
+            }
+        )
+
+    def _iter_records(self, snapshot: _Snapshot, include_schemas: bool = True) -> Iterable[_Record]:
+        """按文件顺序解码全部记录"""
+        for offset in snapshot.offsets.values():
+            yield self._read_record(snapshot, offset, include_schemas)
+
+    def _write_changes(self, changes: dict[str, _Record | None]) -> None:
+        """
+        应用变更并原子重写快照
+
+        Args:
+            changes: 工具名称到记录的映射（None 表示删除）
+
+        Raises:
+            IOError: 如果读取或写入失败
+        """
+        with self._write_lock:
+            try:
+                snapshot = self._read_snapshot()
+            except OSError as e:
+                # 如果快照损坏，重新开始
+                logger.warning(f"二进制快照不可读，将被覆盖: {e}")
+                snapshot = None
+
+            records: dict[str, _Record] = (
+                {record.name: record for record in self._iter_records(snapshot)}
+                if snapshot is not None
+                else {}
+            )
+            for name, record in changes.items():
+                if record is None:
+                    records.pop(name, None)
+                else:
+                    records[name] = record
+
+            if records:
+                self._write_atomic(_encode_snapshot(records.values()))
+            else:
+                self._path.unlink(missing_ok=True)
+
+    def _write_atomic(self, data: bytes) -> None:
+        """
+        原子写入快照
+
+        使用临时文件 + 重命名的方式确保写入原子性。
+
+        Args:
+            data: 快照字节
+
+        Raises:
+            IOError: 如果写入失败
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with NamedTemporaryFile(
+                mode="wb", suffix=".bin", dir=self._path.parent, delete=False
+            ) as tmp_file:
+                tmp_file.write(data)
+                tmp_path = Path(tmp_file.name)
+
+            tmp_path.replace(self._path)
+
+        except OSError as e:
+            if "tmp_path" in locals() and tmp_path.exists():
+                tmp_path.unlink()
+            raise OSError(f"写入二进制快照失败: {e}") from e
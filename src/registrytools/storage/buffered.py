@@ -0,0 +1,434 @@
+"""
+合并写缓冲存储
+
+包装任意 ToolStorage，把写入先放入内存缓冲区，合并同一工具的多次写入，
+按防抖延迟或批量大小通过一次 save_many() / delete_many() 写入底层存储。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from registrytools.defaults import WRITE_BATCH_SIZE, WRITE_FLUSH_DELAY
+from registrytools.registry.models import ToolMetadata, WriteMode
+from registrytools.storage.base import ToolStorage
+
+if TYPE_CHECKING:
+    from registrytools.registry.models import ToolTemperature
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedStorage(ToolStorage):
+    """
+    合并写缓冲存储
+
+    写入（save/save_many/delete）只更新缓冲区：同一工具在两次刷新之间的多次写入
+    只保留最后一次，删除在缓冲区中记为 None。单点读取（get/exists/load_schemas）
+    优先读取缓冲区，批量读取（load_all/load_by_temperature/count）先刷新再委托底层存储，
+    因此读者总能看到自己的写入。
+
+    第一次缓冲写入唤醒后台线程，线程等待 flush_delay 秒（批量已满时立即）后刷新。
+    后台线程在首次缓冲写入时启动，close() 停止线程并刷新剩余写入。
+
+    Attributes:
+        mode: 持久化模式（SYNC 时写入直接委托底层存储）
+        flush_delay: 防抖延迟（秒）
+        batch_size: 触发立即刷新的待写入工具数
+        _inner: 底层存储
+        _pending: 待写入的变更（工具名称到元数据，None 表示删除）
+        _inflight: 正在刷新的变更（刷新期间读取仍可见）
+        _lock: 保护 _pending 和 _inflight 的锁
+        _flush_lock: 串行化刷新
+        _thread: 后台刷新线程
+    """
+
+    def __init__(
+        self,
+        inner: ToolStorage,
+        mode: WriteMode = WriteMode.BATCHED,
+        flush_delay: float = WRITE_FLUSH_DELAY,
+        batch_size: int = WRITE_BATCH_SIZE,
+    ) -> None:
+        """
+        初始化写缓冲存储
+
+        Args:
+            inner: 底层存储
+            mode: 持久化模式，默认 BATCHED
+            flush_delay: 防抖延迟（秒），默认 WRITE_FLUSH_DELAY
+            batch_size: 触发立即刷新的待写入工具数，默认 WRITE_BATCH_SIZE
+
+        Raises:
+            ValueError: 如果防抖延迟为负数或批量大小不大于 0
+        """
+        if flush_delay < 0:
+            raise ValueError(f"防抖延迟不能为负数, 实际 {flush_delay}")
+        if batch_size < 1:
+            raise ValueError(f"批量大小必须大于 0, 实际 {batch_size}")
+
+        super().__init__(inner.path)
+        self.mode = mode
+        self.flush_delay = flush_delay
+        self.batch_size = batch_size
+        self._inner = inner
+        self._pending: dict[str, ToolMetadata | None] = {}
+        self._inflight: dict[str, ToolMetadata | None] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._full_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def inner(self) -> ToolStorage:
+        """底层存储"""
+        return self._inner
+
+    @property
+    def pending_count(self) -> int:
+        """待写入的工具数量"""
+        return len(self._pending)
+
+    @property
+    def is_running(self) -> bool:
+        """后台刷新线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    # ============================================================
+    # 写操作
+    # ============================================================
+
+    def save(self, tool: ToolMetadata) -> None:
+        """
+        保存单个工具元数据（SYNC 模式直接写入，否则进入缓冲区）
+
+        Args:
+            tool: 工具元数据
+
+        Raises:
+            IOError: 如果 SYNC 模式或同步刷新时保存失败
+        """
+        if self.mode == WriteMode.SYNC:
+            self._inner.save(tool)
+        else:
+            self._buffer({tool.name: tool})
+
+    def save_many(self, tools: list[ToolMetadata]) -> None:
+        """
+        批量保存工具元数据（SYNC 模式直接写入，否则进入缓冲区）
+
+        Args:
+            tools: 工具元数据列表
+
+        Raises:
+            IOError: 如果 SYNC 模式或同步刷新时保存失败
+        """
+        if not tools:
+            return
+        if self.mode == WriteMode.SYNC:
+            self._inner.save_many(tools)
+        else:
+            self._buffer({tool.name: tool for tool in tools})
+
+    def delete(self, tool_name: str) -> bool:
+        """
+        删除工具元数据（SYNC 模式直接删除，否则进入缓冲区）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            True 如果工具存在（缓冲区或底层存储中），False 如果工具不存在
+
+        Raises:
+            IOError: 如果 SYNC 模式或同步刷新时删除失败
+        """
+        if self.mode == WriteMode.SYNC:
+            return self._inner.delete(tool_name)
+        if not self.exists(tool_name):
+            return False
+        self._buffer({tool_name: None})
+        return True
+
+    def delete_many(self, tool_names: list[str]) -> int:
+        """
+        批量删除工具元数据（SYNC 模式直接删除，否则进入缓冲区）
+
+        Args:
+            tool_names: 工具名称列表
+
+        Returns:
+            存在并被删除的工具数量
+
+        Raises:
+            IOError: 如果 SYNC 模式或同步刷新时删除失败
+        """
+        if self.mode == WriteMode.SYNC:
+            return self._inner.delete_many(tool_names)
+        existing = [name for name in dict.fromkeys(tool_names) if self.exists(name)]
+        if existing:
+            self._buffer(dict.fromkeys(existing))
+        return len(existing)
+
+    def clear(self) -> None:
+        """丢弃缓冲的写入并清空底层存储"""
+        with self._flush_lock:
+            with self._lock:
+                self._pending.clear()
+            self._inner.clear()
+
+    def flush(self) -> int:
+        """
+        将缓冲的写入批量写入底层存储
+
+        保存通过一次 save_many()，删除通过一次 delete_many()。
+        写入失败时变更放回缓冲区（不覆盖期间更新的写入），下次刷新重试。
+
+        Returns:
+            写入的工具数量
+
+        Raises:
+            IOError: 如果写入失败
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+
+            saves = [tool for tool in batch.values() if tool is not None]
+            deletes = [name for name, tool in batch.items() if tool is None]
+            try:
+                self._inner.save_many(saves)
+                if deletes:
+                    self._inner.delete_many(deletes)
+            except OSError:
+                with self._lock:
+                    for name, tool in batch.items():
+                        self._pending.setdefault(name, tool)
+                    self._inflight = {}
+                raise
+
+            with self._lock:
+                self._inflight = {}
+
+        logger.debug(f"写缓冲已刷新：保存 {len(saves)} 个，删除 {len(deletes)} 个工具")
+        return len(batch)
+
+    def close(self) -> None:
+        """停止后台刷新线程，刷新剩余写入并关闭底层存储"""
+        thread = self._thread
+        if thread is not None:
+            self._stop_event.set()
+            self._wake_event.set()
+            self._full_event.set()
+            thread.join(5.0)
+            self._thread = None
+            self._stop_event.clear()
+
+        self.flush()
+        self._inner.close()
+
+    # ============================================================
+    # 读操作
+    # ============================================================
+
+    def load_all(self, include_schemas: bool = True) -> list[ToolMetadata]:
+        """
+        加载所有工具元数据（先刷新缓冲区）
+
+        Args:
+            include_schemas: 是否加载 Schema
+
+        Returns:
+            工具元数据列表
+
+        Raises:
+            IOError: 如果刷新或读取失败
+        """
+        self.flush()
+        return self._inner.load_all(include_schemas)
+
+    def load_by_temperature(
+        self,
+        temperature: "ToolTemperature",
+        limit: int | None = None,
+        include_schemas: bool = True,
+    ) -> list[ToolMetadata]:
+        """
+        按温度级别加载工具（先刷新缓冲区）
+
+        Args:
+            temperature: 温度级别
+            limit: 加载数量限制
+            include_schemas: 是否加载 Schema
+
+        Returns:
+            工具元数据列表
+        """
+        self.flush()
+        return self._inner.load_by_temperature(temperature, limit, include_schemas)
+
+    def count(self) -> int:
+        """
+        获取工具数量（先刷新缓冲区）
+
+        Returns:
+            工具数量
+        """
+        self.flush()
+        return self._inner.count()
+
+    def get(self, tool_name: str) -> ToolMetadata | None:
+        """
+        获取指定工具的元数据（优先读取缓冲区）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            工具元数据，如果不存在或已在缓冲区中删除则返回 None
+        """
+        found, tool = self._buffered(tool_name)
+        return tool if found else self._inner.get(tool_name)
+
+    def exists(self, tool_name: str) -> bool:
+        """
+        检查工具是否存在（优先读取缓冲区）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            True 如果工具存在，否则 False
+        """
+        found, tool = self._buffered(tool_name)
+        return tool is not None if found else self._inner.exists(tool_name)
+
+    def load_schemas(self, tool_name: str) -> tuple[dict | None, dict | None] | None:
+        """
+        按名称读取工具的 Schema（优先读取缓冲区）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组，工具不存在时返回 None
+
+        Raises:
+            IOError: 如果读取失败
+        """
+        found, tool = self._buffered(tool_name)
+        if not found:
+            return self._inner.load_schemas(tool_name)
+        return (tool.input_schema, tool.output_schema) if tool is not None else None
+
+    def initialize(self) -> None:
+        """初始化底层存储"""
+        self._inner.initialize()
+
+    def validate(self) -> bool:
+        """
+        验证底层存储完整性
+
+        Returns:
+            True 如果存储有效，否则 False
+        """
+        return self._inner.validate()
+
+    def for_namespace(self, namespace: str) -> "BufferedStorage":
+        """
+        获取指定命名空间的存储分区（使用相同的缓冲配置）
+
+        Args:
+            namespace: 命名空间名称（已验证格式）
+
+        Returns:
+            包装底层存储命名空间分区的写缓冲存储
+
+        Raises:
+            NotImplementedError: 如果底层存储不支持命名空间
+        """
+        return BufferedStorage(
+            self._inner.for_namespace(namespace), self.mode, self.flush_delay, self.batch_size
+        )
+
+    # ============================================================
+    # 私有辅助方法
+    # ============================================================
+
+    def _buffered(self, tool_name: str) -> tuple[bool, ToolMetadata | None]:
+        """
+        查找缓冲区中（含正在刷新）的变更
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (是否在缓冲区中, 元数据或 None 表示删除) 元组
+        """
+        with self._lock:
+            for changes in (self._pending, self._inflight):
+                if tool_name in changes:
+                    return True, changes[tool_name]
+        return False, None
+
+    def _buffer(self, changes: dict[str, ToolMetadata | None]) -> None:
+        """
+        合并变更到缓冲区，并按模式安排刷新
+
+        Args:
+            changes: 工具名称到元数据的映射（None 表示删除）
+
+        Raises:
+            IOError: 如果 BATCHED 模式批量已满时同步刷新失败
+        """
+        with self._lock:
+            was_empty = not self._pending
+            self._pending.update(changes)
+            batch_full = len(self._pending) >= self.batch_size
+
+        self._ensure_thread()
+        if batch_full:
+            if self.mode == WriteMode.BATCHED:
+                # 写入方承担刷新开销，缓冲区不会超过批量大小太多
+                self.flush()
+            else:
+                self._full_event.set()
+        if was_empty:
+            self._wake_event.set()
+
+    def _ensure_thread(self) -> None:
+        """启动后台刷新线程（已启动时不重复启动）"""
+        if self.is_running:
+            return
+        with self._lock:
+            if self.is_running:
+                return
+            self._thread = threading.Thread(
+                target=self._run_loop, name="registry-write-buffer", daemon=True
+            )
+            self._thread.start()
+
+    def _run_loop(self) -> None:
+        """后台线程主循环：等待第一次缓冲写入，再防抖等待后刷新"""
+        while not self._stop_event.is_set():
+            self._wake_event.wait()
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            self._full_event.wait(self.flush_delay)
+            self._full_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # 刷新失败不应终止后台线程，变更已放回缓冲区
+                logger.error(f"写缓冲刷新失败（将重试）: {e}")
+                self._wake_event.set()
+                self._stop_event.wait(self.flush_delay)
@@ -9,14 +9,25 @@ License: MIT
 
 import json
 import logging
+import os
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import TYPE_CHECKING
 
 from pydantic import ValidationError
 
-from registrytools.defaults import HOT_TOOL_THRESHOLD, WARM_TOOL_THRESHOLD
+from registrytools.defaults import (
+    JSON_JOURNAL_COMPACT_RATIO,
+    JSON_JOURNAL_MAX_BYTES,
+    JSON_JOURNAL_MIN_BYTES,
+)
 from registrytools.registry.models import ToolMetadata, ToolTemperature
+from registrytools.registry.scoring import classify_usage_score, usage_score_at
 from registrytools.storage.base import ToolStorage
 
 # TYPE_CHECKING 块保留用于其他前向引用
@@ -25,6 +36,68 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_FileKey = tuple[int, int] | None
+"""文件的 (mtime_ns, size)，文件不存在时为 None"""
+
+
+_SCHEMA_FIELDS = frozenset({"input_schema", "output_schema"})
+"""文档条目中的 Schema 字段"""
+
+_KNOWN_FIELDS = frozenset(ToolMetadata.model_fields)
+"""信任加载时保留的字段（未知字段被丢弃）"""
+
+_TEMPERATURES = {temperature.value: temperature for temperature in ToolTemperature}
+"""温度值到枚举的映射（比调用 ToolTemperature() 更快）"""
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock_file(fd: int) -> None:
+        """对文件加排他锁（阻塞直到获得）"""
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK 重试 10 次后仍未获得锁时抛出，继续等待
+                continue
+
+    def _unlock_file(fd: int) -> None:
+        """释放文件锁"""
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def _fsync_directory(path: Path) -> None:
+        """Windows 不支持打开目录，重命名由文件系统保证持久化"""
+
+else:
+    import fcntl
+
+    def _lock_file(fd: int) -> None:
+        """对文件加排他锁（阻塞直到获得）"""
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd: int) -> None:
+        """释放文件锁"""
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _fsync_directory(path: Path) -> None:
+        """fsync 目录，使其中的重命名持久化"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _stat_key(path: Path) -> _FileKey:
+    """获取文件的 (mtime_ns, size)，文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 class JSONStorage(ToolStorage):
     """
@@ -38,30 +111,95 @@ class JSONStorage(ToolStorage):
     }
     ```
 
+    默认命名空间使用主文件，其他命名空间的工具保存在同目录
+    namespaces/<namespace>.json 中（见 for_namespace()）。
+
+    解析后的文档缓存在内存中，每次访问前用 stat() 比较 (mtime_ns, size)，
+    只有文件被其他进程修改后才重新解析；exists/get/count 等单点操作是字典查找。
+    缓存的文档只读，写操作复制后修改，写入成功后替换缓存。
+
+    日志模式 (journal=True) 下，每次写入只向旁路日志 <name>.journal.jsonl 追加
+    JSONL 记录并 fsync，不重写整个文件；日志超过大小或与快照的比例阈值时，
+    把当前文档原子写回快照并删除日志（压缩）。读取时总是在快照上重放日志，
+    因此两种模式可以读取对方写入的数据；非日志模式的写入会把日志合并回快照。
+    写操作持有旁路锁文件 <name>.json.lock 上的操作系统文件锁，多个进程的
+    读取-修改-追加（或压缩）互相串行，不会覆盖或截断其他进程已提交的记录。
+
     Attributes:
-        _path: JSON 文件路径
+        _path: JSON 文件路径（快照）
+        _log_path: 日志文件路径
+        _lock_path: 跨进程写锁文件路径
+        _journal: 是否启用日志模式
+        _cache: 缓存的文档（工具名称到元数据字典的映射）
+        _cache_key: 缓存对应的 (快照, 日志) 文件键
+        _log_end: 已重放的日志字节数（最后一条完整记录之后）
+        _cache_lock: 保护缓存替换的锁
+        _write_lock: 串行化本进程内的写操作
     """
 
-    def __init__(self, path: str | Path) -> None:
+    def __init__(self, path: str | Path, journal: bool = False, verify: bool = False) -> None:
         """
         初始化 JSON 存储
 
         Args:
             path: JSON 文件路径（如 ~/.RegistryTools/tools.json）
+            journal: 是否启用追加日志模式，默认 False（每次写入原子重写整个文件）
+            verify: 读取时是否完整验证工具数据，默认 False（跳过 pydantic 验证）
         """
-        super().__init__(path)
+        super().__init__(path, verify)
         # 确保是 .json 文件
         if self._path.suffix != ".json":
             self._path = self._path.with_suffix(".json")
 
+        self._log_path = self._path.with_suffix(".journal.jsonl")
+        self._lock_path = self._path.with_name(f"{self._path.name}.lock")
+        self._journal = journal
+        self._cache: dict | None = None
+        self._cache_key: tuple[_FileKey, _FileKey] | None = None
+        self._log_end = 0
+        self._cache_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def journal(self) -> bool:
+        """是否启用追加日志模式"""
+        return self._journal
+
+    @property
+    def log_path(self) -> Path:
+        """日志文件路径"""
+        return self._log_path
+
+    def for_namespace(self, namespace: str) -> "JSONStorage":
+        """
+        获取指定命名空间的存储分区（每个命名空间一个 JSON 文件）
+
+        Args:
+            namespace: 命名空间名称（已验证格式）
+
+        Returns:
+            命名空间的 JSON 存储
+        """
+        return JSONStorage(
+            self._path.parent / "namespaces" / f"{namespace}.json",
+            journal=self._journal,
+            verify=self._verify,
+        )
+
     # ============================================================
     # 核心方法实现 (TASK-402)
     # ============================================================
 
-    def load_all(self) -> list[ToolMetadata]:
+    def load_all(self, include_schemas: bool = True) -> list[ToolMetadata]:
         """
         加载所有工具元数据
 
+        默认信任文档中的条目（由本存储写入），只把 JSON 类型还原为字段类型，
+        不经过 pydantic 验证；verify=True 时每个条目完整验证。
+
+        Args:
+            include_schemas: 是否加载 Schema。为 False 时不在返回的工具中保留解析后的 Schema 字典
+
         Returns:
             工具元数据列表
 
@@ -69,19 +207,17 @@ class JSONStorage(ToolStorage):
             FileNotFoundError: 如果 JSON 文件不存在
             IOError: 如果读取失败
         """
-        if not self._path.exists():
-            # 返回空列表而不是抛出异常
-            return []
-
         try:
-            with open(self._path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._read_document()
+            if data is None:
+                # 返回空列表而不是抛出异常
+                return []
 
             # 将字典转换为 ToolMetadata 列表
             tools = []
             for tool_data in data.values():
                 try:
-                    tool = ToolMetadata(**tool_data)
+                    tool = self._entry_to_tool(tool_data, include_schemas)
                     tools.append(tool)
                 except ValidationError as e:
                     # 跳过无效的工具数据，记录警告
@@ -111,27 +247,15 @@ class JSONStorage(ToolStorage):
         Raises:
             IOError: 如果保存失败
         """
-        # 加载现有数据
-        if self._path.exists():
-            try:
-                with open(self._path, encoding="utf-8") as f:
-                    data = json.load(f)
-            except (OSError, json.JSONDecodeError):
-                # 如果文件损坏，重新开始
-                data = {}
-        else:
-            data = {}
-
-        # 更新工具数据
-        data[tool.name] = tool.model_dump(mode="json")
-
-        # 原子写入
-        self._write_atomic(data)
+        self._write_changes({tool.name: tool.model_dump(mode="json")})
 
     def save_many(self, tools: list[ToolMetadata]) -> None:
         """
         批量保存工具元数据
 
+        与 save() 语义一致：已存在的工具被更新，其他工具保持不变。
+        整批工具只进行一次读取和一次原子写入。
+
         Args:
             tools: 工具元数据列表
 
@@ -141,11 +265,7 @@ class JSONStorage(ToolStorage):
         if not tools:
             return
 
-        # 构建字典
-        data = {tool.name: tool.model_dump(mode="json") for tool in tools}
-
-        # 原子写入
-        self._write_atomic(data)
+        self._write_changes({tool.name: tool.model_dump(mode="json") for tool in tools})
 
     def delete(self, tool_name: str) -> bool:
         """
@@ -160,31 +280,40 @@ class JSONStorage(ToolStorage):
         Raises:
             IOError: 如果删除失败
         """
-        if not self._path.exists():
-            return False
-
         try:
-            with open(self._path, encoding="utf-8") as f:
-                data = json.load(f)
-
-            if tool_name not in data:
+            data = self._read_document()
+            if data is None or tool_name not in data:
                 return False
 
-            # 删除工具
-            del data[tool_name]
+            self._write_changes({tool_name: None})
+            return True
 
-            # 如果没有工具了，删除文件
-            if not data:
-                self._path.unlink()
-            else:
-                # 否则原子写入
-                self._write_atomic(data)
+        except (OSError, json.JSONDecodeError) as e:
+            raise OSError(f"删除工具失败: {e}") from e
 
-            return True
+    def delete_many(self, tool_names: list[str]) -> int:
+        """
+        批量删除工具元数据（一次写入）
 
+        Args:
+            tool_names: 工具名称列表
+
+        Returns:
+            实际删除的工具数量
+
+        Raises:
+            IOError: 如果删除失败
+        """
+        try:
+            data = self._read_document()
         except (OSError, json.JSONDecodeError) as e:
             raise OSError(f"删除工具失败: {e}") from e
 
+        existing = [name for name in dict.fromkeys(tool_names) if data and name in data]
+        if existing:
+            self._write_changes(dict.fromkeys(existing))
+        return len(existing)
+
     def exists(self, tool_name: str) -> bool:
         """
         检查工具是否存在
@@ -195,47 +324,42 @@ class JSONStorage(ToolStorage):
         Returns:
             True 如果工具存在，否则 False
         """
-        if not self._path.exists():
-            return False
-
         try:
-            with open(self._path, encoding="utf-8") as f:
-                data = json.load(f)
-            return tool_name in data
+            data = self._read_document()
         except (OSError, json.JSONDecodeError):
             return False
+        return data is not None and tool_name in data
 
     def load_by_temperature(
         self,
         temperature: ToolTemperature,
         limit: int | None = None,
+        include_schemas: bool = True,
     ) -> list[ToolMetadata]:
         """
         按温度级别加载工具 (TASK-802)
 
-        JSON 实现版本：加载全部工具后过滤。
+        JSON 实现版本：加载全部工具后按衰减使用分数过滤，按衰减分数和最近使用时间排序。
 
         Args:
             temperature: 温度级别 (HOT/WARM/COLD)
             limit: 加载数量限制
+            include_schemas: 是否加载 Schema（同 load_all()）
 
         Returns:
             工具元数据列表
         """
         # 加载所有工具
-        all_tools = self.load_all()
-
-        # 根据温度过滤（使用枚举比较）
-        if temperature == ToolTemperature.HOT:
-            filtered = [t for t in all_tools if t.use_frequency >= HOT_TOOL_THRESHOLD]
-        elif temperature == ToolTemperature.WARM:
-            filtered = [
-                t for t in all_tools if WARM_TOOL_THRESHOLD <= t.use_frequency < HOT_TOOL_THRESHOLD
-            ]
-        else:  # ToolTemperature.COLD
-            filtered = [t for t in all_tools if t.use_frequency < WARM_TOOL_THRESHOLD]
-
-        # 应用限制
+        all_tools = self.load_all(include_schemas)
+
+        # 按当前时刻衰减后的使用分数过滤
+        now = datetime.now()
+        filtered = [
+            t for t in all_tools if classify_usage_score(usage_score_at(t, now)) == temperature
+        ]
+
+        # 按衰减分数和最近使用时间排序后应用限制
+        self._order_by_usage(filtered, now)
         return filtered[:limit] if limit else filtered
 
     # ============================================================
@@ -249,15 +373,11 @@ class JSONStorage(ToolStorage):
         Returns:
             工具数量
         """
-        if not self._path.exists():
-            return 0
-
         try:
-            with open(self._path, encoding="utf-8") as f:
-                data = json.load(f)
-            return len(data)
+            data = self._read_document()
         except (OSError, json.JSONDecodeError):
             return 0
+        return len(data) if data is not None else 0
 
     def is_empty(self) -> bool:
         """
@@ -278,29 +398,50 @@ class JSONStorage(ToolStorage):
         Returns:
             工具元数据，如果不存在则返回 None
         """
-        if not self._path.exists():
+        try:
+            data = self._read_document()
+        except (OSError, json.JSONDecodeError):
             return None
 
-        try:
-            with open(self._path, encoding="utf-8") as f:
-                data = json.load(f)
+        if data is None or tool_name not in data:
+            return None
+        return self._entry_to_tool(data[tool_name])
 
-            if tool_name not in data:
-                return None
+    def load_schemas(self, tool_name: str) -> tuple[dict | None, dict | None] | None:
+        """
+        按名称读取工具的 Schema
 
-            return ToolMetadata(**data[tool_name])
+        与 get() 不同，读取失败时抛出异常，避免调用方把缺失的 Schema 当作空值写回。
 
-        except (OSError, json.JSONDecodeError):
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组，工具不存在时返回 None
+
+        Raises:
+            IOError: 如果读取失败
+        """
+        try:
+            data = self._read_document()
+        except (OSError, json.JSONDecodeError) as e:
+            raise OSError(f"读取工具 Schema 失败: {e}") from e
+
+        tool_data = data.get(tool_name) if data is not None else None
+        if tool_data is None:
             return None
+        return (tool_data.get("input_schema"), tool_data.get("output_schema"))
 
     def clear(self) -> None:
         """
         清空所有工具元数据
 
-        删除 JSON 文件。
+        删除 JSON 文件和日志。
         """
-        if self._path.exists():
-            self._path.unlink()
+        with self._write_lock, self._process_lock():
+            self._path.unlink(missing_ok=True)
+            self._log_path.unlink(missing_ok=True)
+            self._invalidate_cache()
 
     def initialize(self) -> None:
         """
@@ -309,8 +450,8 @@ class JSONStorage(ToolStorage):
         创建父目录和空 JSON 文件。
         """
         super().initialize()
-        # 如果文件不存在，创建空文件
-        if not self._path.exists():
+        # 如果文件不存在，创建空文件（只有日志时快照视为空文档）
+        if not self._path.exists() and not self._log_path.exists():
             self._write_atomic({})
 
     def validate(self) -> bool:
@@ -321,14 +462,8 @@ class JSONStorage(ToolStorage):
             True 如果存储有效，否则 False
         """
         try:
-            if not self._path.exists():
-                return False
-            if not self._path.is_file():
-                return False
-            # 尝试解析 JSON
-            with open(self._path, encoding="utf-8") as f:
-                json.load(f)
-            return True
+            # 尝试解析快照和日志（文件未变化时使用缓存）
+            return self._read_document() is not None
         except Exception:
             return False
 
@@ -336,7 +471,322 @@ class JSONStorage(ToolStorage):
     # 私有辅助方法
     # ============================================================
 
-    def _write_atomic(self, data: dict) -> None:
+    def _entry_to_tool(self, tool_data: dict, include_schemas: bool = True) -> ToolMetadata:
+        """
+        将文档条目转换为 ToolMetadata
+
+        条目由 model_dump(mode="json") 写入，信任模式下只还原 tags (set)、
+        时间 (datetime) 和 temperature (枚举)，缺少的可选字段使用模型默认值。
+        无法按写入格式还原的条目（如手工编辑）和 verify=True 时完整验证。
+
+        Args:
+            tool_data: 文档中的工具条目（缓存的文档只读，不得修改）
+            include_schemas: 是否保留 Schema
+
+        Returns:
+            工具元数据
+
+        Raises:
+            ValidationError: 如果条目无效
+        """
+        if not self._verify:
+            try:
+                fields = dict(tool_data)
+                if not fields.keys() <= _KNOWN_FIELDS:
+                    fields = {key: fields[key] for key in _KNOWN_FIELDS.intersection(fields)}
+                if not include_schemas:
+                    fields.pop("input_schema", None)
+                    fields.pop("output_schema", None)
+                fields["name"] = tool_data["name"]
+                fields["description"] = tool_data["description"]
+                fields["tags"] = set(tool_data.get("tags") or ())
+                for key in ("last_used", "usage_score_updated_at"):
+                    value = fields.get(key)
+                    if value is not None:
+                        fields[key] = datetime.fromisoformat(value)
+                temperature = fields.get("temperature")
+                if temperature is not None:
+                    fields["temperature"] = _TEMPERATURES[temperature]
+                return self._construct_tool(fields)
+            except (KeyError, TypeError, ValueError):
+                # 不是本存储写入的格式，回退到完整验证
+                pass
+
+        if not include_schemas:
+            tool_data = {
+                key: value for key, value in tool_data.items() if key not in _SCHEMA_FIELDS
+            }
+        return ToolMetadata(**tool_data)
+
+    def _read_document(self) -> dict | None:
+        """
+        读取 JSON 文档（文件未变化时返回缓存）
+
+        快照和日志的 (mtime_ns, size) 与缓存一致时直接返回缓存；快照未变而日志增长时
+        只重放新增的日志记录；否则重新解析快照并重放整个日志。
+        返回的字典是缓存本身，调用方不得修改。
+
+        Returns:
+            工具名称到元数据字典的映射；快照和日志都不存在时返回 None
+
+        Raises:
+            OSError: 如果读取失败
+            json.JSONDecodeError: 如果快照格式错误
+        """
+        snapshot_key = _stat_key(self._path)
+        log_key = _stat_key(self._log_path)
+        if snapshot_key is None and log_key is None:
+            self._invalidate_cache()
+            return None
+
+        with self._cache_lock:
+            cached, cached_key, log_end = self._cache, self._cache_key, self._log_end
+        if cached is not None and cached_key == (snapshot_key, log_key):
+            return cached
+
+        if (
+            cached is not None
+            and cached_key is not None
+            and cached_key[0] == snapshot_key
+            and cached_key[1] is not None
+            and log_key is not None
+            and log_key[1] >= cached_key[1][1]
+        ):
+            # 只有日志被追加（本进程外的写入），在缓存的副本上重放新增记录
+            data = dict(cached)
+        else:
+            data = self._load_snapshot() if snapshot_key is not None else {}
+            log_end = 0
+
+        if log_key is not None:
+            log_end = self._replay_log(data, log_end)
+        else:
+            log_end = 0
+
+        # 读取期间文件再次变化时，下次 stat() 的结果不同，会重新读取
+        with self._cache_lock:
+            self._cache, self._cache_key, self._log_end = data, (snapshot_key, log_key), log_end
+        return data
+
+    def _load_snapshot(self) -> dict:
+        """
+        解析快照文件
+
+        Returns:
+            工具名称到元数据字典的映射
+
+        Raises:
+            OSError: 如果读取失败
+            json.JSONDecodeError: 如果文件格式错误
+        """
+        with open(self._path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise json.JSONDecodeError("顶层必须是对象", "", 0)
+        return data
+
+    def _replay_log(self, data: dict, offset: int) -> int:
+        """
+        从指定偏移重放日志记录
+
+        只应用以换行结尾的完整记录；崩溃时写了一半的末尾记录被忽略，
+        下次追加前截断（见 _append_log()）。
+
+        Args:
+            data: 要应用记录的文档（原地修改）
+            offset: 开始重放的字节偏移
+
+        Returns:
+            最后一条完整记录之后的字节偏移
+
+        Raises:
+            OSError: 如果读取失败
+        """
+        with open(self._log_path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if record["op"] == "put":
+                    data[record["name"]] = record["tool"]
+                elif record["op"] == "del":
+                    data.pop(record["name"], None)
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.warning(f"跳过无效的日志记录: {line[:100]!r}, 错误: {e}")
+        return offset + complete
+
+    def _write_changes(self, changes: dict[str, dict | None]) -> None:
+        """
+        写入一批变更
+
+        日志模式追加到日志（必要时压缩），否则原子重写整个文件。
+        持有跨进程写锁期间读取最新文档，其他进程已提交的记录都已重放。
+
+        Args:
+            changes: 工具名称到元数据字典的映射，值为 None 表示删除
+
+        Raises:
+            IOError: 如果写入失败
+        """
+        with self._write_lock, self._process_lock():
+            try:
+                current = self._read_document()
+            except (OSError, json.JSONDecodeError):
+                # 如果文件损坏，重新开始（重写快照）
+                current = None
+                self._invalidate_cache()
+
+            # 复制缓存的文档后修改
+            data = dict(current or {})
+            for name, tool_data in changes.items():
+                if tool_data is None:
+                    data.pop(name, None)
+                else:
+                    data[name] = tool_data
+
+            if self._journal and current is not None:
+                self._append_log(changes, data)
+            else:
+                self._write_snapshot(data)
+
+    def _append_log(self, changes: dict[str, dict | None], data: dict) -> None:
+        """
+        向日志追加变更记录并 fsync，日志超过阈值时压缩
+
+        持有跨进程写锁时调用。从已重放的偏移 _log_end 开始检查日志：
+        只截断最后一个换行之后写了一半的记录，之前的完整记录保留。
+
+        Args:
+            changes: 本次变更（值为 None 表示删除）
+            data: 应用变更后的完整文档
+
+        Raises:
+            IOError: 如果写入失败
+        """
+        payload = "".join(
+            json.dumps(
+                (
+                    {"op": "put", "name": name, "tool": tool_data}
+                    if tool_data is not None
+                    else {"op": "del", "name": name}
+                ),
+                ensure_ascii=False,
+            )
+            + "\n"
+            for name, tool_data in changes.items()
+        ).encode("utf-8")
+
+        with self._cache_lock:
+            snapshot_key = self._cache_key[0] if self._cache_key else None
+            log_end = self._log_end
+
+        try:
+            with open(self._log_path, "a+b") as f:
+                f.seek(log_end)
+                tail = f.read()
+                unreplayed = tail.rfind(b"\n") + 1
+                if unreplayed < len(tail):
+                    # 崩溃时写了一半的末尾记录
+                    f.truncate(log_end + unreplayed)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            raise OSError(f"写入 JSON 日志失败: {e}") from e
+
+        if unreplayed:
+            # 尚未重放的完整记录（持有写锁时不应出现），data 不包含它们，下次读取时重新重放
+            self._invalidate_cache()
+            return
+
+        log_end += len(payload)
+        with self._cache_lock:
+            self._cache = data
+            self._cache_key = (snapshot_key, _stat_key(self._log_path))
+            self._log_end = log_end
+
+        snapshot_size = snapshot_key[1] if snapshot_key else 0
+        if log_end >= JSON_JOURNAL_MAX_BYTES or (
+            log_end >= JSON_JOURNAL_MIN_BYTES
+            and log_end >= snapshot_size * JSON_JOURNAL_COMPACT_RATIO
+        ):
+            logger.debug(f"压缩 JSON 日志: 日志 {log_end} 字节, 快照 {snapshot_size} 字节")
+            self._write_snapshot(data)
+
+    def _write_snapshot(self, data: dict) -> None:
+        """
+        原子重写快照并删除日志（快照已包含日志中的全部记录）
+
+        没有工具时删除文件。存在日志时先 fsync 快照和所在目录（重命名持久化）
+        再删除日志，确保崩溃后不会同时丢失两者中的数据。
+
+        Args:
+            data: 完整文档
+
+        Raises:
+            IOError: 如果写入失败
+        """
+        has_log = self._log_path.exists()
+        if data:
+            snapshot_key = self._write_atomic(data, fsync=has_log)
+        else:
+            self._path.unlink(missing_ok=True)
+            snapshot_key = None
+        if has_log:
+            self._log_path.unlink(missing_ok=True)
+
+        with self._cache_lock:
+            if snapshot_key is None:
+                self._cache, self._cache_key = None, None
+            else:
+                self._cache, self._cache_key = data, (snapshot_key, None)
+            self._log_end = 0
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        """
+        持有跨进程写锁（锁文件上的操作系统文件锁）
+
+        Raises:
+            IOError: 如果无法创建锁文件
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock_file(fd)
+            try:
+                yield
+            finally:
+                _unlock_file(fd)
+        finally:
+            os.close(fd)
+
+    def _invalidate_cache(self) -> None:
+        """丢弃缓存的文档"""
+        with self._cache_lock:
+            self._cache, self._cache_key, self._log_end = None, None, 0
+
+    def _load_raw(self) -> dict:
+        """
+        读取原始 JSON 字典
+
+        Returns:
+            工具名称到元数据字典的映射（缓存的文档，调用方不得修改）；
+            文件不存在或损坏时返回空字典
+        """
+        try:
+            data = self._read_document()
+        except (OSError, json.JSONDecodeError):
+            # 如果文件损坏，重新开始
+            return {}
+        return data if data is not None else {}
+
+    def _write_atomic(self, data: dict, fsync: bool = False) -> _FileKey:
         """
         原子写入 JSON 数据
 
@@ -344,6 +794,10 @@ class JSONStorage(ToolStorage):
 
         Args:
             data: 要写入的字典数据
+            fsync: 是否 fsync 临时文件（重命名前）和所在目录（重命名后）
+
+        Returns:
+            写入后文件的 (mtime_ns, size)
 
         Raises:
             IOError: 如果写入失败
@@ -363,9 +817,19 @@ class JSONStorage(ToolStorage):
                 # 写入 JSON 数据（带缩进和排序，便于阅读）
                 json.dump(data, tmp_file, ensure_ascii=False, indent=2, sort_keys=True)
                 tmp_path = Path(tmp_file.name)
+                if fsync:
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
+
+            # 重命名不改变 mtime 和大小，在重命名前取得缓存键，
+            # 避免把其他进程随后的写入误认为本次写入
+            stat = tmp_path.stat()
 
             # 原子重命名
             tmp_path.replace(self._path)
+            if fsync:
+                _fsync_directory(self._path.parent)
+            return (stat.st_mtime_ns, stat.st_size)
 
         except OSError as e:
             # 清理临时文件
@@ -0,0 +1,274 @@
+"""
+SQLite 连接管理
+
+读连接池 + 单写连接写队列，供 SQLiteStorage 使用。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from registrytools.defaults import (
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE,
+    SQLITE_READ_POOL_SIZE,
+)
+
+T = TypeVar("T")
+
+_WriteItem = tuple[Callable[[sqlite3.Connection], Any], Future[Any]] | None
+"""写队列条目：(写操作, 结果)，None 表示停止写线程"""
+
+
+class SQLiteConnectionManager:
+    """
+    SQLite 连接管理器
+
+    - 读操作从连接池借用只读连接（query_only）。WAL 模式下多个读连接并行读取，
+      互不阻塞，也不被写入阻塞；空闲连接最多保留 read_pool_size 个
+    - 写操作放入队列，由专用写线程在唯一的写连接上按提交顺序执行；
+      每个写操作结束时提交（异常时回滚），调用方等待结果，返回时写入已提交
+    - 每个连接设置 synchronous=NORMAL（WAL 模式下掉电最多丢失最后提交的事务，
+      不会损坏数据库）、mmap_size 和 cache_size
+
+    close() 执行完队列中的写操作后关闭写连接和空闲读连接；之后再次使用时重新打开。
+
+    Attributes:
+        path: 数据库文件路径
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        setup: Callable[[sqlite3.Connection], None] | None = None,
+        configure: Callable[[sqlite3.Connection], None] | None = None,
+        read_pool_size: int = SQLITE_READ_POOL_SIZE,
+        mmap_size: int = SQLITE_MMAP_SIZE,
+        cache_size_kb: int = SQLITE_CACHE_SIZE_KB,
+        timeout: float = SQLITE_BUSY_TIMEOUT,
+    ) -> None:
+        """
+        初始化连接管理器（不立即打开连接）
+
+        Args:
+            path: 数据库文件路径
+            setup: 可选，打开后第一次读写前在写连接上执行一次（如模式迁移）
+            configure: 可选，每个新连接上执行（如注册 SQL 函数）
+            read_pool_size: 保留的空闲读连接数，默认 SQLITE_READ_POOL_SIZE
+            mmap_size: PRAGMA mmap_size（字节），默认 SQLITE_MMAP_SIZE
+            cache_size_kb: 每个连接的页缓存大小（KiB），默认 SQLITE_CACHE_SIZE_KB
+            timeout: 等待数据库锁的超时（秒），默认 SQLITE_BUSY_TIMEOUT
+
+        Raises:
+            ValueError: 如果 read_pool_size 为负数
+        """
+        if read_pool_size < 0:
+            raise ValueError(f"read_pool_size 不能为负数, 实际 {read_pool_size}")
+
+        self.path = path
+        self._setup = setup
+        self._configure = configure
+        self._read_pool_size = read_pool_size
+        self._mmap_size = mmap_size
+        self._cache_size_kb = cache_size_kb
+        self._timeout = timeout
+
+        # 保护连接池和写线程状态
+        self._lock = threading.Lock()
+        self._setup_lock = threading.Lock()
+        self._ready = False
+        # 每次 close() 递增，借出的旧读连接归还时直接关闭
+        self._generation = 0
+        self._idle_readers: list[sqlite3.Connection] = []
+        self._queue: queue.SimpleQueue[_WriteItem] | None = None
+        self._writer: threading.Thread | None = None
+
+    # ============================================================
+    # 读写接口
+    # ============================================================
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """
+        借用一个只读连接
+
+        Yields:
+            只读连接（退出上下文时归还连接池）
+
+        Raises:
+            sqlite3.Error: 如果打开连接失败
+        """
+        self._ensure_ready()
+        with self._lock:
+            generation = self._generation
+            conn = self._idle_readers.pop() if self._idle_readers else None
+        if conn is None:
+            conn = self._connect(readonly=True)
+
+        try:
+            yield conn
+        finally:
+            # 结束未读完的语句，避免读快照阻止 WAL 检查点
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                keep = (
+                    generation == self._generation
+                    and len(self._idle_readers) < self._read_pool_size
+                )
+                if keep:
+                    self._idle_readers.append(conn)
+            if not keep:
+                conn.close()
+
+    def write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        在写连接上执行写操作（经写队列串行执行）
+
+        操作结束时提交，抛出异常时回滚并把异常传给调用方。
+        操作内不得再调用 write()（写线程会等待自己）。
+
+        Args:
+            operation: 接收写连接的函数
+
+        Returns:
+            operation 的返回值
+
+        Raises:
+            sqlite3.Error: operation 或提交抛出的数据库错误
+        """
+        self._ensure_ready()
+        return self._submit(operation)
+
+    @property
+    def idle_reader_count(self) -> int:
+        """连接池中的空闲读连接数量"""
+        with self._lock:
+            return len(self._idle_readers)
+
+    @property
+    def is_writer_running(self) -> bool:
+        """写线程是否在运行"""
+        writer = self._writer
+        return writer is not None and writer.is_alive()
+
+    def close(self) -> None:
+        """
+        执行完已排队的写操作后关闭写连接和空闲读连接
+
+        借出中的读连接在归还时关闭。关闭后再次读写会重新打开连接。
+        """
+        with self._lock:
+            writer, write_queue = self._writer, self._queue
+            self._writer = None
+            self._queue = None
+            self._generation += 1
+            idle, self._idle_readers = self._idle_readers, []
+        with self._setup_lock:
+            self._ready = False
+
+        if writer is not None and write_queue is not None:
+            write_queue.put(None)
+            writer.join()
+        for conn in idle:
+            conn.close()
+
+    # ============================================================
+    # 私有辅助方法
+    # ============================================================
+
+    def _ensure_ready(self) -> None:
+        """打开后第一次读写前执行一次 setup"""
+        if self._ready:
+            return
+        with self._setup_lock:
+            if not self._ready:
+                if self._setup is not None:
+                    self._submit(self._setup)
+                self._ready = True
+
+    def _submit(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        把写操作放入队列并等待结果（需要时启动写线程）
+
+        Args:
+            operation: 接收写连接的函数
+
+        Returns:
+            operation 的返回值
+        """
+        future: Future[T] = Future()
+        with self._lock:
+            if self._writer is None or self._queue is None:
+                self._queue = queue.SimpleQueue()
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    args=(self._queue,),
+                    name="registry-sqlite-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+            self._queue.put((operation, future))
+        return future.result()
+
+    def _writer_loop(self, write_queue: "queue.SimpleQueue[_WriteItem]") -> None:
+        """
+        写线程：按提交顺序在唯一的写连接上执行写操作
+
+        Args:
+            write_queue: 写队列（收到 None 时退出）
+        """
+        conn: sqlite3.Connection | None = None
+        try:
+            while (item := write_queue.get()) is not None:
+                operation, future = item
+                try:
+                    if conn is None:
+                        conn = self._connect(readonly=False)
+                    result = operation(conn)
+                    conn.commit()
+                except BaseException as e:
+                    if conn is not None and conn.in_transaction:
+                        conn.rollback()
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        """
+        打开并配置连接
+
+        Args:
+            readonly: 是否为只读连接
+
+        Returns:
+            SQLite 连接（读连接可在任意线程使用）
+        """
+        conn = sqlite3.connect(self.path, timeout=self._timeout, check_same_thread=False)
+        try:
+            if not readonly:
+                # WAL 模式记录在数据库文件中，由写连接设置
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self._mmap_size)}")
+            conn.execute(f"PRAGMA cache_size={-int(self._cache_size_kb)}")
+            if readonly:
+                conn.execute("PRAGMA query_only=ON")
+            if self._configure is not None:
+                self._configure(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
@@ -9,21 +9,74 @@ License: MIT
 
 import json
 import logging
+import re
 import sqlite3
-import threading
+from collections.abc import Callable, Sequence
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from registrytools.defaults import HOT_TOOL_THRESHOLD, WARM_TOOL_THRESHOLD
+import jieba
+
+from registrytools.defaults import DEFAULT_NAMESPACE
 from registrytools.registry.models import ToolMetadata
+from registrytools.registry.scoring import (
+    classify_usage_score,
+    usage_decay_key,
+    usage_score_at,
+    usage_score_range,
+)
 from registrytools.storage.base import ToolStorage
+from registrytools.storage.sqlite_connections import SQLiteConnectionManager
 
 if TYPE_CHECKING:
     from registrytools.registry.models import ToolTemperature
 
 logger = logging.getLogger(__name__)
 
+# 汉字（unicode61 分词器把连续的汉字视为一个词，需要先用 jieba 分词）
+_CJK_PATTERN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+
+@cache
+def _fts5_available() -> bool:
+    """检查当前 sqlite3 模块是否编译了 FTS5 扩展（结果缓存）"""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def fts_segment(text: str | None) -> str | None:
+    """
+    为 FTS5 索引和查询分词：含汉字的文本用 jieba 搜索引擎模式切分，词之间以空格分隔
+
+    不含汉字的文本原样返回，由 unicode61 分词器处理。
+    写入时计算并保存到 tools 表的 fts_* 列，索引和查询必须使用同一切分。
+
+    Args:
+        text: 待分词的文本
+
+    Returns:
+        以空格分隔词语的文本（None 原样返回）
+
+    Examples:
+        >>> fts_segment("读取文件内容")
+        '读取 文件 内容'
+    """
+    if text is None or not _CJK_PATTERN.search(text):
+        return text
+    return " ".join(word for word in jieba.cut_for_search(text) if not word.isspace())
+
+
+_raw_decode_json = json.JSONDecoder().raw_decode
+"""信任加载时解码 tags 列（json.dumps 写入，无首尾空白，跳过 json.loads 的空白检查）"""
+
 
 class SQLiteStorage(ToolStorage):
     """
@@ -32,7 +85,8 @@ class SQLiteStorage(ToolStorage):
     将工具元数据存储到 SQLite 数据库。使用单表结构：
     ```sql
     CREATE TABLE tools (
-        name TEXT PRIMARY KEY,
+        namespace TEXT NOT NULL DEFAULT 'default',
+        name TEXT NOT NULL,
         description TEXT NOT NULL,
         mcp_server TEXT,
         defer_loading INTEGER DEFAULT 1,
@@ -40,20 +94,56 @@ class SQLiteStorage(ToolStorage):
         category TEXT,
         use_frequency INTEGER DEFAULT 0,
         last_used TEXT,
+        temperature TEXT DEFAULT 'cold',
         input_schema TEXT,
-        output_schema TEXT
+        output_schema TEXT,
+        usage_score REAL DEFAULT 0,
+        usage_score_updated_at TEXT,
+        usage_decay_key REAL,
+        fts_name TEXT,
+        fts_description TEXT,
+        fts_tags TEXT,
+        fts_category TEXT,
+        fts_mcp_server TEXT,
+        PRIMARY KEY (namespace, name)
     )
     ```
 
+    多个命名空间共享同一张表，每个 SQLiteStorage 实例只读写自己的命名空间分区。
+    (namespace, use_frequency, last_used)、(namespace, usage_decay_key, last_used)、
+    category 和 mcp_server 上建有二级索引，分层查询按索引范围和顺序读取。
+    usage_decay_key 是写入时计算的前向衰减键（scoring.usage_decay_key()），
+    未跟踪衰减的旧数据为 NULL。
+
+    模式版本记录在 PRAGMA user_version 中，首次连接时按顺序执行未应用的迁移：
+    - 版本 1：旧数据库缺少的列通过 ALTER TABLE 自动补齐，
+      没有 namespace 列的旧表重建后原有工具归入默认命名空间
+    - 版本 2：创建二级索引
+    - 版本 3：添加 usage_decay_key 列并回填，创建衰减键索引，删除未使用的 temperature 索引
+    - 版本 4：添加 fts_* 分词列并回填，删除依赖 SQL 函数 fts_segment 的旧 FTS5 索引
+
+    可选的 FTS5 全文索引（tools_fts）由 ensure_fts_index() 创建，不计入模式版本：
+    外部内容表不复制文本，由触发器随 tools 表的写入同步；含汉字的文本写入时在
+    Python 中经 jieba 分词，保存到对应的 fts_* 列（不含汉字时为 NULL），触发器以
+    coalesce(fts_列, 列) 建立索引。触发器只使用 SQL 内置函数，其他连接
+    （sqlite3 命令行、未注册函数的程序）同样可以写入 tools 表。
+    这些连接修改含汉字的列时应同时更新对应的 fts_* 列（置为 NULL 则按原文索引）。
+
+    连接由 SQLiteConnectionManager 管理：读取从只读连接池借用连接，WAL 模式下
+    多个线程并行读取；写入经写队列在唯一的写连接上串行执行。同一数据库的
+    命名空间分区共享连接管理器，由创建它的存储在 close() 时关闭。
+
     Attributes:
         _path: 数据库文件路径
+        _namespace: 命名空间分区
     """
 
     # 数据库表结构
     _TABLE_NAME = "tools"
     _CREATE_TABLE_SQL = f"""
     CREATE TABLE IF NOT EXISTS {_TABLE_NAME} (
-        name TEXT PRIMARY KEY,
+        namespace TEXT NOT NULL DEFAULT '{DEFAULT_NAMESPACE}',
+        name TEXT NOT NULL,
         description TEXT NOT NULL,
         mcp_server TEXT,
         defer_loading INTEGER DEFAULT 1,
@@ -63,34 +153,175 @@ class SQLiteStorage(ToolStorage):
         last_used TEXT,
         temperature TEXT DEFAULT 'cold',
         input_schema TEXT,
-        output_schema TEXT
+        output_schema TEXT,
+        usage_score REAL DEFAULT 0,
+        usage_score_updated_at TEXT,
+        usage_decay_key REAL,
+        fts_name TEXT,
+        fts_description TEXT,
+        fts_tags TEXT,
+        fts_category TEXT,
+        fts_mcp_server TEXT,
+        PRIMARY KEY (namespace, name)
     )
     """
 
-    def __init__(self, path: str | Path) -> None:
+    # 读取使用的列顺序（与 _row_to_tool 一致；写入额外包含 usage_decay_key 和 fts_* 列）
+    _COLUMNS = (
+        "name",
+        "description",
+        "mcp_server",
+        "defer_loading",
+        "tags",
+        "category",
+        "use_frequency",
+        "last_used",
+        "temperature",
+        "input_schema",
+        "output_schema",
+        "usage_score",
+        "usage_score_updated_at",
+    )
+    _COLUMN_LIST = ", ".join(_COLUMNS)
+    # 不读取 Schema 的列表达式（Schema 列以 NULL 占位，行结构不变）
+    _SUMMARY_COLUMN_LIST = ", ".join(
+        "NULL" if column in ("input_schema", "output_schema") else column for column in _COLUMNS
+    )
+    FTS_COLUMNS = ("name", "description", "tags", "category", "mcp_server")
+    """FTS5 索引的列（bm25 列权重按此顺序）"""
+    # 各 FTS 列分词后的文本（写入时计算，分词不改变文本时为 NULL）
+    _FTS_SEGMENTED_COLUMNS = tuple(f"fts_{column}" for column in FTS_COLUMNS)
+    _INSERT_SQL = (
+        f"INSERT OR REPLACE INTO {_TABLE_NAME} (namespace, {_COLUMN_LIST}, usage_decay_key, "
+        f"{', '.join(_FTS_SEGMENTED_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * (len(_COLUMNS) + len(_FTS_SEGMENTED_COLUMNS) + 2))})"
+    )
+
+    # 当前模式版本（PRAGMA user_version），新的模式变更追加为下一个版本
+    _SCHEMA_VERSION = 4
+
+    # 二级索引（模式版本 2），均以 namespace 开头以匹配分区查询
+    _INDEX_SQL = (
+        f"CREATE INDEX IF NOT EXISTS idx_{_TABLE_NAME}_use_frequency "
+        f"ON {_TABLE_NAME} (namespace, use_frequency DESC, last_used DESC, name)",
+        f"CREATE INDEX IF NOT EXISTS idx_{_TABLE_NAME}_category ON {_TABLE_NAME} (namespace, category)",
+        f"CREATE INDEX IF NOT EXISTS idx_{_TABLE_NAME}_mcp_server "
+        f"ON {_TABLE_NAME} (namespace, mcp_server)",
+    )
+    # 前向衰减键索引（模式版本 3），分层查询按键范围过滤并按键降序读取
+    _DECAY_INDEX_SQL = (
+        f"CREATE INDEX IF NOT EXISTS idx_{_TABLE_NAME}_usage_decay "
+        f"ON {_TABLE_NAME} (namespace, usage_decay_key DESC, last_used DESC, name)"
+    )
+
+    # FTS5 全文索引（外部内容表，rowid 对应 tools 表的 rowid）。
+    # 内容来自视图 tools_fts_content，各列优先取分词后的 fts_* 列，使汉字按词建立索引
+    _FTS_TABLE_NAME = f"{_TABLE_NAME}_fts"
+    _FTS_CONTENT_VIEW = f"{_FTS_TABLE_NAME}_content"
+    _CREATE_FTS_VIEW_SQL = (
+        f"CREATE VIEW IF NOT EXISTS {_FTS_CONTENT_VIEW} AS SELECT rowid AS tool_rowid, "
+        f"{', '.join(f'coalesce(fts_{column}, {column}) AS {column}' for column in FTS_COLUMNS)} "
+        f"FROM {_TABLE_NAME}"
+    )
+    _CREATE_FTS_SQL = (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE_NAME} USING fts5("
+        f"{', '.join(FTS_COLUMNS)}, content='{_FTS_CONTENT_VIEW}', content_rowid='tool_rowid', "
+        "prefix='2 3', tokenize='unicode61 remove_diacritics 2')"
+    )
+    _FTS_TRIGGER_SUFFIXES = ("bi", "ai", "ad", "au")
+    _FTS_INSERT_NEW = (
+        f"INSERT INTO {_FTS_TABLE_NAME} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (new.rowid, "
+        f"{', '.join(f'coalesce(new.fts_{column}, new.{column})' for column in FTS_COLUMNS)});"
+    )
+    _FTS_DELETE_OLD = (
+        f"INSERT INTO {_FTS_TABLE_NAME} ({_FTS_TABLE_NAME}, rowid, {', '.join(FTS_COLUMNS)}) "
+        "VALUES ('delete', old.rowid, "
+        f"{', '.join(f'coalesce(old.fts_{column}, old.{column})' for column in FTS_COLUMNS)});"
+    )
+    # INSERT OR REPLACE 删除旧行时不触发 DELETE 触发器（recursive_triggers 关闭），
+    # 因此在 BEFORE INSERT 中先从索引移除同名工具的旧行；插入失败时随语句一起回滚
+    _FTS_TRIGGERS_SQL = (
+        f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE_NAME}_bi BEFORE INSERT ON {_TABLE_NAME} BEGIN "
+        f"INSERT INTO {_FTS_TABLE_NAME} ({_FTS_TABLE_NAME}, rowid, {', '.join(FTS_COLUMNS)}) "
+        f"SELECT 'delete', rowid, "
+        f"{', '.join(f'coalesce(fts_{column}, {column})' for column in FTS_COLUMNS)} "
+        f"FROM {_TABLE_NAME} "
+        "WHERE namespace = new.namespace AND name = new.name; END",
+        f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE_NAME}_ai AFTER INSERT ON {_TABLE_NAME} BEGIN "
+        f"{_FTS_INSERT_NEW} END",
+        f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE_NAME}_ad AFTER DELETE ON {_TABLE_NAME} BEGIN "
+        f"{_FTS_DELETE_OLD} END",
+        f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE_NAME}_au AFTER UPDATE ON {_TABLE_NAME} BEGIN "
+        f"{_FTS_DELETE_OLD} {_FTS_INSERT_NEW} END",
+    )
+    # 带过滤函数的全文搜索每批读取的行数
+    _FTS_FETCH_SIZE = 256
+
+    # 旧数据库可能缺少的列及其定义
+    _MIGRATION_COLUMNS = {
+        "temperature": "TEXT DEFAULT 'cold'",
+        "usage_score": "REAL DEFAULT 0",
+        "usage_score_updated_at": "TEXT",
+    }
+
+    def __init__(
+        self,
+        path: str | Path,
+        namespace: str = DEFAULT_NAMESPACE,
+        verify: bool = False,
+        connections: SQLiteConnectionManager | None = None,
+    ) -> None:
         """
         初始化 SQLite 存储
 
         Args:
             path: 数据库文件路径（如 ~/.RegistryTools/tools.db）
+            namespace: 命名空间分区，默认 DEFAULT_NAMESPACE
+            verify: 读取时是否完整验证工具数据，默认 False（跳过 pydantic 验证）
+            connections: 可选，共享的连接管理器（命名空间分区使用）；
+                默认创建自己的连接管理器
         """
-        super().__init__(path)
+        super().__init__(path, verify)
+        self._namespace = namespace
         # 确保是 .db 文件
         if self._path.suffix != ".db":
             self._path = self._path.with_suffix(".db")
 
-        # 单例连接（线程安全）
-        self._conn: sqlite3.Connection | None = None
-        self._lock = threading.Lock()
+        # 连接管理器（读连接池 + 单写连接），只关闭自己创建的
+        self._owns_connections = connections is None
+        self._connections = connections or SQLiteConnectionManager(self._path, setup=self._migrate)
+
+        # FTS5 全文索引是否已确认存在
+        self._fts_ready = False
+
+    @property
+    def namespace(self) -> str:
+        """存储分区所属的命名空间"""
+        return self._namespace
+
+    def for_namespace(self, namespace: str) -> "SQLiteStorage":
+        """
+        获取指定命名空间的存储分区（同一数据库文件，按 namespace 列分区）
+
+        Args:
+            namespace: 命名空间名称（已验证格式）
+
+        Returns:
+            命名空间的 SQLite 存储
+        """
+        return SQLiteStorage(self._path, namespace, self._verify, self._connections)
 
     # ============================================================
     # 核心方法实现 (TASK-403)
     # ============================================================
 
-    def load_all(self) -> list[ToolMetadata]:
+    def load_all(self, include_schemas: bool = True) -> list[ToolMetadata]:
         """
         加载所有工具元数据
 
+        Args:
+            include_schemas: 是否加载 Schema。为 False 时查询不读取 Schema 列
+
         Returns:
             工具元数据列表
 
@@ -100,9 +331,13 @@ class SQLiteStorage(ToolStorage):
         self._ensure_initialized()
 
         try:
-            with self._get_connection() as conn:
+            with self._connections.read() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT * FROM {self._TABLE_NAME}")
+                columns = self._COLUMN_LIST if include_schemas else self._SUMMARY_COLUMN_LIST
+                cursor.execute(
+                    f"SELECT {columns} FROM {self._TABLE_NAME} WHERE namespace = ?",
+                    (self._namespace,),
+                )
                 rows = cursor.fetchall()
 
             # 转换为 ToolMetadata 列表
@@ -134,18 +369,10 @@ class SQLiteStorage(ToolStorage):
             IOError: 如果保存失败
         """
         self._ensure_initialized()
+        row = self._tool_to_row(tool)
 
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    f"""
-                    INSERT OR REPLACE INTO {self._TABLE_NAME}
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    self._tool_to_row(tool),
-                )
-                conn.commit()
+            self._connections.write(lambda conn: conn.execute(self._INSERT_SQL, row))
 
         except sqlite3.Error as e:
             raise OSError(f"保存工具到数据库失败: {e}") from e
@@ -166,32 +393,15 @@ class SQLiteStorage(ToolStorage):
             return
 
         self._ensure_initialized()
+        # 在调用方线程序列化，写线程只执行插入
+        rows = [self._tool_to_row(tool) for tool in tools]
 
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                # 开始事务
-                cursor.execute("BEGIN TRANSACTION")
-
-                try:
-                    # 批量插入
-                    for tool in tools:
-                        cursor.execute(
-                            f"""
-                            INSERT OR REPLACE INTO {self._TABLE_NAME}
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            self._tool_to_row(tool),
-                        )
-                    # 提交事务
-                    conn.commit()
-                except sqlite3.Error as e:
-                    # 回滚事务并记录错误
-                    logger.error(f"批量保存工具时发生数据库错误: {e}")
-                    conn.rollback()
-                    raise
+            # executemany 隐式开启事务，写线程结束时提交，出错时回滚
+            self._connections.write(lambda conn: conn.executemany(self._INSERT_SQL, rows))
 
         except sqlite3.Error as e:
+            logger.error(f"批量保存工具时发生数据库错误: {e}")
             raise OSError(f"批量保存工具到数据库失败: {e}") from e
 
     def delete(self, tool_name: str) -> bool:
@@ -210,17 +420,49 @@ class SQLiteStorage(ToolStorage):
         self._ensure_initialized()
 
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"DELETE FROM {self._TABLE_NAME} WHERE name = ?", (tool_name,))
-                conn.commit()
-
-                # 检查是否删除了行
-                return cursor.rowcount > 0
+            cursor = self._connections.write(
+                lambda conn: conn.execute(
+                    f"DELETE FROM {self._TABLE_NAME} WHERE namespace = ? AND name = ?",
+                    (self._namespace, tool_name),
+                )
+            )
+            # 检查是否删除了行
+            return cursor.rowcount > 0
 
         except sqlite3.Error as e:
             raise OSError(f"从数据库删除工具失败: {e}") from e
 
+    def delete_many(self, tool_names: list[str]) -> int:
+        """
+        批量删除工具元数据（一个事务）
+
+        Args:
+            tool_names: 工具名称列表
+
+        Returns:
+            实际删除的工具数量
+
+        Raises:
+            IOError: 如果删除失败
+        """
+        if not tool_names:
+            return 0
+
+        self._ensure_initialized()
+
+        params = [(self._namespace, name) for name in dict.fromkeys(tool_names)]
+
+        try:
+            cursor = self._connections.write(
+                lambda conn: conn.executemany(
+                    f"DELETE FROM {self._TABLE_NAME} WHERE namespace = ? AND name = ?", params
+                )
+            )
+            return cursor.rowcount
+
+        except sqlite3.Error as e:
+            raise OSError(f"从数据库批量删除工具失败: {e}") from e
+
     def exists(self, tool_name: str) -> bool:
         """
         检查工具是否存在
@@ -234,9 +476,12 @@ class SQLiteStorage(ToolStorage):
         self._ensure_initialized()
 
         try:
-            with self._get_connection() as conn:
+            with self._connections.read() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT 1 FROM {self._TABLE_NAME} WHERE name = ?", (tool_name,))
+                cursor.execute(
+                    f"SELECT 1 FROM {self._TABLE_NAME} WHERE namespace = ? AND name = ?",
+                    (self._namespace, tool_name),
+                )
                 return cursor.fetchone() is not None
 
         except sqlite3.Error:
@@ -246,15 +491,21 @@ class SQLiteStorage(ToolStorage):
         self,
         temperature: "ToolTemperature",
         limit: int | None = None,
+        include_schemas: bool = True,
     ) -> list[ToolMetadata]:
         """
         按温度级别加载工具 (TASK-802)
 
-        SQLite 优化版本：使用 WHERE 子句直接过滤。
+        SQLite 优化版本：温度按查询时刻衰减后的使用分数计算，而不是依赖持久化的
+        temperature 列。分数阈值换算为前向衰减键的界限，在 usage_decay_key 索引上
+        做范围查询；未跟踪衰减的旧数据以累计使用频率作为分数，在 use_frequency
+        索引上做范围查询。两部分各自按索引顺序读取至多 limit 行，合并后在 Python 中
+        按衰减分数、最近使用时间降序排列（同值按名称升序），limit 返回最常用的工具。
 
         Args:
             temperature: 温度级别 (HOT/WARM/COLD)
             limit: 加载数量限制（必须为非负整数）
+            include_schemas: 是否加载 Schema（同 load_all()）
 
         Returns:
             工具元数据列表
@@ -268,30 +519,50 @@ class SQLiteStorage(ToolStorage):
 
         self._ensure_initialized()
 
+        now = datetime.now()
+        lower, upper = usage_score_range(temperature)
+        # 衰减键条件：至少有一个界限，NULL 键（未跟踪衰减）不满足比较
+        decay_conditions: list[str] = []
+        decay_params: list[float] = []
+        # 未跟踪衰减的旧数据：分数即累计使用频率
+        frequency_conditions = ["usage_decay_key IS NULL"]
+        frequency_params: list[float] = []
+        if lower is not None:
+            decay_conditions.append("usage_decay_key >= ?")
+            decay_params.append(usage_decay_key(lower, now))
+            frequency_conditions.append("use_frequency >= ?")
+            frequency_params.append(lower)
+        if upper is not None:
+            decay_conditions.append("usage_decay_key < ?")
+            decay_params.append(usage_decay_key(upper, now))
+            frequency_conditions.append("use_frequency < ?")
+            frequency_params.append(upper)
+
+        # 注意：表名和列名是类常量，limit 已验证为非负整数
+        columns = self._COLUMN_LIST if include_schemas else self._SUMMARY_COLUMN_LIST
+        limit_sql = f" LIMIT {limit}" if limit else ""
+        queries = (
+            (
+                f"SELECT {columns} FROM {self._TABLE_NAME} "
+                f"WHERE namespace = ? AND {' AND '.join(decay_conditions)} "
+                f"ORDER BY usage_decay_key DESC, last_used DESC, name{limit_sql}",
+                (self._namespace, *decay_params),
+            ),
+            (
+                f"SELECT {columns} FROM {self._TABLE_NAME} "
+                f"WHERE namespace = ? AND {' AND '.join(frequency_conditions)} "
+                f"ORDER BY use_frequency DESC, last_used DESC, name{limit_sql}",
+                (self._namespace, *frequency_params),
+            ),
+        )
+
         try:
-            with self._get_connection() as conn:
+            rows: list[tuple] = []
+            with self._connections.read() as conn:
                 cursor = conn.cursor()
-
-                # 根据温度构建 WHERE 子句
-                # 注意：where_clause 基于枚举值和常量阈值构建，不涉及用户输入
-                if temperature.value == "hot":
-                    where_clause = f"use_frequency >= {HOT_TOOL_THRESHOLD}"
-                elif temperature.value == "warm":
-                    where_clause = (
-                        f"use_frequency >= {WARM_TOOL_THRESHOLD} "
-                        f"AND use_frequency < {HOT_TOOL_THRESHOLD}"
-                    )
-                else:  # cold
-                    where_clause = f"use_frequency < {WARM_TOOL_THRESHOLD}"
-
-                # 构建 SQL 查询
-                # 注意：表名是类常量，where_clause 是内部构建，limit 已验证为非负整数
-                sql = f"SELECT * FROM {self._TABLE_NAME} WHERE {where_clause}"
-                if limit:
-                    sql += f" LIMIT {limit}"
-
-                cursor.execute(sql)
-                rows = cursor.fetchall()
+                for sql, params in queries:
+                    cursor.execute(sql, params)
+                    rows.extend(cursor.fetchall())
 
             # 转换为 ToolMetadata 列表
             tools = []
@@ -308,11 +579,14 @@ class SQLiteStorage(ToolStorage):
                     logger.error(f"转换数据库行时发生意外错误: {e}")
                     continue
 
-            return tools
-
         except sqlite3.Error as e:
             raise OSError(f"按温度加载工具失败: {e}") from e
 
+        # 在缩小后的结果上按衰减分数复核温度（兼容没有衰减键的行）并排序
+        tools = [t for t in tools if classify_usage_score(usage_score_at(t, now)) == temperature]
+        self._order_by_usage(tools, now)
+        return tools[:limit] if limit else tools
+
     # ============================================================
     # 优化的工具方法
     # ============================================================
@@ -327,9 +601,12 @@ class SQLiteStorage(ToolStorage):
         self._ensure_initialized()
 
         try:
-            with self._get_connection() as conn:
+            with self._connections.read() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT COUNT(*) FROM {self._TABLE_NAME}")
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {self._TABLE_NAME} WHERE namespace = ?",
+                    (self._namespace,),
+                )
                 result = cursor.fetchone()
                 return result[0] if result else 0
 
@@ -358,9 +635,13 @@ class SQLiteStorage(ToolStorage):
         self._ensure_initialized()
 
         try:
-            with self._get_connection() as conn:
+            with self._connections.read() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT * FROM {self._TABLE_NAME} WHERE name = ?", (tool_name,))
+                cursor.execute(
+                    f"SELECT {self._COLUMN_LIST} FROM {self._TABLE_NAME} "
+                    "WHERE namespace = ? AND name = ?",
+                    (self._namespace, tool_name),
+                )
                 row = cursor.fetchone()
 
                 if row is None:
@@ -371,19 +652,55 @@ class SQLiteStorage(ToolStorage):
         except sqlite3.Error:
             return None
 
+    def load_schemas(self, tool_name: str) -> tuple[dict | None, dict | None] | None:
+        """
+        按名称读取工具的 Schema（只查询 Schema 列）
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            (input_schema, output_schema) 元组，工具不存在时返回 None
+
+        Raises:
+            IOError: 如果读取失败
+        """
+        self._ensure_initialized()
+
+        try:
+            with self._connections.read() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT input_schema, output_schema FROM {self._TABLE_NAME} "
+                    "WHERE namespace = ? AND name = ?",
+                    (self._namespace, tool_name),
+                )
+                row = cursor.fetchone()
+        except sqlite3.Error as e:
+            raise OSError(f"从数据库读取工具 Schema 失败: {e}") from e
+
+        if row is None:
+            return None
+        input_schema, output_schema = row
+        return (
+            json.loads(input_schema) if input_schema else None,
+            json.loads(output_schema) if output_schema else None,
+        )
+
     def clear(self) -> None:
         """
         清空所有工具元数据
 
-        删除表中的所有数据。
+        删除当前命名空间分区中的所有数据。
         """
         self._ensure_initialized()
 
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"DELETE FROM {self._TABLE_NAME}")
-                conn.commit()
+            self._connections.write(
+                lambda conn: conn.execute(
+                    f"DELETE FROM {self._TABLE_NAME} WHERE namespace = ?", (self._namespace,)
+                )
+            )
 
         except sqlite3.Error as e:
             raise OSError(f"清空数据库失败: {e}") from e
@@ -397,14 +714,145 @@ class SQLiteStorage(ToolStorage):
         super().initialize()
 
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(self._CREATE_TABLE_SQL)
-                conn.commit()
+            self._connections.write(self._create_schema)
 
         except sqlite3.Error as e:
             raise OSError(f"初始化数据库失败: {e}") from e
 
+    # ============================================================
+    # FTS5 全文索引
+    # ============================================================
+
+    @staticmethod
+    def fts5_available() -> bool:
+        """
+        检查当前 sqlite3 模块是否支持 FTS5
+
+        Returns:
+            True 如果支持 FTS5，否则 False
+        """
+        return _fts5_available()
+
+    def ensure_fts_index(self) -> bool:
+        """
+        创建 FTS5 全文索引和同步触发器（幂等）
+
+        索引是 tools 表的外部内容表，只保存倒排索引；之后 tools 表的插入、替换、
+        更新和删除由触发器同步到索引，无需在启动时重建。首次创建时在同一事务中
+        从现有数据重建一次索引。同一数据库的所有命名空间共享该索引。
+
+        旧版本创建的索引（直接以 tools 表为内容、不分词汉字）没有内容视图，
+        删除后按当前定义重建。
+
+        Returns:
+            True 如果本次新建了索引，False 如果索引已存在
+
+        Raises:
+            IOError: 如果 SQLite 不支持 FTS5 或创建失败
+        """
+        if self._fts_ready:
+            return False
+
+        self._ensure_initialized()
+
+        def create_index(conn: sqlite3.Connection) -> bool:
+            cursor = conn.cursor()
+            # 写锁内检查，避免其他进程同时重建（写线程结束时提交，出错时回滚）
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                "SELECT type FROM sqlite_master WHERE name IN (?, ?)",
+                (self._FTS_TABLE_NAME, self._FTS_CONTENT_VIEW),
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            created = existing != {"table", "view"}
+            if "table" in existing and created:
+                # 旧版本索引：删除后重建（触发器同样按新定义重建）
+                for suffix in self._FTS_TRIGGER_SUFFIXES:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {self._FTS_TABLE_NAME}_{suffix}")
+                cursor.execute(f"DROP TABLE {self._FTS_TABLE_NAME}")
+            cursor.execute(self._CREATE_FTS_VIEW_SQL)
+            cursor.execute(self._CREATE_FTS_SQL)
+            for sql in self._FTS_TRIGGERS_SQL:
+                cursor.execute(sql)
+            if created:
+                cursor.execute(
+                    f"INSERT INTO {self._FTS_TABLE_NAME} ({self._FTS_TABLE_NAME}) VALUES ('rebuild')"
+                )
+            return created
+
+        try:
+            created = self._connections.write(create_index)
+
+        except sqlite3.Error as e:
+            raise OSError(f"创建 FTS5 全文索引失败: {e}") from e
+
+        if created:
+            logger.info(f"已创建 FTS5 全文索引: {self._FTS_TABLE_NAME}")
+        self._fts_ready = True
+        return created
+
+    def search_fts(
+        self,
+        match: str,
+        limit: int,
+        weights: Sequence[float] | None = None,
+        accept: Callable[[str], bool] | None = None,
+    ) -> list[tuple[str, str, float]]:
+        """
+        在 FTS5 全文索引中搜索当前命名空间的工具
+
+        按 bm25() 排序在 SQLite 中完成，只有返回的行被读入内存。
+
+        Args:
+            match: FTS5 MATCH 查询表达式
+            limit: 返回结果数量限制
+            weights: 各列的 bm25 权重（FTS_COLUMNS 顺序），None 表示等权
+            accept: 可选的工具名称过滤函数；提供时按相关度分批读取，直到通过过滤的结果达到 limit
+
+        Returns:
+            (名称, 描述, bm25 分数) 列表，按相关度降序排列（bm25 分数越小越相关）
+
+        Raises:
+            IOError: 如果索引不存在或查询失败
+        """
+        if limit < 1:
+            return []
+
+        weight_params = tuple(weights or ())
+        rank = f"bm25({self._FTS_TABLE_NAME}{', ?' * len(weight_params)})"
+        sql = (
+            f"SELECT t.name, t.description, {rank} AS score "
+            f"FROM {self._FTS_TABLE_NAME} JOIN {self._TABLE_NAME} AS t "
+            f"ON t.rowid = {self._FTS_TABLE_NAME}.rowid "
+            f"WHERE {self._FTS_TABLE_NAME} MATCH ? AND t.namespace = ? ORDER BY score"
+        )
+        params: tuple = (*weight_params, match, self._namespace)
+        if accept is None:
+            sql += " LIMIT ?"
+            params += (limit,)
+
+        try:
+            with self._connections.read() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+                if accept is None:
+                    return cursor.fetchall()
+
+                hits: list[tuple[str, str, float]] = []
+                try:
+                    while len(hits) < limit:
+                        rows = cursor.fetchmany(self._FTS_FETCH_SIZE)
+                        if not rows:
+                            break
+                        hits.extend(row for row in rows if accept(row[0]))
+                finally:
+                    # 结束未读完的查询，释放读快照后再归还连接
+                    cursor.close()
+                return hits[:limit]
+
+        except sqlite3.Error as e:
+            raise OSError(f"FTS5 全文搜索失败: {e}") from e
+
     def validate(self) -> bool:
         """
         验证存储完整性
@@ -418,7 +866,7 @@ class SQLiteStorage(ToolStorage):
             if not self._path.is_file():
                 return False
             # 尝试连接数据库
-            with self._get_connection() as conn:
+            with self._connections.read() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
@@ -430,28 +878,184 @@ class SQLiteStorage(ToolStorage):
             logger.debug(f"检查表存在性时发生数据库错误: {e}")
             return False
 
+    def close(self) -> None:
+        """
+        关闭写连接和空闲读连接（之后的读写重新打开连接）
+
+        命名空间分区共享创建者的连接管理器，关闭分区不影响其他分区。
+        """
+        if self._owns_connections:
+            self._connections.close()
+
     # ============================================================
     # 私有辅助方法
     # ============================================================
 
-    def _get_connection(self) -> sqlite3.Connection:
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
         """
-        获取数据库连接（单例模式，线程安全）
+        创建表结构并执行未应用的迁移（在写连接上执行）
 
-        使用单例连接避免创建过多连接。首次调用时创建连接，
-        后续调用复用同一连接。
+        Args:
+            conn: 数据库连接
+        """
+        conn.execute(self._CREATE_TABLE_SQL)
+        conn.commit()
+        self._migrate(conn)
 
-        Returns:
-            SQLite 连接对象
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """
+        按 PRAGMA user_version 执行未应用的模式迁移（表不存在时跳过）
+
+        每个迁移完成后更新 user_version，已应用的迁移不再执行。迁移只做增量修改
+        （ALTER TABLE ADD COLUMN / CREATE INDEX IF NOT EXISTS），可安全重复执行，
+        更新版本号前中断时下次连接重新执行即可。
+
+        Args:
+            conn: 数据库连接
+        """
+        table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (self._TABLE_NAME,)
+        ).fetchone()
+        if table is None:
+            return
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self._SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            self._migrate_columns(conn)
+            self._set_schema_version(conn, 1)
+
+        if version < 2:
+            for sql in self._INDEX_SQL:
+                conn.execute(sql)
+            self._set_schema_version(conn, 2)
+            logger.info("数据库迁移：创建二级索引")
+
+        if version < 3:
+            self._migrate_decay_key(conn)
+            self._set_schema_version(conn, 3)
+
+        if version < 4:
+            self._migrate_fts_columns(conn)
+            self._set_schema_version(conn, 4)
+
+    @staticmethod
+    def _set_schema_version(conn: sqlite3.Connection, version: int) -> None:
+        """
+        记录已应用的模式版本
+
+        Args:
+            conn: 数据库连接
+            version: 模式版本（整数常量）
+        """
+        # PRAGMA 不支持参数绑定，version 是内部整数常量
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+
+    def _migrate_decay_key(self, conn: sqlite3.Connection) -> None:
+        """
+        模式版本 3：添加前向衰减键列并按已有使用分数回填，创建衰减键索引
+
+        温度由衰减分数决定后不再按 temperature 列查询，同时删除该列的索引。
+
+        Args:
+            conn: 数据库连接
+        """
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({self._TABLE_NAME})")}
+        with conn:
+            if "usage_decay_key" not in existing:
+                conn.execute(f"ALTER TABLE {self._TABLE_NAME} ADD COLUMN usage_decay_key REAL")
+            rows = conn.execute(
+                f"SELECT rowid, usage_score, usage_score_updated_at FROM {self._TABLE_NAME} "
+                "WHERE usage_score_updated_at IS NOT NULL"
+            ).fetchall()
+            conn.executemany(
+                f"UPDATE {self._TABLE_NAME} SET usage_decay_key = ? WHERE rowid = ?",
+                [
+                    (self._decay_key(score, self._deserialize_datetime(updated_at)), rowid)
+                    for rowid, score, updated_at in rows
+                ],
+            )
+            conn.execute(self._DECAY_INDEX_SQL)
+            conn.execute(f"DROP INDEX IF EXISTS idx_{self._TABLE_NAME}_temperature")
+        logger.info("数据库迁移：添加 usage_decay_key 列和衰减键索引")
+
+    def _migrate_fts_columns(self, conn: sqlite3.Connection) -> None:
+        """
+        模式版本 4：添加分词后的 fts_* 列并回填含汉字的行
+
+        之前版本的 FTS5 索引由视图和触发器调用 SQL 函数 fts_segment 分词，未注册该函数的
+        连接写入 tools 表时失败。先删除这些对象（下次 ensure_fts_index() 时按当前定义
+        重建），再回填，避免回填的 UPDATE 触发旧触发器。
+
+        Args:
+            conn: 数据库连接
+        """
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({self._TABLE_NAME})")}
+        with conn:
+            view = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='view' AND name=?",
+                (self._FTS_CONTENT_VIEW,),
+            ).fetchone()
+            if view is not None and "fts_segment" in view[0]:
+                for suffix in self._FTS_TRIGGER_SUFFIXES:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {self._FTS_TABLE_NAME}_{suffix}")
+                conn.execute(f"DROP TABLE IF EXISTS {self._FTS_TABLE_NAME}")
+                conn.execute(f"DROP VIEW {self._FTS_CONTENT_VIEW}")
+                logger.info("数据库迁移：删除依赖 fts_segment 函数的 FTS5 索引")
+
+            for column in self._FTS_SEGMENTED_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {self._TABLE_NAME} ADD COLUMN {column} TEXT")
+
+            rows = conn.execute(
+                f"SELECT rowid, {', '.join(self.FTS_COLUMNS)} FROM {self._TABLE_NAME}"
+            ).fetchall()
+            assignments = ", ".join(f"{column} = ?" for column in self._FTS_SEGMENTED_COLUMNS)
+            conn.executemany(
+                f"UPDATE {self._TABLE_NAME} SET {assignments} WHERE rowid = ?",
+                [
+                    (*segmented, rowid)
+                    for rowid, *texts in rows
+                    if any(segmented := self._segment_fts_columns(texts))
+                ],
+            )
+        logger.info("数据库迁移：添加 fts_* 分词列")
+
+    def _migrate_columns(self, conn: sqlite3.Connection) -> None:
         """
-        if self._conn is None:
-            with self._lock:
-                # 双重检查锁定
-                if self._conn is None:
-                    self._conn = sqlite3.connect(self._path, timeout=10.0)
-                    # 启用 WAL 模式以提高并发性能
-                    self._conn.execute("PRAGMA journal_mode=WAL")
-        return self._conn
+        模式版本 1：为旧数据库补齐缺少的列（表不存在时跳过）
+
+        没有 namespace 列的旧表以 name 为主键，无法通过 ALTER TABLE 修改主键，
+        需要重建表并把原有工具归入默认命名空间。
+
+        Args:
+            conn: 数据库连接
+        """
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({self._TABLE_NAME})")}
+        if not existing:
+            return
+
+        for column, definition in self._MIGRATION_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {self._TABLE_NAME} ADD COLUMN {column} {definition}")
+                logger.info(f"数据库迁移：添加列 {column}")
+        conn.commit()
+
+        if "namespace" not in existing:
+            legacy = f"{self._TABLE_NAME}_legacy"
+            with conn:
+                conn.execute(f"ALTER TABLE {self._TABLE_NAME} RENAME TO {legacy}")
+                conn.execute(self._CREATE_TABLE_SQL)
+                conn.execute(
+                    f"INSERT INTO {self._TABLE_NAME} (namespace, {self._COLUMN_LIST}) "
+                    f"SELECT ?, {self._COLUMN_LIST} FROM {legacy}",
+                    (DEFAULT_NAMESPACE,),
+                )
+                conn.execute(f"DROP TABLE {legacy}")
+            logger.info("数据库迁移：添加 namespace 列，原有工具归入默认命名空间")
 
     def _ensure_initialized(self) -> None:
         """确保数据库已初始化"""
@@ -468,23 +1072,66 @@ class SQLiteStorage(ToolStorage):
         Returns:
             数据库行元组
         """
+        tags = json.dumps(list(tool.tags), ensure_ascii=False)
         return (
+            self._namespace,
             tool.name,
             tool.description,
             tool.mcp_server,
             1 if tool.defer_loading else 0,
-            json.dumps(list(tool.tags), ensure_ascii=False),
+            tags,
             tool.category,
             tool.use_frequency,
             self._serialize_datetime(tool.last_used),
             tool.temperature.value,
             json.dumps(tool.input_schema) if tool.input_schema else None,
             json.dumps(tool.output_schema) if tool.output_schema else None,
+            tool.usage_score,
+            self._serialize_datetime(tool.usage_score_updated_at),
+            self._decay_key(tool.usage_score, tool.usage_score_updated_at),
+            *self._segment_fts_columns(
+                (tool.name, tool.description, tags, tool.category, tool.mcp_server)
+            ),
         )
 
+    @staticmethod
+    def _segment_fts_columns(texts: Sequence[str | None]) -> tuple[str | None, ...]:
+        """
+        计算 fts_* 列的值（FTS_COLUMNS 顺序）
+
+        Args:
+            texts: 各 FTS 列的原始文本
+
+        Returns:
+            分词后的文本，分词不改变文本（不含汉字）时为 None
+        """
+        segmented = []
+        for text in texts:
+            segment = fts_segment(text)
+            segmented.append(None if segment == text else segment)
+        return tuple(segmented)
+
+    @staticmethod
+    def _decay_key(
+        usage_score: float | None, usage_score_updated_at: datetime | None
+    ) -> float | None:
+        """
+        计算 usage_decay_key 列的值
+
+        Args:
+            usage_score: 使用分数
+            usage_score_updated_at: 使用分数更新时间
+
+        Returns:
+            前向衰减键，未跟踪衰减（更新时间为 None）时返回 None
+        """
+        if usage_score_updated_at is None:
+            return None
+        return usage_decay_key(usage_score or 0.0, usage_score_updated_at)
+
     def _row_to_tool(self, row: tuple) -> ToolMetadata:
         """
-        将数据库行转换为 ToolMetadata
+        将数据库行转换为 ToolMetadata（列值已转换为字段类型，见 _construct_tool()）
 
         Args:
             row: 数据库行元组
@@ -494,6 +1141,12 @@ class SQLiteStorage(ToolStorage):
         """
         from registrytools.registry.models import ToolTemperature
 
+        # 使用分数列（旧格式行没有这两列）
+        usage_score, usage_score_updated_at = 0.0, None
+        if len(row) == len(self._COLUMNS):
+            usage_score, usage_score_updated_at = row[11:]
+            row = row[:11]
+
         # 处理旧数据：可能没有 temperature 字段
         if len(row) == 10:
             # 旧格式（无 temperature 字段）
@@ -534,18 +1187,29 @@ class SQLiteStorage(ToolStorage):
             else:
                 temperature = ToolTemperature.COLD
 
-        return ToolMetadata(
-            name=name,
-            description=description,
-            mcp_server=mcp_server,
-            defer_loading=bool(defer_loading),
-            tags=set(json.loads(tags) if tags else []),
-            category=category,
-            use_frequency=use_frequency,
-            last_used=self._deserialize_datetime(last_used),
-            temperature=temperature,
-            input_schema=json.loads(input_schema) if input_schema else None,
-            output_schema=json.loads(output_schema) if output_schema else None,
+        if not tags:
+            tag_list = []
+        elif self._verify:
+            tag_list = json.loads(tags)
+        else:
+            tag_list = _raw_decode_json(tags)[0]
+
+        return self._construct_tool(
+            {
+                "name": name,
+                "description": description,
+                "mcp_server": mcp_server,
+                "defer_loading": bool(defer_loading),
+                "tags": set(tag_list),
+                "category": category,
+                "use_frequency": use_frequency,
+                "last_used": self._deserialize_datetime(last_used),
+                "temperature": temperature,
+                "usage_score": usage_score or 0.0,
+                "usage_score_updated_at": self._deserialize_datetime(usage_score_updated_at),
+                "input_schema": json.loads(input_schema) if input_schema else None,
+                "output_schema": json.loads(output_schema) if output_schema else None,
+            }
         )
 
     @staticmethod
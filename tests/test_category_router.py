@@ -0,0 +1,121 @@
+"""
+类别质心路由单元测试
+
+测试 CategoryCentroidRouter 的增量维护和查询路由。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import numpy as np
+import pytest
+
+from registrytools.search.category_router import CategoryCentroidRouter
+
+
+@pytest.fixture
+def router():
+    """创建包含 4 个类别的路由器（每个类别的向量沿不同坐标轴）"""
+    router = CategoryCentroidRouter(top_k=1, min_confidence=0.6)
+    categories = []
+    for axis, category in enumerate(["github", "slack", "aws", "database"]):
+        for _ in range(3):
+            vector = np.zeros(4)
+            vector[axis] = 1.0
+            router.add(category, vector)
+            categories.append(category)
+    router.assign_rows(categories)
+    return router
+
+
+class TestCategoryCentroidRouter:
+    """CategoryCentroidRouter 测试"""
+
+    def test_invalid_top_k(self):
+        """测试 top_k 必须大于 0"""
+        with pytest.raises(ValueError):
+            CategoryCentroidRouter(top_k=0)
+
+    def test_centroid_is_mean(self):
+        """测试质心等于类别向量均值"""
+        router = CategoryCentroidRouter()
+        router.add("github", np.array([1.0, 0.0]))
+        router.add("github", np.array([0.0, 1.0]))
+
+        centroid = router.get_centroid("github")
+        assert centroid is not None
+        assert np.allclose(centroid, [0.5, 0.5])
+
+    def test_incremental_remove(self):
+        """测试增量移除向量后质心正确更新"""
+        router = CategoryCentroidRouter()
+        router.add("github", np.array([1.0, 0.0]))
+        router.add("github", np.array([0.0, 1.0]))
+        router.remove("github", np.array([0.0, 1.0]))
+
+        centroid = router.get_centroid("github")
+        assert centroid is not None
+        assert np.allclose(centroid, [1.0, 0.0])
+
+    def test_remove_last_vector_drops_category(self):
+        """测试移除类别最后一个向量后类别被删除"""
+        router = CategoryCentroidRouter()
+        router.add("github", np.array([1.0, 0.0]))
+        router.remove("github", np.array([1.0, 0.0]))
+
+        assert router.category_count == 0
+        assert router.get_centroid("github") is None
+
+    def test_uncategorized_tools(self):
+        """测试未分类工具使用 None 作为类别键"""
+        router = CategoryCentroidRouter()
+        router.add(None, np.array([1.0, 0.0]))
+
+        assert router.category_count == 1
+        assert router.get_centroid(None) is not None
+
+    def test_route_selects_matching_category(self, router):
+        """测试路由选中最相近类别的行"""
+        rows = router.route(np.array([0.0, 0.0, 1.0, 0.0]))
+
+        assert rows is not None
+        assert sorted(rows.tolist()) == [6, 7, 8]
+
+    def test_route_low_confidence_falls_back(self, router):
+        """测试置信度不足时返回 None（回退到全局搜索）"""
+        rows = router.route(np.array([1.0, 1.0, 1.0, 1.0]))
+
+        assert rows is None
+
+    def test_route_insufficient_rows_falls_back(self, router):
+        """测试候选行不足时返回 None"""
+        rows = router.route(np.array([1.0, 0.0, 0.0, 0.0]), min_rows=5)
+
+        assert rows is None
+
+    def test_route_too_few_categories(self):
+        """测试类别数不超过 top_k 时不路由"""
+        router = CategoryCentroidRouter(top_k=3)
+        router.add("github", np.array([1.0, 0.0]))
+        router.assign_rows(["github"])
+
+        assert router.route(np.array([1.0, 0.0])) is None
+
+    def test_route_zero_query(self, router):
+        """测试零向量查询不路由"""
+        assert router.route(np.zeros(4)) is None
+
+    def test_centroid_cache_invalidated_on_add(self, router):
+        """测试添加向量后质心缓存失效"""
+        router.route(np.array([1.0, 0.0, 0.0, 0.0]))
+        assert router._centroids is not None
+
+        router.add("github", np.array([1.0, 0.0, 0.0, 0.0]))
+        assert router._centroids is None
+
+    def test_clear(self, router):
+        """测试清空路由器"""
+        router.clear()
+
+        assert router.category_count == 0
+        assert router.route(np.array([1.0, 0.0, 0.0, 0.0])) is None
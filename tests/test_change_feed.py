@@ -0,0 +1,154 @@
+"""
+注册表变更日志单元测试
+
+测试按代数记录的注册、注销和温度变化，以及增量拉取。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+
+import pytest
+
+from registrytools.registry.changes import ChangeLog, ChangeOp, ToolChange
+from registrytools.registry.models import ToolMetadata, ToolTemperature
+from registrytools.registry.registry import ToolRegistry
+from registrytools.server import create_server
+
+
+def ops(changes) -> list[tuple[str, str | None]]:
+    """提取 (变更类型, 工具名称) 列表"""
+    return [(change.op.value, change.tool_name) for change in changes]
+
+
+class TestChangeLog:
+    """ChangeLog 测试"""
+
+    def test_invalid_capacity(self):
+        """测试容量必须大于 0"""
+        with pytest.raises(ValueError, match="容量"):
+            ChangeLog(0)
+
+    def test_since(self):
+        """测试只返回指定代数之后的变更"""
+        log = ChangeLog()
+        log.extend([ToolChange(1, ChangeOp.REGISTER, "a"), ToolChange(1, ChangeOp.REGISTER, "b")])
+        log.extend([ToolChange(2, ChangeOp.UNREGISTER, "a")])
+
+        changes, truncated = log.since(1)
+
+        assert ops(changes) == [("unregister", "a")]
+        assert not truncated
+        assert len(log.since(0)[0]) == 3
+
+    def test_truncated_when_dropped(self):
+        """测试超出容量丢弃变更后，落后的消费者得到 truncated"""
+        log = ChangeLog(2)
+        for generation in (1, 2, 3):
+            log.extend([ToolChange(generation, ChangeOp.REGISTER, f"t{generation}")])
+
+        changes, truncated = log.since(1)
+
+        assert log.since(0)[1] is True
+        assert ops(changes) == [("register", "t2"), ("register", "t3")]
+        assert not truncated
+        assert len(log) == 2
+
+
+class TestRegistryChangeFeed:
+    """ToolRegistry 变更日志测试"""
+
+    def test_register_and_unregister(self):
+        """测试注册和注销以写操作的新代数记录"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="a", description="A"))
+        registry.unregister("a")
+
+        change_set = registry.get_changes()
+
+        assert ops(change_set.changes) == [("register", "a"), ("unregister", "a")]
+        assert [c.generation for c in change_set.changes] == [1, 2]
+        assert change_set.generation == registry.generation == 2
+
+    def test_bulk_register_shares_generation(self):
+        """测试批量注册的变更共享同一代数"""
+        registry = ToolRegistry()
+        registry.register_many(
+            [ToolMetadata(name=f"t{i}", description=f"Tool {i}") for i in range(3)]
+        )
+
+        changes = registry.get_changes().changes
+
+        assert {c.generation for c in changes} == {registry.generation}
+        assert [c.temperature for c in changes] == [ToolTemperature.COLD] * 3
+
+    def test_temperature_change(self):
+        """测试使用导致升级时记录温度变化"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="a", description="A", use_frequency=2))
+        since = registry.generation
+
+        registry.update_usage("a")
+
+        [change] = registry.get_changes(since).changes
+        assert change.op == ChangeOp.TEMPERATURE
+        assert change.temperature == ToolTemperature.WARM
+
+    def test_usage_without_temperature_change_not_logged(self):
+        """测试未改变温度的使用不产生变更"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="a", description="A"))
+        since = registry.generation
+
+        registry.update_usage("a")
+
+        assert registry.get_changes(since).changes == []
+
+    def test_clear(self):
+        """测试清空注册表记录 CLEAR 变更"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="a", description="A"))
+        since = registry.generation
+
+        registry.clear()
+
+        assert ops(registry.get_changes(since).changes) == [("clear", None)]
+
+    def test_iter_changes_truncated(self):
+        """测试变更已被丢弃时迭代器要求全量重新同步"""
+        registry = ToolRegistry(change_log_size=2)
+        for i in range(3):
+            registry.register(ToolMetadata(name=f"t{i}", description=f"Tool {i}"))
+
+        assert [c.tool_name for c in registry.iter_changes(1)] == ["t1", "t2"]
+        with pytest.raises(ValueError, match="全量重新同步"):
+            list(registry.iter_changes(0))
+
+    def test_negative_since(self):
+        """测试 since_generation 不能为负数"""
+        with pytest.raises(ValueError):
+            ToolRegistry().get_changes(-1)
+
+
+class TestGetChangesTool:
+    """get_changes MCP 工具测试"""
+
+    def test_incremental_sync(self, tmp_path):
+        """测试从返回的代数增量同步"""
+        server = create_server(tmp_path / "data")
+        tools = {tool.name: tool for tool in server._tool_manager._tools.values()}
+
+        first = json.loads(tools["get_changes"].fn())
+        tools["register_tool"].fn(name="new.tool", description="New tool")
+        second = json.loads(tools["get_changes"].fn(since_generation=first["generation"]))
+
+        assert first["truncated"] is False
+        assert second["changes"] == [
+            {
+                "generation": second["generation"],
+                "op": "register",
+                "tool_name": "new.tool",
+                "temperature": "cold",
+            }
+        ]
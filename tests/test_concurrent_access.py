@@ -590,3 +590,45 @@ class TestRaceConditions:
         assert len(search_results) == 10
         assert all(register_results)
         assert all(count >= 0 for count in search_results)
+
+    def test_snapshot_consistent_under_concurrent_writes(self, registry):
+        """
+        测试并发写入时读者获取的快照始终内部一致
+
+        快照的工具元组、名称映射和类别索引必须来自同一代状态。
+        """
+        registry.register_many(
+            [ToolMetadata(name=f"tool_{i}", description=f"Tool {i}") for i in range(100)]
+        )
+        errors = []
+        stop = threading.Event()
+
+        def writer():
+            for i in range(200):
+                name = f"churn_{i % 20}"
+                registry.register(
+                    ToolMetadata(name=name, description="Churn tool", category="churn")
+                )
+                registry.unregister(name)
+            stop.set()
+
+        def reader():
+            while not stop.is_set():
+                snapshot = registry.snapshot()
+                names = {tool.name for tool in snapshot.tools}
+                if names != set(snapshot.by_name):
+                    errors.append("tools/by_name mismatch")
+                indexed = set().union(*snapshot.category_index.values())
+                if not indexed <= names:
+                    errors.append("category index mismatch")
+
+        threads = [threading.Thread(target=writer)] + [
+            threading.Thread(target=reader) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert registry.tool_count == 100
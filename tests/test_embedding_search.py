@@ -9,6 +9,7 @@ License: MIT
 
 import threading
 
+import numpy as np
 import pytest
 
 from registrytools.registry.models import SearchMethod, ToolMetadata
@@ -532,3 +533,68 @@ class TestEmbeddingSearchLazyLoader:
         # 不传参数时，应该从环境变量读取
         searcher2 = EmbeddingSearch()
         assert searcher2._device in ("cpu", "cuda:0", "cuda:1")
+
+
+class TestEmbeddingCategoryRouting:
+    """Embedding 类别质心路由（两阶段分层搜索）测试"""
+
+    @pytest.fixture
+    def categorized_tools(self):
+        """创建按类别聚类的工具列表"""
+        topics = {
+            "github": "pull request branch repository commit",
+            "slack": "channel message chat notification",
+            "aws": "s3 bucket lambda cloud storage",
+            "database": "sql query table schema",
+            "filesystem": "read write file directory",
+        }
+        return [
+            ToolMetadata(
+                name=f"{category}.tool_{i}",
+                description=f"{category} {words} {i}",
+                category=category,
+            )
+            for category, words in topics.items()
+            for i in range(5)
+        ]
+
+    def test_routing_disabled_by_default(self):
+        """测试默认不启用路由"""
+        searcher = EmbeddingSearch()
+        assert searcher._router is None
+
+    def test_routing_restricts_to_matching_categories(self, categorized_tools):
+        """测试路由只返回候选类别内的工具"""
+        searcher = EmbeddingSearch(enable_routing=True, routing_top_k=1, routing_min_tools=1)
+        results = searcher.search("sql query on database table", categorized_tools, 3)
+
+        assert len(results) == 3
+        assert all(r.tool_name.startswith("database.") for r in results)
+
+    def test_centroids_updated_incrementally(self, categorized_tools):
+        """测试注册/注销工具后质心增量更新且仅编码变化的工具"""
+        searcher = EmbeddingSearch(enable_routing=True, routing_min_tools=1)
+        searcher.index(categorized_tools)
+        assert searcher._router is not None
+        assert searcher._router._counts["github"] == 5
+
+        new_tool = ToolMetadata(
+            name="github.new_tool", description="github merge", category="github"
+        )
+        searcher.index(categorized_tools + [new_tool])
+        assert searcher._router._counts["github"] == 6
+
+        searcher.index(categorized_tools)
+        assert searcher._router._counts["github"] == 5
+
+    def test_vector_cache_reused_on_reindex(self, categorized_tools):
+        """测试重建索引时复用未变化工具的向量"""
+        searcher = EmbeddingSearch()
+        searcher.index(categorized_tools)
+        cached = searcher._vector_cache[categorized_tools[0].name][2]
+
+        searcher.index(categorized_tools[:-1])
+        reused = searcher._vector_cache[categorized_tools[0].name][2]
+
+        assert np.array_equal(cached, reused)
+        assert categorized_tools[-1].name not in searcher._vector_cache
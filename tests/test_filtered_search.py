@@ -0,0 +1,218 @@
+"""
+预过滤搜索单元测试
+
+测试快照布尔掩码和按类别/标签/服务器/温度过滤的搜索。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from registrytools.registry.models import SearchMethod, ToolMetadata, ToolTemperature
+from registrytools.registry.registry import ToolRegistry
+from registrytools.search.bm25_search import BM25Search
+from registrytools.search.hybrid_search import HybridSearch
+from registrytools.search.regex_search import RegexSearch
+from registrytools.server import create_server
+
+
+class KeywordScorer:
+    """按关键字打分的语义打分器（记录每次打分的候选）"""
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.scored: list[list[str]] = []
+
+    def score_tools(self, query: str, tools: list[ToolMetadata]) -> np.ndarray:
+        self.scored.append([tool.name for tool in tools])
+        return np.array([1.0 if self.keyword in tool.description else 0.0 for tool in tools])
+
+
+@pytest.fixture
+def registry():
+    """创建包含多个服务器和类别工具的注册表"""
+    reg = ToolRegistry()
+    reg.register_searcher(SearchMethod.REGEX, RegexSearch())
+    reg.register_searcher(SearchMethod.BM25, BM25Search())
+    reg.register_many(
+        [
+            ToolMetadata(
+                name="github.create_pr",
+                description="Create a pull request",
+                category="git",
+                mcp_server="github",
+                tags={"git", "pr"},
+            ),
+            ToolMetadata(
+                name="github.merge_pr",
+                description="Merge a pull request",
+                category="git",
+                mcp_server="github",
+                tags={"git", "merge"},
+                use_frequency=20,
+            ),
+            ToolMetadata(
+                name="gitlab.merge_request",
+                description="Create a merge request pull request",
+                category="git",
+                mcp_server="gitlab",
+                tags={"git", "mr"},
+            ),
+            ToolMetadata(
+                name="slack.send_message",
+                description="Send message to channel",
+                category="chat",
+                mcp_server="slack",
+                tags={"message"},
+            ),
+        ]
+    )
+    return reg
+
+
+class TestSnapshotFilterRows:
+    """RegistrySnapshot.filter_rows 测试"""
+
+    def test_no_filters(self, registry):
+        """测试未指定条件时返回 None"""
+        assert registry.snapshot().filter_rows() is None
+
+    def test_single_facets(self, registry):
+        """测试单个维度的过滤"""
+        snapshot = registry.snapshot()
+
+        def names(rows):
+            return [snapshot.tools[row].name for row in rows]
+
+        assert names(snapshot.filter_rows(category="chat")) == ["slack.send_message"]
+        assert names(snapshot.filter_rows(mcp_server="github")) == [
+            "github.create_pr",
+            "github.merge_pr",
+        ]
+        assert names(snapshot.filter_rows(temperature=ToolTemperature.HOT)) == ["github.merge_pr"]
+        assert len(snapshot.filter_rows(category="missing")) == 0
+
+    def test_combined_facets_intersect(self, registry):
+        """测试多个条件按位与组合，标签需全部包含"""
+        snapshot = registry.snapshot()
+
+        rows = snapshot.filter_rows(category="git", tags=["git", "merge"], mcp_server="github")
+
+        assert [snapshot.tools[row].name for row in rows] == ["github.merge_pr"]
+
+    def test_masks_cached_per_snapshot(self, registry):
+        """测试掩码缓存在快照上，写操作后随快照失效"""
+        snapshot = registry.snapshot()
+        snapshot.filter_rows(mcp_server="github")
+        mask = snapshot._mask_cache[("mcp_server", "github")]
+
+        snapshot.filter_rows(mcp_server="github", category="git")
+        assert snapshot._mask_cache[("mcp_server", "github")] is mask
+        assert not mask.flags.writeable
+
+        registry.register(ToolMetadata(name="github.new", description="New", mcp_server="github"))
+        rows = registry.snapshot().filter_rows(mcp_server="github")
+        assert len(rows) == 3
+
+
+class TestFilteredSearch:
+    """ToolRegistry.search 预过滤测试"""
+
+    @pytest.mark.parametrize("method", [SearchMethod.BM25, SearchMethod.REGEX])
+    def test_results_respect_filter(self, registry, method):
+        """测试结果只包含满足条件的工具"""
+        results = registry.search("pull request", method=method, limit=5, mcp_server="github")
+
+        assert results
+        assert {r.tool_name for r in results} <= {"github.create_pr", "github.merge_pr"}
+
+    def test_limit_applies_after_filter(self, registry):
+        """测试 limit 作用于过滤后的结果"""
+        results = registry.search("merge", method=SearchMethod.BM25, limit=1, mcp_server="gitlab")
+
+        assert [r.tool_name for r in results] == ["gitlab.merge_request"]
+
+    def test_empty_filter_returns_nothing(self, registry):
+        """测试没有工具满足条件时返回空结果"""
+        assert registry.search("pull", method=SearchMethod.BM25, category="missing") == []
+
+    def test_bm25_scores_only_allowed_rows(self, registry, monkeypatch):
+        """测试 BM25 预过滤时不对全部工具打分"""
+        registry.rebuild_indexes()
+        searcher = registry.get_searcher(SearchMethod.BM25)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("预过滤搜索不应对全部工具打分")
+
+        monkeypatch.setattr(searcher._bm25, "get_scores", fail)
+
+        results = registry.search("merge", method=SearchMethod.BM25, category="git")
+
+        assert {r.tool_name for r in results} <= {
+            "github.create_pr",
+            "github.merge_pr",
+            "gitlab.merge_request",
+        }
+
+    def test_rows_follow_snapshot_after_layered_index(self, registry):
+        """测试分层索引重排顺序后，预过滤行号仍对应正确的工具"""
+        searcher = registry.get_searcher(SearchMethod.BM25)
+        snapshot = registry.snapshot()
+        searcher.index_layered(
+            list(snapshot.hot_tools), list(snapshot.warm_tools + snapshot.cold_tools)
+        )
+
+        results = registry.search("message", method=SearchMethod.BM25, category="chat")
+
+        assert [r.tool_name for r in results] == ["slack.send_message"]
+
+    def test_hybrid_reranks_only_filtered_candidates(self, registry):
+        """测试混合搜索只对过滤后的候选计算语义分数"""
+        # 补充无关工具，使 "pull" 在小语料中的 IDF 为正
+        registry.register_many(
+            [ToolMetadata(name=f"fs.tool_{i}", description="Read a file") for i in range(4)]
+        )
+        scorer = KeywordScorer("Merge")
+        registry.register_searcher(SearchMethod.HYBRID, HybridSearch(embedding=scorer))
+
+        results = registry.search("pull", method=SearchMethod.HYBRID, mcp_server="github")
+
+        assert len(scorer.scored) == 1
+        assert sorted(scorer.scored[0]) == ["github.create_pr", "github.merge_pr"]
+        assert results[0].tool_name == "github.merge_pr"
+
+    def test_fusion_with_filter(self, registry):
+        """测试融合搜索的所有方法共享过滤条件"""
+        registry.rebuild_indexes()
+
+        fused = registry.search_fusion("merge", limit=5, mcp_server="gitlab")
+
+        assert [r.tool_name for r in fused.results] == ["gitlab.merge_request"]
+
+
+class TestSearchToolsFilters:
+    """search_tools MCP 工具过滤参数测试"""
+
+    @pytest.fixture
+    def search_tools(self, tmp_path):
+        server = create_server(tmp_path / "data")
+        for tool in server._tool_manager._tools.values():
+            if tool.name == "search_tools":
+                return tool
+        raise AssertionError("search_tools 未注册")
+
+    def test_category_filter(self, search_tools):
+        """测试按类别过滤默认工具集"""
+        data = json.loads(search_tools.fn(query="create", search_method="bm25", category="github"))
+
+        assert data
+        assert all(item["tool_name"].startswith("github.") for item in data)
+
+    def test_invalid_temperature(self, search_tools):
+        """测试无效的温度级别"""
+        with pytest.raises(ValueError, match="温度级别"):
+            search_tools.fn(query="create", temperature="lukewarm")
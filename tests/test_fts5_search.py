@@ -0,0 +1,330 @@
+"""
+FTS5 全文搜索单元测试
+
+测试 SQLiteStorage 的 FTS5 索引同步和 FTS5Search 搜索算法。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from registrytools.registry.models import SearchMethod, ToolMetadata
+from registrytools.registry.registry import ToolRegistry
+from registrytools.search.fts5_search import FTS5Search
+from registrytools.server import create_server, create_server_with_sqlite
+from registrytools.storage.sqlite_storage import SQLiteStorage, fts_segment
+
+pytestmark = pytest.mark.skipif(
+    not SQLiteStorage.fts5_available(), reason="当前 SQLite 未编译 FTS5 扩展"
+)
+
+
+@pytest.fixture
+def tools() -> list[ToolMetadata]:
+    """示例工具"""
+    return [
+        ToolMetadata(
+            name="github.create_pull_request",
+            description="Create a new pull request in a GitHub repository",
+            mcp_server="github",
+            tags={"github", "git", "pr"},
+            category="github",
+        ),
+        ToolMetadata(
+            name="github.merge_pull_request",
+            description="Merge an existing pull request",
+            mcp_server="github",
+            tags={"github", "git"},
+            category="github",
+        ),
+        ToolMetadata(
+            name="fs.read_file",
+            description="Read the contents of a file",
+            mcp_server="filesystem",
+            tags={"file", "io"},
+            category="filesystem",
+        ),
+        ToolMetadata(
+            name="slack.send_message",
+            description="Send a message to a Slack channel",
+            mcp_server="slack",
+            tags={"chat"},
+            category="communication",
+        ),
+    ]
+
+
+@pytest.fixture
+def storage(tmp_path: Path, tools: list[ToolMetadata]) -> SQLiteStorage:
+    """已保存示例工具的 SQLite 存储"""
+    storage = SQLiteStorage(tmp_path / "tools.db")
+    storage.save_many(tools)
+    return storage
+
+
+def integrity_check(storage: SQLiteStorage) -> None:
+    """FTS5 外部内容索引与 tools 表一致性检查（不一致时抛出 sqlite3.DatabaseError）"""
+    conn = sqlite3.connect(storage.path)
+    try:
+        conn.execute("INSERT INTO tools_fts (tools_fts, rank) VALUES ('integrity-check', 1)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class TestFTS5Index:
+    """测试 SQLiteStorage 的 FTS5 索引"""
+
+    def test_ensure_fts_index_builds_from_existing_rows(self, storage: SQLiteStorage) -> None:
+        """测试首次创建时从现有数据建立索引，之后幂等"""
+        assert storage.ensure_fts_index() is True
+        assert storage.ensure_fts_index() is False
+        assert SQLiteStorage(storage.path).ensure_fts_index() is False
+
+        names = [name for name, _, _ in storage.search_fts('"pull"', 10)]
+        assert sorted(names) == ["github.create_pull_request", "github.merge_pull_request"]
+        integrity_check(storage)
+
+    def test_triggers_sync_replace_and_delete(self, storage: SQLiteStorage) -> None:
+        """测试替换、删除和清空通过触发器同步到索引"""
+        storage.ensure_fts_index()
+
+        storage.save(ToolMetadata(name="fs.read_file", description="Open documents"))
+        storage.delete("slack.send_message")
+
+        assert storage.search_fts('"contents"', 10) == []
+        assert [hit[0] for hit in storage.search_fts('"documents"', 10)] == ["fs.read_file"]
+        assert storage.search_fts('"slack"', 10) == []
+        integrity_check(storage)
+
+        storage.clear()
+        assert storage.search_fts('"pull"', 10) == []
+        integrity_check(storage)
+
+    def test_other_connections_can_write_tools(self, storage: SQLiteStorage) -> None:
+        """测试触发器不依赖自定义 SQL 函数，未注册函数的连接也能写入 tools 表"""
+        storage.save(ToolMetadata(name="fs.read_cn", description="读取文件内容"))
+        storage.ensure_fts_index()
+
+        conn = sqlite3.connect(storage.path)
+        try:
+            conn.execute("DELETE FROM tools WHERE name = 'fs.read_cn'")
+            conn.execute(
+                "INSERT INTO tools (name, description) VALUES ('cli.tool', 'Added from the CLI')"
+            )
+            conn.execute("UPDATE tools SET description = 'Fetch pages' WHERE name = 'fs.read_file'")
+            conn.commit()
+        finally:
+            conn.close()
+
+        assert storage.search_fts('"读取"', 10) == []
+        assert [hit[0] for hit in storage.search_fts('"cli"', 10)] == ["cli.tool"]
+        assert [hit[0] for hit in storage.search_fts('"pages"', 10)] == ["fs.read_file"]
+        integrity_check(storage)
+
+    def test_migrates_index_using_segment_function(self, tmp_path: Path) -> None:
+        """测试旧版本依赖 fts_segment 函数的索引在迁移时删除，之后按当前定义重建"""
+        db_path = tmp_path / "tools.db"
+        SQLiteStorage(db_path).save(ToolMetadata(name="fs.read_cn", description="读取文件内容"))
+        conn = sqlite3.connect(db_path)
+        conn.create_function("fts_segment", 1, fts_segment)
+        try:
+            conn.execute(
+                "CREATE VIEW tools_fts_content AS SELECT rowid AS tool_rowid, "
+                "fts_segment(name) AS name, fts_segment(description) AS description, "
+                "fts_segment(tags) AS tags, fts_segment(category) AS category, "
+                "fts_segment(mcp_server) AS mcp_server FROM tools"
+            )
+            conn.execute(
+                "CREATE VIRTUAL TABLE tools_fts USING fts5(name, description, tags, category, "
+                "mcp_server, content='tools_fts_content', content_rowid='tool_rowid')"
+            )
+            conn.execute(
+                "CREATE TRIGGER tools_fts_ad AFTER DELETE ON tools BEGIN "
+                "INSERT INTO tools_fts (tools_fts, rowid, description) "
+                "VALUES ('delete', old.rowid, fts_segment(old.description)); END"
+            )
+            conn.execute("UPDATE tools SET fts_description = NULL")
+            conn.execute("PRAGMA user_version = 3")
+            conn.commit()
+        finally:
+            conn.close()
+
+        storage = SQLiteStorage(db_path)
+        assert storage.ensure_fts_index() is True
+        assert [hit[0] for hit in storage.search_fts('"读取"', 10)] == ["fs.read_cn"]
+        integrity_check(storage)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("DELETE FROM tools")
+            conn.commit()
+        finally:
+            conn.close()
+        integrity_check(storage)
+
+    def test_namespaces_share_index_but_not_results(self, storage: SQLiteStorage) -> None:
+        """测试命名空间分区只返回自己的工具"""
+        other = storage.for_namespace("team")
+        other.save(ToolMetadata(name="team.pull_metrics", description="Pull team metrics"))
+        storage.ensure_fts_index()
+
+        assert "team.pull_metrics" not in [hit[0] for hit in storage.search_fts('"pull"', 10)]
+        assert [hit[0] for hit in other.search_fts('"pull"', 10)] == ["team.pull_metrics"]
+
+    def test_rebuilds_index_without_segmentation(self, storage: SQLiteStorage) -> None:
+        """测试旧版本索引（直接以 tools 表为内容）被删除后按分词定义重建"""
+        storage.save(ToolMetadata(name="fs.read_cn", description="读取文件内容"))
+        conn = sqlite3.connect(storage.path)
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE tools_fts USING fts5(name, description, tags, category, "
+                "mcp_server, content='tools', prefix='2 3', tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.execute("INSERT INTO tools_fts (tools_fts) VALUES ('rebuild')")
+            conn.commit()
+        finally:
+            conn.close()
+
+        assert storage.ensure_fts_index() is True
+
+        assert [hit[0] for hit in storage.search_fts('"读取"', 10)] == ["fs.read_cn"]
+        integrity_check(storage)
+
+    def test_search_fts_accept_filter_fills_limit(self, storage: SQLiteStorage) -> None:
+        """测试过滤函数跳过不允许的工具，直到满足 limit"""
+        storage.ensure_fts_index()
+
+        hits = storage.search_fts('"pull" OR "file"', 1, accept=lambda name: name.startswith("fs."))
+
+        assert [hit[0] for hit in hits] == ["fs.read_file"]
+
+
+class TestFTS5Search:
+    """测试 FTS5Search 搜索算法"""
+
+    def test_search_ranks_with_bm25(self, storage: SQLiteStorage) -> None:
+        """测试搜索按 bm25 排序，分数归一化到 [0, 1]"""
+        searcher = FTS5Search(storage)
+
+        results = searcher.search("merge pull request", [], 5)
+
+        assert results[0].tool_name == "github.merge_pull_request"
+        assert results[0].score == 1.0
+        assert all(0.0 <= result.score <= 1.0 for result in results)
+        assert results[0].match_reason == "fts5_match"
+
+    def test_prefix_query(self, storage: SQLiteStorage) -> None:
+        """测试以 * 结尾的词和 prefix=True 时的前缀查询"""
+        assert FTS5Search(storage).search("mer", [], 5) == []
+        assert [r.tool_name for r in FTS5Search(storage).search("mer*", [], 5)] == [
+            "github.merge_pull_request"
+        ]
+        assert [r.tool_name for r in FTS5Search(storage, prefix=True).search("mes", [], 5)] == [
+            "slack.send_message"
+        ]
+
+    def test_chinese_words(self, storage: SQLiteStorage) -> None:
+        """测试中文按词建立索引，查询其中的词可以命中"""
+        storage.save(ToolMetadata(name="fs.read_cn", description="读取文件内容"))
+        searcher = FTS5Search(storage)
+
+        assert [r.tool_name for r in searcher.search("读取", [], 5)] == ["fs.read_cn"]
+        assert [r.tool_name for r in searcher.search("内容", [], 5)] == ["fs.read_cn"]
+        assert [r.tool_name for r in searcher.search("读取文件内容", [], 5)] == ["fs.read_cn"]
+        assert searcher.build_match_query("读取文件 pull*") == '"读取" OR "文件" OR "pull"*'
+        integrity_check(storage)
+
+    def test_column_weights(self, storage: SQLiteStorage) -> None:
+        """测试列权重改变排序"""
+        storage.save(
+            ToolMetadata(name="chat.relay", description="Relay chat chat chat", tags={"misc"})
+        )
+
+        by_description = FTS5Search(storage).search("chat", [], 5)
+        by_tags = FTS5Search(storage, weights={"description": 0.0, "tags": 10.0}).search(
+            "chat", [], 5
+        )
+
+        assert by_description[0].tool_name == "chat.relay"
+        assert by_tags[0].tool_name == "slack.send_message"
+
+    def test_invalid_weights(self, storage: SQLiteStorage) -> None:
+        """测试未知列或负数权重"""
+        with pytest.raises(ValueError, match="未知的 FTS5 列"):
+            FTS5Search(storage, weights={"schema": 1.0})
+        with pytest.raises(ValueError, match="不能为负数"):
+            FTS5Search(storage, weights={"name": -1.0})
+
+    def test_query_syntax_is_escaped(self, storage: SQLiteStorage) -> None:
+        """测试查询中的 FTS5 运算符和引号按普通文本处理"""
+        searcher = FTS5Search(storage)
+
+        assert searcher.build_match_query('name: "pull" NOT -') == '"name" OR "pull" OR "NOT"'
+        assert searcher.build_match_query("!!!") == ""
+        assert searcher.search("!!!", [], 5) == []
+
+    def test_searches_tools_not_in_memory(self, storage: SQLiteStorage) -> None:
+        """测试注册表只加载部分工具时仍能搜索存储中的全部工具"""
+        registry = ToolRegistry()
+        registry.register(storage.get("github.create_pull_request"))
+        registry.register_searcher(SearchMethod.FTS5, FTS5Search(storage))
+        registry.rebuild_indexes()
+
+        results = registry.search("slack message", method=SearchMethod.FTS5)
+
+        assert [r.tool_name for r in results] == ["slack.send_message"]
+
+    def test_filtered_search_uses_subset(
+        self, storage: SQLiteStorage, tools: list[ToolMetadata]
+    ) -> None:
+        """测试过滤条件只返回允许的工具"""
+        registry = ToolRegistry()
+        registry.register_many(tools)
+        registry.register_searcher(SearchMethod.FTS5, FTS5Search(storage))
+
+        results = registry.search("pull file", method=SearchMethod.FTS5, category="filesystem")
+
+        assert [r.tool_name for r in results] == ["fs.read_file"]
+
+
+class TestFTS5Server:
+    """测试服务器注册 FTS5 搜索器"""
+
+    def test_registered_when_configured(self, tmp_path: Path, monkeypatch) -> None:
+        """测试 REGISTRYTOOLS_SEARCH_METHOD=fts5 且使用 SQLite 时可通过 search_tools 搜索"""
+        monkeypatch.setenv("REGISTRYTOOLS_SEARCH_METHOD", "fts5")
+        mcp = create_server_with_sqlite(tmp_path)
+        tools = {tool.name: tool for tool in mcp._tool_manager._tools.values()}
+
+        tools["register_tool"].fn(
+            name="acme.deploy", description="Deploy the service to production"
+        )
+        results = json.loads(tools["search_tools"].fn(query="deploy production"))
+
+        assert results[0]["tool_name"] == "acme.deploy"
+        assert results[0]["match_reason"] == "fts5_match"
+
+    def test_not_registered_for_json(self, tmp_path: Path, monkeypatch) -> None:
+        """测试 JSON 存储不注册 FTS5 搜索器"""
+        monkeypatch.setenv("REGISTRYTOOLS_SEARCH_METHOD", "fts5")
+        mcp = create_server(tmp_path)
+        tools = {tool.name: tool for tool in mcp._tool_manager._tools.values()}
+
+        with pytest.raises(ValueError, match="未注册"):
+            tools["search_tools"].fn(query="search")
+
+    def test_not_registered_by_default(self, tmp_path: Path, monkeypatch) -> None:
+        """测试未配置 fts5 时不创建 FTS5 索引"""
+        monkeypatch.delenv("REGISTRYTOOLS_SEARCH_METHOD", raising=False)
+        create_server_with_sqlite(tmp_path)
+
+        conn = sqlite3.connect(tmp_path / "tools.db")
+        fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tools_fts'").fetchone()
+        conn.close()
+        assert fts is None
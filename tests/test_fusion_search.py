@@ -0,0 +1,222 @@
+"""
+融合搜索单元测试
+
+测试 ToolRegistry.search_fusion 的并发执行、截止时间和倒数排名融合。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from registrytools.registry.models import SearchMethod, ToolMetadata, ToolSearchResult
+from registrytools.registry.registry import ToolRegistry
+from registrytools.search.base import SearchAlgorithm
+from registrytools.search.bm25_search import BM25Search
+from registrytools.search.regex_search import RegexSearch
+from registrytools.server import create_server
+from registrytools.storage.json_storage import JSONStorage
+
+
+class SlowSearch(SearchAlgorithm):
+    """固定延迟后返回第一个工具的搜索器"""
+
+    method = SearchMethod.EMBEDDING
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def index(self, tools: list[ToolMetadata]) -> None:
+        pass
+
+    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+        time.sleep(self.delay)
+        return self._filter_by_score([(tools[0], 1.0)], limit)
+
+    def _get_match_reason(self) -> str:
+        return "slow"
+
+
+class FailingSearch(SearchAlgorithm):
+    """总是抛出异常的搜索器"""
+
+    method = SearchMethod.HYBRID
+
+    def index(self, tools: list[ToolMetadata]) -> None:
+        pass
+
+    def search(self, query: str, tools: list[ToolMetadata], limit: int) -> list[ToolSearchResult]:
+        raise RuntimeError("boom")
+
+    def _get_match_reason(self) -> str:
+        return "failing"
+
+
+@pytest.fixture
+def registry():
+    """创建注册了 REGEX 和 BM25 搜索器的注册表"""
+    reg = ToolRegistry()
+    reg.register_searcher(SearchMethod.REGEX, RegexSearch(case_sensitive=False))
+    reg.register_searcher(SearchMethod.BM25, BM25Search())
+    reg.register_many(
+        [
+            ToolMetadata(name="github.create_pr", description="Create a pull request in GitHub"),
+            ToolMetadata(name="github.merge_pr", description="Merge a pull request"),
+            ToolMetadata(name="slack.send_message", description="Send message to Slack channel"),
+            ToolMetadata(name="aws.s3.upload", description="Upload file to AWS S3 bucket"),
+        ]
+    )
+    reg.rebuild_indexes()
+    yield reg
+    reg.close()
+
+
+class TestFusionSearch:
+    """ToolRegistry.search_fusion 测试"""
+
+    def test_fusion_merges_methods(self, registry):
+        """测试融合所有已注册方法并报告状态与耗时"""
+        fused = registry.search_fusion("pull request", limit=3)
+
+        assert set(fused.contributing_methods) == {SearchMethod.REGEX, SearchMethod.BM25}
+        assert all(report.latency_ms >= 0 for report in fused.methods)
+        assert fused.results[0].tool_name.startswith("github.")
+        assert all(r.match_reason == "reciprocal_rank_fusion" for r in fused.results)
+        assert all(0.0 <= r.score <= 1.0 for r in fused.results)
+
+    def test_slow_method_dropped(self, registry):
+        """测试超过截止时间的方法被丢弃且不阻塞响应"""
+        registry.register_searcher(SearchMethod.EMBEDDING, SlowSearch(delay=1.0))
+
+        start = time.perf_counter()
+        fused = registry.search_fusion("pull request", limit=3, deadline_ms=200)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.8
+        reports = {report.method: report for report in fused.methods}
+        assert reports[SearchMethod.EMBEDDING].status == "timeout"
+        assert SearchMethod.EMBEDDING not in fused.contributing_methods
+        assert fused.results
+
+    def test_slow_method_not_resubmitted_while_running(self, registry):
+        """测试超时任务仍在运行时该方法不再提交，结束后恢复"""
+        release = threading.Event()
+        calls = []
+
+        class BlockingSearch(SlowSearch):
+            def search(self, query, tools, limit):
+                calls.append(query)
+                release.wait(timeout=5)
+                return super().search(query, tools, limit)
+
+        registry.register_searcher(SearchMethod.EMBEDDING, BlockingSearch(delay=0))
+
+        first = registry.search_fusion("pull request", deadline_ms=50)
+        second = registry.search_fusion("pull request", deadline_ms=50)
+
+        assert {r.method: r.status for r in first.methods}[SearchMethod.EMBEDDING] == "timeout"
+        assert {r.method: r.status for r in second.methods}[SearchMethod.EMBEDDING] == "busy"
+        assert second.contributing_methods == [SearchMethod.REGEX, SearchMethod.BM25]
+        assert len(calls) == 1
+
+        release.set()
+        for _ in range(100):
+            if not registry._fusion_stragglers:
+                break
+            time.sleep(0.01)
+        third = registry.search_fusion("pull request", deadline_ms=2000)
+
+        assert {r.method: r.status for r in third.methods}[SearchMethod.EMBEDDING] == "ok"
+        assert len(calls) == 2
+
+    def test_failing_method_dropped(self, registry):
+        """测试执行出错的方法被丢弃"""
+        registry.register_searcher(SearchMethod.HYBRID, FailingSearch())
+
+        fused = registry.search_fusion("pull request", limit=3)
+
+        reports = {report.method: report for report in fused.methods}
+        assert reports[SearchMethod.HYBRID].status == "error"
+        assert set(fused.contributing_methods) == {SearchMethod.REGEX, SearchMethod.BM25}
+
+    def test_explicit_methods(self, registry):
+        """测试仅融合指定的方法"""
+        fused = registry.search_fusion("pull request", methods=[SearchMethod.BM25])
+
+        assert fused.contributing_methods == [SearchMethod.BM25]
+
+    def test_unregistered_method(self, registry):
+        """测试指定未注册的方法抛出异常"""
+        with pytest.raises(ValueError, match="未注册"):
+            registry.search_fusion("test", methods=[SearchMethod.EMBEDDING])
+
+    def test_search_with_fusion_method(self, registry):
+        """测试 search() 支持 FUSION 方法"""
+        results = registry.search("slack message", method=SearchMethod.FUSION, limit=2)
+
+        assert results[0].tool_name == "slack.send_message"
+
+    def test_empty_registry(self):
+        """测试空注册表返回空结果"""
+        fused = ToolRegistry().search_fusion("test")
+
+        assert fused.results == []
+        assert fused.methods == []
+
+
+class TestReciprocalRankFusion:
+    """倒数排名融合测试"""
+
+    def _result(self, name: str) -> ToolSearchResult:
+        return ToolSearchResult(tool_name=name, description=name, score=1.0, match_reason="x")
+
+    def test_agreement_ranks_first(self):
+        """测试多个方法一致靠前的工具排名第一且分数为 1"""
+        fused = ToolRegistry._reciprocal_rank_fusion(
+            [
+                [self._result("a"), self._result("b")],
+                [self._result("a"), self._result("c")],
+            ],
+            limit=3,
+        )
+
+        assert [r.tool_name for r in fused] == ["a", "b", "c"]
+        assert fused[0].score == pytest.approx(1.0)
+
+    def test_limit(self):
+        """测试结果数量限制"""
+        fused = ToolRegistry._reciprocal_rank_fusion(
+            [[self._result(name) for name in "abcde"]], limit=2
+        )
+
+        assert len(fused) == 2
+
+    def test_empty(self):
+        """测试无结果列表时返回空"""
+        assert ToolRegistry._reciprocal_rank_fusion([], limit=5) == []
+
+
+class TestFusionSearchTool:
+    """search_tools MCP 工具的 fusion 方法测试"""
+
+    def test_fusion_response_reports_methods(self, tmp_path):
+        """测试 fusion 响应包含参与方法和耗时"""
+        storage = JSONStorage(tmp_path / "tools.json")
+        storage.save_many(
+            [ToolMetadata(name="search_tool", description="搜索工具", category="utility")]
+        )
+        mcp = create_server(tmp_path)
+        search_tools = next(
+            tool for tool in mcp._tool_manager._tools.values() if tool.name == "search_tools"
+        )
+
+        data = json.loads(search_tools.fn(query="搜索", search_method="fusion", limit=5))
+
+        assert data["results"][0]["tool_name"] == "search_tool"
+        assert "bm25" in data["contributing_methods"]
+        assert all("latency_ms" in report for report in data["methods"])
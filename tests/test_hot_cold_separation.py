@@ -10,9 +10,12 @@ License: MIT
 import time
 from datetime import datetime, timedelta
 
+import pytest
+
 from registrytools.defaults import (
     HOT_TOOL_INACTIVE_DAYS,
     HOT_TOOL_THRESHOLD,
+    USAGE_SCORE_HALF_LIFE_DAYS,
     WARM_TOOL_INACTIVE_DAYS,
     WARM_TOOL_THRESHOLD,
 )
@@ -22,6 +25,7 @@ from registrytools.registry.models import (
     ToolTemperature,
 )
 from registrytools.registry.registry import ToolRegistry
+from registrytools.registry.scoring import record_usage, usage_score_at
 from registrytools.search.bm25_search import BM25Search
 from registrytools.storage.json_storage import JSONStorage
 from registrytools.storage.sqlite_storage import SQLiteStorage
@@ -185,7 +189,7 @@ class TestToolUpgrade:
         for _ in range(WARM_TOOL_THRESHOLD - 1):
             registry.update_usage(tool.name)
 
-        assert tool.temperature == ToolTemperature.WARM
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.WARM
         assert tool.name in registry._warm_tools
 
     def test_warm_to_hot_upgrade(self):
@@ -202,7 +206,7 @@ class TestToolUpgrade:
         for _ in range(HOT_TOOL_THRESHOLD - WARM_TOOL_THRESHOLD):
             registry.update_usage(tool.name)
 
-        assert tool.temperature == ToolTemperature.HOT
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.HOT
         assert tool.name in registry._hot_tools
 
     def test_cold_to_hot_direct_upgrade(self):
@@ -217,7 +221,7 @@ class TestToolUpgrade:
         for _ in range(HOT_TOOL_THRESHOLD - 1):
             registry.update_usage(tool.name)
 
-        assert tool.temperature == ToolTemperature.HOT
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.HOT
         assert tool.name in registry._hot_tools
 
     def test_upgrade_updates_last_used(self):
@@ -236,8 +240,9 @@ class TestToolUpgrade:
 
         registry.update_usage(tool.name)
 
-        assert tool.last_used is not None
-        assert tool.last_used > initial_last_used  # type: ignore[arg-type]
+        updated = registry.get_tool(tool.name)
+        assert updated.last_used is not None
+        assert updated.last_used > initial_last_used  # type: ignore[arg-type]
 
 
 # ============================================================
@@ -267,7 +272,7 @@ class TestToolDowngrade:
 
         registry._downgrade_tool(tool.name)
 
-        assert tool.temperature == ToolTemperature.WARM
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.WARM
 
     def test_warm_to_cold_downgrade(self):
         """测试温工具降级为冷工具"""
@@ -288,7 +293,7 @@ class TestToolDowngrade:
 
         registry._downgrade_tool(tool.name)
 
-        assert tool.temperature == ToolTemperature.COLD
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.COLD
 
     def test_no_downgrade_for_active_hot_tool(self):
         """测试活跃热工具不降级"""
@@ -322,6 +327,166 @@ class TestToolDowngrade:
         assert result is False  # 冷工具无法降级
 
 
+# ============================================================
+# 降级截止时间堆测试 (5个)
+# ============================================================
+
+
+class TestDowngradeHeap:
+    """测试基于截止时间堆的增量降级维护"""
+
+    def _register(self, registry, name, frequency, days_ago):
+        tool = ToolMetadata(
+            name=name,
+            description=name,
+            use_frequency=frequency,
+            last_used=datetime.now() - timedelta(days=days_ago),
+        )
+        registry.register(tool)
+        return tool
+
+    def test_only_expired_tools_downgraded(self):
+        """测试维护只降级截止时间已到的工具"""
+        registry = ToolRegistry()
+        stale = self._register(registry, "stale", HOT_TOOL_THRESHOLD, HOT_TOOL_INACTIVE_DAYS + 1)
+        active = self._register(registry, "active", HOT_TOOL_THRESHOLD, 1)
+
+        downgraded = registry._check_and_downgrade_other_tools()
+
+        assert downgraded == ["stale"]
+        assert registry.get_tool(stale.name).temperature == ToolTemperature.WARM
+        assert "stale" in registry._warm_tools
+        assert registry.get_tool(active.name).temperature == ToolTemperature.HOT
+        assert "active" in registry._hot_tools
+
+    def test_cascading_downgrade(self):
+        """测试超过两个窗口的热工具在一次维护中降为冷工具"""
+        registry = ToolRegistry()
+        tool = self._register(registry, "ancient", HOT_TOOL_THRESHOLD, 365)
+
+        downgraded = registry._check_and_downgrade_other_tools()
+
+        assert downgraded == ["ancient", "ancient"]
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.COLD
+        assert "ancient" in registry._cold_tools
+        assert "ancient" not in registry._downgrade_seq
+
+    def test_recent_use_reschedules(self):
+        """测试出堆时按最新 last_used 重新入堆而不降级"""
+        registry = ToolRegistry()
+        self._register(registry, "tool", HOT_TOOL_THRESHOLD, HOT_TOOL_INACTIVE_DAYS + 1)
+        registry._tools["tool"].last_used = datetime.now()
+
+        assert registry._check_and_downgrade_other_tools() == []
+        assert registry.get_tool("tool").temperature == ToolTemperature.HOT
+        assert "tool" in registry._downgrade_seq
+
+    def test_unregistered_tool_entry_ignored(self):
+        """测试已注销工具的堆条目被惰性丢弃"""
+        registry = ToolRegistry()
+        self._register(registry, "gone", HOT_TOOL_THRESHOLD, HOT_TOOL_INACTIVE_DAYS + 1)
+        registry.unregister("gone")
+
+        assert registry._check_and_downgrade_other_tools() == []
+
+    def test_first_usage_schedules_deadline(self):
+        """测试无使用记录的热工具首次使用后登记截止时间"""
+        registry = ToolRegistry()
+        tool = ToolMetadata(name="tool", description="Tool", use_frequency=HOT_TOOL_THRESHOLD)
+        registry.register(tool)
+        assert "tool" not in registry._downgrade_seq
+
+        registry.update_usage("tool")
+
+        assert "tool" in registry._downgrade_seq
+        # 分数在不活跃窗口内已衰减到温工具阈值以下，连续降级为冷工具
+        future = datetime.now() + timedelta(days=HOT_TOOL_INACTIVE_DAYS + 1)
+        assert registry._check_and_downgrade_other_tools(now=future) == ["tool", "tool"]
+        assert registry.get_tool("tool").temperature == ToolTemperature.COLD
+
+
+# ============================================================
+# 使用分数衰减测试 (5个)
+# ============================================================
+
+
+class TestUsageScoreDecay:
+    """测试指数衰减使用分数驱动的温度分类"""
+
+    def test_legacy_tool_uses_frequency(self):
+        """测试未跟踪衰减的工具以累计频率作为分数"""
+        tool = ToolMetadata(name="tool", description="Tool", use_frequency=7)
+
+        assert usage_score_at(tool) == 7.0
+
+    def test_score_halves_after_half_life(self):
+        """测试经过一个半衰期后分数减半"""
+        now = datetime.now()
+        tool = ToolMetadata(
+            name="tool", description="Tool", usage_score=8.0, usage_score_updated_at=now
+        )
+
+        later = now + timedelta(days=USAGE_SCORE_HALF_LIFE_DAYS)
+        assert usage_score_at(tool, later) == pytest.approx(4.0)
+
+    def test_record_usage_decays_then_increments(self):
+        """测试记录使用时先衰减再加 1，累计频率照常递增"""
+        start = datetime.now()
+        tool = ToolMetadata(
+            name="tool",
+            description="Tool",
+            use_frequency=20,
+            usage_score=8.0,
+            usage_score_updated_at=start,
+        )
+
+        record_usage(tool, start + timedelta(days=USAGE_SCORE_HALF_LIFE_DAYS))
+
+        assert tool.usage_score == pytest.approx(5.0)
+        assert tool.use_frequency == 21
+
+    def test_old_burst_becomes_cold(self):
+        """测试很久以前的集中使用不再使工具保持热状态"""
+        registry = ToolRegistry()
+        burst_at = datetime.now() - timedelta(days=USAGE_SCORE_HALF_LIFE_DAYS * 10)
+        tool = ToolMetadata(
+            name="burst",
+            description="Burst tool",
+            use_frequency=500,
+            usage_score=500.0,
+            usage_score_updated_at=burst_at,
+        )
+        registry.register(tool)
+
+        assert tool.temperature == ToolTemperature.COLD
+
+    def test_deadline_at_threshold_crossing(self):
+        """测试降级截止时间为分数衰减到阈值的时刻（早于不活跃窗口）"""
+        registry = ToolRegistry()
+        now = datetime.now()
+        tool = ToolMetadata(
+            name="tool",
+            description="Tool",
+            use_frequency=HOT_TOOL_THRESHOLD * 2,
+            last_used=now,
+            usage_score=HOT_TOOL_THRESHOLD * 2.0,
+            usage_score_updated_at=now,
+        )
+        registry.register(tool)
+        assert tool.temperature == ToolTemperature.HOT
+
+        # 分数 2 * 阈值，一个半衰期后降到阈值
+        deadline = registry._get_downgrade_deadline(tool)
+        expected = now + timedelta(days=USAGE_SCORE_HALF_LIFE_DAYS)
+        assert abs((deadline - expected).total_seconds()) < 60
+
+        just_before = expected - timedelta(hours=1)
+        assert registry._check_and_downgrade_other_tools(now=just_before) == []
+        just_after = expected + timedelta(hours=1)
+        assert registry._check_and_downgrade_other_tools(now=just_after) == ["tool"]
+        assert registry.get_tool("tool").temperature == ToolTemperature.WARM
+
+
 # ============================================================
 # 分层加载测试 (10个)
 # ============================================================
@@ -560,7 +725,7 @@ class TestRegistryIntegration:
         for _ in range(HOT_TOOL_THRESHOLD - WARM_TOOL_THRESHOLD):
             registry.update_usage(tool.name)
 
-        assert tool.temperature == ToolTemperature.HOT
+        assert registry.get_tool(tool.name).temperature == ToolTemperature.HOT
 
     def test_layer_counts(self):
         """测试各层工具计数"""
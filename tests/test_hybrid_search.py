@@ -0,0 +1,155 @@
+"""
+混合搜索单元测试
+
+测试 BM25 候选召回和 HybridSearch 两阶段融合排序。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import numpy as np
+import pytest
+
+from registrytools.registry.models import SearchMethod, ToolMetadata
+from registrytools.search.bm25_search import BM25Search
+from registrytools.search.hybrid_search import HybridSearch
+
+
+class KeywordScorer:
+    """按关键字给候选工具打分的语义打分器（记录每次打分的候选）"""
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.scored: list[list[str]] = []
+
+    def score_tools(self, query: str, tools: list[ToolMetadata]) -> np.ndarray:
+        self.scored.append([tool.name for tool in tools])
+        return np.array([1.0 if self.keyword in tool.description else 0.0 for tool in tools])
+
+
+@pytest.fixture
+def sample_tools():
+    """创建示例工具列表"""
+    return [
+        ToolMetadata(
+            name="github.create_pr",
+            description="Create a pull request in GitHub repository",
+            tags={"github", "git", "pr"},
+        ),
+        ToolMetadata(
+            name="github.merge_pr",
+            description="Merge a pull request after review",
+            tags={"github", "git", "merge"},
+        ),
+        ToolMetadata(
+            name="gitlab.merge_request",
+            description="Create merge request in GitLab",
+            tags={"gitlab", "mr"},
+        ),
+        ToolMetadata(
+            name="slack.send_message",
+            description="Send message to Slack channel",
+            tags={"slack", "message"},
+        ),
+        ToolMetadata(
+            name="aws.s3.upload",
+            description="Upload file to AWS S3 bucket",
+            tags={"aws", "s3"},
+        ),
+    ]
+
+
+class TestBM25TopCandidates:
+    """BM25Search.top_candidates 测试"""
+
+    def test_candidates_sorted_and_limited(self, sample_tools):
+        """测试候选按 BM25 分数降序并受数量限制"""
+        searcher = BM25Search()
+        searcher.index(sample_tools)
+
+        candidates = searcher.top_candidates("pull request", sample_tools, 2)
+
+        assert len(candidates) == 2
+        assert candidates[0][1] >= candidates[1][1]
+        assert {tool.name for tool, _ in candidates} <= {
+            "github.create_pr",
+            "github.merge_pr",
+            "gitlab.merge_request",
+        }
+
+    def test_candidates_exclude_zero_scores(self, sample_tools):
+        """测试不返回 BM25 分数为 0 的工具"""
+        searcher = BM25Search()
+        searcher.index(sample_tools)
+
+        candidates = searcher.top_candidates("slack", sample_tools, 10)
+
+        assert [tool.name for tool, _ in candidates] == ["slack.send_message"]
+
+    def test_candidates_empty_inputs(self, sample_tools):
+        """测试空查询和空工具列表"""
+        searcher = BM25Search()
+
+        assert searcher.top_candidates("", sample_tools, 5) == []
+        assert searcher.top_candidates("github", [], 5) == []
+
+
+class TestHybridSearch:
+    """HybridSearch 混合搜索测试"""
+
+    def test_method(self):
+        """测试搜索方法类型"""
+        assert HybridSearch(embedding=KeywordScorer("x")).method == SearchMethod.HYBRID
+
+    @pytest.mark.parametrize("weight", [-0.1, 1.5])
+    def test_invalid_weight(self, weight):
+        """测试融合权重必须在 [0, 1] 范围"""
+        with pytest.raises(ValueError):
+            HybridSearch(embedding=KeywordScorer("x"), bm25_weight=weight)
+
+    def test_invalid_candidate_pool(self):
+        """测试候选数量必须大于 0"""
+        with pytest.raises(ValueError):
+            HybridSearch(embedding=KeywordScorer("x"), candidate_pool=0)
+
+    def test_semantic_rerank(self, sample_tools):
+        """测试语义分数重排序 BM25 候选"""
+        scorer = KeywordScorer("review")
+        searcher = HybridSearch(embedding=scorer, bm25_weight=0.2)
+        searcher.index(sample_tools)
+
+        results = searcher.search("pull request", sample_tools, limit=3)
+
+        assert results[0].tool_name == "github.merge_pr"
+        assert all(r.match_reason == "hybrid_bm25_semantic" for r in results)
+
+    def test_only_candidates_are_scored(self, sample_tools):
+        """测试语义打分只覆盖 BM25 候选"""
+        scorer = KeywordScorer("review")
+        searcher = HybridSearch(embedding=scorer, candidate_pool=2)
+        searcher.index(sample_tools)
+
+        searcher.search("pull request", sample_tools, limit=1)
+
+        assert len(scorer.scored) == 1
+        assert len(scorer.scored[0]) == 2
+        assert "slack.send_message" not in scorer.scored[0]
+
+    def test_pure_bm25_weight(self, sample_tools):
+        """测试权重为 1 时结果与 BM25 排序一致"""
+        bm25 = BM25Search()
+        bm25.index(sample_tools)
+        expected = bm25.search("merge request", sample_tools, limit=1)
+
+        searcher = HybridSearch(embedding=KeywordScorer("Slack"), bm25_weight=1.0)
+        results = searcher.search("merge request", sample_tools, limit=1)
+
+        assert results[0].tool_name == expected[0].tool_name
+
+    def test_no_candidates(self, sample_tools):
+        """测试 BM25 无候选时返回空结果且不调用语义打分"""
+        scorer = KeywordScorer("review")
+        searcher = HybridSearch(embedding=scorer)
+
+        assert searcher.search("nonexistent", sample_tools, limit=5) == []
+        assert scorer.scored == []
@@ -0,0 +1,155 @@
+"""
+Schema 延迟加载单元测试
+
+测试 SchemaCache LRU 缓存，以及注册表按需从存储读取 Schema。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+
+import pytest
+
+from registrytools.registry.models import SearchMethod, ToolMetadata
+from registrytools.registry.registry import ToolRegistry
+from registrytools.registry.schemas import SchemaCache
+from registrytools.search.bm25_search import BM25Search
+from registrytools.server import create_server
+from registrytools.storage.json_storage import JSONStorage
+from registrytools.storage.sqlite_storage import SQLiteStorage
+
+
+class CountingStorage(SQLiteStorage):
+    """记录 load_schemas 调用的 SQLite 存储"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.schema_loads: list[str] = []
+
+    def load_schemas(self, tool_name):
+        self.schema_loads.append(tool_name)
+        return super().load_schemas(tool_name)
+
+
+def make_tool(name: str) -> ToolMetadata:
+    """创建带 Schema 的测试工具"""
+    return ToolMetadata(
+        name=name,
+        description=f"Tool {name} for searching files",
+        category="fs",
+        input_schema={"type": "object", "properties": {"path": {"type": "string"}}},
+        output_schema={"type": "string"},
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """保存了三个带 Schema 工具的存储"""
+    storage = CountingStorage(tmp_path / "tools.db")
+    storage.initialize()
+    storage.save_many([make_tool(f"fs.tool_{i}") for i in range(3)])
+    return storage
+
+
+@pytest.fixture
+def registry(storage):
+    """以延迟 Schema 方式加载存储的注册表"""
+    reg = ToolRegistry()
+    reg.enable_lazy_schemas(storage, cache_size=2)
+    reg.register_many(storage.load_all(include_schemas=False), defer_schemas=True)
+    reg.register_searcher(SearchMethod.BM25, BM25Search())
+    return reg
+
+
+class TestSchemaCache:
+    """SchemaCache 测试"""
+
+    def test_invalid_capacity(self):
+        """测试容量必须大于 0"""
+        with pytest.raises(ValueError, match="缓存容量"):
+            SchemaCache(0)
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = SchemaCache(2)
+        cache.put("a", ({"a": 1}, None))
+        cache.put("b", ({"b": 1}, None))
+        assert cache.get("a") == ({"a": 1}, None)
+
+        cache.put("c", ({"c": 1}, None))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (2, 1)
+
+
+class TestLazySchemaRegistry:
+    """注册表 Schema 延迟加载测试"""
+
+    def test_get_tool_loads_and_caches(self, registry, storage):
+        """测试 get_tool 首次访问时读取 Schema，之后命中缓存"""
+        tool = registry.get_tool("fs.tool_0")
+        again = registry.get_tool("fs.tool_0")
+
+        assert tool.input_schema == make_tool("fs.tool_0").input_schema
+        assert again.output_schema == {"type": "string"}
+        assert storage.schema_loads == ["fs.tool_0"]
+
+    def test_cache_evicts_to_capacity(self, registry, storage):
+        """测试超出缓存容量后重新从存储读取"""
+        for name in ("fs.tool_0", "fs.tool_1", "fs.tool_2", "fs.tool_0"):
+            registry.get_tool(name)
+
+        assert storage.schema_loads == ["fs.tool_0", "fs.tool_1", "fs.tool_2", "fs.tool_0"]
+
+    def test_search_and_list_do_not_load_schemas(self, registry, storage):
+        """测试搜索和列表路径不读取 Schema"""
+        results = registry.search("searching files", method=SearchMethod.BM25)
+        tools = registry.list_tools(category="fs")
+        registry.get_most_used()
+
+        assert results
+        assert len(tools) == 3
+        assert all(tool.input_schema is None for tool in tools)
+        assert storage.schema_loads == []
+
+    def test_reregister_replaces_cached_schemas(self, registry):
+        """测试重新注册工具后不再使用旧的缓存 Schema"""
+        registry.get_tool("fs.tool_0")
+        updated = make_tool("fs.tool_0")
+        updated.input_schema = {"type": "null"}
+
+        registry.register(updated)
+
+        assert registry.get_tool("fs.tool_0").input_schema == {"type": "null"}
+
+    def test_defer_requires_enable(self):
+        """测试未启用延迟加载时不能注册延迟 Schema 的工具"""
+        with pytest.raises(ValueError, match="enable_lazy_schemas"):
+            ToolRegistry().register(make_tool("x"), defer_schemas=True)
+
+
+class TestLazySchemaServer:
+    """服务器启动时的 Schema 延迟加载测试"""
+
+    @pytest.mark.parametrize("cache_size", ["256", "0"])
+    def test_get_tool_definition_returns_schema(self, tmp_path, monkeypatch, cache_size):
+        """测试启用或禁用延迟加载时 get_tool_definition 都返回完整 Schema"""
+        monkeypatch.setenv("REGISTRYTOOLS_SCHEMA_CACHE_SIZE", cache_size)
+        data_path = tmp_path / "data"
+        data_path.mkdir()
+        storage = JSONStorage(data_path / "tools.json")
+        storage.initialize()
+        storage.save(make_tool("fs.tool_0"))
+
+        server = create_server(data_path)
+        for tool in server._tool_manager._tools.values():
+            if tool.name == "get_tool_definition":
+                data = json.loads(tool.fn(tool_name="fs.tool_0"))
+                break
+        else:
+            raise AssertionError("get_tool_definition 未注册")
+
+        assert data["input_schema"] == make_tool("fs.tool_0").input_schema
@@ -0,0 +1,135 @@
+"""
+后台温度维护单元测试
+
+测试 TemperatureMaintenanceScheduler 的维护执行、批量持久化和生命周期。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from registrytools.defaults import (
+    HOT_TOOL_INACTIVE_DAYS,
+    HOT_TOOL_THRESHOLD,
+    TEMPERATURE_MAINTENANCE_INTERVAL,
+)
+from registrytools.registry.maintenance import TemperatureMaintenanceScheduler
+from registrytools.registry.models import ToolMetadata, ToolTemperature
+from registrytools.registry.registry import ToolRegistry
+from registrytools.server import _create_server_lifespan, get_maintenance_interval
+from registrytools.storage.json_storage import JSONStorage
+
+
+@pytest.fixture
+def registry():
+    """创建包含一个过期热工具和一个活跃热工具的注册表（不内联维护）"""
+    reg = ToolRegistry(inline_maintenance=False)
+    reg.register_many(
+        [
+            ToolMetadata(
+                name="stale",
+                description="Stale tool",
+                use_frequency=HOT_TOOL_THRESHOLD,
+                last_used=datetime.now() - timedelta(days=HOT_TOOL_INACTIVE_DAYS + 1),
+            ),
+            ToolMetadata(
+                name="active",
+                description="Active tool",
+                use_frequency=HOT_TOOL_THRESHOLD,
+                last_used=datetime.now(),
+            ),
+        ]
+    )
+    return reg
+
+
+class TestTemperatureMaintenanceScheduler:
+    """TemperatureMaintenanceScheduler 测试"""
+
+    def test_invalid_interval(self, registry):
+        """测试维护间隔必须大于 0"""
+        with pytest.raises(ValueError):
+            TemperatureMaintenanceScheduler(registry, interval=0)
+
+    def test_run_once_reports_moved_tools(self, registry):
+        """测试维护报告包含降级工具和耗时"""
+        scheduler = TemperatureMaintenanceScheduler(registry)
+
+        report = scheduler.run_once()
+
+        assert report.moved == ["stale"]
+        assert report.moved_count == 1
+        assert report.duration_ms >= 0
+        assert scheduler.last_report is report
+        assert registry.get_tool("stale").temperature == ToolTemperature.WARM
+
+    def test_run_once_persists_in_batch(self, registry, tmp_path):
+        """测试温度变化批量写入存储且不影响其他工具"""
+        storage = JSONStorage(tmp_path / "tools.json")
+        storage.save_many(registry.list_tools())
+        scheduler = TemperatureMaintenanceScheduler(registry, storage)
+
+        scheduler.run_once()
+
+        assert storage.count() == 2
+        assert storage.get("stale").temperature == ToolTemperature.WARM
+        assert storage.get("active").temperature == ToolTemperature.HOT
+
+    def test_update_usage_without_inline_maintenance(self, registry):
+        """测试关闭内联维护后 update_usage 不触发降级"""
+        registry.update_usage("active")
+
+        assert registry.get_tool("stale").temperature == ToolTemperature.HOT
+
+    def test_background_thread(self, registry):
+        """测试后台线程周期性执行维护并可停止"""
+        scheduler = TemperatureMaintenanceScheduler(registry, interval=0.05)
+        scheduler.start()
+        try:
+            deadline = time.time() + 2
+            while scheduler.last_report is None and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+
+        assert scheduler.last_report is not None
+        assert registry.get_tool("stale").temperature == ToolTemperature.WARM
+        assert not scheduler.is_running
+
+    async def test_server_lifespan(self, registry):
+        """测试服务器生命周期启动和停止维护线程"""
+        scheduler = TemperatureMaintenanceScheduler(registry, interval=60)
+        lifespan = _create_server_lifespan(registry, scheduler)
+
+        async with lifespan(None):
+            assert scheduler.is_running
+
+        assert not scheduler.is_running
+
+
+class TestGetMaintenanceInterval:
+    """get_maintenance_interval 测试"""
+
+    def test_default(self, monkeypatch):
+        """测试未设置时使用默认值"""
+        monkeypatch.delenv("REGISTRYTOOLS_MAINTENANCE_INTERVAL", raising=False)
+
+        assert get_maintenance_interval() == TEMPERATURE_MAINTENANCE_INTERVAL
+
+    @pytest.mark.parametrize(("value", "expected"), [("60", 60.0), ("0", 0.0), ("0.5", 0.5)])
+    def test_valid_values(self, monkeypatch, value, expected):
+        """测试有效值"""
+        monkeypatch.setenv("REGISTRYTOOLS_MAINTENANCE_INTERVAL", value)
+
+        assert get_maintenance_interval() == expected
+
+    @pytest.mark.parametrize("value", ["abc", "-1"])
+    def test_invalid_values(self, monkeypatch, value):
+        """测试无效值回退到默认值"""
+        monkeypatch.setenv("REGISTRYTOOLS_MAINTENANCE_INTERVAL", value)
+
+        assert get_maintenance_interval() == TEMPERATURE_MAINTENANCE_INTERVAL
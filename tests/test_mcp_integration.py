@@ -20,7 +20,7 @@ from registrytools.registry.models import SearchMethod, ToolMetadata
 from registrytools.registry.registry import ToolRegistry
 from registrytools.search.bm25_search import BM25Search
 from registrytools.search.regex_search import RegexSearch
-from registrytools.server import create_server, create_server_with_sqlite
+from registrytools.server import create_server, create_server_with_binary, create_server_with_sqlite
 from registrytools.storage.json_storage import JSONStorage
 
 # ============================================================
@@ -323,6 +323,65 @@ class TestListToolsByCategoryFunction:
         assert data["tools"] == []
 
 
+class TestListToolsByTagAndServerFunction:
+    """直接测试 list_tools_by_tag / list_tools_by_server 工具函数"""
+
+    @staticmethod
+    def _get_tool(server, name):
+        for tool in server._tool_manager._tools.values():
+            if tool.name == name:
+                return tool
+        raise AssertionError(f"MCP 工具未注册: {name}")
+
+    def test_list_tools_by_tag(self, test_server_with_tools):
+        """测试按标签列出工具"""
+        list_by_tag = self._get_tool(test_server_with_tools, "list_tools_by_tag")
+
+        data = json.loads(list_by_tag.fn(tag="search"))
+
+        assert data["tag"] == "search"
+        assert data["total"] == 1
+        assert data["has_more"] is False
+        assert data["tools"][0]["name"] == "search_tool"
+
+    def test_list_tools_by_tag_pagination(self, test_server_with_tools):
+        """测试标签查询分页"""
+        register = self._get_tool(test_server_with_tools, "register_tool")
+        for i in range(3):
+            register.fn(name=f"paged_{i}", description=f"Paged tool {i}", tags=["paged"])
+        list_by_tag = self._get_tool(test_server_with_tools, "list_tools_by_tag")
+
+        first = json.loads(list_by_tag.fn(tag="paged", offset=0, limit=2))
+        second = json.loads(list_by_tag.fn(tag="paged", offset=2, limit=2))
+
+        assert first["total"] == 3
+        assert first["has_more"] is True
+        assert [t["name"] for t in first["tools"]] == ["paged_0", "paged_1"]
+        assert second["has_more"] is False
+        assert [t["name"] for t in second["tools"]] == ["paged_2"]
+
+    def test_list_tools_by_server(self, test_server_with_tools):
+        """测试按 MCP 服务器列出工具"""
+        register = self._get_tool(test_server_with_tools, "register_tool")
+        register.fn(name="gh.create_pr", description="Create PR", mcp_server="github")
+        list_by_server = self._get_tool(test_server_with_tools, "list_tools_by_server")
+
+        data = json.loads(list_by_server.fn(mcp_server="github"))
+
+        assert data["mcp_server"] == "github"
+        assert data["total"] == 1
+        assert data["tools"][0]["name"] == "gh.create_pr"
+        assert data["tools"][0]["mcp_server"] == "github"
+
+    @pytest.mark.parametrize("kwargs", [{"offset": -1}, {"limit": 0}, {"limit": 101}])
+    def test_invalid_pagination(self, test_server_with_tools, kwargs):
+        """测试无效的分页参数"""
+        list_by_tag = self._get_tool(test_server_with_tools, "list_tools_by_tag")
+
+        with pytest.raises(ValueError):
+            list_by_tag.fn(tag="search", **kwargs)
+
+
 class TestRegisterToolFunction:
     """直接测试 register_tool 工具函数"""
 
@@ -412,6 +471,57 @@ class TestRegisterToolFunction:
         assert data["tool"]["tags"] == []
 
 
+class TestRegisterToolsFunction:
+    """直接测试 register_tools 批量注册工具函数"""
+
+    @pytest.fixture
+    def register_tools(self, test_server_with_tools):
+        for tool in test_server_with_tools._tool_manager._tools.values():
+            if tool.name == "register_tools":
+                return tool
+        raise AssertionError("register_tools 未注册")
+
+    def test_register_tools_success(self, register_tools, temp_data_dir):
+        """测试批量注册成功并一次持久化"""
+        entries = [
+            {"name": f"bulk_{i}", "description": f"Bulk tool {i}", "mcp_server": "bulk"}
+            for i in range(3)
+        ]
+
+        data = json.loads(register_tools.fn(tools=entries))
+
+        assert data["success"] is True
+        assert data["registered"] == ["bulk_0", "bulk_1", "bulk_2"]
+        saved = JSONStorage(temp_data_dir / "tools.json").load_all()
+        assert {"bulk_0", "bulk_1", "bulk_2"} <= {t.name for t in saved}
+
+    def test_register_tools_all_or_nothing(self, register_tools, temp_data_dir):
+        """测试任一条目无效时不注册任何工具，并报告所有错误"""
+        entries = [
+            {"name": "ok_tool", "description": "Valid"},
+            {"name": "test_tool_1", "description": "Already exists"},
+            {"name": "ok_tool", "description": "Duplicate in batch"},
+            {"name": "bad", "description": ""},
+            {"name": "extra", "description": "Extra", "owner": "me"},
+        ]
+
+        with pytest.raises(ValueError) as exc_info:
+            register_tools.fn(tools=entries)
+
+        message = str(exc_info.value)
+        assert "[1] 工具已存在" in message
+        assert "[2] 工具名称重复" in message
+        assert "[3] 工具描述不能为空" in message
+        assert "[4] 不支持的字段" in message
+        saved = JSONStorage(temp_data_dir / "tools.json").load_all()
+        assert "ok_tool" not in {t.name for t in saved}
+
+    def test_register_tools_empty(self, register_tools):
+        """测试空列表"""
+        with pytest.raises(ValueError, match="不能为空"):
+            register_tools.fn(tools=[])
+
+
 class TestStatsResource:
     """测试 registry://stats 资源"""
 
@@ -449,6 +559,25 @@ class TestStatsResource:
         assert len(most_used) > 0
 
 
+class TestTopToolsResource:
+    """测试 registry://top-tools 资源"""
+
+    def test_get_top_tools(self, test_server_with_tools):
+        """测试最常用工具按使用频率降序返回"""
+        get_top_tools = test_server_with_tools._resource_manager._resources.get(
+            "registry://top-tools"
+        )
+
+        assert get_top_tools is not None
+
+        data = json.loads(get_top_tools.fn())
+
+        assert data["count"] == len(data["tools"])
+        assert data["tools"][0]["name"] == "data_tool"
+        assert data["tools"][0]["use_count"] == 15
+        assert data["tools"][0]["temperature"] == "hot"
+
+
 class TestCategoriesResource:
     """测试 registry://categories 资源"""
 
@@ -527,6 +656,21 @@ class TestCreateServerWithSQLite:
         assert len(mcp._tool_manager._tools) > 0
 
 
+class TestCreateServerWithBinary:
+    """测试 create_server_with_binary 函数"""
+
+    def test_default_tools_persisted_and_reloaded(self, temp_data_dir):
+        """测试默认工具写入二进制快照，重启后从快照加载"""
+        create_server_with_binary(temp_data_dir)
+
+        snapshot_path = temp_data_dir / "tools.bin"
+        assert snapshot_path.exists()
+
+        mcp = create_server_with_binary(temp_data_dir)
+        stats = json.loads(mcp._resource_manager._resources["registry://stats"].fn())
+        assert stats["total_tools"] > 0
+
+
 class TestCompleteWorkflow:
     """测试完整的 MCP 工具使用工作流"""
 
@@ -26,10 +26,13 @@ class TestSearchMethod:
         assert SearchMethod.REGEX.value == "regex"
         assert SearchMethod.BM25.value == "bm25"
         assert SearchMethod.EMBEDDING.value == "embedding"
+        assert SearchMethod.HYBRID.value == "hybrid"
+        assert SearchMethod.FUSION.value == "fusion"
+        assert SearchMethod.FTS5.value == "fts5"
 
     def test_search_method_count(self):
         """测试搜索方法数量"""
-        assert len(SearchMethod) == 3
+        assert len(SearchMethod) == 6
 
     def test_search_method_iteration(self):
         """测试搜索方法可迭代"""
@@ -0,0 +1,305 @@
+"""
+多租户命名空间单元测试
+
+测试命名空间的存储分区、LRU 淘汰、API Key 绑定和 MCP 工具的命名空间参数。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from registrytools.auth import APIKeyPermission, APIKeyStorage, generate_api_key
+from registrytools.auth.middleware import APIKeyAuthMiddleware
+from registrytools.registry.models import ToolMetadata
+from registrytools.registry.namespaces import (
+    NamespaceContext,
+    NamespaceManager,
+    validate_namespace,
+)
+from registrytools.registry.registry import ToolRegistry
+from registrytools.server import _create_server_lifespan, create_server, create_server_with_sqlite
+from registrytools.storage.json_storage import JSONStorage
+from registrytools.storage.sqlite_storage import SQLiteStorage
+
+
+def mcp_tools(server) -> dict:
+    """获取 MCP 工具名称到工具的映射"""
+    return {tool.name: tool for tool in server._tool_manager._tools.values()}
+
+
+class TestValidateNamespace:
+    """命名空间名称验证测试"""
+
+    @pytest.mark.parametrize("name", ["default", "team-a", "Team_1.prod", "a" * 64])
+    def test_valid(self, name):
+        """测试合法名称"""
+        assert validate_namespace(name) == name
+
+    @pytest.mark.parametrize("name", ["", "-team", "../etc", "team/a", "a" * 65, "团队"])
+    def test_invalid(self, name):
+        """测试非法名称（不能用作文件名或包含路径分隔符）"""
+        with pytest.raises(ValueError, match="无效的命名空间"):
+            validate_namespace(name)
+
+
+class TestStoragePartitions:
+    """存储后端命名空间分区测试"""
+
+    def test_sqlite_partitions_are_isolated(self, tmp_path: Path):
+        """测试同一数据库中不同命名空间的工具互不可见"""
+        default = SQLiteStorage(tmp_path / "tools.db")
+        team = default.for_namespace("team-a")
+        default.save(ToolMetadata(name="shared", description="Default tool"))
+        team.save(ToolMetadata(name="shared", description="Team tool"))
+        team.save(ToolMetadata(name="team.only", description="Team only"))
+
+        assert team.namespace == "team-a"
+        assert default.count() == 1
+        assert team.count() == 2
+        assert default.get("shared").description == "Default tool"
+        assert team.get("shared").description == "Team tool"
+        assert not default.exists("team.only")
+
+        team.clear()
+
+        assert team.count() == 0
+        assert default.count() == 1
+
+    def test_sqlite_migrates_table_without_namespace(self, tmp_path: Path):
+        """测试没有 namespace 列的旧表重建后工具归入默认命名空间"""
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE tools (
+                name TEXT PRIMARY KEY, description TEXT NOT NULL, mcp_server TEXT,
+                defer_loading INTEGER DEFAULT 1, tags TEXT, category TEXT,
+                use_frequency INTEGER DEFAULT 0, last_used TEXT,
+                input_schema TEXT, output_schema TEXT
+            )
+            """)
+        conn.execute("INSERT INTO tools (name, description) VALUES ('old', 'Old tool')")
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage(db_path)
+        team = storage.for_namespace("team-a")
+        team.save(ToolMetadata(name="old", description="Team copy"))
+
+        assert storage.get("old").description == "Old tool"
+        assert team.get("old").description == "Team copy"
+
+    def test_json_partition_file(self, tmp_path: Path):
+        """测试 JSON 命名空间使用独立文件"""
+        default = JSONStorage(tmp_path / "tools.json")
+        team = default.for_namespace("team-a")
+        team.save(ToolMetadata(name="team.tool", description="Team tool"))
+
+        assert team.path == tmp_path / "namespaces" / "team-a.json"
+        assert default.load_all() == []
+        assert [t.name for t in team.load_all()] == ["team.tool"]
+
+
+class TestNamespaceManager:
+    """NamespaceManager 测试"""
+
+    @staticmethod
+    def make_manager(capacity: int = 2) -> tuple[NamespaceManager, list[str]]:
+        """创建使用内存注册表的管理器，返回 (管理器, 打开记录)"""
+        opened: list[str] = []
+
+        def factory(name: str) -> NamespaceContext:
+            opened.append(name)
+            return NamespaceContext(name, ToolRegistry(), JSONStorage(Path(f"/nonexistent/{name}")))
+
+        default = NamespaceContext("default", ToolRegistry(), JSONStorage(Path("/nonexistent")))
+        return NamespaceManager(default, factory, capacity), opened
+
+    def test_default_always_resident(self):
+        """测试默认命名空间不经过 factory"""
+        manager, opened = self.make_manager()
+
+        assert manager.get("default") is manager.default
+        assert manager.resolve(None) is manager.default
+        assert opened == []
+
+    def test_reuses_loaded_namespace(self):
+        """测试已加载的命名空间不重复打开"""
+        manager, opened = self.make_manager()
+
+        first = manager.get("team-a")
+
+        assert manager.get("team-a") is first
+        assert opened == ["team-a"]
+
+    def test_evicts_least_recently_used(self):
+        """测试超出容量时淘汰最久未使用的命名空间"""
+        manager, opened = self.make_manager(capacity=2)
+        manager.get("a")
+        manager.get("b")
+        manager.get("a")
+        manager.get("c")
+
+        assert manager.loaded_namespaces == ["default", "a", "c"]
+
+        manager.get("b")
+
+        assert opened == ["a", "b", "c", "b"]
+
+    def test_bound_namespace(self):
+        """测试 API Key 绑定的命名空间优先且不能越权访问"""
+        manager, _ = self.make_manager()
+
+        assert manager.resolve(None, "team-a").name == "team-a"
+        assert manager.resolve("team-a", "team-a").name == "team-a"
+        with pytest.raises(PermissionError, match="team-a"):
+            manager.resolve("team-b", "team-a")
+
+    def test_disabled_without_factory(self):
+        """测试未提供 factory 时只支持默认命名空间"""
+        default = NamespaceContext("default", ToolRegistry(), JSONStorage(Path("/nonexistent")))
+        manager = NamespaceManager(default)
+
+        with pytest.raises(ValueError, match="未启用多命名空间"):
+            manager.get("team-a")
+
+    def test_invalid_name(self):
+        """测试非法名称在打开前被拒绝"""
+        manager, opened = self.make_manager()
+
+        with pytest.raises(ValueError, match="无效的命名空间"):
+            manager.get("../etc")
+        assert opened == []
+
+    def test_factory_runs_outside_lock(self):
+        """测试打开命名空间期间不阻塞已加载命名空间和同名请求只打开一次"""
+        started = threading.Event()
+        release = threading.Event()
+        opened: list[str] = []
+
+        def factory(name: str) -> NamespaceContext:
+            opened.append(name)
+            if name == "slow":
+                started.set()
+                release.wait(timeout=5)
+            return NamespaceContext(name, ToolRegistry(), JSONStorage(Path(f"/nonexistent/{name}")))
+
+        default = NamespaceContext("default", ToolRegistry(), JSONStorage(Path("/nonexistent")))
+        manager = NamespaceManager(default, factory, capacity=2)
+        fast = manager.get("fast")
+
+        results: list[NamespaceContext] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(manager.get("slow"))) for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        assert started.wait(timeout=5)
+
+        # 打开 slow 期间仍可访问已加载的命名空间
+        assert manager.get("fast") is fast
+
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert opened == ["fast", "slow"]
+        assert len(results) == 2 and results[0] is results[1]
+
+    def test_evicted_namespace_closed_after_lease(self):
+        """测试使用中被淘汰的命名空间在租约释放后才关闭"""
+        manager, _ = self.make_manager(capacity=1)
+        closed: list[str] = []
+
+        with manager.lease("a") as context:
+            context.close = lambda: closed.append("a")  # type: ignore[method-assign]
+            manager.get("b")
+
+            assert manager.loaded_namespaces == ["default", "b"]
+            assert closed == []
+
+        assert closed == ["a"]
+
+
+class TestNamespacedServer:
+    """MCP 工具命名空间参数测试"""
+
+    @pytest.mark.parametrize("factory", [create_server, create_server_with_sqlite])
+    def test_register_and_search_in_namespace(self, tmp_path, factory):
+        """测试命名空间中注册的工具只在该命名空间可见，并在重启后保留"""
+        data_path = tmp_path / "data"
+        tools = mcp_tools(factory(data_path))
+
+        tools["register_tool"].fn(
+            name="team.deploy", description="Deploy team services", namespace="team-a"
+        )
+
+        team_results = json.loads(tools["search_tools"].fn(query="deploy", namespace="team-a"))
+        default_results = json.loads(tools["search_tools"].fn(query="deploy"))
+        assert [r["tool_name"] for r in team_results] == ["team.deploy"]
+        assert "team.deploy" not in [r["tool_name"] for r in default_results]
+        with pytest.raises(ValueError, match="工具不存在"):
+            tools["get_tool_definition"].fn(tool_name="team.deploy")
+
+        restarted = mcp_tools(factory(data_path))
+        definition = json.loads(
+            restarted["get_tool_definition"].fn(tool_name="team.deploy", namespace="team-a")
+        )
+        assert definition["name"] == "team.deploy"
+
+    def test_disabled_by_env(self, tmp_path, monkeypatch):
+        """测试 REGISTRYTOOLS_MAX_NAMESPACES=0 禁用非默认命名空间"""
+        monkeypatch.setenv("REGISTRYTOOLS_MAX_NAMESPACES", "0")
+        tools = mcp_tools(create_server(tmp_path / "data"))
+
+        with pytest.raises(ValueError, match="未启用多命名空间"):
+            tools["search_tools"].fn(query="deploy", namespace="team-a")
+
+    def test_api_key_bound_namespace(self, tmp_path, monkeypatch):
+        """测试绑定命名空间的 API Key 默认访问该命名空间且不能访问其他命名空间"""
+        data_path = tmp_path / "data"
+        data_path.mkdir()
+        key_storage = APIKeyStorage(data_path / "api_keys.db")
+        api_key = generate_api_key(
+            "team key", APIKeyPermission.WRITE, metadata={"namespace": "team-a"}
+        )
+        key_storage.save(api_key)
+        monkeypatch.setenv("REGISTRYTOOLS_API_KEY", api_key.api_key)
+
+        server = create_server(data_path, APIKeyAuthMiddleware(key_storage))
+        tools = mcp_tools(server)
+        tools["register_tool"].fn(name="team.tool", description="Team tool")
+
+        stats = json.loads(server._resource_manager._resources["registry://stats"].fn())
+        assert stats["namespace"] == "team-a"
+        assert stats["total_tools"] == 1
+        with pytest.raises(PermissionError, match="team-a"):
+            tools["list_tools_by_category"].fn(category="all", namespace="default")
+
+    @pytest.mark.asyncio
+    async def test_lifespan_flushes_namespace_usage(self, tmp_path):
+        """测试服务器关闭时刷新命名空间的使用统计"""
+        default_storage = JSONStorage(tmp_path / "tools.json")
+        team_storage = default_storage.for_namespace("team-a")
+        team_storage.save(ToolMetadata(name="team.tool", description="Team tool"))
+
+        from registrytools.server import _open_namespace
+
+        registry = ToolRegistry()
+        manager = NamespaceManager(
+            NamespaceContext("default", registry, default_storage),
+            factory=lambda name: _open_namespace(default_storage, name),
+        )
+        lifespan = _create_server_lifespan(registry, None, None, None, manager)
+
+        async with lifespan(None):
+            context = manager.get("team-a")
+            context.usage_recorder.record("team.tool")
+
+        assert manager.loaded_namespaces == ["default"]
+        assert team_storage.get("team.tool").use_frequency == 1
@@ -7,11 +7,23 @@ Copyright (c) 2026 Maric
 License: MIT
 """
 
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
 import pytest
 
+from registrytools.registry.compact import ToolRecord
 from registrytools.registry.models import ToolMetadata
 from registrytools.search.bm25_search import BM25Search
 from registrytools.search.regex_search import RegexSearch
+from registrytools.storage import BinaryStorage, JSONStorage, SQLiteStorage
+
+STORAGE_CLASSES = {"json": JSONStorage, "sqlite": SQLiteStorage, "binary": BinaryStorage}
+"""存储后端名称到存储类的映射"""
 
 
 class ToolDataGenerator:
@@ -398,6 +410,47 @@ class TestMemoryUsage:
         results = searcher.search("common action", large_toolset, 10)
         assert len(results) > 0, "Should return results"
 
+    @staticmethod
+    def _resident_bytes(build: Callable[[], Any]) -> tuple[int, Any]:
+        """测量 build() 返回的对象保留的内存（字节）"""
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = build()
+            gc.collect()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return size, result
+
+    def test_compact_record_memory(self, large_toolset: list[ToolMetadata]) -> None:
+        """
+        测试注册表紧凑记录的每工具内存占用
+
+        模拟从存储加载：对比保留 ToolMetadata 实例（之前）和保留 ToolRecord（之后）
+        每个工具占用的字节数
+        """
+        payload = json.dumps([tool.model_dump(mode="json") for tool in large_toolset])
+        count = len(large_toolset)
+
+        before, models = self._resident_bytes(
+            lambda: [ToolMetadata(**data) for data in json.loads(payload)]
+        )
+        tag_sets: dict[frozenset[str], frozenset[str]] = {}
+        after, records = self._resident_bytes(
+            lambda: [
+                ToolRecord.from_metadata(ToolMetadata(**data), tag_sets)
+                for data in json.loads(payload)
+            ]
+        )
+
+        assert len(models) == len(records) == count
+        print(
+            f"\nToolMetadata: {before / count:.0f} B/tool, ToolRecord: {after / count:.0f} B/tool"
+        )
+        # 目标: 紧凑记录占用不超过 ToolMetadata 的一半
+        assert after < before / 2
+
     @pytest.mark.benchmark(group="memory", min_rounds=5)
     def test_search_memory_stability(self, benchmark, large_toolset: list[ToolMetadata]) -> None:
         """
@@ -415,6 +468,51 @@ class TestMemoryUsage:
         benchmark(search_multiple, large_toolset)
 
 
+class TestStorageLoadPerformance:
+    """存储加载性能测试"""
+
+    TOOL_COUNT = 100_000
+
+    @pytest.fixture(scope="class")
+    def populated_paths(self, tmp_path_factory) -> dict[str, Path]:
+        """写入 100k 工具的 JSON / SQLite / 二进制快照文件"""
+        tools = ToolDataGenerator.generate_large_toolset(self.TOOL_COUNT)
+        data_path = tmp_path_factory.mktemp("storage_load")
+        paths = {
+            "json": data_path / "tools.json",
+            "sqlite": data_path / "tools.db",
+            "binary": data_path / "tools.bin",
+        }
+        for backend, path in paths.items():
+            STORAGE_CLASSES[backend](path).save_many(tools)
+        return paths
+
+    @pytest.mark.benchmark(group="storage_load", min_rounds=3)
+    @pytest.mark.parametrize("verify", [False, True], ids=["trusted", "verified"])
+    @pytest.mark.parametrize("backend", ["json", "sqlite", "binary"])
+    def test_load_all(
+        self, benchmark, backend: str, verify: bool, populated_paths: dict[str, Path]
+    ) -> None:
+        """
+        测试信任加载（跳过验证）和完整验证的 load_all 耗时
+
+        模拟服务器启动（不加载 Schema），每轮新建存储实例避免缓存影响；
+        两种模式的耗时通过 pytest-benchmark 的 storage_load 分组对比，不断言先后
+        """
+        storage_class = STORAGE_CLASSES[backend]
+        path = populated_paths[backend]
+
+        def setup() -> tuple[tuple[Any, ...], dict[str, Any]]:
+            return (storage_class(path, verify=verify),), {}
+
+        def load(storage: Any) -> list[ToolMetadata]:
+            return storage.load_all(include_schemas=False)
+
+        tools = benchmark.pedantic(load, setup=setup, rounds=3)
+
+        assert len(tools) == self.TOOL_COUNT
+
+
 # 性能测试标记
 pytestmark = [
     pytest.mark.slow,  # 性能测试通常较慢
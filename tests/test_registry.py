@@ -7,9 +7,12 @@ Copyright (c) 2026 Maric
 License: MIT
 """
 
+import threading
+from datetime import datetime, timedelta
+
 import pytest
 
-from registrytools.registry.models import SearchMethod, ToolMetadata
+from registrytools.registry.models import SearchMethod, ToolMetadata, ToolTemperature
 from registrytools.registry.registry import ToolRegistry
 from registrytools.search.bm25_search import BM25Search
 from registrytools.search.regex_search import RegexSearch
@@ -96,6 +99,21 @@ class TestToolRegistry:
 
         assert registry.tool_count == 5
 
+    def test_register_many_single_generation(self):
+        """测试批量注册整批只递增一次代数"""
+        registry = ToolRegistry()
+        before = registry.generation
+
+        registry.register_many(
+            [
+                ToolMetadata(name=f"tool{i}", description=f"Tool {i}", tags={"batch"})
+                for i in range(50)
+            ]
+        )
+
+        assert registry.generation == before + 1
+        assert len(registry.snapshot().tag_index["batch"]) == 50
+
     def test_register_updates_existing_tool(self):
         """测试更新已存在的工具"""
         registry = ToolRegistry()
@@ -169,6 +187,16 @@ class TestToolRegistry:
         assert "gitlab" in categories
         assert "aws" in categories
 
+    def test_unregister_uncategorized_tool(self):
+        """测试注销空类别的工具后不再出现在未分类列表中"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="a", description="A", category=""))
+        registry.unregister("a")
+        registry.register(ToolMetadata(name="a", description="A", category="x"))
+
+        assert registry.snapshot().list_by_category(None) == []
+        assert [t.name for t in registry.list_tools(category="x")] == ["a"]
+
     # ============================================================
     # 搜索器注册测试
     # ============================================================
@@ -235,10 +263,10 @@ class TestToolRegistry:
         assert tool.use_frequency == 0
 
         registry.update_usage("test.tool")
-        assert tool.use_frequency == 1
+        assert registry.get_tool("test.tool").use_frequency == 1
 
         registry.update_usage("test.tool")
-        assert tool.use_frequency == 2
+        assert registry.get_tool("test.tool").use_frequency == 2
 
     def test_update_usage_updates_last_used(self):
         """测试更新最后使用时间"""
@@ -249,15 +277,74 @@ class TestToolRegistry:
         registry.register(tool)
         registry.update_usage("test.tool")
 
-        assert tool.last_used is not None
+        updated = registry.get_tool("test.tool")
+        assert updated.last_used is not None
         if original_time:
-            assert tool.last_used >= original_time
+            assert updated.last_used >= original_time
 
     def test_update_usage_nonexistent_tool(self):
         """测试更新不存在的工具"""
         registry = ToolRegistry()
         assert registry.update_usage("nonexistent") is False
 
+    def test_update_usage_concurrent_unregister(self):
+        """测试查找工具后、加锁前工具被注销时不会重新登记到温度层和降级堆"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="ghost", description="Ghost", use_frequency=100))
+
+        class UnregisterAfterLookup(dict):
+            """第一次查找 ghost 后将其注销（模拟另一个线程在加锁前注销）"""
+
+            triggered = False
+
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                if key == "ghost" and not self.triggered:
+                    self.triggered = True
+                    registry.unregister("ghost")
+                return value
+
+        registry._tools = UnregisterAfterLookup(registry._tools)
+
+        assert registry.update_usage("ghost") is False
+        assert "ghost" not in registry.snapshot().hot_tools
+        assert "ghost" not in registry._downgrade_seq
+        # 降级堆中的失效条目被跳过
+        registry._check_and_downgrade_other_tools(datetime.now() + timedelta(days=365))
+
+    def test_temperature_change_keeps_published_snapshot(self):
+        """测试温度变化以副本替换记录，已发布快照中的记录温度与温度层一致"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="tool", description="Tool", use_frequency=2))
+        before = registry.snapshot()
+        assert [t.name for t in before.cold_tools] == ["tool"]
+
+        registry.update_usage("tool")
+        after = registry.snapshot()
+
+        assert before.by_name["tool"].temperature == ToolTemperature.COLD
+        assert [t.name for t in after.warm_tools] == ["tool"]
+        assert after.by_name["tool"].temperature == ToolTemperature.WARM
+        assert after.by_name["tool"].use_frequency == 3
+
+    def test_update_usage_concurrent_counts(self):
+        """测试并发记录使用时不丢失计数"""
+        registry = ToolRegistry()
+        registry.register(ToolMetadata(name="busy", description="Busy"))
+
+        def worker() -> None:
+            for _ in range(200):
+                registry.update_usage("busy")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry.get_tool("busy").use_frequency == 1600
+        assert registry.get_usage_stats()["busy"] == 1600
+
     def test_get_usage_stats(self, registry):
         """测试获取使用统计"""
         stats = registry.get_usage_stats()
@@ -286,6 +373,38 @@ class TestToolRegistry:
         assert most_used[0].name == "tool1"
         assert most_used[1].name == "tool2"
 
+    def test_get_most_used_ranking_maintained(self):
+        """测试使用频率排行随使用、重新注册和注销增量更新"""
+        registry = ToolRegistry()
+        registry.register_many(
+            [
+                ToolMetadata(name="a", description="A", use_frequency=5),
+                ToolMetadata(name="b", description="B", use_frequency=3),
+                ToolMetadata(name="c", description="C"),
+            ]
+        )
+
+        for _ in range(3):
+            registry.update_usage("b")
+        assert [t.name for t in registry.get_most_used(2)] == ["b", "a"]
+
+        registry.register(ToolMetadata(name="c", description="C", use_frequency=50))
+        assert [t.name for t in registry.get_most_used(10)] == ["c", "b", "a"]
+
+        registry.unregister("c")
+        assert [t.name for t in registry.get_most_used(10)] == ["b", "a"]
+        assert registry.get_most_used(0) == []
+
+    def test_usage_stats_is_snapshot(self, registry):
+        """测试使用统计是调用时刻的副本，不随后续使用变化"""
+        stats = registry.get_usage_stats()
+        name = next(iter(stats))
+
+        registry.update_usage(name)
+
+        assert stats[name] == 0
+        assert registry.get_usage_stats()[name] == 1
+
     # ============================================================
     # 索引管理测试
     # ============================================================
@@ -301,6 +420,98 @@ class TestToolRegistry:
         assert searcher is not None
         assert searcher.is_indexed()
 
+    # ============================================================
+    # 二级索引测试
+    # ============================================================
+
+    def test_list_tools_by_tag(self, registry):
+        """测试按标签查询工具"""
+        names = [tool.name for tool in registry.list_tools_by_tag("code")]
+
+        assert names == ["github.create_pr", "gitlab.merge_request"]
+        assert registry.list_tools_by_tag("missing") == []
+
+    def test_list_tools_by_server(self, registry):
+        """测试按 MCP 服务器查询工具"""
+        registry.register(
+            ToolMetadata(name="gh.issue", description="Create issue", mcp_server="github")
+        )
+
+        assert [t.name for t in registry.list_tools_by_server("github")] == ["gh.issue"]
+        assert "github" in registry.list_servers()
+        assert len(registry.list_tools_by_server(None)) == 4
+
+    def test_secondary_indexes_follow_updates(self, registry):
+        """测试重新注册和注销时维护标签与服务器索引"""
+        registry.register(
+            ToolMetadata(
+                name="github.create_pr",
+                description="Create a pull request",
+                tags={"pr"},
+                mcp_server="github",
+            )
+        )
+
+        assert [t.name for t in registry.list_tools_by_tag("code")] == ["gitlab.merge_request"]
+        assert [t.name for t in registry.list_tools_by_server("github")] == ["github.create_pr"]
+
+        registry.unregister("github.create_pr")
+
+        assert registry.list_tools_by_tag("pr") == []
+        assert "pr" not in registry.list_tags()
+        assert registry.list_servers() == []
+
+    def test_list_tools_by_temperature(self, registry):
+        """测试按温度查询工具"""
+        from registrytools.registry.models import ToolTemperature
+
+        registry.register(ToolMetadata(name="hot", description="Hot", use_frequency=20))
+
+        assert [t.name for t in registry.list_tools_by_temperature(ToolTemperature.HOT)] == ["hot"]
+        assert len(registry.list_tools_by_temperature(ToolTemperature.COLD)) == 4
+
+    # ============================================================
+    # 快照测试
+    # ============================================================
+
+    def test_snapshot_reused_until_write(self, registry):
+        """测试没有写操作时重复返回同一快照"""
+        first = registry.snapshot()
+
+        assert registry.snapshot() is first
+        assert len(first) == 4
+        assert first.generation == registry.generation
+
+    def test_write_publishes_new_snapshot(self, registry):
+        """测试写操作后发布新一代快照，旧快照保持不变"""
+        old = registry.snapshot()
+
+        registry.register(ToolMetadata(name="new.tool", description="New tool"))
+        new = registry.snapshot()
+
+        assert new is not old
+        assert new.generation > old.generation
+        assert "new.tool" in new.by_name
+        assert "new.tool" not in old.by_name
+        assert len(old.tools) == 4
+
+    def test_snapshot_is_immutable(self, registry):
+        """测试快照的工具集合和索引不可修改"""
+        snapshot = registry.snapshot()
+
+        assert isinstance(snapshot.tools, tuple)
+        with pytest.raises(TypeError):
+            snapshot.by_name["x"] = snapshot.tools[0]  # type: ignore[index]
+        assert snapshot.category_index["github"] == frozenset({"github.create_pr"})
+
+    def test_search_skips_rehash_for_same_snapshot(self, registry):
+        """测试同一快照上的重复搜索不重新计算工具哈希"""
+        searcher = BM25Search()
+        registry.register_searcher(SearchMethod.BM25, searcher)
+        registry.search("github", method=SearchMethod.BM25)
+
+        assert searcher._should_rebuild_index(registry.snapshot().tools) is False
+
     # ============================================================
     # 清空测试
     # ============================================================
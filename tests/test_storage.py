@@ -1,22 +1,27 @@
 """
 存储层单元测试
 
-测试 ToolStorage 基类、JSONStorage 和 SQLiteStorage 实现。
+测试 ToolStorage 基类、JSONStorage、SQLiteStorage 和 BinaryStorage 实现。
 
 Copyright (c) 2026 Maric
 License: MIT
 """
 
+import concurrent.futures
 import json
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
-from registrytools.registry.models import ToolMetadata
+from registrytools.defaults import SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+from registrytools.registry.models import ToolMetadata, ToolTemperature
 from registrytools.storage.base import ToolStorage
+from registrytools.storage.binary_storage import FORMAT_VERSION, MAGIC, BinaryStorage
 from registrytools.storage.json_storage import JSONStorage
+from registrytools.storage.sqlite_connections import SQLiteConnectionManager
 from registrytools.storage.sqlite_storage import SQLiteStorage
 
 # ============================================================
@@ -202,6 +207,20 @@ class TestJSONStorage:
         json_storage.save_many([])
         assert json_storage.is_empty()
 
+    def test_save_many_keeps_existing_tools(
+        self, json_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试批量保存只更新给定工具，不覆盖其他工具"""
+        json_storage.save_many(sample_tools)
+
+        updated = sample_tools[0].model_copy(update={"description": "Updated"})
+        json_storage.save_many([updated])
+
+        assert json_storage.count() == len(sample_tools)
+        loaded = json_storage.get(updated.name)
+        assert loaded is not None
+        assert loaded.description == "Updated"
+
     # ------------------------------------------------------------
     # delete 测试
     # ------------------------------------------------------------
@@ -307,6 +326,188 @@ class TestJSONStorage:
         assert isinstance(data, dict)
         assert len(data) == len(sample_tools)
 
+    # ------------------------------------------------------------
+    # 读缓存测试
+    # ------------------------------------------------------------
+
+    def test_point_reads_use_cache(
+        self,
+        json_storage: JSONStorage,
+        sample_tools: list[ToolMetadata],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """测试文件未变化时单点操作不重新解析文件"""
+        json_storage.save_many(sample_tools)
+        calls = []
+        original_load = json.load
+        monkeypatch.setattr(
+            "registrytools.storage.json_storage.json.load",
+            lambda f: calls.append(f) or original_load(f),
+        )
+
+        assert json_storage.exists("aws.s3.upload")
+        assert json_storage.count() == 3
+        assert json_storage.get("slack.send_message") is not None
+        json_storage.save(ToolMetadata(name="new.tool", description="New tool"))
+        assert json_storage.exists("new.tool")
+
+        assert calls == []
+
+    def test_detects_external_change(
+        self, json_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试其他进程修改文件后重新读取"""
+        json_storage.save_many(sample_tools)
+        assert json_storage.count() == 3
+
+        # 另一个存储实例模拟其他进程写入
+        JSONStorage(json_storage.path).delete("aws.s3.upload")
+
+        assert json_storage.count() == 2
+        assert not json_storage.exists("aws.s3.upload")
+
+    def test_load_without_schemas_keeps_cache(self, json_storage: JSONStorage) -> None:
+        """测试不加载 Schema 的 load_all 不修改缓存的文档"""
+        json_storage.save(
+            ToolMetadata(name="schema.tool", description="Tool", input_schema={"type": "object"})
+        )
+
+        assert json_storage.load_all(include_schemas=False)[0].input_schema is None
+        assert json_storage.load_schemas("schema.tool") == ({"type": "object"}, None)
+
+
+class TestJSONStorageJournal:
+    """测试 JSONStorage 追加日志模式"""
+
+    @pytest.fixture
+    def journal_storage(self, tmp_path: Path) -> JSONStorage:
+        """返回启用日志模式的 JSONStorage 实例"""
+        storage = JSONStorage(tmp_path / "tools.json", journal=True)
+        storage.initialize()
+        return storage
+
+    def test_writes_append_to_log(
+        self, journal_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试写入只追加日志，不重写快照"""
+        snapshot = journal_storage.path.read_bytes()
+
+        journal_storage.save_many(sample_tools)
+        journal_storage.delete("aws.s3.upload")
+
+        assert journal_storage.path.read_bytes() == snapshot
+        records = [json.loads(line) for line in journal_storage.log_path.read_text().splitlines()]
+        assert [(r["op"], r["name"]) for r in records][-1] == ("del", "aws.s3.upload")
+        assert len(records) == 4
+
+    def test_replays_log(
+        self, journal_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试新实例在快照上重放日志"""
+        journal_storage.save_many(sample_tools)
+        journal_storage.delete("aws.s3.upload")
+
+        reopened = JSONStorage(journal_storage.path)
+
+        assert sorted(t.name for t in reopened.load_all()) == [
+            "github.create_pr",
+            "slack.send_message",
+        ]
+
+    def test_sees_appends_from_other_instance(
+        self, journal_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试其他实例追加的记录被增量重放"""
+        journal_storage.save(sample_tools[0])
+        assert journal_storage.count() == 1
+
+        JSONStorage(journal_storage.path, journal=True).save(sample_tools[1])
+
+        assert journal_storage.count() == 2
+        assert journal_storage.exists("aws.s3.upload")
+
+    def test_compaction(
+        self,
+        journal_storage: JSONStorage,
+        sample_tools: list[ToolMetadata],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """测试日志超过阈值时压缩回快照"""
+        monkeypatch.setattr("registrytools.storage.json_storage.JSON_JOURNAL_MIN_BYTES", 0)
+
+        journal_storage.save_many(sample_tools)
+
+        assert not journal_storage.log_path.exists()
+        with open(journal_storage.path, encoding="utf-8") as f:
+            assert len(json.load(f)) == 3
+
+    def test_ignores_torn_record(
+        self, journal_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试崩溃时写了一半的记录被忽略，下次追加前截断"""
+        journal_storage.save(sample_tools[0])
+        with open(journal_storage.log_path, "ab") as f:
+            f.write(b'{"op": "put", "name": "torn"')
+
+        reopened = JSONStorage(journal_storage.path, journal=True)
+        assert [t.name for t in reopened.load_all()] == ["github.create_pr"]
+
+        reopened.save(sample_tools[1])
+
+        assert JSONStorage(journal_storage.path).count() == 2
+        for line in reopened.log_path.read_text().splitlines():
+            json.loads(line)
+
+    def test_keeps_records_committed_by_other_writer(
+        self, journal_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试缓存过期的实例追加前不截断其他写入者已提交的记录，只截断写了一半的末尾"""
+        journal_storage.save(sample_tools[0])
+        assert journal_storage.count() == 1
+
+        JSONStorage(journal_storage.path, journal=True).save(sample_tools[1])
+        with open(journal_storage.log_path, "ab") as f:
+            f.write(b'{"op": "put", "name": "torn"')
+
+        journal_storage.save(sample_tools[2])
+
+        reopened = JSONStorage(journal_storage.path)
+        assert reopened.count() == 3
+        for line in reopened.log_path.read_text().splitlines():
+            json.loads(line)
+
+    def test_concurrent_writers_share_log(self, journal_storage: JSONStorage) -> None:
+        """测试同一文件的多个实例并发追加时不丢失记录（跨实例写锁）"""
+        writers = [JSONStorage(journal_storage.path, journal=True) for _ in range(4)]
+
+        def write(index: int) -> None:
+            for i in range(25):
+                writers[index].save(
+                    ToolMetadata(name=f"writer{index}.tool{i}", description="Concurrent tool")
+                )
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(len(writers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert JSONStorage(journal_storage.path).count() == 100
+
+    def test_non_journal_write_folds_log(
+        self, journal_storage: JSONStorage, sample_tools: list[ToolMetadata]
+    ) -> None:
+        """测试非日志模式写入把日志合并回快照"""
+        journal_storage.save(sample_tools[0])
+
+        plain = JSONStorage(journal_storage.path)
+        plain.save(sample_tools[1])
+
+        assert not plain.log_path.exists()
+        with open(plain.path, encoding="utf-8") as f:
+            assert sorted(json.load(f)) == ["aws.s3.upload", "github.create_pr"]
+        assert journal_storage.count() == 2
+
 
 # ============================================================
 # SQLiteStorage 测试
@@ -559,6 +760,516 @@ class TestSQLiteStorage:
         assert loaded is not None
         assert loaded.description == "Updated description"
 
+    # ------------------------------------------------------------
+    # 使用分数测试
+    # ------------------------------------------------------------
+
+    def test_persists_usage_score(self, sqlite_storage: SQLiteStorage) -> None:
+        """测试衰减使用分数及其更新时间的序列化"""
+        updated_at = datetime(2026, 1, 1, 12, 0, 0)
+        tool = ToolMetadata(
+            name="scored",
+            description="Scored tool",
+            usage_score=4.5,
+            usage_score_updated_at=updated_at,
+        )
+        sqlite_storage.save(tool)
+
+        loaded = sqlite_storage.get("scored")
+        assert loaded is not None
+        assert loaded.usage_score == 4.5
+        assert loaded.usage_score_updated_at == updated_at
+
+    def test_migrates_legacy_table(self, tmp_path: Path) -> None:
+        """测试旧表结构自动补齐使用分数列"""
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE tools (
+                name TEXT PRIMARY KEY, description TEXT NOT NULL, mcp_server TEXT,
+                defer_loading INTEGER DEFAULT 1, tags TEXT, category TEXT,
+                use_frequency INTEGER DEFAULT 0, last_used TEXT,
+                temperature TEXT DEFAULT 'cold', input_schema TEXT, output_schema TEXT
+            )
+            """)
+        conn.execute(
+            "INSERT INTO tools (name, description, use_frequency) VALUES ('old', 'Old tool', 12)"
+        )
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage(db_path)
+        loaded = storage.get("old")
+
+        assert loaded is not None
+        assert loaded.use_frequency == 12
+        assert loaded.usage_score_updated_at is None
+        assert [t.name for t in storage.load_by_temperature(ToolTemperature.HOT)] == ["old"]
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SQLiteStorage._SCHEMA_VERSION
+        conn.close()
+
+    # ------------------------------------------------------------
+    # 模式版本和索引测试
+    # ------------------------------------------------------------
+
+    def test_new_database_has_indexes_and_version(self, sqlite_storage: SQLiteStorage) -> None:
+        """测试新数据库创建二级索引并记录模式版本"""
+        conn = sqlite3.connect(sqlite_storage.path)
+        indexes = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='tools'"
+            )
+        }
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+
+        assert {
+            "idx_tools_use_frequency",
+            "idx_tools_usage_decay",
+            "idx_tools_category",
+            "idx_tools_mcp_server",
+        } <= indexes
+        assert version == SQLiteStorage._SCHEMA_VERSION
+
+    def test_migration_adds_indexes_to_unversioned_database(self, tmp_path: Path) -> None:
+        """测试没有模式版本的旧数据库补建索引，已有数据不变"""
+        db_path = tmp_path / "tools.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(SQLiteStorage._CREATE_TABLE_SQL)
+        conn.execute("INSERT INTO tools (name, description) VALUES ('kept', 'Kept tool')")
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage(db_path)
+        assert storage.get("kept") is not None
+
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(tools)")}
+        conn.close()
+        assert "idx_tools_use_frequency" in indexes
+
+    def test_applied_migrations_are_not_rerun(self, tmp_path: Path) -> None:
+        """测试 user_version 已是最新版本时不再执行迁移"""
+        db_path = tmp_path / "tools.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(SQLiteStorage._CREATE_TABLE_SQL)
+        conn.execute(f"PRAGMA user_version = {SQLiteStorage._SCHEMA_VERSION}")
+        conn.commit()
+        conn.close()
+
+        SQLiteStorage(db_path).count()
+
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(tools)")}
+        conn.close()
+        assert "idx_tools_use_frequency" not in indexes
+
+    def test_tier_query_uses_frequency_index(self, sqlite_storage: SQLiteStorage) -> None:
+        """测试分层查询沿 use_frequency 索引排序，无需临时排序"""
+        conn = sqlite3.connect(sqlite_storage.path)
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT name FROM tools WHERE namespace = ? "
+                "ORDER BY use_frequency DESC, last_used DESC, name LIMIT 10",
+                ("default",),
+            )
+        )
+        conn.close()
+
+        assert "idx_tools_use_frequency" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_tier_query_uses_decay_key_index(self, sqlite_storage: SQLiteStorage) -> None:
+        """测试衰减分数的分层查询在衰减键索引上做范围查询，无需临时排序"""
+        conn = sqlite3.connect(sqlite_storage.path)
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT name FROM tools WHERE namespace = ? "
+                "AND usage_decay_key >= ? AND usage_decay_key < ? "
+                "ORDER BY usage_decay_key DESC, last_used DESC, name LIMIT 10",
+                ("default", 1.0, 2.0),
+            )
+        )
+        conn.close()
+
+        assert "idx_tools_usage_decay" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_migration_backfills_decay_key(self, tmp_path: Path) -> None:
+        """测试版本 2 的数据库迁移时回填衰减键并删除 temperature 索引"""
+        db_path = tmp_path / "tools.db"
+        updated_at = datetime.now() - timedelta(days=14)
+        conn = sqlite3.connect(db_path)
+        conn.execute(SQLiteStorage._CREATE_TABLE_SQL.replace("usage_decay_key REAL,", ""))
+        conn.execute("CREATE INDEX idx_tools_temperature ON tools (namespace, temperature)")
+        conn.execute(
+            "INSERT INTO tools (name, description, use_frequency, usage_score, "
+            "usage_score_updated_at) VALUES ('faded', 'Faded tool', 50, 30.0, ?)",
+            (updated_at.isoformat(),),
+        )
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage(db_path)
+
+        # 14 天（一个半衰期）后分数约为 15，仍是热工具
+        assert [t.name for t in storage.load_by_temperature(ToolTemperature.HOT)] == ["faded"]
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(tools)")}
+        key = conn.execute("SELECT usage_decay_key FROM tools").fetchone()[0]
+        conn.close()
+        assert "idx_tools_usage_decay" in indexes
+        assert "idx_tools_temperature" not in indexes
+        assert key is not None
+
+
+class TestSQLiteConnections:
+    """测试 SQLite 连接管理（读连接池 + 单写连接）"""
+
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> SQLiteStorage:
+        """已保存一个工具的 SQLite 存储（测试结束时关闭）"""
+        storage = SQLiteStorage(tmp_path / "tools.db")
+        storage.save(ToolMetadata(name="seed", description="Seed tool"))
+        yield storage
+        storage.close()
+
+    def test_readers_run_in_parallel(self, storage: SQLiteStorage) -> None:
+        """测试多个线程同时持有不同的读连接"""
+        barrier = threading.Barrier(3)
+        seen: list[int] = []
+
+        def read() -> None:
+            with storage._connections.read() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0] == 1
+                seen.append(id(conn))
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(seen)) == 3
+
+    def test_idle_readers_are_bounded(self, tmp_path: Path) -> None:
+        """测试归还的读连接最多保留 read_pool_size 个，空闲连接被复用"""
+        manager = SQLiteConnectionManager(tmp_path / "pool.db", read_pool_size=1)
+        try:
+            with manager.read() as first, manager.read() as second:
+                assert first is not second
+            assert manager.idle_reader_count == 1
+
+            with manager.read() as conn:
+                assert conn in (first, second)
+        finally:
+            manager.close()
+
+    def test_writes_are_serialized_on_writer_thread(self, storage: SQLiteStorage) -> None:
+        """测试并发写入都在唯一的写线程上执行且全部提交"""
+        writer_threads = set()
+
+        def save(index: int) -> None:
+            storage.save(ToolMetadata(name=f"tool_{index}", description=f"Tool {index}"))
+            storage._connections.write(
+                lambda conn: writer_threads.add(threading.current_thread().name)
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(save, range(40)))
+
+        assert writer_threads == {"registry-sqlite-writer"}
+        assert storage.count() == 41
+
+    def test_failed_write_is_rolled_back(self, storage: SQLiteStorage) -> None:
+        """测试写操作抛出异常时回滚，异常传给调用方"""
+
+        def insert_then_fail(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM tools")
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            storage._connections.write(insert_then_fail)
+
+        assert storage.count() == 1
+
+    def test_readers_are_query_only(self, storage: SQLiteStorage) -> None:
+        """测试读连接不能写入"""
+        with storage._connections.read() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM tools")
+
+    def test_connection_pragmas(self, storage: SQLiteStorage) -> None:
+        """测试读写连接的 PRAGMA 设置"""
+        writer = storage._connections.write(
+            lambda conn: (
+                conn.execute("PRAGMA journal_mode").fetchone()[0],
+                conn.execute("PRAGMA synchronous").fetchone()[0],
+            )
+        )
+        with storage._connections.read() as conn:
+            mmap_size = conn.execute("PRAGMA mmap_size").fetchone()[0]
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+
+        # synchronous=NORMAL 对应 1
+        assert writer == ("wal", 1)
+        assert cache_size == -SQLITE_CACHE_SIZE_KB
+        # 不支持内存映射的平台上 mmap_size 为 0
+        assert mmap_size in (0, SQLITE_MMAP_SIZE)
+
+    def test_close_releases_connections_and_reopens(self, storage: SQLiteStorage) -> None:
+        """测试 close() 停止写线程、关闭空闲读连接，之后可继续使用"""
+        storage.count()
+        assert storage._connections.is_writer_running
+        assert storage._connections.idle_reader_count == 1
+
+        storage.close()
+        storage.close()
+
+        assert not storage._connections.is_writer_running
+        assert storage._connections.idle_reader_count == 0
+        storage.save(ToolMetadata(name="after_close", description="Saved after close"))
+        assert storage.count() == 2
+
+    def test_reader_checked_out_during_close_is_discarded(self, storage: SQLiteStorage) -> None:
+        """测试 close() 时借出的读连接归还后被关闭，不回到连接池"""
+        with storage._connections.read() as conn:
+            storage.close()
+        assert storage._connections.idle_reader_count == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_namespaces_share_connections(self, storage: SQLiteStorage) -> None:
+        """测试命名空间分区共享连接管理器，关闭分区不关闭共享连接"""
+        team = storage.for_namespace("team")
+        team.save(ToolMetadata(name="team.tool", description="Team tool"))
+        assert team._connections is storage._connections
+
+        team.close()
+
+        assert storage._connections.is_writer_running
+        assert storage.count() == 1
+
+
+# ============================================================
+# BinaryStorage 测试
+# ============================================================
+
+
+class TestBinaryStorage:
+    """测试二进制快照存储"""
+
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> BinaryStorage:
+        """返回临时 BinaryStorage 实例"""
+        return BinaryStorage(tmp_path / "tools.bin")
+
+    def test_round_trip_all_fields(self, storage: BinaryStorage) -> None:
+        """测试所有字段（含时间、标签和 Schema）写入后原样读回"""
+        tool = ToolMetadata(
+            name="github.创建_pr",
+            description="创建拉取请求",
+            mcp_server="github",
+            defer_loading=False,
+            tags={"github", "git"},
+            category="github",
+            use_frequency=42,
+            last_used=datetime(2026, 1, 1, 12, 30, 15, 123456),
+            usage_score=3.5,
+            usage_score_updated_at=datetime(2026, 1, 2),
+            temperature=ToolTemperature.WARM,
+            input_schema={"type": "object", "properties": {"q": {"type": "string"}}},
+            output_schema={"type": "array"},
+        )
+        storage.save(tool)
+
+        reopened = BinaryStorage(storage.path)
+
+        assert reopened.get(tool.name) == tool
+        assert reopened.load_all() == [tool]
+
+    def test_interns_repeated_values(self, storage: BinaryStorage) -> None:
+        """测试标签、类别和服务器名称在字符串表中只保存一次"""
+        storage.save_many(
+            [
+                ToolMetadata(
+                    name=f"tool.{i}",
+                    description="Tool",
+                    mcp_server="shared-server-name",
+                    category="shared-category-name",
+                    tags={"shared-tag-name"},
+                )
+                for i in range(50)
+            ]
+        )
+
+        content = storage.path.read_bytes()
+
+        assert content.startswith(MAGIC)
+        assert content.count(b"shared-server-name") == 1
+        assert content.count(b"shared-category-name") == 1
+        assert content.count(b"shared-tag-name") == 1
+
+    def test_sees_writes_from_other_instance(self, storage: BinaryStorage) -> None:
+        """测试文件被替换后重新映射"""
+        storage.save(ToolMetadata(name="a", description="A"))
+        assert storage.count() == 1
+
+        other = BinaryStorage(storage.path)
+        other.save(ToolMetadata(name="b", description="B"))
+        other.delete("a")
+
+        assert [t.name for t in storage.load_all()] == ["b"]
+        assert not storage.exists("a")
+
+    def test_delete_last_tool_removes_file(self, storage: BinaryStorage) -> None:
+        """测试删除最后一个工具时删除快照文件"""
+        storage.save(ToolMetadata(name="a", description="A"))
+
+        assert storage.delete("a") is True
+        assert storage.delete("a") is False
+        assert not storage.path.exists()
+        assert storage.load_all() == []
+
+    def test_rejects_unknown_format(self, storage: BinaryStorage) -> None:
+        """测试文件标识或版本不匹配时报告格式错误"""
+        storage.save(ToolMetadata(name="a", description="A"))
+        content = bytearray(storage.path.read_bytes())
+        content[4] = FORMAT_VERSION + 1
+        storage.path.write_bytes(bytes(content))
+
+        assert storage.validate() is False
+        with pytest.raises(OSError, match="不支持的快照版本"):
+            storage.load_all()
+
+        storage.path.write_bytes(b'{"a": {}}')
+
+        assert storage.validate() is False
+        with pytest.raises(OSError, match="格式错误"):
+            storage.load_all()
+
+    def test_namespace_partition_file(self, storage: BinaryStorage, tmp_path: Path) -> None:
+        """测试命名空间使用独立快照文件"""
+        team = storage.for_namespace("team-a")
+        team.save(ToolMetadata(name="team.tool", description="Team tool"))
+
+        assert team.path == tmp_path / "namespaces" / "team-a.bin"
+        assert storage.load_all() == []
+        assert [t.name for t in team.load_all()] == ["team.tool"]
+
+    def test_close_releases_mapping(self, storage: BinaryStorage) -> None:
+        """测试 close() 释放映射后仍可重新读取"""
+        storage.save(ToolMetadata(name="a", description="A"))
+        assert storage.exists("a")
+
+        storage.close()
+
+        assert storage.get("a").name == "a"
+
+    def test_close_keeps_mapping_for_readers(self, storage: BinaryStorage) -> None:
+        """测试 close() 不关闭并发读者仍持有的映射"""
+        storage.save(ToolMetadata(name="a", description="A"))
+        snapshot = storage._read_snapshot()
+        assert snapshot is not None
+
+        storage.close()
+
+        assert not snapshot.buffer.closed
+
+
+# ============================================================
+# 信任加载测试
+# ============================================================
+
+
+class TestTrustedLoad:
+    """测试读取时跳过 pydantic 验证的信任加载和可选的完整性检查"""
+
+    @pytest.mark.parametrize(
+        "storage_class,filename",
+        [(JSONStorage, "test.json"), (SQLiteStorage, "test.db"), (BinaryStorage, "test.bin")],
+    )
+    def test_trusted_matches_verified(
+        self, storage_class, filename, sample_tools: list[ToolMetadata], tmp_path: Path
+    ) -> None:
+        """测试信任加载与完整验证得到相同的工具"""
+        tools = [
+            *sample_tools,
+            ToolMetadata(
+                name="scored",
+                description="Scored tool",
+                temperature=ToolTemperature.HOT,
+                usage_score=2.5,
+                usage_score_updated_at=datetime(2026, 1, 2, 3, 4, 5),
+                input_schema={"type": "object"},
+            ),
+        ]
+        storage_class(tmp_path / filename).save_many(tools)
+
+        trusted = storage_class(tmp_path / filename)
+        verified = storage_class(tmp_path / filename, verify=True)
+
+        assert not trusted.verify and verified.verify
+        by_name = {tool.name: tool for tool in tools}
+        for loaded in (trusted.load_all(), verified.load_all()):
+            assert {tool.name: tool for tool in loaded} == by_name
+        assert trusted.get("scored") == by_name["scored"]
+        assert trusted.for_namespace("team-a").verify is False
+        assert verified.for_namespace("team-a").verify is True
+
+    def test_json_integrity_check_rejects_invalid_entry(self, tmp_path: Path) -> None:
+        """测试 JSON 存储启用完整性检查时跳过类型错误的条目"""
+        path = tmp_path / "tools.json"
+        path.write_text(
+            json.dumps({"bad": {"name": "bad", "description": "Bad", "use_frequency": "many"}}),
+            encoding="utf-8",
+        )
+
+        assert JSONStorage(path).load_all()[0].use_frequency == "many"
+        assert JSONStorage(path, verify=True).load_all() == []
+
+    def test_json_falls_back_to_validation(self, tmp_path: Path) -> None:
+        """测试无法按写入格式还原的条目（如手工编辑）回退到完整验证"""
+        path = tmp_path / "tools.json"
+        path.write_text(
+            json.dumps({"old": {"name": "old", "description": "Old", "last_used": 0}}),
+            encoding="utf-8",
+        )
+
+        [tool] = JSONStorage(path).load_all()
+
+        assert isinstance(tool.last_used, datetime)
+
+    def test_sqlite_integrity_check_rejects_invalid_row(self, tmp_path: Path) -> None:
+        """测试 SQLite 存储启用完整性检查时跳过类型错误的行"""
+        storage = SQLiteStorage(tmp_path / "tools.db")
+        storage.save(ToolMetadata(name="bad", description="Bad"))
+        conn = sqlite3.connect(tmp_path / "tools.db")
+        conn.execute("UPDATE tools SET tags = '[1, 2]' WHERE name = 'bad'")
+        conn.commit()
+        conn.close()
+
+        assert SQLiteStorage(tmp_path / "tools.db").load_all()[0].tags == {1, 2}
+        assert SQLiteStorage(tmp_path / "tools.db", verify=True).load_all() == []
+
+    def test_server_env(self, tmp_path: Path, monkeypatch) -> None:
+        """测试 REGISTRYTOOLS_VERIFY_ON_LOAD 为所有后端启用完整性检查"""
+        from registrytools.registry.models import StorageBackend
+        from registrytools.server import create_storage
+
+        assert not create_storage(StorageBackend.JSON, tmp_path).verify
+
+        monkeypatch.setenv("REGISTRYTOOLS_VERIFY_ON_LOAD", "true")
+
+        assert all(create_storage(backend, tmp_path).verify for backend in StorageBackend)
+
 
 # ============================================================
 # 跨存储实现测试
@@ -573,6 +1284,7 @@ class TestStorageImplementations:
         [
             lambda tmp_path: JSONStorage(tmp_path / "test.json"),
             lambda tmp_path: SQLiteStorage(tmp_path / "test.db"),
+            lambda tmp_path: BinaryStorage(tmp_path / "test.bin"),
         ],
     )
     def test_storage_workflow(
@@ -610,6 +1322,7 @@ class TestStorageImplementations:
         [
             lambda tmp_path: JSONStorage(tmp_path / "test.json"),
             lambda tmp_path: SQLiteStorage(tmp_path / "test.db"),
+            lambda tmp_path: BinaryStorage(tmp_path / "test.bin"),
         ],
     )
     def test_validate_method(self, storage_factory, tmp_path: Path) -> None:
@@ -622,3 +1335,149 @@ class TestStorageImplementations:
         # 删除文件
         storage.path.unlink()
         assert storage.validate() is False
+
+    @pytest.mark.parametrize(
+        "storage_factory",
+        [
+            lambda tmp_path: JSONStorage(tmp_path / "test.json"),
+            lambda tmp_path: SQLiteStorage(tmp_path / "test.db"),
+            lambda tmp_path: BinaryStorage(tmp_path / "test.bin"),
+        ],
+    )
+    def test_load_by_temperature_uses_decayed_score(self, storage_factory, tmp_path: Path) -> None:
+        """测试按温度加载基于衰减后的使用分数而非累计次数"""
+        storage = storage_factory(tmp_path)
+        storage.initialize()
+        now = datetime.now()
+        storage.save_many(
+            [
+                # 累计次数很高但早已不用
+                ToolMetadata(
+                    name="faded",
+                    description="Faded tool",
+                    use_frequency=1000,
+                    usage_score=1000.0,
+                    usage_score_updated_at=now - timedelta(days=365),
+                ),
+                ToolMetadata(
+                    name="recent",
+                    description="Recent tool",
+                    use_frequency=20,
+                    usage_score=20.0,
+                    usage_score_updated_at=now,
+                ),
+            ]
+        )
+
+        hot = storage.load_by_temperature(ToolTemperature.HOT)
+        cold = storage.load_by_temperature(ToolTemperature.COLD)
+
+        assert [t.name for t in hot] == ["recent"]
+        assert [t.name for t in cold] == ["faded"]
+
+    @pytest.mark.parametrize(
+        "storage_factory",
+        [
+            lambda tmp_path: JSONStorage(tmp_path / "test.json"),
+            lambda tmp_path: SQLiteStorage(tmp_path / "test.db"),
+            lambda tmp_path: BinaryStorage(tmp_path / "test.bin"),
+        ],
+    )
+    def test_load_by_temperature_orders_by_usage(self, storage_factory, tmp_path: Path) -> None:
+        """测试按温度加载按使用频率、最近使用时间降序排列，limit 返回最常用的工具"""
+        storage = storage_factory(tmp_path)
+        storage.initialize()
+        now = datetime.now()
+        storage.save_many(
+            [
+                ToolMetadata(name="b_tie", description="Tie", use_frequency=20),
+                ToolMetadata(name="hottest", description="Hottest", use_frequency=50),
+                ToolMetadata(
+                    name="recent",
+                    description="Recent",
+                    use_frequency=20,
+                    last_used=now,
+                ),
+                ToolMetadata(name="a_tie", description="Tie", use_frequency=20),
+                ToolMetadata(name="cold", description="Cold", use_frequency=1),
+            ]
+        )
+
+        hot = storage.load_by_temperature(ToolTemperature.HOT)
+        limited = storage.load_by_temperature(ToolTemperature.HOT, limit=2)
+
+        assert [t.name for t in hot] == ["hottest", "recent", "a_tie", "b_tie"]
+        assert [t.name for t in limited] == ["hottest", "recent"]
+
+    @pytest.mark.parametrize(
+        "storage_factory",
+        [
+            lambda tmp_path: JSONStorage(tmp_path / "test.json"),
+            lambda tmp_path: SQLiteStorage(tmp_path / "test.db"),
+            lambda tmp_path: BinaryStorage(tmp_path / "test.bin"),
+        ],
+    )
+    def test_load_by_temperature_orders_by_decayed_score(
+        self, storage_factory, tmp_path: Path
+    ) -> None:
+        """测试按温度加载按衰减后的使用分数排序，而不是累计使用频率"""
+        storage = storage_factory(tmp_path)
+        storage.initialize()
+        now = datetime.now()
+        storage.save_many(
+            [
+                # 累计次数最多，但一个半衰期后分数约为 20
+                ToolMetadata(
+                    name="veteran",
+                    description="Veteran tool",
+                    use_frequency=100,
+                    usage_score=40.0,
+                    usage_score_updated_at=now - timedelta(days=14),
+                ),
+                ToolMetadata(
+                    name="current",
+                    description="Current tool",
+                    use_frequency=30,
+                    usage_score=30.0,
+                    usage_score_updated_at=now,
+                ),
+                # 未跟踪衰减的旧数据以累计次数作为分数
+                ToolMetadata(name="legacy", description="Legacy tool", use_frequency=25),
+            ]
+        )
+
+        hot = storage.load_by_temperature(ToolTemperature.HOT)
+        limited = storage.load_by_temperature(ToolTemperature.HOT, limit=2)
+
+        assert [t.name for t in hot] == ["current", "legacy", "veteran"]
+        assert [t.name for t in limited] == ["current", "legacy"]
+
+    @pytest.mark.parametrize(
+        "storage_factory",
+        [
+            lambda tmp_path: JSONStorage(tmp_path / "test.json"),
+            lambda tmp_path: SQLiteStorage(tmp_path / "test.db"),
+            lambda tmp_path: BinaryStorage(tmp_path / "test.bin"),
+        ],
+    )
+    def test_load_all_without_schemas(self, storage_factory, tmp_path: Path) -> None:
+        """测试 include_schemas=False 时不加载 Schema，可按名称单独读取"""
+        storage = storage_factory(tmp_path)
+        storage.initialize()
+        input_schema = {"type": "object", "properties": {"q": {"type": "string"}}}
+        storage.save(
+            ToolMetadata(
+                name="schema_tool",
+                description="Tool with schema",
+                tags={"a"},
+                input_schema=input_schema,
+            )
+        )
+
+        [tool] = storage.load_all(include_schemas=False)
+
+        assert tool.name == "schema_tool"
+        assert tool.tags == {"a"}
+        assert tool.input_schema is None
+        assert storage.load_schemas("schema_tool") == (input_schema, None)
+        assert storage.load_schemas("missing") is None
@@ -0,0 +1,222 @@
+"""
+分层启动加载单元测试
+
+测试只预加载热/温工具、后台分批加载冷工具，以及未驻留工具的按需读取。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from registrytools.registry.models import SearchMethod, ToolMetadata, ToolTemperature
+from registrytools.registry.registry import ToolRegistry
+from registrytools.registry.tier_loader import BackgroundTierLoader
+from registrytools.search.bm25_search import BM25Search
+from registrytools.server import _create_server_lifespan, create_server_with_sqlite
+from registrytools.storage.sqlite_storage import SQLiteStorage
+
+
+def make_tool(name: str, uses: int = 0) -> ToolMetadata:
+    """创建测试工具（uses 决定温度层：>=10 热，>=3 温，其余冷）"""
+    return ToolMetadata(
+        name=name,
+        description=f"Tool {name} for reading files",
+        use_frequency=uses,
+        usage_score=float(uses),
+        usage_score_updated_at=datetime.now() if uses else None,
+        last_used=datetime.now() if uses else None,
+        input_schema={"type": "object"},
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """包含 1 个热、1 个温和 5 个冷工具的存储"""
+    storage = SQLiteStorage(tmp_path / "tools.db")
+    storage.initialize()
+    storage.save_many(
+        [make_tool("hot_tool", 20), make_tool("warm_tool", 5)]
+        + [make_tool(f"cold_{i}") for i in range(5)]
+    )
+    return storage
+
+
+@pytest.fixture
+def registry(storage):
+    """只预加载热/温工具的注册表"""
+    reg = ToolRegistry()
+    reg.register_searcher(SearchMethod.BM25, BM25Search())
+    reg.preload_tiers(storage)
+    return reg
+
+
+class TestPreloadTiers:
+    """ToolRegistry.preload_tiers 测试"""
+
+    def test_only_hot_and_warm_resident(self, registry):
+        """测试启动时只加载热/温工具"""
+        assert {t.name for t in registry.list_tools()} == {"hot_tool", "warm_tool"}
+        assert registry.resident_temperatures == {ToolTemperature.HOT, ToolTemperature.WARM}
+        assert registry.pending_temperatures == [ToolTemperature.COLD]
+        assert not registry.is_fully_loaded
+
+    def test_hot_tools_searchable_immediately(self, registry):
+        """测试热工具搜索不等待冷工具加载"""
+        results = registry.search_hot_warm("reading files", SearchMethod.BM25)
+
+        assert {r.tool_name for r in results} <= {"hot_tool", "warm_tool"}
+
+    def test_load_tier_in_batches(self, registry):
+        """测试冷工具分批加载后全部驻留"""
+        loaded = registry.load_tier(ToolTemperature.COLD, batch_size=2)
+
+        assert loaded == 5
+        assert registry.tool_count == 7
+        assert registry.is_fully_loaded
+        assert registry.load_tier(ToolTemperature.COLD) == 0
+
+    def test_load_tier_stops_between_batches(self, registry):
+        """测试停止信号在批次之间中止加载，温度层保持未驻留"""
+        stop = threading.Event()
+        stop.set()
+
+        assert registry.load_tier(ToolTemperature.COLD, batch_size=2, stop_event=stop) == 0
+        assert registry.pending_temperatures == [ToolTemperature.COLD]
+
+    def test_load_does_not_overwrite_newer_tools(self, registry):
+        """测试加载期间重新注册的工具不被存储中的旧数据覆盖"""
+        registry.register(ToolMetadata(name="cold_0", description="Updated in memory"))
+
+        registry.load_tier(ToolTemperature.COLD)
+
+        assert registry.get_tool("cold_0").description == "Updated in memory"
+
+    def test_unregistered_tool_not_reloaded(self, registry):
+        """测试加载期间注销的工具不会被重新加载"""
+        assert registry.get_tool("cold_1") is not None
+        registry.unregister("cold_1")
+
+        registry.load_tier(ToolTemperature.COLD)
+
+        assert registry.get_tool("cold_1") is None
+
+
+class TestOnDemandFetch:
+    """未驻留工具按需读取测试"""
+
+    def test_get_tool_fetches_cold_tool(self, registry):
+        """测试 get_tool 从存储读取未驻留的冷工具并注册"""
+        tool = registry.get_tool("cold_2")
+
+        assert tool is not None
+        assert tool.input_schema == {"type": "object"}
+        assert registry.tool_count == 3
+
+    def test_update_usage_fetches_cold_tool(self, registry):
+        """测试 update_usage 对未驻留的工具同样生效"""
+        assert registry.update_usage("cold_3") is True
+        assert registry.get_tool("cold_3").use_frequency == 1
+
+    def test_missing_tool(self, registry):
+        """测试存储中不存在的工具返回 None"""
+        assert registry.get_tool("missing") is None
+        assert registry.update_usage("missing") is False
+
+    def test_fetch_with_lazy_schemas(self, storage):
+        """测试启用 Schema 延迟加载时按需读取的工具 Schema 进入缓存"""
+        reg = ToolRegistry()
+        reg.enable_lazy_schemas(storage)
+        reg.preload_tiers(storage, defer_schemas=True)
+
+        tool = reg.get_tool("cold_4")
+
+        assert tool.input_schema == {"type": "object"}
+        assert reg._tools["cold_4"].input_schema is None
+        assert len(reg._schema_cache) == 1
+
+
+class TestBackgroundTierLoader:
+    """BackgroundTierLoader 测试"""
+
+    def test_run_once(self, registry):
+        """测试同步加载所有未驻留的温度层"""
+        loader = BackgroundTierLoader(registry)
+
+        assert loader.run_once() == 5
+        assert registry.is_fully_loaded
+
+    def test_background_thread(self, registry):
+        """测试后台线程加载完成后退出"""
+        loader = BackgroundTierLoader(registry)
+        loader.start()
+        loader._thread.join(5)
+
+        assert not loader.is_running
+        assert registry.tool_count == 7
+
+    def test_start_noop_when_fully_loaded(self):
+        """测试全部温度层已驻留时不启动线程"""
+        loader = BackgroundTierLoader(ToolRegistry())
+        loader.start()
+
+        assert loader._thread is None
+
+
+class TestColdLoadModeServer:
+    """REGISTRYTOOLS_COLD_LOAD_MODE 服务器集成测试"""
+
+    @pytest.fixture
+    def data_path(self, tmp_path):
+        data_path = tmp_path / "data"
+        data_path.mkdir()
+        storage = SQLiteStorage(data_path / "tools.db")
+        storage.initialize()
+        storage.save_many([make_tool("hot_tool", 20)] + [make_tool(f"cold_{i}") for i in range(3)])
+        return data_path
+
+    @staticmethod
+    def read_stats(server) -> dict:
+        resource = server._resource_manager._resources.get("registry://stats")
+        return json.loads(resource.fn())
+
+    def test_on_demand(self, data_path, monkeypatch):
+        """测试按需模式只预加载热工具，且不加载默认工具集"""
+        monkeypatch.setenv("REGISTRYTOOLS_COLD_LOAD_MODE", "on_demand")
+        server = create_server_with_sqlite(data_path)
+
+        stats = self.read_stats(server)
+        assert stats["total_tools"] == 1
+        assert stats["resident_temperatures"] == ["hot", "warm"]
+
+        for tool in server._tool_manager._tools.values():
+            if tool.name == "get_tool_definition":
+                data = json.loads(tool.fn(tool_name="cold_1"))
+                break
+        assert data["name"] == "cold_1"
+
+    def test_background_mode_skips_cold_tools_at_startup(self, data_path, monkeypatch):
+        """测试后台模式启动时冷工具未驻留（由生命周期中的加载线程加载）"""
+        monkeypatch.setenv("REGISTRYTOOLS_COLD_LOAD_MODE", "background")
+        server = create_server_with_sqlite(data_path)
+
+        assert self.read_stats(server)["total_tools"] == 1
+
+    async def test_lifespan_runs_loader(self, registry):
+        """测试服务器生命周期启动和停止后台加载线程"""
+        loader = BackgroundTierLoader(registry)
+        lifespan = _create_server_lifespan(registry, None, None, loader)
+
+        async with lifespan(None):
+            for _ in range(100):
+                if registry.is_fully_loaded:
+                    break
+                await asyncio.sleep(0.01)
+
+        assert registry.tool_count == 7
+        assert not loader.is_running
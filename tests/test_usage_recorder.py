@@ -0,0 +1,191 @@
+"""
+写后使用统计单元测试
+
+测试 UsageRecorder 的内存更新、批量刷新和关闭刷新，以及相关 MCP 工具。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from registrytools.registry.models import ToolMetadata, ToolTemperature
+from registrytools.registry.registry import ToolRegistry
+from registrytools.registry.usage import UsageRecorder
+from registrytools.server import _create_server_lifespan, create_server, get_usage_flush_config
+from registrytools.storage.json_storage import JSONStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """创建包含两个工具的 JSON 存储"""
+    storage = JSONStorage(tmp_path / "tools.json")
+    storage.save_many(
+        [
+            ToolMetadata(name="tool_a", description="Tool A"),
+            ToolMetadata(name="tool_b", description="Tool B"),
+        ]
+    )
+    return storage
+
+
+@pytest.fixture
+def registry(storage):
+    """从存储加载的注册表"""
+    reg = ToolRegistry(inline_maintenance=False)
+    reg.register_many(storage.load_all())
+    return reg
+
+
+def _get_mcp_tool(mcp, name):
+    return next(tool for tool in mcp._tool_manager._tools.values() if tool.name == name)
+
+
+class TestUsageRecorder:
+    """UsageRecorder 测试"""
+
+    @pytest.mark.parametrize(("interval", "batch_size"), [(0, 10), (1.0, 0)])
+    def test_invalid_config(self, registry, storage, interval, batch_size):
+        """测试刷新间隔和批量大小必须大于 0"""
+        with pytest.raises(ValueError):
+            UsageRecorder(registry, storage, interval, batch_size)
+
+    def test_record_updates_memory_without_io(self, registry, storage):
+        """测试记录只更新内存，不写存储"""
+        mock_storage = MagicMock(wraps=storage)
+        recorder = UsageRecorder(registry, mock_storage)
+
+        assert recorder.record("tool_a") is True
+        assert recorder.record("tool_a") is True
+
+        assert registry.get_tool("tool_a").use_frequency == 2
+        assert recorder.pending_count == 1
+        mock_storage.save_many.assert_not_called()
+        assert storage.get("tool_a").use_frequency == 0
+
+    def test_record_unknown_tool(self, registry, storage):
+        """测试记录不存在的工具"""
+        recorder = UsageRecorder(registry, storage)
+
+        assert recorder.record("missing") is False
+        assert recorder.pending_count == 0
+
+    def test_flush_writes_batch(self, registry, storage):
+        """测试刷新通过一次 save_many 写入所有待刷新工具"""
+        mock_storage = MagicMock(wraps=storage)
+        recorder = UsageRecorder(registry, mock_storage)
+        for _ in range(3):
+            recorder.record("tool_a")
+        recorder.record("tool_b")
+
+        assert recorder.flush() == 2
+
+        mock_storage.save_many.assert_called_once()
+        assert storage.get("tool_a").use_frequency == 3
+        assert storage.get("tool_b").use_frequency == 1
+        assert recorder.pending_count == 0
+
+    def test_batch_size_triggers_flush(self, registry, storage):
+        """测试达到批量大小时提前刷新"""
+        recorder = UsageRecorder(registry, storage, flush_batch_size=2)
+
+        recorder.record("tool_a")
+        assert storage.get("tool_a").use_frequency == 0
+        recorder.record("tool_b")
+
+        assert recorder.pending_count == 0
+        assert storage.get("tool_a").use_frequency == 1
+
+    def test_failed_flush_retries(self, registry, storage):
+        """测试写入失败时待刷新工具被保留"""
+        mock_storage = MagicMock()
+        mock_storage.save_many.side_effect = OSError("disk full")
+        recorder = UsageRecorder(registry, mock_storage)
+        recorder.record("tool_a")
+
+        assert recorder.flush() == 0
+        assert recorder.pending_count == 1
+
+    def test_background_flush_and_stop(self, registry, storage):
+        """测试后台线程按间隔刷新，停止时刷新剩余数据"""
+        recorder = UsageRecorder(registry, storage, flush_interval=0.05)
+        recorder.start()
+        try:
+            recorder.record("tool_a")
+            deadline = time.time() + 2
+            while storage.get("tool_a").use_frequency == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert storage.get("tool_a").use_frequency == 1
+
+            recorder.record("tool_b")
+        finally:
+            recorder.stop()
+
+        assert not recorder.is_running
+        assert storage.get("tool_b").use_frequency == 1
+
+    async def test_server_lifespan_flushes_on_shutdown(self, registry, storage):
+        """测试服务器关闭时刷新剩余的使用统计"""
+        recorder = UsageRecorder(registry, storage, flush_interval=60)
+        lifespan = _create_server_lifespan(registry, None, recorder)
+
+        async with lifespan(None):
+            assert recorder.is_running
+            recorder.record("tool_a")
+
+        assert not recorder.is_running
+        assert storage.get("tool_a").use_frequency == 1
+
+
+class TestUsageMCPTools:
+    """使用统计相关 MCP 工具测试"""
+
+    def test_get_tool_definition_records_usage(self, storage, tmp_path):
+        """测试 get_tool_definition 记录工具使用"""
+        mcp = create_server(tmp_path)
+        get_tool_definition = _get_mcp_tool(mcp, "get_tool_definition")
+        record_tool_usage = _get_mcp_tool(mcp, "record_tool_usage")
+
+        get_tool_definition.fn(tool_name="tool_a")
+        data = json.loads(record_tool_usage.fn(tool_name="tool_a"))
+
+        assert data["success"] is True
+        assert data["use_frequency"] == 2
+        assert data["temperature"] == ToolTemperature.COLD.value
+
+    def test_record_tool_usage_unknown_tool(self, storage, tmp_path):
+        """测试记录不存在的工具抛出异常"""
+        mcp = create_server(tmp_path)
+        record_tool_usage = _get_mcp_tool(mcp, "record_tool_usage")
+
+        with pytest.raises(ValueError, match="工具不存在"):
+            record_tool_usage.fn(tool_name="missing")
+
+
+class TestGetUsageFlushConfig:
+    """get_usage_flush_config 测试"""
+
+    def test_default(self, monkeypatch):
+        """测试默认配置"""
+        monkeypatch.delenv("REGISTRYTOOLS_USAGE_FLUSH_INTERVAL", raising=False)
+        monkeypatch.delenv("REGISTRYTOOLS_USAGE_FLUSH_BATCH_SIZE", raising=False)
+
+        assert get_usage_flush_config() == (5.0, 100)
+
+    def test_custom(self, monkeypatch):
+        """测试自定义配置"""
+        monkeypatch.setenv("REGISTRYTOOLS_USAGE_FLUSH_INTERVAL", "2.5")
+        monkeypatch.setenv("REGISTRYTOOLS_USAGE_FLUSH_BATCH_SIZE", "20")
+
+        assert get_usage_flush_config() == (2.5, 20)
+
+    def test_zero_uses_default(self, monkeypatch):
+        """测试 0 使用默认值"""
+        monkeypatch.setenv("REGISTRYTOOLS_USAGE_FLUSH_INTERVAL", "0")
+        monkeypatch.setenv("REGISTRYTOOLS_USAGE_FLUSH_BATCH_SIZE", "0")
+
+        assert get_usage_flush_config() == (5.0, 100)
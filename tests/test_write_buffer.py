@@ -0,0 +1,220 @@
+"""
+存储写缓冲单元测试
+
+测试 BufferedStorage 的写入合并、读己之写、批量/防抖刷新、失败重试，
+以及存储后端的批量删除和服务器写入模式配置。
+
+Copyright (c) 2026 Maric
+License: MIT
+"""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from registrytools.registry.models import ToolMetadata, WriteMode
+from registrytools.server import create_server, get_write_buffer_config
+from registrytools.storage.base import ToolStorage
+from registrytools.storage.buffered import BufferedStorage
+from registrytools.storage.json_storage import JSONStorage
+from registrytools.storage.sqlite_storage import SQLiteStorage
+
+
+class CountingStorage(JSONStorage):
+    """记录 save_many / delete_many 调用次数的 JSON 存储"""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.save_calls: list[list[str]] = []
+        self.delete_calls: list[list[str]] = []
+        self.fail = False
+        self.saved = threading.Event()
+
+    def save_many(self, tools: list[ToolMetadata]) -> None:
+        if self.fail:
+            raise OSError("disk full")
+        self.save_calls.append([tool.name for tool in tools])
+        super().save_many(tools)
+        self.saved.set()
+
+    def delete_many(self, tool_names: list[str]) -> int:
+        self.delete_calls.append(list(tool_names))
+        return super().delete_many(tool_names)
+
+
+def make_tool(name: str, description: str = "Test tool") -> ToolMetadata:
+    """创建测试工具"""
+    return ToolMetadata(name=name, description=description)
+
+
+@pytest.fixture
+def inner(tmp_path: Path) -> CountingStorage:
+    """底层计数存储"""
+    return CountingStorage(tmp_path / "tools.json")
+
+
+class TestBufferedStorage:
+    """BufferedStorage 测试"""
+
+    def test_coalesces_writes(self, inner):
+        """测试两次刷新之间同一工具的多次写入只写入最后一次"""
+        storage = BufferedStorage(inner, flush_delay=60)
+        for i in range(5):
+            storage.save(make_tool("tool.a", f"Version {i}"))
+        storage.save(make_tool("tool.b"))
+
+        assert inner.save_calls == []
+        assert storage.pending_count == 2
+        assert storage.flush() == 2
+        assert inner.save_calls == [["tool.a", "tool.b"]]
+        assert inner.get("tool.a").description == "Version 4"
+        storage.close()
+
+    def test_reads_own_writes(self, inner):
+        """测试刷新前的读取能看到缓冲的保存和删除"""
+        inner.save(make_tool("existing"))
+        storage = BufferedStorage(inner, flush_delay=60)
+        storage.save(make_tool("new.tool", "New"))
+
+        assert storage.get("new.tool").description == "New"
+        assert storage.exists("new.tool")
+        assert storage.load_schemas("new.tool") == (None, None)
+
+        assert storage.delete("existing") is True
+        assert storage.get("existing") is None
+        assert not storage.exists("existing")
+        assert storage.delete("missing") is False
+
+        assert [t.name for t in storage.load_all()] == ["new.tool"]
+        assert inner.delete_calls == [["existing"]]
+        storage.close()
+
+    def test_batched_flushes_when_batch_full(self, inner):
+        """测试 BATCHED 模式批量已满时由写入方同步刷新"""
+        storage = BufferedStorage(inner, WriteMode.BATCHED, flush_delay=60, batch_size=3)
+        storage.save_many([make_tool(f"tool.{i}") for i in range(2)])
+
+        assert inner.save_calls == []
+
+        storage.save(make_tool("tool.2"))
+
+        assert inner.save_calls == [["tool.0", "tool.1", "tool.2"]]
+        assert storage.pending_count == 0
+        storage.close()
+
+    def test_async_background_flush(self, inner):
+        """测试 ASYNC 模式在防抖延迟后由后台线程刷新"""
+        storage = BufferedStorage(inner, WriteMode.ASYNC, flush_delay=0.01)
+        storage.save(make_tool("tool.a"))
+
+        assert storage.is_running
+        assert inner.saved.wait(5.0)
+        assert inner.get("tool.a") is not None
+        storage.close()
+        assert not storage.is_running
+
+    def test_sync_mode_passes_through(self, inner):
+        """测试 SYNC 模式写入直接到达底层存储"""
+        storage = BufferedStorage(inner, WriteMode.SYNC)
+        storage.save(make_tool("tool.a"))
+
+        assert inner.get("tool.a") is not None
+        assert storage.pending_count == 0
+        assert not storage.is_running
+
+    def test_flush_returns_written_count(self, inner):
+        """测试 flush() 返回写入数量，未缓冲的存储返回 0"""
+        storage = BufferedStorage(inner, flush_delay=60)
+        storage.save(make_tool("tool.a"))
+        storage.save(make_tool("tool.b"))
+
+        assert storage.flush() == 2
+        assert storage.flush() == 0
+        assert inner.flush() == 0
+
+    def test_failed_flush_requeues(self, inner):
+        """测试写入失败时变更放回缓冲区，不覆盖期间更新的写入"""
+        storage = BufferedStorage(inner, flush_delay=60)
+        storage.save(make_tool("tool.a", "Old"))
+        inner.fail = True
+
+        with pytest.raises(OSError):
+            storage.flush()
+
+        assert storage.pending_count == 1
+        storage.save(make_tool("tool.a", "New"))
+        inner.fail = False
+        storage.close()
+
+        assert inner.get("tool.a").description == "New"
+
+    def test_close_flushes_pending(self, inner):
+        """测试 close() 刷新剩余写入"""
+        storage = BufferedStorage(inner, WriteMode.ASYNC, flush_delay=60)
+        storage.save(make_tool("tool.a"))
+        storage.close()
+
+        assert inner.get("tool.a") is not None
+
+    def test_invalid_config(self, inner):
+        """测试无效的防抖延迟和批量大小"""
+        with pytest.raises(ValueError, match="防抖延迟"):
+            BufferedStorage(inner, flush_delay=-1)
+        with pytest.raises(ValueError, match="批量大小"):
+            BufferedStorage(inner, batch_size=0)
+
+
+class TestDeleteMany:
+    """存储后端批量删除测试"""
+
+    @pytest.mark.parametrize("backend", [JSONStorage, SQLiteStorage])
+    def test_delete_many(self, tmp_path: Path, backend: type[ToolStorage]):
+        """测试一次删除多个工具并返回实际删除数量"""
+        storage = backend(tmp_path / "tools.store")
+        storage.save_many([make_tool(f"tool.{i}") for i in range(4)])
+
+        assert storage.delete_many(["tool.0", "tool.2", "missing"]) == 2
+        assert sorted(t.name for t in storage.load_all()) == ["tool.1", "tool.3"]
+        assert storage.delete_many([]) == 0
+
+
+class TestServerWriteMode:
+    """服务器写入模式配置测试"""
+
+    def test_default_sync(self, monkeypatch):
+        """测试默认使用 SYNC 模式"""
+        monkeypatch.delenv("REGISTRYTOOLS_WRITE_MODE", raising=False)
+
+        assert get_write_buffer_config()[0] == WriteMode.SYNC
+
+    def test_env_config(self, monkeypatch):
+        """测试从环境变量读取模式、延迟和批量大小"""
+        monkeypatch.setenv("REGISTRYTOOLS_WRITE_MODE", "ASYNC")
+        monkeypatch.setenv("REGISTRYTOOLS_WRITE_FLUSH_DELAY", "0.5")
+        monkeypatch.setenv("REGISTRYTOOLS_WRITE_BATCH_SIZE", "20")
+
+        assert get_write_buffer_config() == (WriteMode.ASYNC, 0.5, 20)
+
+    def test_invalid_mode(self, monkeypatch):
+        """测试无效模式回退到 SYNC"""
+        monkeypatch.setenv("REGISTRYTOOLS_WRITE_MODE", "eventually")
+
+        assert get_write_buffer_config()[0] == WriteMode.SYNC
+
+    @pytest.mark.asyncio
+    async def test_batched_server_persists_on_shutdown(self, tmp_path, monkeypatch):
+        """测试 BATCHED 模式下注册的工具在服务器关闭时写入存储"""
+        monkeypatch.setenv("REGISTRYTOOLS_WRITE_MODE", "batched")
+        monkeypatch.setenv("REGISTRYTOOLS_WRITE_FLUSH_DELAY", "60")
+        data_path = tmp_path / "data"
+        server = create_server(data_path)
+        tools = {tool.name: tool for tool in server._tool_manager._tools.values()}
+
+        async with server._lifespan(server):
+            tools["register_tool"].fn(name="buffered.tool", description="Buffered tool")
+            definition = json.loads(tools["get_tool_definition"].fn(tool_name="buffered.tool"))
+            assert definition["name"] == "buffered.tool"
+
+        assert JSONStorage(data_path / "tools.json").get("buffered.tool") is not None